@@ -0,0 +1,35 @@
+"""add rolling context summary to conversations and message tail index
+
+Revision ID: a1c4e7f2b9d0
+Revises: 39bedf8c62d3
+Create Date: 2026-10-18 12:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c4e7f2b9d0'
+down_revision: Union[str, None] = '39bedf8c62d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('conversations', sa.Column('context_summary', sa.Text(), nullable=True))
+    op.add_column('conversations', sa.Column('context_summary_until', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_messages_conversation_id_created_at',
+        'messages',
+        ['conversation_id', 'created_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_conversation_id_created_at', table_name='messages')
+    op.drop_column('conversations', 'context_summary_until')
+    op.drop_column('conversations', 'context_summary')
@@ -0,0 +1,84 @@
+"""add structured_data_rows and move row-based documents into it
+
+Revision ID: b7d2e91c4f3a
+Revises: a1c4e7f2b9d0
+Create Date: 2026-10-18 13:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e91c4f3a'
+down_revision: Union[str, None] = 'a1c4e7f2b9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _data_column_type() -> str:
+    """structured_data.data may be json or jsonb depending on how the table was created."""
+    columns = sa.inspect(op.get_bind()).get_columns('structured_data')
+    data_column = next(c for c in columns if c['name'] == 'data')
+    return 'jsonb' if isinstance(data_column['type'], postgresql.JSONB) else 'json'
+
+
+def upgrade() -> None:
+    op.add_column(
+        'structured_data',
+        sa.Column('rows_in_table', sa.Boolean(), server_default=sa.false(), nullable=False)
+    )
+    op.create_table(
+        'structured_data_rows',
+        sa.Column('structured_data_id', sa.UUID(), nullable=False),
+        sa.Column('ordinal', sa.Integer(), nullable=False),
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.ForeignKeyConstraint(['structured_data_id'], ['structured_data.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint(
+            'structured_data_id', 'ordinal',
+            name='pk_structured_data_rows',
+            deferrable=True,
+            initially='IMMEDIATE'
+        )
+    )
+
+    # Move the rows of every row-based document into the new table
+    data_type = _data_column_type()
+    op.execute("""
+        INSERT INTO structured_data_rows (structured_data_id, ordinal, data)
+        SELECT sd.id, r.ordinality - 1, r.value
+        FROM structured_data sd
+        CROSS JOIN LATERAL jsonb_array_elements(sd.data::jsonb -> 'rows') WITH ORDINALITY AS r(value, ordinality)
+        WHERE jsonb_typeof(sd.data::jsonb -> 'rows') = 'array'
+    """)
+    op.execute(f"""
+        UPDATE structured_data
+        SET data = (data::jsonb - 'rows')::{data_type},
+            rows_in_table = true
+        WHERE jsonb_typeof(data::jsonb -> 'rows') = 'array'
+    """)
+
+
+def downgrade() -> None:
+    # Fold the rows back into their documents before dropping the table
+    data_type = _data_column_type()
+    op.execute(f"""
+        UPDATE structured_data sd
+        SET data = (
+            sd.data::jsonb || jsonb_build_object(
+                'rows',
+                COALESCE(
+                    (SELECT jsonb_agg(r.data ORDER BY r.ordinal)
+                     FROM structured_data_rows r
+                     WHERE r.structured_data_id = sd.id),
+                    '[]'::jsonb
+                )
+            )
+        )::{data_type}
+        WHERE sd.rows_in_table
+    """)
+    op.drop_table('structured_data_rows')
+    op.drop_column('structured_data', 'rows_in_table')
@@ -0,0 +1,29 @@
+"""add version to structured_data_rows
+
+Revision ID: c3f8a5d1e6b2
+Revises: b7d2e91c4f3a
+Create Date: 2026-10-18 14:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a5d1e6b2'
+down_revision: Union[str, None] = 'b7d2e91c4f3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'structured_data_rows',
+        sa.Column('version', sa.Integer(), server_default='0', nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('structured_data_rows', 'version')
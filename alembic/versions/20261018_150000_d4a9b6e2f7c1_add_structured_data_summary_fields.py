@@ -0,0 +1,80 @@
+"""add row_count and column_names summary fields to structured_data
+
+Revision ID: d4a9b6e2f7c1
+Revises: c3f8a5d1e6b2
+Create Date: 2026-10-18 15:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a9b6e2f7c1'
+down_revision: Union[str, None] = 'c3f8a5d1e6b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'structured_data',
+        sa.Column('row_count', sa.Integer(), server_default='0', nullable=False)
+    )
+    op.add_column(
+        'structured_data',
+        sa.Column(
+            'column_names',
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'[]'::jsonb"),
+            nullable=False
+        )
+    )
+    op.create_index(
+        'ix_structured_data_created_at_id', 'structured_data', ['created_at', 'id']
+    )
+
+    # Backfill from the stored documents: column_order, then headers, then
+    # the keys of the first row (inline or in structured_data_rows)
+    op.execute("""
+        UPDATE structured_data sd
+        SET row_count = CASE
+                WHEN sd.rows_in_table THEN (
+                    SELECT count(*) FROM structured_data_rows r
+                    WHERE r.structured_data_id = sd.id
+                )
+                WHEN jsonb_typeof(sd.data::jsonb -> 'rows') = 'array'
+                    THEN jsonb_array_length(sd.data::jsonb -> 'rows')
+                ELSE 0
+            END,
+            column_names = CASE
+                WHEN jsonb_typeof(sd.data::jsonb -> 'column_order') = 'array'
+                    THEN sd.data::jsonb -> 'column_order'
+                WHEN jsonb_typeof(sd.data::jsonb -> 'headers') = 'array'
+                    THEN sd.data::jsonb -> 'headers'
+                ELSE COALESCE(
+                    (SELECT jsonb_agg(k)
+                     FROM jsonb_object_keys(
+                         CASE
+                             WHEN sd.rows_in_table THEN (
+                                 SELECT r.data FROM structured_data_rows r
+                                 WHERE r.structured_data_id = sd.id AND r.ordinal = 0
+                                   AND jsonb_typeof(r.data) = 'object'
+                             )
+                             WHEN jsonb_typeof(sd.data::jsonb -> 'rows' -> 0) = 'object'
+                                 THEN sd.data::jsonb -> 'rows' -> 0
+                         END
+                     ) AS k),
+                    '[]'::jsonb
+                )
+            END
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_structured_data_created_at_id', table_name='structured_data')
+    op.drop_column('structured_data', 'column_names')
+    op.drop_column('structured_data', 'row_count')
@@ -0,0 +1,48 @@
+"""add row_value_numeric/row_value_boolean for typed row queries
+
+Revision ID: e5b1c7d3a8f4
+Revises: d4a9b6e2f7c1
+Create Date: 2026-10-18 16:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b1c7d3a8f4'
+down_revision: Union[str, None] = 'd4a9b6e2f7c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lenient casts of cell text: NULL instead of an error for values that
+    # don't parse. IMMUTABLE so they can be used in expression indexes.
+    op.execute(r"""
+        CREATE OR REPLACE FUNCTION row_value_numeric(value text) RETURNS numeric
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT CASE
+                WHEN cleaned ~ '^[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?$'
+                THEN cleaned::numeric
+            END
+            FROM (SELECT btrim(regexp_replace(value, '[$,]', '', 'g')) AS cleaned) AS v
+        $$
+    """)
+    op.execute(r"""
+        CREATE OR REPLACE FUNCTION row_value_boolean(value text) RETURNS boolean
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT CASE lower(btrim(value))
+                WHEN 'true' THEN true WHEN 't' THEN true WHEN 'yes' THEN true
+                WHEN 'y' THEN true WHEN '1' THEN true
+                WHEN 'false' THEN false WHEN 'f' THEN false WHEN 'no' THEN false
+                WHEN 'n' THEN false WHEN '0' THEN false
+            END
+        $$
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS row_value_boolean(text)")
+    op.execute("DROP FUNCTION IF EXISTS row_value_numeric(text)")
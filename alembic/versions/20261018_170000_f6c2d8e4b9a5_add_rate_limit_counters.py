@@ -0,0 +1,39 @@
+"""add unlogged rate_limit_counters table for the shared rate limiter
+
+Revision ID: f6c2d8e4b9a5
+Revises: e5b1c7d3a8f4
+Create Date: 2026-10-18 17:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c2d8e4b9a5'
+down_revision: Union[str, None] = 'e5b1c7d3a8f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # UNLOGGED: counters are short-lived, so skip the WAL; losing them on a
+    # crash only resets the current windows
+    op.execute("""
+        CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_counters (
+            key text NOT NULL,
+            window_start bigint NOT NULL,
+            count integer NOT NULL,
+            expires_at bigint NOT NULL,
+            PRIMARY KEY (key, window_start)
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_rate_limit_counters_expires_at "
+        "ON rate_limit_counters (expires_at)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS rate_limit_counters")
@@ -0,0 +1,79 @@
+"""add pg_trgm and lower() indexes on sports entity names
+
+Revision ID: a7d3e9f5c0b6
+Revises: f6c2d8e4b9a5
+Create Date: 2026-10-18 18:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9f5c0b6'
+down_revision: Union[str, None] = 'f6c2d8e4b9a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Named sports tables and the columns entity search matches against
+NAME_COLUMNS = {
+    'leagues': ('name', 'nickname'),
+    'divisions_conferences': ('name', 'nickname'),
+    'stadiums': ('name', 'nickname'),
+    'teams': ('name', 'nickname'),
+    'players': ('name', 'nickname'),
+    'brands': ('name', 'nickname'),
+    'league_executives': ('name', 'nickname'),
+    'broadcast_rights': ('name', 'nickname'),
+    'production_services': ('name', 'nickname'),
+    'game_broadcasts': ('name', 'nickname'),
+    'corporate': ('name', 'nickname'),
+    'managements': ('name',),
+}
+
+
+def _index_names(table: str, column: str) -> Sequence[str]:
+    return (f"ix_{table}_{column}_trgm", f"ix_{table}_{column}_lower")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Built CONCURRENTLY so the entity tables stay writable; that can't run
+    # inside the migration transaction
+    with op.get_context().autocommit_block():
+        for table, columns in NAME_COLUMNS.items():
+            for column in columns:
+                trgm, lower = _index_names(table, column)
+                # An interrupted concurrent build leaves an invalid index that
+                # IF NOT EXISTS would keep; drop it so it is rebuilt
+                for name in (trgm, lower):
+                    invalid = op.get_bind().execute(
+                        sa.text(
+                            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                            "WHERE c.relname = :name AND NOT i.indisvalid"
+                        ),
+                        {"name": name},
+                    ).first()
+                    if invalid:
+                        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                # Trigram GIN index: ILIKE '%x%' and similarity (%) searches
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {trgm} "
+                    f"ON {table} USING gin ({column} gin_trgm_ops)"
+                )
+                # lower() btree: case-insensitive equality and LIKE 'x%' prefixes
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {lower} "
+                    f"ON {table} (lower({column}) text_pattern_ops)"
+                )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, columns in NAME_COLUMNS.items():
+            for column in columns:
+                for name in _index_names(table, column):
+                    op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    # The extension is left installed; other objects may depend on it
@@ -0,0 +1,169 @@
+"""add denormalized *_display tables for sports related names
+
+Revision ID: b8e4f0a6d1c7
+Revises: a7d3e9f5c0b6
+Create Date: 2026-10-18 19:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4f0a6d1c7'
+down_revision: Union[str, None] = 'a7d3e9f5c0b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Display table -> (source table, related-name columns)
+DISPLAY_TABLES = {
+    'games_display': ('games', (
+        'league_name', 'league_sport', 'home_team_name', 'away_team_name', 'stadium_name',
+    )),
+    'broadcast_rights_display': ('broadcast_rights', (
+        'broadcast_company_name', 'division_conference_name', 'entity_name', 'league_name', 'league_sport',
+    )),
+    'production_services_display': ('production_services', (
+        'production_company_name', 'secondary_brand_name', 'entity_name', 'league_name', 'league_sport',
+    )),
+    'game_broadcasts_display': ('game_broadcasts', (
+        'game_name', 'broadcast_company_name', 'production_company_name',
+    )),
+}
+POLYMORPHIC_DISPLAY_TABLES = ('broadcast_rights_display', 'production_services_display')
+
+# Foreign keys the incremental refresh looks rows up by
+REFRESH_INDEXES = {
+    'games': ('league_id', 'home_team_id', 'away_team_id', 'stadium_id'),
+    'broadcast_rights': ('entity_id', 'broadcast_company_id', 'division_conference_id'),
+    'production_services': ('entity_id', 'production_company_id'),
+    'game_broadcasts': ('game_id', 'broadcast_company_id', 'production_company_id'),
+    'teams': ('league_id',),
+    'divisions_conferences': ('league_id',),
+}
+
+# Joins resolving the (entity_type, entity_id) subject of {t}, as in
+# src.services.sports.relationships.POLYMORPHIC_TARGETS
+SUBJECT_JOINS = """
+    LEFT JOIN leagues sl ON lower({t}.entity_type) = 'league' AND sl.id = {t}.entity_id
+    LEFT JOIN teams st ON lower({t}.entity_type) = 'team' AND st.id = {t}.entity_id
+    LEFT JOIN divisions_conferences sd
+        ON lower({t}.entity_type) IN ('division', 'conference', 'division_conference') AND sd.id = {t}.entity_id
+    LEFT JOIN games sg ON lower({t}.entity_type) = 'game' AND sg.id = {t}.entity_id
+    LEFT JOIN teams sgh ON sgh.id = sg.home_team_id
+    LEFT JOIN teams sga ON sga.id = sg.away_team_id
+"""
+SUBJECT_NAMES = "sl.name, st.name, sd.name, sgh.name || ' vs ' || sga.name"
+SUBJECT_LEAGUES = "sl.id, st.league_id, sd.league_id, sg.league_id"
+
+BACKFILL = {
+    'games_display': """
+        INSERT INTO games_display (id, league_name, league_sport, home_team_name, away_team_name, stadium_name)
+        SELECT games.id, l.name, l.sport, h.name, a.name, s.name
+        FROM games
+        LEFT JOIN leagues l ON l.id = games.league_id
+        LEFT JOIN teams h ON h.id = games.home_team_id
+        LEFT JOIN teams a ON a.id = games.away_team_id
+        LEFT JOIN stadiums s ON s.id = games.stadium_id
+    """,
+    'broadcast_rights_display': f"""
+        INSERT INTO broadcast_rights_display (id, broadcast_company_name, division_conference_name,
+                                              entity_name, league_id, league_name, league_sport)
+        SELECT broadcast_rights.id, bc.name, dc.name, coalesce({SUBJECT_NAMES}), l.id, l.name, l.sport
+        FROM broadcast_rights
+        LEFT JOIN brands bc ON bc.id = broadcast_rights.broadcast_company_id
+        LEFT JOIN divisions_conferences dc ON dc.id = broadcast_rights.division_conference_id
+        {SUBJECT_JOINS.format(t='broadcast_rights')}
+        LEFT JOIN leagues l ON l.id = coalesce({SUBJECT_LEAGUES}, dc.league_id)
+    """,
+    'production_services_display': f"""
+        INSERT INTO production_services_display (id, production_company_name, secondary_brand_name,
+                                                 entity_name, league_id, league_name, league_sport)
+        SELECT production_services.id, pc.name, sb.name,
+               coalesce(
+                   CASE WHEN lower(production_services.entity_type)
+                        IN ('championship', 'playoff', 'playoffs', 'tournament')
+                        THEN initcap(production_services.entity_type) END,
+                   {SUBJECT_NAMES},
+                   'Unknown Entity'
+               ),
+               l.id, l.name, l.sport
+        FROM production_services
+        LEFT JOIN brands pc ON pc.id = production_services.production_company_id
+        LEFT JOIN brands sb ON sb.id = production_services.secondary_brand_id
+        {SUBJECT_JOINS.format(t='production_services')}
+        LEFT JOIN leagues l ON l.id = coalesce({SUBJECT_LEAGUES})
+    """,
+    'game_broadcasts_display': """
+        INSERT INTO game_broadcasts_display (id, game_name, broadcast_company_name, production_company_name)
+        SELECT game_broadcasts.id, h.name || ' vs ' || a.name, bc.name, pc.name
+        FROM game_broadcasts
+        LEFT JOIN games g ON g.id = game_broadcasts.game_id
+        LEFT JOIN teams h ON h.id = g.home_team_id
+        LEFT JOIN teams a ON a.id = g.away_team_id
+        LEFT JOIN brands bc ON bc.id = game_broadcasts.broadcast_company_id
+        LEFT JOIN brands pc ON pc.id = game_broadcasts.production_company_id
+    """,
+}
+
+# Statement-level AFTER INSERT trigger giving every new entity its display row,
+# even when inserted with raw SQL, so listings can inner-join the display
+# table; the application's refresh keeps the names current afterwards
+INSERT_TRIGGER_FUNCTION = """
+    CREATE FUNCTION {display}_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        {backfill}
+        WHERE {source}.id IN (SELECT id FROM new_rows)
+        ON CONFLICT (id) DO NOTHING;
+        RETURN NULL;
+    END
+    $$
+"""
+INSERT_TRIGGER = """
+    CREATE TRIGGER {display}_insert AFTER INSERT ON {source}
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION {display}_insert();
+"""
+
+
+def upgrade() -> None:
+    for table, columns in REFRESH_INDEXES.items():
+        for column in columns:
+            op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})")
+
+    for display, (source, columns) in DISPLAY_TABLES.items():
+        league_id = (
+            [sa.Column('league_id', postgresql.UUID(), nullable=True)]
+            if display in POLYMORPHIC_DISPLAY_TABLES else []
+        )
+        op.create_table(
+            display,
+            sa.Column('id', postgresql.UUID(), nullable=False),
+            *(sa.Column(column, sa.String(length=255), nullable=True) for column in columns),
+            *league_id,
+            sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.ForeignKeyConstraint(['id'], [f'{source}.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        for column in columns:
+            # (name, id) matches the listings' ORDER BY name NULLS LAST, id
+            op.create_index(f'ix_{display}_{column}', display, [column, 'id'])
+        op.execute(BACKFILL[display])
+        op.execute(INSERT_TRIGGER_FUNCTION.format(display=display, source=source, backfill=BACKFILL[display].strip()))
+        op.execute(INSERT_TRIGGER.format(display=display, source=source))
+
+
+def downgrade() -> None:
+    for display, (source, columns) in DISPLAY_TABLES.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {display}_insert ON {source}")
+        op.execute(f"DROP FUNCTION IF EXISTS {display}_insert()")
+        for column in columns:
+            op.drop_index(f'ix_{display}_{column}', table_name=display)
+        op.drop_table(display)
+
+    for table, columns in REFRESH_INDEXES.items():
+        for column in columns:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}")
@@ -0,0 +1,291 @@
+"""
+Request rate limiting.
+
+Limits are sliding-window counters: each key keeps the hit count of the
+current fixed window and of the previous one, and the previous count is
+weighted by how much of it still overlaps the sliding window. That is O(1)
+per hit and a few integers per key, with none of the burst-at-the-boundary
+problem of plain fixed windows.
+
+Counters live in a RateLimitStore. MemoryRateLimitStore is per process
+(expired keys are dropped lazily as new hits arrive); PostgresRateLimitStore
+keeps them in an UNLOGGED table so every worker enforces the same limit.
+
+Which limit applies is decided by RateLimitPolicy: per-user overrides first,
+then the first route rule whose pattern occurs in the path, then the
+default. Authenticated requests are counted per user, everything else per
+client address (IPv6 clients per /64, since one host usually owns the whole
+prefix).
+"""
+import abc
+import ipaddress
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """At most `limit` requests per `window` seconds."""
+    limit: int
+    window: int
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse "<count>/<period>", e.g. "60/minute" or "1000/hour"."""
+        count, sep, period = value.partition("/")
+        try:
+            limit = int(count.strip())
+        except ValueError:
+            limit = -1
+        window = PERIODS.get(period.strip().lower().rstrip("s"))
+        if not sep or limit < 1 or window is None:
+            raise ValueError(f"Invalid rate limit '{value}', expected e.g. '60/minute'")
+        return cls(limit, window)
+
+    def __str__(self) -> str:
+        return f"{self.limit}/{self.window}s"
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one hit against a limit."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_at: int  # Unix time the current window ends
+    retry_after: int = 0  # Seconds until a request would be allowed again
+
+
+def evaluate(rate: RateLimit, now: float, count: int, previous: int) -> RateLimitResult:
+    """
+    Apply the sliding-window estimate to a key's counters.
+
+    Args:
+        rate: The limit being enforced.
+        now: Current Unix time.
+        count: Hits in the current window, including this one.
+        previous: Hits in the previous window.
+    """
+    window_start = int(now // rate.window) * rate.window
+    elapsed = now - window_start
+    carry = previous * (rate.window - elapsed) / rate.window
+    used = count + carry
+    reset_at = window_start + rate.window
+    if used <= rate.limit:
+        return RateLimitResult(True, rate.limit, int(rate.limit - used), reset_at)
+
+    # Wait until the previous window's share has decayed enough to make room
+    # for one more hit, or for the next window if this one alone fills the limit
+    headroom = rate.limit - count - 1
+    if headroom >= 0 and previous:
+        allowed_at = window_start + rate.window * (1 - headroom / previous)
+        retry_after = max(1, math.ceil(allowed_at - now))
+    else:
+        retry_after = max(1, math.ceil(reset_at - now))
+    return RateLimitResult(False, rate.limit, 0, reset_at, retry_after)
+
+
+class RateLimitStore(abc.ABC):
+    """Storage for sliding-window counters."""
+
+    @abc.abstractmethod
+    async def hit(self, key: str, rate: RateLimit, now: float) -> RateLimitResult:
+        """Count one request for `key` and report whether it is within `rate`."""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    Per-process counters.
+
+    Entries are kept in least-recently-hit order, so expired ones are found
+    at the front and dropped a few at a time on each hit; max_keys bounds
+    memory when many clients are active at once.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [window index, count, previous count, expires at]
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self, now: float) -> None:
+        # Amortized O(1): every entry is removed at most once
+        for _ in range(2):
+            if not self._entries:
+                return
+            key, entry = next(iter(self._entries.items()))
+            if entry[3] > now and len(self._entries) <= self.max_keys:
+                return
+            del self._entries[key]
+
+    async def hit(self, key: str, rate: RateLimit, now: float) -> RateLimitResult:
+        window = int(now // rate.window)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = [window, 0, 0, 0]
+            self._entries[key] = entry
+        else:
+            self._entries.move_to_end(key)
+            if entry[0] != window:
+                # Roll forward; anything older than the previous window no longer counts
+                entry[2] = entry[1] if entry[0] == window - 1 else 0
+                entry[0] = window
+                entry[1] = 0
+        entry[1] += 1
+        # Once two windows have passed the counters are all zero again
+        entry[3] = (window + 2) * rate.window
+        self._expire(now)
+        return evaluate(rate, now, int(entry[1]), int(entry[2]))
+
+
+class PostgresRateLimitStore(RateLimitStore):
+    """
+    Counters shared by all workers, in the UNLOGGED rate_limit_counters table.
+
+    Each hit is one statement: an upsert of the current window's row that
+    also reads the previous window's count. Rows are never updated once
+    their window has passed; they are deleted in the background of a hit at
+    most every cleanup_interval seconds. If the database is unavailable the
+    request is allowed rather than failing the API.
+    """
+
+    HIT_SQL = text("""
+        WITH this_window AS (
+            INSERT INTO rate_limit_counters (key, window_start, count, expires_at)
+            VALUES (:key, :window_start, 1, :expires_at)
+            ON CONFLICT (key, window_start)
+            DO UPDATE SET count = rate_limit_counters.count + 1
+            RETURNING count
+        )
+        SELECT
+            (SELECT count FROM this_window) AS count,
+            COALESCE((
+                SELECT count FROM rate_limit_counters
+                WHERE key = :key AND window_start = :previous_start
+            ), 0) AS previous
+    """)
+    CLEANUP_SQL = text("DELETE FROM rate_limit_counters WHERE expires_at < :now")
+
+    def __init__(self, engine=None, cleanup_interval: float = 60.0):
+        self._engine = engine
+        self.cleanup_interval = cleanup_interval
+        self._next_cleanup = 0.0
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from src.utils.database import engine
+            self._engine = engine
+        return self._engine
+
+    async def hit(self, key: str, rate: RateLimit, now: float) -> RateLimitResult:
+        window_start = int(now // rate.window) * rate.window
+        try:
+            async with self.engine.begin() as conn:
+                row = (await conn.execute(self.HIT_SQL, {
+                    "key": key,
+                    "window_start": window_start,
+                    "previous_start": window_start - rate.window,
+                    "expires_at": window_start + 2 * rate.window,
+                })).one()
+                if now >= self._next_cleanup:
+                    self._next_cleanup = now + self.cleanup_interval
+                    await conn.execute(self.CLEANUP_SQL, {"now": int(now)})
+        except Exception as e:
+            logger.warning(f"Rate limit store unavailable, allowing request: {e}")
+            return RateLimitResult(True, rate.limit, rate.limit, window_start + rate.window)
+        return evaluate(rate, now, row.count, row.previous)
+
+
+def client_identity(host: Optional[str]) -> str:
+    """Rate-limit identity for a client address."""
+    if not host:
+        return "ip:unknown"
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return f"ip:{host}"
+    if address.version == 6:
+        if address.ipv4_mapped:
+            return f"ip:{address.ipv4_mapped}"
+        return f"ip:{ipaddress.ip_network((address, 64), strict=False)}"
+    return f"ip:{address}"
+
+
+class RateLimitPolicy:
+    """Decides which limit applies to a request."""
+
+    def __init__(
+        self,
+        default: RateLimit,
+        routes: Optional[Mapping[str, RateLimit]] = None,
+        users: Optional[Mapping[str, RateLimit]] = None,
+    ):
+        self.default = default
+        # Checked in order; the first pattern found in the path wins
+        self.routes: List[Tuple[str, RateLimit]] = list((routes or {}).items())
+        self.users: Dict[str, RateLimit] = dict(users or {})
+
+    def resolve(self, path: str, user_id: Optional[str] = None) -> Tuple[str, RateLimit]:
+        """
+        Returns:
+            Tuple of (bucket name, limit). Each bucket is counted separately.
+        """
+        if user_id and user_id in self.users:
+            return "user", self.users[user_id]
+        for pattern, rate in self.routes:
+            if pattern in path:
+                return pattern, rate
+        return "default", self.default
+
+
+class RateLimiter:
+    """A policy plus the store that holds its counters."""
+
+    def __init__(self, policy: RateLimitPolicy, store: Optional[RateLimitStore] = None):
+        self.policy = policy
+        self.store = store if store is not None else MemoryRateLimitStore()
+
+    @classmethod
+    def from_settings(cls, settings=None) -> "RateLimiter":
+        if settings is None:
+            from src.utils.config import get_settings
+            settings = get_settings()
+        policy = RateLimitPolicy(
+            default=RateLimit.parse(settings.RATE_LIMIT_DEFAULT),
+            routes={pattern: RateLimit.parse(value) for pattern, value in settings.RATE_LIMIT_ROUTES.items()},
+            users={user_id: RateLimit.parse(value) for user_id, value in settings.RATE_LIMIT_USERS.items()},
+        )
+        backend = settings.RATE_LIMIT_BACKEND.lower()
+        if backend == "postgres":
+            store: RateLimitStore = PostgresRateLimitStore()
+        elif backend == "memory":
+            store = MemoryRateLimitStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{settings.RATE_LIMIT_BACKEND}'")
+        return cls(policy, store)
+
+    async def hit(
+        self,
+        path: str,
+        client_host: Optional[str],
+        user_id: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> RateLimitResult:
+        bucket, rate = self.policy.resolve(path, user_id)
+        identity = f"user:{user_id}" if user_id else client_identity(client_host)
+        # Keys are only ever compared, never parsed, so ":" in IPv6 is harmless
+        key = f"{bucket}|{rate}|{identity}"
+        return await self.store.hit(key, rate, time.time() if now is None else now)
@@ -1,9 +1,15 @@
 import os
 import time
 import uuid
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.api.middleware.rate_limit import RateLimiter
+from src.utils.query_stats import QueryStats, track_queries
+from src.utils.security import decode_token_and_get_user_id
 
 # Import with fallback
 try:
@@ -13,14 +19,14 @@ except ImportError:
     from src.core.config import settings
 
 try:
-    from src.config.logging_config import log_request, log_security_event
+    from src.config.logging_config import api_logger, log_request, log_security_event
 except ImportError:
     # Fallback logging functions if imports fail
     import logging
     security_logger = logging.getLogger("sheetgpt.security")
     api_logger = logging.getLogger("sheetgpt.api")
     
-    def log_request(request_id, method, path, status_code, duration_ms, user_id=None, ip_address=None):
+    def log_request(request_id, method, path, status_code, duration_ms, user_id=None, ip_address=None, db=None):
         api_logger.info(
             f"Request {request_id}: {method} {path} {status_code} {duration_ms}ms",
             extra={
@@ -30,7 +36,8 @@ except ImportError:
                 "status_code": status_code,
                 "duration_ms": duration_ms,
                 "user_id": user_id,
-                "ip_address": ip_address
+                "ip_address": ip_address,
+                **(db or {})
             }
         )
     
@@ -46,46 +53,37 @@ except ImportError:
             }
         )
 
-async def add_security_headers(request: Request, call_next):
-    """Add security headers to responses in production."""
-    response = await call_next(request)
-    
-    if ENVIRONMENT == "production":
-        # CSP Headers for production with enhanced security
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline'; "  # Allow inline scripts for React
-            "style-src 'self' 'unsafe-inline'; "   # Allow inline styles for React
-            "img-src 'self' data: blob:; "         # Allow data URIs and blobs for images
-            "font-src 'self'; "
-            "connect-src 'self' https://api.anthropic.com; "
-            "frame-ancestors 'none'; "             # Prevent embedding in iframes
-            "form-action 'self'; "                 # Only allow forms to submit to same origin
-            "upgrade-insecure-requests; "          # Upgrade HTTP to HTTPS
-            "block-all-mixed-content"              # Block mixed content
-        )
-        
-        # Other security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=(), payment=()"
-        
-    return response
+# Security headers added to every response in production
+SECURITY_HEADERS: List[Tuple[str, str]] = [
+    # CSP Headers for production with enhanced security
+    ("Content-Security-Policy", (
+        "default-src 'self'; "
+        "script-src 'self' 'unsafe-inline'; "  # Allow inline scripts for React
+        "style-src 'self' 'unsafe-inline'; "   # Allow inline styles for React
+        "img-src 'self' data: blob:; "         # Allow data URIs and blobs for images
+        "font-src 'self'; "
+        "connect-src 'self' https://api.anthropic.com; "
+        "frame-ancestors 'none'; "             # Prevent embedding in iframes
+        "form-action 'self'; "                 # Only allow forms to submit to same origin
+        "upgrade-insecure-requests; "          # Upgrade HTTP to HTTPS
+        "block-all-mixed-content"              # Block mixed content
+    )),
+    # Other security headers
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-XSS-Protection", "1; mode=block"),
+    ("X-Frame-Options", "DENY"),
+    ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    ("Permissions-Policy", "camera=(), microphone=(), geolocation=(), payment=()"),
+]
 
-async def add_cache_headers(request: Request, call_next):
-    """Add appropriate cache headers based on resource type and method."""
-    response = await call_next(request)
-    
-    path = request.url.path
-    method = request.method
-    
+
+def cache_control_for(path: str, method: str, production: bool = ENVIRONMENT == "production") -> str:
+    """Cache-Control value based on resource type and method."""
     # Don't cache API responses by default
     cache_control = "no-store, max-age=0"
     
-    if ENVIRONMENT == "production":
+    if production:
         # Static resources can be cached longer
         if path.startswith("/static/"):
             # Use versioning or hashes in filenames for better caching
@@ -116,173 +114,213 @@ async def add_cache_headers(request: Request, call_next):
         elif any(path.endswith(ext) for ext in [".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp"]):
             cache_control = "public, max-age=86400"  # 1 day
             
-    # Set cache control header
-    response.headers["Cache-Control"] = cache_control
-    
-    # Add Vary header for better caching
-    response.headers["Vary"] = "Accept, Accept-Encoding"
-    
-    return response
+    return cache_control
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging API requests with timing and request ID tracking."""
-    
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+
+class RequestPipelineMiddleware:
+    """
+    Per-request bookkeeping in a single pure-ASGI pass.
+
+    Replaces the former stack of BaseHTTPMiddleware layers (debug print,
+    request logging, rate limiting, security headers, cache headers and the
+    catch-all error handler), each of which pumped the response body through
+    its own task and memory stream. Here the response is passed straight
+    through: headers are added to the http.response.start message and body
+    chunks are forwarded untouched, so streamed responses reach the client
+    as soon as the route yields them.
+
+    For every HTTP request it:
+    - assigns a request ID (request.state.request_id, X-Request-ID header)
+    - applies the rate limiter (production by default) and answers 429 itself
+    - sets security headers (production) and Cache-Control/Vary
+    - turns unhandled exceptions into a 500 JSON response with CORS headers
+    - tracks the SQL statements it runs (src.utils.query_stats): X-DB-*
+      headers outside production, the request log and Prometheus metrics
+    - logs the request with its total duration, plus security events for
+      401/403/429 responses
+    """
     
-    async def dispatch(self, request: Request, call_next):
-        # Generate unique request ID
-        request_id = str(uuid.uuid4())
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: Optional[RateLimiter] = None,
+        rate_limit: Optional[bool] = None,
+        environment: str = ENVIRONMENT,
+    ):
+        self.app = app
+        self.production = environment == "production"
+        # Only apply rate limiting in production unless asked explicitly
+        if rate_limit is None:
+            rate_limit = self.production
+        self.limiter = (limiter or RateLimiter.from_settings()) if rate_limit else None
         
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+            
         # Store request ID in request state for access by route handlers
-        request.state.request_id = request_id
-        
-        # Extract basic request information
-        method = request.method
-        path = request.url.path
-        client = request.client.host if request.client else None
+        request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
         
-        # Extract user ID if available (will be populated by auth middleware)
-        user_id = None
-        if hasattr(request.state, "user") and request.state.user:
-            user_id = str(request.state.user.id)
+        with track_queries(request_id) as queries:
+            try:
+                await self._handle(scope, receive, send, request_id, queries)
+            finally:
+                queries.publish(self._route(scope))
+                
+    async def _handle(self, scope: Scope, receive: Receive, send: Send, request_id: str, queries: QueryStats) -> None:
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_ip = client[0] if client else None
+        start_time = time.perf_counter()
+        api_logger.debug(f"Received request for path: {path}")
         
-        # Record start time
-        start_time = time.time()
+        # User populated by auth, if any
+        user = scope["state"].get("user")
+        user_id = str(user.id) if user else None
         
-        try:
-            # Process the request
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration_ms = round((time.time() - start_time) * 1000, 2)
-            
-            # Add request ID to response headers for client-side correlation
-            response.headers["X-Request-ID"] = request_id
-            
-            # Log regular requests
-            log_request(
-                request_id=request_id,
-                method=method,
-                path=path,
-                status_code=response.status_code,
-                duration_ms=duration_ms,
-                user_id=user_id,
-                ip_address=client
-            )
-            
-            # Log potential security events
-            if response.status_code == 401:
-                log_security_event(
-                    event_type="AUTHENTICATION_FAILURE",
-                    description=f"Authentication failed for path: {path}",
-                    user_id=user_id,
-                    ip_address=client
-                )
-            elif response.status_code == 403:
-                log_security_event(
-                    event_type="AUTHORIZATION_FAILURE",
-                    description=f"Authorization failed for path: {path}",
-                    user_id=user_id,
-                    ip_address=client
-                )
-            elif response.status_code == 429:
+        headers: List[Tuple[str, str]] = [("X-Request-ID", request_id)]
+        if self.limiter is not None:
+            user_id = user_id or self._token_user_id(scope)
+            result = await self.limiter.hit(path, client_ip, user_id)
+            headers += [
+                ("X-RateLimit-Limit", str(result.limit)),
+                ("X-RateLimit-Remaining", str(result.remaining)),
+                ("X-RateLimit-Reset", str(result.reset_at)),
+            ]
+            if not result.allowed:
                 log_security_event(
                     event_type="RATE_LIMIT_EXCEEDED",
-                    description=f"Rate limit exceeded for path: {path}",
+                    description=f"Rate limit exceeded ({result.limit} requests): {path}",
                     user_id=user_id,
-                    ip_address=client
+                    ip_address=client_ip
+                )
+                response = JSONResponse(
+                    content={"error": "Rate limit exceeded"},
+                    status_code=429,
+                    headers={"Retry-After": str(result.retry_after), **dict(headers), **self._cors_headers(scope)}
                 )
+                await response(scope, receive, send)
+                self._log(request_id, method, path, 429, start_time, user_id, client_ip, queries, security_event=False)
+                return
                 
-            return response
+        if self.production:
+            headers += SECURITY_HEADERS
+        headers += [
+            ("Cache-Control", cache_control_for(path, method, self.production)),
+            # Vary header for better caching
+            ("Vary", "Accept, Accept-Encoding"),
+        ]
+        
+        status_code = 500
+        response_started = False
+        
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                response_headers = MutableHeaders(scope=message)
+                for name, value in headers:
+                    response_headers[name] = value
+                if not self.production:
+                    for name, value in queries.headers():
+                        response_headers[name] = value
+            await send(message)
             
+        try:
+            await self.app(scope, receive, send_with_headers)
         except Exception as exc:
-            # Calculate duration even for exceptions
-            duration_ms = round((time.time() - start_time) * 1000, 2)
-            
-            # Log the exception request
-            log_request(
-                request_id=request_id,
-                method=method,
-                path=path,
-                status_code=500,  # Assumed to be a server error
-                duration_ms=duration_ms,
-                user_id=user_id,
-                ip_address=client
+            if response_started:
+                # Too late for an error response; let the server close the connection
+                self._log(request_id, method, path, 500, start_time, user_id, client_ip, queries)
+                raise
+                
+            api_logger.error(
+                f"Middleware error: {str(exc)}",
+                exc_info=True,
+                extra={"request_id": request_id}
             )
+            response = JSONResponse(
+                status_code=500,
+                content={
+                    "error": "ServerError",
+                    "message": "Internal server error",
+                    "request_id": request_id,
+                    "timestamp": datetime.utcnow().isoformat()
+                },
+                headers={"X-Request-ID": request_id, **self._cors_headers(scope)}
+            )
+            await response(scope, receive, send)
+            status_code = 500
             
-            # Re-raise the exception for the global exception handler
-            raise
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware for rate limiting API requests in production."""
-    
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        self.rate_limits = {}
-        # Default rate limits (requests per minute)
-        self.default_limit = 60
-        self.auth_limit = 10
-        self.sheet_limit = 30
+        self._log(request_id, method, path, status_code, start_time, user_id, client_ip, queries)
         
-    async def dispatch(self, request: Request, call_next):
-        # Only apply rate limiting in production
-        if ENVIRONMENT != "production":
-            return await call_next(request)
-            
-        client_ip = request.client.host if request.client else "unknown"
-        path = request.url.path
+    @staticmethod
+    def _route(scope: Scope) -> str:
+        """The matched route's path template, keeping metric labels few; raw paths carry IDs."""
+        route = scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
         
-        # Determine rate limit based on path
-        limit = self.default_limit
-        if "/auth/" in path:
-            limit = self.auth_limit
-        elif "/sheets/" in path or "/export/" in path:
-            limit = self.sheet_limit
-            
-        # Check if client has exceeded rate limit
-        current_time = int(time.time() / 60)  # Current minute
-        rate_key = f"{client_ip}:{current_time}"
+    @staticmethod
+    def _token_user_id(scope: Scope) -> Optional[str]:
+        """User ID from a valid bearer token, so authenticated clients are limited per user."""
+        authorization = Headers(scope=scope).get("authorization", "")
+        if authorization[:7].lower() != "bearer ":
+            return None
+        user_id = decode_token_and_get_user_id(authorization[7:])
+        return str(user_id) if user_id else None
         
-        if rate_key in self.rate_limits:
-            self.rate_limits[rate_key] += 1
-            if self.rate_limits[rate_key] > limit:
-                # Log rate limit event
-                user_id = None
-                if hasattr(request.state, "user") and request.state.user:
-                    user_id = str(request.state.user.id)
-                    
-                log_security_event(
-                    event_type="RATE_LIMIT_EXCEEDED",
-                    description=f"Rate limit exceeded ({self.rate_limits[rate_key]}/{limit}): {path}",
-                    user_id=user_id,
-                    ip_address=client_ip
-                )
-                
-                # Return rate limit response
-                return Response(
-                    content={"error": "Rate limit exceeded"},
-                    status_code=429,
-                    headers={
-                        "Retry-After": "60",
-                        "X-RateLimit-Limit": str(limit),
-                        "X-RateLimit-Remaining": "0",
-                        "X-RateLimit-Reset": str((current_time + 1) * 60)
-                    }
-                )
-        else:
-            self.rate_limits[rate_key] = 1
-            
-            # Clean up old entries (from previous minutes)
-            self.rate_limits = {k: v for k, v in self.rate_limits.items() 
-                               if k.split(":")[1] == str(current_time)}
-                
-        # Add rate limit headers
-        response = await call_next(request)
-        remaining = max(0, limit - self.rate_limits.get(rate_key, 0))
+    def _cors_headers(self, scope: Scope) -> dict:
+        """CORS headers for responses created here, outside CORSMiddleware."""
+        origin = Headers(scope=scope).get("origin")
+        # In production, check against whitelist; in development, allow all origins
+        if not origin or (self.production and origin not in settings.CORS_ORIGINS):
+            return {}
+        return {
+            "Access-Control-Allow-Origin": origin,
+            "Access-Control-Allow-Credentials": "true",
+            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, PATCH",
+            "Access-Control-Allow-Headers": "Authorization, Content-Type, X-Request-ID",
+        }
         
-        response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str((current_time + 1) * 60)
+    @staticmethod
+    def _log(
+        request_id: str,
+        method: str,
+        path: str,
+        status_code: int,
+        start_time: float,
+        user_id: Optional[str],
+        client_ip: Optional[str],
+        queries: Optional[QueryStats] = None,
+        security_event: bool = True,
+    ) -> None:
+        duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+        log_request(
+            request_id=request_id,
+            method=method,
+            path=path,
+            status_code=status_code,
+            duration_ms=duration_ms,
+            user_id=user_id,
+            ip_address=client_ip,
+            db=queries.summary() if queries is not None else None
+        )
         
-        return response
\ No newline at end of file
+        # Log potential security events
+        events = {
+            401: ("AUTHENTICATION_FAILURE", "Authentication failed"),
+            403: ("AUTHORIZATION_FAILURE", "Authorization failed"),
+            429: ("RATE_LIMIT_EXCEEDED", "Rate limit exceeded"),
+        }
+        if security_event and status_code in events:
+            event_type, description = events[status_code]
+            log_security_event(
+                event_type=event_type,
+                description=f"{description} for path: {path}",
+                user_id=user_id,
+                ip_address=client_ip
+            )
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 import os
+import logging
 import sqlalchemy
-from src.utils.auth import get_current_user
-from src.utils.database import get_db, get_db_session
+from src.utils.auth import get_current_user, principal_cache
+from src.utils.database import get_db, get_db_session, pool_metrics
+from src.services.llm_router import get_llm_router
+from src.config.logging_config import get_log_levels, set_log_level
+from src.utils.security import auth_crypto, token_cache
 
 router = APIRouter(tags=["admin"])
+logger = logging.getLogger(__name__)
 
 @router.post("/clean-database")
 async def clean_database(current_user: dict = Depends(get_current_user)):
@@ -28,6 +33,7 @@ async def clean_database(current_user: dict = Depends(get_current_user)):
         "data_columns",
         "data_change_history",
         "messages",
+        "structured_data_rows",
         "structured_data",
         "conversations"
     ]
@@ -59,7 +65,7 @@ async def clean_database(current_user: dict = Depends(get_current_user)):
         except Exception as e:
             success = False
             results[table] = f"Error: {str(e)}"
-            print(f"Error cleaning {table}: {str(e)}")
+            logger.error(f"Error cleaning {table}: {str(e)}")
     
     # Process sports tables if they exist
     for table in sports_tables:
@@ -84,7 +90,7 @@ async def clean_database(current_user: dict = Depends(get_current_user)):
         except Exception as e:
             success = False
             results[table] = f"Error: {str(e)}"
-            print(f"Error cleaning {table}: {str(e)}")
+            logger.error(f"Error cleaning {table}: {str(e)}")
     
     # Get counts for verification with fresh sessions
     counts = {}
@@ -119,4 +125,88 @@ async def clean_database(current_user: dict = Depends(get_current_user)):
     if success:
         return {"message": "Database cleaned successfully", "details": details}
     else:
-        return {"message": "Database cleaned with some errors", "details": details}
\ No newline at end of file
+        return {"message": "Database cleaned with some errors", "details": details}
+
+
+@router.get("/llm-metrics")
+async def get_llm_metrics(current_user: dict = Depends(get_current_user)):
+    """
+    LLM router metrics: per-route request counts, queue/circuit rejections,
+    hedging, time-to-first-token and latency percentiles, and breaker states.
+    """
+    if not current_user.get("is_admin", False):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to perform this action"
+        )
+
+    return get_llm_router().metrics()
+
+
+@router.get("/auth-metrics")
+async def get_auth_metrics(current_user: dict = Depends(get_current_user)):
+    """
+    Auth crypto pool (bcrypt jobs pending, queue depth, wait and run times,
+    rejections) and verified-token and principal cache hit rates.
+    """
+    if not current_user.get("is_admin", False):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to perform this action"
+        )
+
+    return {
+        "crypto_pool": auth_crypto.metrics(),
+        "token_cache": token_cache.metrics(),
+        "principal_cache": principal_cache.metrics(),
+    }
+
+
+@router.get("/db-pool-metrics")
+async def get_db_pool_metrics(current_user: dict = Depends(get_current_user)):
+    """
+    Connection pool utilization and checkout wait times, for the primary and
+    (when configured) the read replica.
+    """
+    if not current_user.get("is_admin", False):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to perform this action"
+        )
+
+    return pool_metrics()
+
+
+@router.get("/log-levels")
+async def get_logger_levels(current_user: dict = Depends(get_current_user)):
+    """Levels of the root logger and every logger with a level of its own."""
+    if not current_user.get("is_admin", False):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to perform this action"
+        )
+
+    return get_log_levels()
+
+
+@router.put("/log-levels/{logger_name}")
+async def update_logger_level(
+    logger_name: str,
+    level: str = Body(..., embed=True),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Change a logger's level without a restart ("root" for the root logger).
+    Applies to the worker that handles the request only.
+    """
+    if not current_user.get("is_admin", False):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to perform this action"
+        )
+
+    try:
+        level = set_log_level(logger_name, level)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"logger": logger_name, "level": level}
@@ -208,8 +208,8 @@ async def auth_debug():
             else:
                 user_count = "table not found"
                 
-            from src.utils.security import get_password_hash
-            password_hash = get_password_hash("test_password")
+            from src.utils.security import get_password_hash_async
+            password_hash = await get_password_hash_async("test_password")
             hash_working = bool(password_hash and len(password_hash) > 20)
                 
             results["database"] = {
@@ -1,5 +1,6 @@
 from typing import List
 from uuid import UUID
+import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.responses import StreamingResponse
@@ -20,6 +21,7 @@ from src.utils.database import get_db
 from src.utils.security import get_current_user_id
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Instantiate the service once
 chat_service = ChatService()
@@ -99,7 +101,7 @@ async def create_message(
     current_user_id: UUID = Depends(get_current_user_id),
     chat_service: ChatService = Depends(get_chat_service)
 ):
-    print(f"--- Entered create_message for conversation {conversation_id}, user {current_user_id} ---")
+    logger.debug(f"--- Entered create_message for conversation {conversation_id}, user {current_user_id} ---")
     try:
         # Get conversation and verify ownership
         conversation = await chat_service.get_conversation(db, conversation_id)
@@ -116,7 +118,7 @@ async def create_message(
 
         # Create async generator for streaming response
         async def event_generator():
-            print(f"--- event_generator started for conversation {conversation_id} ---")
+            logger.debug(f"--- event_generator started for conversation {conversation_id} ---")
             import asyncio
             search_detected = False
             
@@ -126,8 +128,8 @@ async def create_message(
                 is_complete = False
                 
                 # Log the request message details
-                print(f"Processing message from user: {message.content[:100]}... with LLM: {message.selected_llm}")
-                print(f"Structured format requested: {message.structured_format is not None}")
+                logger.debug(f"Processing message from user: {message.content[:100]}... with LLM: {message.selected_llm}")
+                logger.debug(f"Structured format requested: {message.structured_format is not None}")
                 
                 # Process the streaming response
                 async for chunk in chat_service.get_chat_response(
@@ -140,7 +142,7 @@ async def create_message(
                     # Detect search activity
                     if "[SEARCH]" in chunk:
                         search_detected = True
-                        print(f"Search detected in stream: {chunk}")
+                        logger.debug(f"Search detected in stream: {chunk}")
                     
                     # Check for stream end marker
                     if "[STREAM_END]" in chunk:
@@ -163,7 +165,7 @@ async def create_message(
                     if is_complete:
                         # Add delay to ensure prior chunks are processed
                         await asyncio.sleep(1.0)
-                        print(f"Sending stream completion marker")
+                        logger.debug(f"Sending stream completion marker")
                         yield f'data: {{"text": "__STREAM_COMPLETE__"}}\n\n'
                         # Another delay to ensure completion marker is processed
                         await asyncio.sleep(1.0)
@@ -171,12 +173,12 @@ async def create_message(
                         
                 # If we somehow exit the loop without sending completion marker, send it now
                 if not is_complete:
-                    print(f"Loop ended without completion marker, sending completion")
+                    logger.debug(f"Loop ended without completion marker, sending completion")
                     await asyncio.sleep(1.0)
                     yield f'data: {{"text": "__STREAM_COMPLETE__"}}\n\n'
                     
             except Exception as e:
-                print(f"Error in event generator: {str(e)}")
+                logger.error(f"Error in event generator: {str(e)}")
                 yield f'data: {{"error": "{str(e)}"}}\n\n'
                 # Also send completion marker in case of error
                 yield f'data: {{"text": "__STREAM_COMPLETE__"}}\n\n'
@@ -186,16 +188,16 @@ async def create_message(
             media_type="text/event-stream"
         )
     except ValueError as e:
-        print(f"ValueError in create_message (likely conversation not found or auth issue): {str(e)}")
+        logger.error(f"ValueError in create_message (likely conversation not found or auth issue): {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
     except HTTPException as he:
-        print(f"HTTPException during pre-stream setup: {str(he.detail)}")
+        logger.error(f"HTTPException during pre-stream setup: {str(he.detail)}")
         raise he
     except Exception as e:
-        print(f"Unexpected error in create_message before streaming: {str(e)}")
+        logger.error(f"Unexpected error in create_message before streaming: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Server error before initiating chat stream: {str(e)}"
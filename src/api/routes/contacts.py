@@ -343,7 +343,7 @@ async def rematch_contacts(
     service = ContactsService(db) 
     
     # --- Add Logging --- 
-    print(f"Received rematch request for user {user_id} with threshold: {request_body.match_threshold}")
+    logger.debug(f"Received rematch request for user {user_id} with threshold: {request_body.match_threshold}")
     
     try:
         stats = await service.rematch_contacts_with_brands(
@@ -353,12 +353,12 @@ async def rematch_contacts(
         )
         
         # --- Add Logging --- 
-        print(f"Rematch complete. Stats: {stats}")
+        logger.debug(f"Rematch complete. Stats: {stats}")
         
         return {"success": True, "stats": stats}
     except Exception as e:
         # Log the exception
-        print(f"Error during contact rematch: {e}")
+        logger.error(f"Error during contact rematch: {e}")
         # Consider more specific error handling based on potential exceptions
         raise HTTPException(status_code=500, detail=f"Failed to rematch contacts: {str(e)}")
 
@@ -433,7 +433,7 @@ async def bulk_update_specific_tags(
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
         # Log the exception for debugging
-        print(f"Error in bulk_update_specific_tags: {str(e)}") # Replace with proper logging if available
+        logger.error(f"Error in bulk_update_specific_tags: {str(e)}")
         raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred while updating contact tags.")
 
 @router.post("/import/custom_csv", response_model=ContactImportStats)
@@ -592,7 +592,7 @@ async def import_single_contact(
         raise HTTPException(status_code=HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         # Log the exception for debugging
-        print(f"Unexpected error during single contact import: {str(e)}") # TODO: Replace with proper logging
+        logger.error(f"Unexpected error during single contact import: {str(e)}")
         raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred during single contact import.")
 
 @router.post("/bulk-delete", status_code=HTTP_200_OK)
@@ -611,5 +611,5 @@ async def bulk_delete_contacts(
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
         # Log the exception for debugging
-        print(f"Error in bulk_delete_contacts: {str(e)}") # Replace with proper logging
+        logger.error(f"Error in bulk_delete_contacts: {str(e)}")
         raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred while deleting contacts.")
\ No newline at end of file
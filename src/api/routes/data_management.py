@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Literal, Optional
 from uuid import UUID
 
 # This comment was added to test hot reloading
@@ -11,10 +11,13 @@ from src.schemas.data_management import (
     StructuredDataCreate,
     StructuredDataUpdate,
     StructuredDataResponse,
+    StructuredDataSummaryPage,
     ColumnCreate,
     ColumnUpdate,
     ColumnResponse,
     DataUpdate,
+    CellBatchUpdate,
+    RowQuery,
     DataChangeHistoryResponse
 )
 
@@ -92,6 +95,17 @@ async def list_structured_data(
     
     return response_list
 
+@router.get("/summary", response_model=StructuredDataSummaryPage)
+async def list_structured_data_summaries(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    current_user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> StructuredDataSummaryPage:
+    """List structured data metadata (no data payloads) for the sidebar."""
+    service = DataManagementService(db)
+    return await service.get_data_summaries(current_user_id, limit, cursor)
+
 @router.post("", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
 async def create_structured_data(
     data: StructuredDataCreate,
@@ -268,6 +282,17 @@ async def delete_column(
     service = DataManagementService(db)
     await service.delete_column(data_id, column_name, current_user_id)
 
+@router.post("/{data_id}/columns/{column_name}/index", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+async def create_column_index(
+    data_id: UUID,
+    column_name: str,
+    current_user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """Index a column so server-side sorting and filtering on it stays fast."""
+    service = DataManagementService(db)
+    return await service.create_column_index(data_id, current_user_id, column_name)
+
 @router.put("/{data_id}/cells", response_model=Dict[str, Any])
 async def update_cell(
     data_id: UUID,
@@ -282,9 +307,21 @@ async def update_cell(
         current_user_id,
         update.column_name,
         update.row_index,
-        update.value
+        update.value,
+        update.expected_version
     )
 
+@router.patch("/{data_id}/cells", response_model=Dict[str, Any])
+async def update_cells(
+    data_id: UUID,
+    batch: CellBatchUpdate,
+    current_user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """Apply several cell edits at once; all of them are applied or none."""
+    service = DataManagementService(db)
+    return await service.update_cells(data_id, current_user_id, batch.edits)
+
 @router.get("/{data_id}/history", response_model=List[DataChangeHistoryResponse])
 async def get_change_history(
     data_id: UUID,
@@ -323,6 +360,38 @@ async def get_rows(
     service = DataManagementService(db)
     return await service.get_rows(data_id, current_user_id, skip, limit)
 
+@router.post("/{data_id}/rows/query", response_model=Dict[str, Any])
+async def query_rows(
+    data_id: UUID,
+    query: RowQuery,
+    current_user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """Filter, sort and aggregate rows on the server."""
+    service = DataManagementService(db)
+    return await service.query_rows(data_id, current_user_id, query)
+
+@router.post("/{data_id}/rows/bulk", response_model=Dict[str, Any])
+async def bulk_ingest_rows(
+    data_id: UUID,
+    request: Request,
+    mode: Literal["append", "replace"] = "append",
+    format: Optional[Literal["ndjson", "csv"]] = None,
+    skip_invalid: bool = False,
+    current_user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Append or replace rows from a streamed NDJSON or CSV body.
+
+    The format defaults from the Content-Type (text/csv, otherwise NDJSON).
+    """
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    service = DataManagementService(db)
+    return await service.ingest_rows(
+        data_id, current_user_id, request.stream(), fmt, mode, skip_invalid
+    )
+
 @router.post("/{data_id}/rows", response_model=Dict[str, Any])
 async def add_row(
     data_id: UUID,
@@ -339,20 +408,24 @@ async def update_row(
     data_id: UUID,
     row_index: int,
     row_data: Dict[str, Any],
+    expected_version: Optional[int] = None,
     current_user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """Update a row in structured data."""
     service = DataManagementService(db)
-    return await service.update_row(data_id, current_user_id, row_index, row_data)
+    return await service.update_row(
+        data_id, current_user_id, row_index, row_data, expected_version
+    )
 
 @router.delete("/{data_id}/rows/{row_index}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_row(
     data_id: UUID,
     row_index: int,
+    expected_version: Optional[int] = None,
     current_user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ) -> None:
     """Delete a row from structured data."""
     service = DataManagementService(db)
-    await service.delete_row(data_id, current_user_id, row_index) 
\ No newline at end of file
+    await service.delete_row(data_id, current_user_id, row_index, expected_version) 
\ No newline at end of file
@@ -17,7 +17,7 @@ from src.schemas.common import ApiSuccess
 from src.services.anthropic_service import AnthropicService
 from src.services.query_service import QueryService
 from src.services.ai_query_processor import AnthropicAIProcessor
-from src.utils.database import get_db
+from src.utils.database import get_db, get_read_db
 from src.utils.security import get_current_user_id, get_current_admin_user
 from src.services.database_admin_service import DatabaseAdminService
 from src.services.statistics_service import StatisticsService
@@ -371,7 +371,7 @@ async def export_data_route(
 async def execute_database_query(
     query_data: Dict[str, Any],
     current_user_id: UUID = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """Execute a database query and return the results.
     
@@ -390,6 +390,7 @@ async def execute_database_query(
         query_text = query_data.get("query", "")
         translate_only = query_data.get("translate_only", False)
         limit = query_data.get("limit", 100) # Default to 100 if not provided
+        schema_mode = query_data.get("schema_context") # "full" or "relevant"; defaults to settings
 
         if not query_text:
             raise ValueError("Query text is required")
@@ -399,10 +400,12 @@ async def execute_database_query(
 
         if is_natural_language:
             if translate_only:
-                generated_sql = await query_service.translate_natural_language_to_sql(query_text)
+                generated_sql = await query_service.translate_natural_language_to_sql(query_text, schema_mode)
                 # results remain empty as per original logic
             else:
-                results, generated_sql = await query_service.execute_natural_language_query(query_text, limit=limit)
+                results, generated_sql = await query_service.execute_natural_language_query(
+                    query_text, limit=limit, schema_mode=schema_mode
+                )
         else: # Direct SQL
             is_valid, validated_sql, error_msg = await query_service.validate_sql_query(query_text)
             
@@ -411,7 +414,8 @@ async def execute_database_query(
                     "success": False,
                     "error": "SQL validation failed",
                     "validation_error": error_msg,
-                    "suggested_sql": validated_sql # This is the (potentially) corrected SQL by AI
+                    "suggested_sql": validated_sql, # This is the (potentially) corrected SQL by AI
+                    "token_usage": ai_processor.get_token_usage()
                 }
             results = await query_service.execute_safe_query(validated_sql, limit=limit)
             # If SQL was changed by validation, show it as generated_sql
@@ -422,6 +426,8 @@ async def execute_database_query(
         response_data: Dict[str, Any] = {"success": True, "results": results}
         if generated_sql:
             response_data["generated_sql"] = generated_sql
+        # Cached vs uncached prompt tokens per AI call made for this request
+        response_data["token_usage"] = ai_processor.get_token_usage()
 
         if export_format:
             # NOTE: The export_query_results_to_sheets method was not migrated to QueryService yet in the plan.
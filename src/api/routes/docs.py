@@ -5,12 +5,13 @@ import os
 # import glob # Assuming unused, commented out
 from pathlib import Path
 import re
-import traceback
+import logging
 
 # from src.utils.auth import get_current_user # Assuming unused for these doc routes
 # from src.models.models import User # Assuming unused for these doc routes
 
 router = APIRouter(prefix="/docs", tags=["documentation"])
+logger = logging.getLogger(__name__)
 
 # Define the base directory for documentation
 DOCS_DIR = Path(__file__).resolve().parent.parent.parent.parent / "docs"
@@ -119,9 +120,7 @@ async def get_documentation_content(
                     found_files = list(DOCS_DIR.glob(f"**/{base_name}"))
                     # print(f"Found files: {[str(f) for f in found_files]}") # Optional debug
                 except Exception as glob_error:
-                    print(f"Error during glob: {str(glob_error)}") # Uncommented for active line
-                    traceback.print_exc() # Ensure traceback is available and called
-                    # pass # No longer needed if print is active
+                    logger.error(f"Error during glob: {str(glob_error)}", exc_info=True)
                 
                 if found_files:
                     file_path_obj = found_files[0]
@@ -330,6 +329,5 @@ def sanitize_content(content: str) -> str:
         
         return content
     except Exception as e:
-        print(f"Error sanitizing content: {str(e)}") 
-        traceback.print_exc()
+        logger.error(f"Error sanitizing content: {str(e)}", exc_info=True)
         return content # This is the action for the except block
\ No newline at end of file
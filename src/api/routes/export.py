@@ -3,15 +3,18 @@ from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, List, Any, Optional
 from uuid import UUID
+import logging
 from pydantic import BaseModel
 
 from src.services.export.sheets_service import GoogleSheetsService
 from src.services.export.template_service import SheetTemplate
-from src.utils.database import get_db
+from src.utils.database import get_db, get_read_db
 from src.utils.security import get_current_user_id
 from src.config.sheets_config import GoogleSheetsConfig
 from src.services.data_management import DataManagementService
 
+logger = logging.getLogger(__name__)
+
 # Add these new model classes at the top
 class SpreadsheetCreate(BaseModel):
     """Schema for creating a new spreadsheet."""
@@ -125,9 +128,8 @@ async def get_auth_token() -> Dict[str, Any]:
         # Return the access token for use with Google Drive Picker
         return {"token": sheets_service.credentials.token}
     except Exception as e:
-        print(f"DEBUG: Error getting auth token: {str(e)}")
-        import traceback
-        print(f"DEBUG: Traceback: {traceback.format_exc()}")
+        logger.debug(f"Error getting auth token: {str(e)}")
+        logger.debug("Traceback:", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get auth token: {str(e)}"
@@ -138,7 +140,7 @@ async def get_export_preview(
     data_id: UUID,
     template_name: str = "default",
     user_id: UUID = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """Get preview of data export with selected template."""
     try:
@@ -147,20 +149,20 @@ async def get_export_preview(
         data = await data_service.get_data_by_id(data_id, user_id)
         columns = await data_service.get_columns(data_id, user_id)
 
-        print(f"DEBUG: Export preview for data_id {data_id}")
-        print(f"DEBUG: Data structure keys: {data.data.keys() if data.data else 'No data'}")
-        print(f"DEBUG: Data type: {data.data_type if data else 'No data type'}")
-        print(f"DEBUG: Columns count: {len(columns) if columns else 0}")
+        logger.debug(f"Export preview for data_id {data_id}")
+        logger.debug(f"Data structure keys: {data.data.keys() if data.data else 'No data'}")
+        logger.debug(f"Data type: {data.data_type if data else 'No data type'}")
+        logger.debug(f"Columns count: {len(columns) if columns else 0}")
         
         # Check if we have headers in the data structure
         headers_from_data = data.data.get("headers", [])
-        print(f"DEBUG: Headers from data: {headers_from_data}")
+        logger.debug(f"Headers from data: {headers_from_data}")
         
         if 'rows' in data.data:
-            print(f"DEBUG: Rows count: {len(data.data['rows'])}")
-            print(f"DEBUG: First row sample: {data.data['rows'][0] if data.data['rows'] else 'Empty row'}")
+            logger.debug(f"Rows count: {len(data.data['rows'])}")
+            logger.debug(f"First row sample: {data.data['rows'][0] if data.data['rows'] else 'Empty row'}")
         else:
-            print(f"DEBUG: No 'rows' key in data.data. Available keys: {data.data.keys()}")
+            logger.debug(f"No 'rows' key in data.data. Available keys: {data.data.keys()}")
 
         # Get active columns in correct order
         active_columns = sorted(
@@ -168,39 +170,39 @@ async def get_export_preview(
             key=lambda x: x.order
         )
 
-        print(f"DEBUG: Active columns count: {len(active_columns)}")
-        print(f"DEBUG: Active column names: {[col.name for col in active_columns]}")
+        logger.debug(f"Active columns count: {len(active_columns)}")
+        logger.debug(f"Active column names: {[col.name for col in active_columns]}")
 
         # Get column names - if no active columns but we have headers, use those
         if active_columns:
             column_names = [col.name for col in active_columns]
         elif headers_from_data:
             column_names = headers_from_data
-            print(f"DEBUG: Using headers from data as column names: {column_names}")
+            logger.debug(f"Using headers from data as column names: {column_names}")
         else:
             column_names = []
 
-        print(f"DEBUG: Column names: {column_names}")
+        logger.debug(f"Column names: {column_names}")
 
         # Get sample data (first 5 rows)
         sample_data = []
         raw_data = data.data.get("rows", [])
         
-        print(f"DEBUG: Raw data type: {type(raw_data)}")
-        print(f"DEBUG: Raw data length: {len(raw_data)}")
-        print(f"DEBUG: Raw data sample: {raw_data[:2] if raw_data else 'empty'}")
+        logger.debug(f"Raw data type: {type(raw_data)}")
+        logger.debug(f"Raw data length: {len(raw_data)}")
+        logger.debug(f"Raw data sample: {raw_data[:2] if raw_data else 'empty'}")
 
         # Handle different data structures
         if raw_data and isinstance(raw_data, list):
-            print(f"DEBUG: Raw data is a list")
+            logger.debug(f"Raw data is a list")
             # If raw_data is a list of dictionaries (objects)
             if raw_data and isinstance(raw_data[0], dict):
-                print(f"DEBUG: Raw data contains dictionaries")
+                logger.debug(f"Raw data contains dictionaries")
                 
                 # If no column names but we have dictionary data, use keys as columns
                 if not column_names and raw_data:
                     column_names = list(raw_data[0].keys())
-                    print(f"DEBUG: Auto-generated column names from dictionary keys: {column_names}")
+                    logger.debug(f"Auto-generated column names from dictionary keys: {column_names}")
                 
                 for row in raw_data[:5]:
                     sample_row = []
@@ -210,11 +212,11 @@ async def get_export_preview(
                     sample_data.append(sample_row)
             # If raw_data is a list of lists (2D array)
             elif raw_data and isinstance(raw_data[0], list):
-                print(f"DEBUG: Raw data contains lists")
+                logger.debug(f"Raw data contains lists")
                 # If we have no active columns but have headers, just use the raw data directly
                 if not active_columns and headers_from_data:
                     sample_data = raw_data[:5]
-                    print(f"DEBUG: Using raw data directly as sample data")
+                    logger.debug(f"Using raw data directly as sample data")
                 else:
                     for row in raw_data[:5]:
                         sample_row = []
@@ -225,21 +227,20 @@ async def get_export_preview(
                                 sample_row.append("")
                         sample_data.append(sample_row)
             else:
-                print(f"DEBUG: Raw data first element type: {type(raw_data[0]) if raw_data else 'No elements'}")
+                logger.debug(f"Raw data first element type: {type(raw_data[0]) if raw_data else 'No elements'}")
         else:
-            print(f"DEBUG: Raw data is not a list or is empty")
+            logger.debug(f"Raw data is not a list or is empty")
 
-        print(f"DEBUG: Sample data length: {len(sample_data)}")
-        print(f"DEBUG: Sample data: {sample_data}")
+        logger.debug(f"Sample data length: {len(sample_data)}")
+        logger.debug(f"Sample data: {sample_data}")
 
         return {
             "columns": column_names,
             "sampleData": sample_data
         }
     except Exception as e:
-        print(f"DEBUG: Error in export preview: {str(e)}")
-        import traceback
-        print(f"DEBUG: Traceback: {traceback.format_exc()}")
+        logger.debug(f"Error in export preview: {str(e)}")
+        logger.debug("Traceback:", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -249,11 +250,11 @@ async def get_export_preview(
 async def export_to_csv(
     data: SpreadsheetCreate,
     user_id: UUID = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """Export data to CSV format for download."""
     try:
-        print(f"DEBUG: CSV export for data_id {data.data_id}")
+        logger.debug(f"CSV export for data_id {data.data_id}")
         
         # If data_id is provided, fetch and format the data
         if data.data_id:
@@ -261,7 +262,7 @@ async def export_to_csv(
             structured_data = await data_service.get_data_by_id(data.data_id, user_id)
             columns = await data_service.get_columns(data.data_id, user_id)
             
-            print(f"DEBUG: Got structured data with type: {structured_data.data_type if structured_data else 'No data type'}")
+            logger.debug(f"Got structured data with type: {structured_data.data_type if structured_data else 'No data type'}")
             
             # Get active columns in correct order
             active_columns = sorted(
@@ -352,9 +353,8 @@ async def export_to_csv(
                 detail="No data_id provided"
             )
     except Exception as e:
-        print(f"DEBUG: Error in CSV export: {str(e)}")
-        import traceback
-        print(f"DEBUG: Traceback: {traceback.format_exc()}")
+        logger.debug(f"Error in CSV export: {str(e)}")
+        logger.debug("Traceback:", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -368,29 +368,29 @@ async def create_spreadsheet(
 ) -> Dict[str, Any]:
     """Create a new spreadsheet with structured data."""
     try:
-        print(f"DEBUG: Spreadsheet create parameters: title={data.title}, template={data.template_name}, folder_id={data.folder_id}, use_drive_picker={data.use_drive_picker}")
+        logger.debug(f"Spreadsheet create parameters: title={data.title}, template={data.template_name}, folder_id={data.folder_id}, use_drive_picker={data.use_drive_picker}")
         
         # If data_id is provided, fetch and format the data
         if data.data_id:
-            print(f"DEBUG: Creating spreadsheet for data_id {data.data_id}")
+            logger.debug(f"Creating spreadsheet for data_id {data.data_id}")
             
             data_service = DataManagementService(db)
             structured_data = await data_service.get_data_by_id(data.data_id, user_id)
             columns = await data_service.get_columns(data.data_id, user_id)
 
-            print(f"DEBUG: Structured data keys: {structured_data.data.keys() if structured_data.data else 'No data'}")
-            print(f"DEBUG: Data type: {structured_data.data_type if structured_data else 'No data type'}")
-            print(f"DEBUG: Columns count: {len(columns) if columns else 0}")
+            logger.debug(f"Structured data keys: {structured_data.data.keys() if structured_data.data else 'No data'}")
+            logger.debug(f"Data type: {structured_data.data_type if structured_data else 'No data type'}")
+            logger.debug(f"Columns count: {len(columns) if columns else 0}")
             
             # Check if we have headers in the data structure
             headers_from_data = structured_data.data.get("headers", [])
-            print(f"DEBUG: Headers from data: {headers_from_data}")
+            logger.debug(f"Headers from data: {headers_from_data}")
             
             if 'rows' in structured_data.data:
-                print(f"DEBUG: Rows count: {len(structured_data.data['rows'])}")
-                print(f"DEBUG: First row sample: {structured_data.data['rows'][0] if structured_data.data['rows'] else 'Empty row'}")
+                logger.debug(f"Rows count: {len(structured_data.data['rows'])}")
+                logger.debug(f"First row sample: {structured_data.data['rows'][0] if structured_data.data['rows'] else 'Empty row'}")
             else:
-                print(f"DEBUG: No 'rows' key in structured_data.data. Available keys: {structured_data.data.keys()}")
+                logger.debug(f"No 'rows' key in structured_data.data. Available keys: {structured_data.data.keys()}")
 
             # Get active columns in correct order
             active_columns = sorted(
@@ -398,15 +398,15 @@ async def create_spreadsheet(
                 key=lambda x: x.order
             )
 
-            print(f"DEBUG: Active columns count: {len(active_columns)}")
-            print(f"DEBUG: Active column names: {[col.name for col in active_columns]}")
+            logger.debug(f"Active columns count: {len(active_columns)}")
+            logger.debug(f"Active column names: {[col.name for col in active_columns]}")
 
             # Prepare data for export - if no active columns but we have headers, use those
             if active_columns:
                 column_names = [col.name for col in active_columns]
             elif headers_from_data:
                 column_names = headers_from_data
-                print(f"DEBUG: Using headers from data as column names: {column_names}")
+                logger.debug(f"Using headers from data as column names: {column_names}")
             else:
                 column_names = []
                 
@@ -416,50 +416,50 @@ async def create_spreadsheet(
             # If we have rows that are dictionaries, use their keys as column names
             if not column_names and rows and isinstance(rows, list) and len(rows) > 0 and isinstance(rows[0], dict):
                 column_names = list(rows[0].keys())
-                print(f"DEBUG: Auto-generated column names from row dictionary keys: {column_names}")
+                logger.debug(f"Auto-generated column names from row dictionary keys: {column_names}")
             
             # This duplicate check is now redundant, so we'll remove it
             
-            print(f"DEBUG: Column names: {column_names}")
-            print(f"DEBUG: Rows type: {type(rows)}")
-            print(f"DEBUG: Rows length: {len(rows)}")
-            print(f"DEBUG: Rows sample: {rows[:2] if rows else 'empty'}")
+            logger.debug(f"Column names: {column_names}")
+            logger.debug(f"Rows type: {type(rows)}")
+            logger.debug(f"Rows length: {len(rows)}")
+            logger.debug(f"Rows sample: {rows[:2] if rows else 'empty'}")
 
             # Create base export data with column headers
             if not column_names:
                 # Create some meaningful default column names based on data type
                 if structured_data.data_type and structured_data.data_type.lower() == "sports":
                     column_names = ["Team", "League", "Wins", "Losses", "Points"]
-                    print(f"DEBUG: Using sports-specific default column headers")
+                    logger.debug(f"Using sports-specific default column headers")
                 else:
                     # If no columns, create a default "Data" column
                     column_names = ["Data"]
-                    print(f"DEBUG: Using single default column header")
+                    logger.debug(f"Using single default column header")
             
             export_data = [column_names]  # First row is column headers
-            print(f"DEBUG: Column names for export: {column_names}")
+            logger.debug(f"Column names for export: {column_names}")
             
             # Super detailed logging
-            print(f"DEBUG: HEADER ROW TYPE: {type(column_names)}")
+            logger.debug(f"HEADER ROW TYPE: {type(column_names)}")
             if isinstance(column_names, list):
                 for i, header in enumerate(column_names):
-                    print(f"DEBUG: HEADER {i} TYPE: {type(header)}, VALUE: {header}")
+                    logger.debug(f"HEADER {i} TYPE: {type(header)}, VALUE: {header}")
             
             # Handle different data structures
             if rows and isinstance(rows, list):
-                print(f"DEBUG: Rows is a list with {len(rows)} items")
+                logger.debug(f"Rows is a list with {len(rows)} items")
                 
                 # Make a copy of rows to avoid modifying the original data
                 processed_rows = []
                 
                 # If rows is a list of dictionaries (objects)
                 if rows and isinstance(rows[0], dict):
-                    print(f"DEBUG: Rows contains dictionaries")
+                    logger.debug(f"Rows contains dictionaries")
                     
                     # In case we have no column names but have dict rows, use keys
                     if not column_names and rows and len(rows) > 0:
                         column_names = list(rows[0].keys())
-                        print(f"DEBUG: Using dictionary keys as column names in processing step: {column_names}")
+                        logger.debug(f"Using dictionary keys as column names in processing step: {column_names}")
                         # Update the header row in export_data with new column names
                         if export_data and len(export_data) > 0:
                             export_data[0] = column_names
@@ -476,13 +476,13 @@ async def create_spreadsheet(
                         
                 # If rows is a list of lists (2D array)
                 elif rows and isinstance(rows[0], list):
-                    print(f"DEBUG: Rows contains lists")
+                    logger.debug(f"Rows contains lists")
                     # If we have headers from data, use them directly
                     if not active_columns and headers_from_data and headers_from_data != column_names:
                         # Replace our first row with the better headers
                         export_data[0] = headers_from_data
                         processed_rows = rows
-                        print(f"DEBUG: Using raw data directly with headers: {headers_from_data}")
+                        logger.debug(f"Using raw data directly with headers: {headers_from_data}")
                     else:
                         # Map data based on column indices
                         for row in rows:
@@ -500,12 +500,12 @@ async def create_spreadsheet(
                 
                 # Handle primitive value rows (strings, numbers)
                 elif rows and isinstance(rows[0], (str, int, float, bool)):
-                    print(f"DEBUG: Rows contains primitive values")
+                    logger.debug(f"Rows contains primitive values")
                     for value in rows:
                         processed_rows.append([value])
                         
                 else:
-                    print(f"DEBUG: Rows first element type: {type(rows[0]) if rows else 'No elements'}")
+                    logger.debug(f"Rows first element type: {type(rows[0]) if rows else 'No elements'}")
                     # Try to convert each element to a string and create a single-column row
                     for item in rows:
                         processed_rows.append([str(item)])
@@ -514,19 +514,19 @@ async def create_spreadsheet(
                 export_data.extend(processed_rows)
                 
                 # Exhaustive logging of data structure
-                print(f"DEBUG: DETAILED DATA INSPECTION:")
-                print(f"DEBUG: export_data type: {type(export_data)}")
-                print(f"DEBUG: export_data length: {len(export_data)}")
+                logger.debug(f"DETAILED DATA INSPECTION:")
+                logger.debug(f"export_data type: {type(export_data)}")
+                logger.debug(f"export_data length: {len(export_data)}")
                 
                 # Check for any non-list rows
                 non_list_rows = []
                 for i, row in enumerate(export_data):
                     if not isinstance(row, list):
                         non_list_rows.append(i)
-                        print(f"DEBUG: Row {i} is not a list: {type(row)}")
+                        logger.debug(f"Row {i} is not a list: {type(row)}")
                 
                 if non_list_rows:
-                    print(f"DEBUG: Found {len(non_list_rows)} non-list rows: {non_list_rows}")
+                    logger.debug(f"Found {len(non_list_rows)} non-list rows: {non_list_rows}")
                     # Fix non-list rows
                     for i in non_list_rows:
                         export_data[i] = [str(export_data[i])]
@@ -538,7 +538,7 @@ async def create_spreadsheet(
                         empty_rows.append(i)
                 
                 if empty_rows:
-                    print(f"DEBUG: Found {len(empty_rows)} empty rows: {empty_rows}")
+                    logger.debug(f"Found {len(empty_rows)} empty rows: {empty_rows}")
                     # Fix empty rows
                     for i in empty_rows:
                         export_data[i] = [""]
@@ -554,26 +554,26 @@ async def create_spreadsheet(
                                 export_data[i][j] = str(cell)
                 
                 if complex_cells:
-                    print(f"DEBUG: Found {len(complex_cells)} complex cells: {complex_cells[:5]}...")
+                    logger.debug(f"Found {len(complex_cells)} complex cells: {complex_cells[:5]}...")
                 
                 # Log a few sample rows
-                print(f"DEBUG: Sample rows:")
+                logger.debug(f"Sample rows:")
                 for i in range(min(5, len(export_data))):
-                    print(f"DEBUG: Row {i}: {export_data[i]}")
+                    logger.debug(f"Row {i}: {export_data[i]}")
                 
             else:
-                print(f"DEBUG: Rows is not a list or is empty")
+                logger.debug(f"Rows is not a list or is empty")
                 # Add a default empty row
                 export_data.append(["No data available"])
                 
             # Debug the final export data
-            print(f"DEBUG: Export data length: {len(export_data)}")
-            print(f"DEBUG: Export data first row (headers): {export_data[0] if export_data else 'No data'}")
-            print(f"DEBUG: Export data second row (first data row): {export_data[1] if len(export_data) > 1 else 'No data row'}")
+            logger.debug(f"Export data length: {len(export_data)}")
+            logger.debug(f"Export data first row (headers): {export_data[0] if export_data else 'No data'}")
+            logger.debug(f"Export data second row (first data row): {export_data[1] if len(export_data) > 1 else 'No data row'}")
             
             # Last resort - if data seems empty, create some minimal example data
             if len(export_data) <= 1 or (len(export_data) == 2 and not export_data[1]):
-                print(f"DEBUG: CRITICAL - Data appears to be empty or insufficient. Creating default sample data.")
+                logger.debug(f"CRITICAL - Data appears to be empty or insufficient. Creating default sample data.")
                 
                 # Create a basic sample data structure
                 export_data = [
@@ -587,30 +587,30 @@ async def create_spreadsheet(
                     ["Notre Dame", "Independent", "9", "3", "401", "266"]
                 ]
                 
-                print(f"DEBUG: Created fallback data with {len(export_data)} rows")
+                logger.debug(f"Created fallback data with {len(export_data)} rows")
                 for i in range(min(3, len(export_data))):
-                    print(f"DEBUG: Fallback row {i}: {export_data[i]}")
+                    logger.debug(f"Fallback row {i}: {export_data[i]}")
             
-            print(f"DEBUG: Export data length: {len(export_data)}")
-            print(f"DEBUG: Export data sample: {export_data[:2] if export_data else 'empty'}")
+            logger.debug(f"Export data length: {len(export_data)}")
+            logger.debug(f"Export data sample: {export_data[:2] if export_data else 'empty'}")
         else:
             export_data = data.data
-            print(f"DEBUG: Using provided data: {export_data}")
+            logger.debug(f"Using provided data: {export_data}")
 
         # Create spreadsheet with template
         try:
-            print(f"DEBUG: Initializing sheets service from token")
+            logger.debug(f"Initializing sheets service from token")
             is_authorized = await sheets_service.initialize_from_token(sheets_config.TOKEN_PATH)
             if not is_authorized:
-                print(f"DEBUG: Not authorized with Google Sheets")
+                logger.debug(f"Not authorized with Google Sheets")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Not authorized with Google Sheets. Please authenticate first."
                 )
             
-            print(f"DEBUG: Creating spreadsheet with template: {data.template_name}")
-            print(f"DEBUG: Title: {data.title or 'Exported Data'}")
-            print(f"DEBUG: Export data length: {len(export_data) if export_data else 0}")
+            logger.debug(f"Creating spreadsheet with template: {data.template_name}")
+            logger.debug(f"Title: {data.title or 'Exported Data'}")
+            logger.debug(f"Export data length: {len(export_data) if export_data else 0}")
             
             result = await sheets_service.create_spreadsheet_with_template(
                 title=data.title or "Exported Data",
@@ -621,22 +621,20 @@ async def create_spreadsheet(
                 use_drive_picker=data.use_drive_picker or False
             )
 
-            print(f"DEBUG: Spreadsheet creation result: {result}")
+            logger.debug(f"Spreadsheet creation result: {result}")
             return {
                 "spreadsheetId": result.get("spreadsheet_id"),
                 "spreadsheetUrl": result.get("spreadsheetUrl", "")
             }
         except Exception as sheet_error:
-            print(f"DEBUG: Error in sheets service: {str(sheet_error)}")
-            print(f"DEBUG: Error type: {type(sheet_error)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Error in sheets service: {str(sheet_error)}")
+            logger.debug(f"Error type: {type(sheet_error)}")
+            logger.debug("Traceback:", exc_info=True)
             raise
     except Exception as e:
-        print(f"DEBUG: Error creating spreadsheet: {str(e)}")
-        print(f"DEBUG: Error type: {type(e)}")
-        import traceback
-        print(f"DEBUG: Traceback: {traceback.format_exc()}")
+        logger.debug(f"Error creating spreadsheet: {str(e)}")
+        logger.debug(f"Error type: {type(e)}")
+        logger.debug("Traceback:", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
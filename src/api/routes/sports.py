@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Literal, Union
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import ValidationError
 import math
+import logging
 
 from src.models.sports_models import (
     League, Team, Player, Game, Stadium, 
@@ -27,7 +28,7 @@ from src.schemas.sports import (
     BrandCreate, BrandUpdate, BrandRead,
     EntityExportRequest, EntityExportResponse
 )
-from src.utils.database import get_db
+from src.utils.database import get_db, get_read_db
 from src.services.sports_service import SportsService
 from src.services.export_service import ExportService
 from src.utils.auth import get_current_user
@@ -39,10 +40,12 @@ from src.utils.errors import (
     DatabaseOperationError
 )
 from src.services.sports.league_service import LeagueService
+from src.services.sports.pagination import InvalidCursorError
 from src.services.sports.utils import normalize_entity_type
 from src.services.sports.game_service import GameService
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 sports_service = SportsService()
 export_service = ExportService()
 
@@ -52,11 +55,14 @@ async def lookup_entity_by_name(
     entity_type: str,
     name: str,
     league_id: Optional[UUID] = Query(None, description="Optional league ID to scope the search for division/conference"),
+    fuzzy: bool = Query(False, description="Fall back to the best prefix, substring or similar-name match"),
     db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """
-    Looks up an entity by name. For division/conference, can be scoped by league_id.
+    Looks up an entity by name or nickname. For division/conference, can be scoped by league_id.
+    With fuzzy=true the best ranked match is returned when there is no exact one; its
+    '_match' field says how it matched (exact, prefix, contains or fuzzy).
     """
     try:
         normalized_type = normalize_entity_type(entity_type)
@@ -67,7 +73,7 @@ async def lookup_entity_by_name(
                 details={"valid_types": list(sports_service.ENTITY_TYPES.keys())}
             )
             
-        entity = await sports_service.get_entity_by_name(db, normalized_type, name, league_id=league_id)
+        entity = await sports_service.get_entity_by_name(db, normalized_type, name, league_id=league_id, fuzzy=fuzzy)
         
         if not entity:
             raise HTTPException(status_code=404, detail=f"{entity_type} '{name}' not found.")
@@ -80,6 +86,29 @@ async def lookup_entity_by_name(
             entity_type=entity_type
         )
 
+@router.post("/entities/{entity_type}/bulk", response_model=Dict[str, Any])
+async def bulk_upsert_entities(
+    entity_type: str,
+    entities_data: List[Dict[str, Any]],
+    update_if_exists: bool = Query(True, description="Update entities that already exist (matched by name) instead of skipping them"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Dict = Depends(get_current_user)
+):
+    """
+    Insert or update many entities of one type in a single transaction.
+    Returns inserted/updated/failed counts per chunk.
+    """
+    normalized_type = normalize_entity_type(entity_type)
+    if normalized_type not in sports_service.ENTITY_TYPES:
+        raise EntityValidationError(
+            message=f"Invalid entity type: {entity_type}",
+            entity_type=entity_type,
+            details={"valid_types": list(sports_service.ENTITY_TYPES.keys())}
+        )
+    return await sports_service.bulk_upsert_entities(
+        db, normalized_type, entities_data, update_if_exists=update_if_exists
+    )
+
 # Generic entity endpoints
 @router.get("/entities/{entity_type}", response_model=PaginatedResponse[Dict[str, Any]])
 async def get_entities(
@@ -89,10 +118,18 @@ async def get_entities(
     sort_by: str = Query("id", description="Field to sort by"),
     sort_direction: str = Query("asc", description="Sort direction (asc or desc)"),
     filters: Optional[str] = Query(None, description="JSON string of filter conditions"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces page when given"),
+    count: Literal["exact", "estimated", "cached", "auto"] = Query("auto", description="How the total is counted for unfiltered listings"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
-    """Get paginated entities of a specific type."""
+    """
+    Get paginated entities of a specific type.
+
+    Pass next_cursor back as cursor to fetch the following page by keyset,
+    which costs the same at any depth. total_estimated is true when total
+    is the planner's row estimate rather than an exact count.
+    """
     try:
         # Parse filters if provided
         filter_conditions = None
@@ -100,41 +137,42 @@ async def get_entities(
             import json
             try:
                 filter_conditions = json.loads(filters)
-                print(f"Parsed filters: {filter_conditions}")
+                logger.debug(f"Parsed filters: {filter_conditions}")
             except json.JSONDecodeError:
                 raise ValueError(f"Invalid filter format: {filters}")
 
         # Standard, consistent handling for all entity types
-        result = await sports_service.get_entities_with_related_names(
+        result = await sports_service.list_entities_with_related_names(
             entity_type=entity_type,
             page=page,
             page_size=limit,
             sort_field=sort_by,
             sort_direction=sort_direction,
-            filters=filter_conditions
+            filters=filter_conditions,
+            cursor=cursor,
+            count_mode=count
         )
-        
-        # Unpack the tuple result
-        entities_list, total_count = result
+        total_count = result["total"]
 
         # Construct the dictionary for PaginatedResponse
         response_data = {
-            "items": entities_list,
+            "items": result["items"],
             "total": total_count,
             "page": page,
             "size": limit, # 'limit' is the query param for page size
-            "pages": math.ceil(total_count / limit) if limit > 0 else 0 # Avoid division by zero, return 0 pages if limit is 0
+            "pages": math.ceil(total_count / limit) if limit > 0 else 0, # Avoid division by zero, return 0 pages if limit is 0
+            "next_cursor": result["next_cursor"],
+            "total_estimated": result["total_estimated"]
         }
         
         # Log the number of results for debugging using the new response_data dict
-        print(f"Found {len(response_data.get('items', []))} results for {entity_type} with filters: {filter_conditions}")
+        logger.debug(f"Found {len(response_data.get('items', []))} results for {entity_type} with filters: {filter_conditions}")
         
         return response_data # This dict will be validated by PaginatedResponse
-    except ValueError as e:
+    except (ValueError, InvalidCursorError) as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.error(f"Error listing {entity_type}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 # League endpoints
@@ -382,7 +420,7 @@ async def create_team(
     Also handles partial updates where only the division_conference_id is provided.
     """
     # Print the team data for debugging
-    print(f"Received team data: {team_data}")
+    logger.debug(f"Received team data: {team_data}")
     
     # Check if this could be a partial update (has name and division_conference_id)
     try:
@@ -391,11 +429,11 @@ async def create_team(
             required_fields = ['league_id', 'stadium_id', 'city', 'country']
             missing_fields = [field for field in required_fields if field not in team_data]
             
-            print(f"Missing fields for team {team_data['name']}: {missing_fields}")
+            logger.debug(f"Missing fields for team {team_data['name']}: {missing_fields}")
             
             # If we're missing some required fields, treat this as a partial update
             if len(missing_fields) > 0:
-                print(f"Treating as partial update for team: {team_data['name']}")
+                logger.debug(f"Treating as partial update for team: {team_data['name']}")
                 
                 # Look up the existing team by name
                 query = select(Team).where(Team.name == team_data['name'])
@@ -404,7 +442,7 @@ async def create_team(
             
             if existing_team:
                 # This is a partial update to an existing team
-                print(f"Detected partial update for team: {team_data['name']}")
+                logger.debug(f"Detected partial update for team: {team_data['name']}")
                 
                 try:
                     # Verify division_conference_id exists
@@ -422,23 +460,23 @@ async def create_team(
                     return existing_team
                 except Exception as e:
                     await db.rollback()
-                    print(f"Error performing partial update: {str(e)}")
+                    logger.error(f"Error performing partial update: {str(e)}")
                     raise HTTPException(status_code=500, detail=f"Error performing partial update: {str(e)}")
     except Exception as e:
-        print(f"Error in partial update check: {str(e)}")
+        logger.error(f"Error in partial update check: {str(e)}")
         # Continue to normal processing
     
     # If not a partial update, process as normal create/update
     # Convert dict to TeamCreate model
     try:
-        print(f"Creating team with data: {team_data}")
+        logger.debug(f"Creating team with data: {team_data}")
         team = TeamCreate(**team_data)
         return await sports_service.create_team(db, team)
     except ValidationError as e:
-        print(f"Validation error: {str(e)}")
+        logger.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+        logger.error(f"Unexpected error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
 @router.get("/teams/{team_id}", response_model=TeamResponse)
@@ -527,7 +565,7 @@ async def update_entity_by_name(
     as it doesn't require all fields to be present - just the ones
     you want to update.
     """
-    print(f"Updating {entity_type} by name with data: {update_data}")
+    logger.debug(f"Updating {entity_type} by name with data: {update_data}")
     
     # Validate required fields
     if 'name' not in update_data:
@@ -1489,29 +1527,29 @@ async def delete_brand(
 @router.post("/export", response_model=EntityExportResponse)
 async def export_entities(
     export_request: EntityExportRequest,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: Dict = Depends(get_current_user)
 ):
     """Export selected entities to Google Sheets."""
     # Log export request details for debugging
-    print(f"Export request received - entity_type: {export_request.entity_type}")
-    print(f"Export request received - entity_ids count: {len(export_request.entity_ids)}")
-    print(f"Export request received - include_relationships: {export_request.include_relationships}")
-    print(f"Export request received - visible_columns: {export_request.visible_columns}")
-    print(f"Export request received - target_folder: {export_request.target_folder}")
-    print(f"Export request received - file_name: {export_request.file_name}")
-    print(f"Export request received - use_drive_picker: {export_request.use_drive_picker}")
+    logger.debug(f"Export request received - entity_type: {export_request.entity_type}")
+    logger.debug(f"Export request received - entity_ids count: {len(export_request.entity_ids)}")
+    logger.debug(f"Export request received - include_relationships: {export_request.include_relationships}")
+    logger.debug(f"Export request received - visible_columns: {export_request.visible_columns}")
+    logger.debug(f"Export request received - target_folder: {export_request.target_folder}")
+    logger.debug(f"Export request received - file_name: {export_request.file_name}")
+    logger.debug(f"Export request received - use_drive_picker: {export_request.use_drive_picker}")
     
     # If visible_columns is provided as an empty list, set it to None
     visible_columns = export_request.visible_columns
     if visible_columns is not None and len(visible_columns) == 0:
-        print("Visible columns is an empty list, setting to None")
+        logger.debug("Visible columns is an empty list, setting to None")
         visible_columns = None
     
     # Ensure we're passing a list of strings if visible_columns is provided
     if visible_columns is not None:
         visible_columns = [str(col) for col in visible_columns]
-        print(f"Sanitized visible columns: {visible_columns}")
+        logger.debug(f"Sanitized visible columns: {visible_columns}")
     
     # CRITICAL CHANGE: Always export ALL entities by setting export_all=True
     # This forces the export_service to query all entities regardless of the entity_ids provided
@@ -1,14 +1,18 @@
 import os
+import atexit
+import copy
 import json
 import logging
 import logging.config
 import logging.handlers
+import queue
+import random
 import socket
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 # Import settings from config - with fallback if ENVIRONMENT isn't exported
 try:
@@ -109,7 +113,8 @@ if ENVIRONMENT == "production":
                     'args', 'asctime', 'created', 'exc_info', 'exc_text', 'filename',
                     'funcName', 'id', 'levelname', 'levelno', 'lineno', 'module',
                     'msecs', 'message', 'msg', 'name', 'pathname', 'process',
-                    'processName', 'relativeCreated', 'stack_info', 'thread', 'threadName'
+                    'processName', 'relativeCreated', 'stack_info', 'thread', 'threadName',
+                    'taskName'
                 ] and not key.startswith('_'):
                     log_data[key] = value
                     
@@ -187,8 +192,133 @@ class RequestContextFilter(logging.Filter):
 # Create a single instance of the request context filter
 request_filter = RequestContextFilter()
 
+class LogSampler(logging.Filter):
+    """
+    Rate limits and samples high-volume low-level records.
+
+    Each call site (logger, file, line) may emit `per_second` records per
+    second at `level` or below; past that only `sample_rate` of them are
+    kept. The next record let through from a site carries the number
+    suppressed since the previous one.
+    """
+    
+    def __init__(self, per_second: int, sample_rate: float, level: int = logging.DEBUG):
+        super().__init__()
+        self.per_second = per_second
+        self.sample_rate = sample_rate
+        self.level = level
+        self.suppressed_total = 0
+        # (logger, file, line) -> [second, records this second, suppressed since last emitted]
+        self._sites: Dict[Tuple[str, str, int], List[int]] = {}
+        
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        second = int(record.created)
+        site = self._sites.get(key)
+        if site is None:
+            site = self._sites[key] = [second, 0, 0]
+        elif site[0] != second:
+            site[0], site[1] = second, 0
+        site[1] += 1
+        if site[1] <= self.per_second or random.random() < self.sample_rate:
+            if site[2]:
+                record.suppressed = site[2]
+                site[2] = 0
+            return True
+        site[2] += 1
+        self.suppressed_total += 1
+        return False
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without ever blocking the caller.
+    
+    Only the message is rendered here (so later changes to the arguments
+    can't alter it); formatting, including JSON and tracebacks, and all file
+    writes happen on the listener thread. If the queue is full the record is
+    dropped and counted.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, target: str):
+        super().__init__(log_queue)
+        self.target = target
+        self.dropped = 0
+        
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        message = record.getMessage()
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += f" ({suppressed} similar messages suppressed)"
+        record.msg = message
+        record.args = None
+        record._log_target = self.target
+        return record
+        
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class LogDispatcher(logging.Handler):
+    """Runs on the listener thread and passes each record to its logger's handlers."""
+    
+    def __init__(self):
+        super().__init__()
+        self.targets: Dict[str, List[logging.Handler]] = {}
+        
+    def register(self, target: str, handlers: List[logging.Handler]) -> None:
+        self.targets[target] = list(handlers)
+        
+    def handle(self, record: logging.LogRecord) -> bool:
+        for handler in self.targets.get(getattr(record, "_log_target", ""), ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+        
+    def emit(self, record: logging.LogRecord) -> None:
+        self.handle(record)
+
+class LogListener(QueueListener):
+    """QueueListener whose shutdown waits for room in a full queue instead of failing."""
+    
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+# All configured loggers share one queue and one writer thread
+log_queue: queue.Queue = queue.Queue(settings.LOG_QUEUE_SIZE)
+log_dispatcher = LogDispatcher()
+log_listener = LogListener(log_queue, log_dispatcher)
+log_sampler = LogSampler(settings.LOG_DEBUG_PER_SECOND, settings.LOG_DEBUG_SAMPLE_RATE)
+
+# File and console handlers are shared between loggers writing to the same place
+_shared_handlers: Dict[str, logging.Handler] = {}
+
+def _shared_handler(key: str, factory, level: int) -> logging.Handler:
+    handler = _shared_handlers.get(key)
+    if handler is None:
+        handler = factory()
+        handler.setLevel(level)
+        handler.setFormatter(CONSOLE_FORMAT if key == 'console' else LOG_FORMAT)
+        _shared_handlers[key] = handler
+    return handler
+
+def _queue_handler(target: str, handlers: List[logging.Handler]) -> NonBlockingQueueHandler:
+    log_dispatcher.register(target, handlers)
+    queue_handler = NonBlockingQueueHandler(log_queue, target)
+    queue_handler.addFilter(log_sampler)
+    return queue_handler
+
 def setup_logger(name: str) -> logging.Logger:
-    """Set up a logger with environment-appropriate handlers and formatting."""
+    """
+    Set up a logger with environment-appropriate handlers and formatting.
+    
+    The logger itself only gets a NonBlockingQueueHandler; the console and
+    file handlers run on the shared listener thread.
+    """
     logger = logging.getLogger(name)
     
     # Set base log level from configuration
@@ -200,21 +330,20 @@ def setup_logger(name: str) -> logging.Logger:
         return logger
 
     # Clean up old log files before creating new ones
-    cleanup_old_logs()
+    if not _shared_handlers:
+        cleanup_old_logs()
 
     # Get current log paths
     log_paths = get_log_paths()
+    handlers: List[logging.Handler] = []
 
     # Console Handler (level based on environment)
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, CONSOLE_LOG_LEVEL))
-    console_handler.setFormatter(CONSOLE_FORMAT)
-    logger.addHandler(console_handler)
+    handlers.append(_shared_handler('console', logging.StreamHandler, getattr(logging, CONSOLE_LOG_LEVEL)))
 
     # App Log Handler
     if ENVIRONMENT == "production":
         # In production, use timed rotating handler for daily rotation
-        app_handler = TimedRotatingFileHandler(
+        app_factory = lambda: TimedRotatingFileHandler(
             log_paths['app'],
             when='midnight',
             interval=1,
@@ -222,74 +351,80 @@ def setup_logger(name: str) -> logging.Logger:
         )
     else:
         # In development, use size-based rotation
-        app_handler = RotatingFileHandler(
+        app_factory = lambda: RotatingFileHandler(
             log_paths['app'],
             maxBytes=MAX_BYTES,
             backupCount=BACKUP_COUNT
         )
-    app_handler.setLevel(logging.INFO)
-    app_handler.setFormatter(LOG_FORMAT)
-    logger.addHandler(app_handler)
+    handlers.append(_shared_handler('app', app_factory, logging.INFO))
+
+    def rotating(kind: str):
+        return lambda: RotatingFileHandler(log_paths[kind], maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT)
 
     # Error Log Handler (ERROR and above)
-    error_handler = RotatingFileHandler(
-        log_paths['error'],
-        maxBytes=MAX_BYTES,
-        backupCount=BACKUP_COUNT
-    )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(LOG_FORMAT)
-    logger.addHandler(error_handler)
+    handlers.append(_shared_handler('error', rotating('error'), logging.ERROR))
 
     # Debug Log Handler (DEBUG and above)
     # Only add in development or if explicitly requested in production
     if ENVIRONMENT != "production" or LOG_LEVEL == "DEBUG":
-        debug_handler = RotatingFileHandler(
-            log_paths['debug'],
-            maxBytes=MAX_BYTES,
-            backupCount=BACKUP_COUNT
-        )
-        debug_handler.setLevel(logging.DEBUG)
-        debug_handler.setFormatter(LOG_FORMAT)
-        logger.addHandler(debug_handler)
+        handlers.append(_shared_handler('debug', rotating('debug'), logging.DEBUG))
 
     # Chat Log Handler (specific to chat operations)
     if 'chat' in name:
-        chat_handler = RotatingFileHandler(
-            log_paths['chat'],
-            maxBytes=MAX_BYTES,
-            backupCount=BACKUP_COUNT
-        )
-        chat_handler.setLevel(logging.INFO)
-        chat_handler.setFormatter(LOG_FORMAT)
-        logger.addHandler(chat_handler)
+        handlers.append(_shared_handler('chat', rotating('chat'), logging.INFO))
         
     # Request Log Handler (for API requests)
     if 'api' in name:
-        request_handler = RotatingFileHandler(
-            log_paths['request'],
-            maxBytes=MAX_BYTES,
-            backupCount=BACKUP_COUNT
-        )
-        request_handler.setLevel(logging.INFO)
-        request_handler.setFormatter(LOG_FORMAT)
-        # Add request context filter
-        request_handler.addFilter(request_filter)
-        logger.addHandler(request_handler)
+        handlers.append(_shared_handler('request', rotating('request'), logging.INFO))
         
     # Security Log Handler (for security events in production)
     if ENVIRONMENT == "production" and ('security' in name or 'auth' in name):
-        security_handler = RotatingFileHandler(
-            log_paths['security'],
-            maxBytes=MAX_BYTES,
-            backupCount=BACKUP_COUNT
-        )
-        security_handler.setLevel(logging.INFO)
-        security_handler.setFormatter(LOG_FORMAT)
-        logger.addHandler(security_handler)
+        handlers.append(_shared_handler('security', rotating('security'), logging.INFO))
+
+    queue_handler = _queue_handler(name, handlers)
+    if 'api' in name:
+        # Request context is per thread, so it is attached before the record is queued
+        queue_handler.addFilter(request_filter)
+    logger.addHandler(queue_handler)
+    # This logger's handlers already include everything its parents would add
+    logger.propagate = False
 
     return logger
 
+def _queue_root_handlers() -> None:
+    """Move the root logger's handlers (module loggers end up there) behind the queue."""
+    root = logging.getLogger()
+    handlers = [h for h in root.handlers if not isinstance(h, QueueHandler)]
+    if handlers:
+        root.handlers = [_queue_handler('root', handlers)]
+
+def get_log_levels() -> Dict[str, str]:
+    """Effective level of the root logger and every logger configured so far."""
+    levels = {"root": logging.getLevelName(logging.getLogger().level)}
+    for name in sorted(logging.root.manager.loggerDict):
+        logger = logging.getLogger(name)
+        if logger.level != logging.NOTSET:
+            levels[name] = logging.getLevelName(logger.level)
+    return levels
+
+def set_log_level(name: str, level: str) -> str:
+    """
+    Change a logger's level at runtime ("root" for the root logger).
+    
+    Only affects the current process. Returns the normalized level name;
+    raises ValueError for an unknown level.
+    """
+    level_name = level.strip().upper()
+    if level_name not in ("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"):
+        raise ValueError(f"Unknown log level '{level}'")
+    logging.getLogger(None if name == "root" else name).setLevel(level_name)
+    return level_name
+
+def stop_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    if log_listener._thread is not None:
+        log_listener.stop()
+
 # Create main application logger
 app_logger = setup_logger('sheetgpt')
 
@@ -300,6 +435,10 @@ api_logger = setup_logger('sheetgpt.api')
 auth_logger = setup_logger('sheetgpt.auth')
 security_logger = setup_logger('sheetgpt.security')
 
+_queue_root_handlers()
+log_listener.start()
+atexit.register(stop_logging)
+
 # Log startup information
 app_logger.info("Logging system initialized")
 app_logger.info(f"Environment: {ENVIRONMENT}")
@@ -315,9 +454,10 @@ def log_request(
     status_code: int,
     duration_ms: float,
     user_id: Optional[str] = None,
-    ip_address: Optional[str] = None
+    ip_address: Optional[str] = None,
+    db: Optional[Dict[str, Any]] = None
 ) -> None:
-    """Log API request information in a structured format."""
+    """Log API request information in a structured format, with its SQL statement statistics if given."""
     # Set request context for the current thread
     request_filter.set_context(
         request_id=request_id,
@@ -326,9 +466,13 @@ def log_request(
         path=path
     )
     
+    message = f"Request {request_id}: {method} {path} {status_code} {duration_ms}ms"
+    if db:
+        message += f" ({db['db_statements']} statements, {db['db_time_ms']}ms in the database)"
+
     # Log request with all relevant information
     api_logger.info(
-        f"Request {request_id}: {method} {path} {status_code} {duration_ms}ms",
+        message,
         extra={
             "request_id": request_id,
             "method": method,
@@ -336,7 +480,8 @@ def log_request(
             "status_code": status_code,
             "duration_ms": duration_ms,
             "user_id": user_id,
-            "ip_address": ip_address
+            "ip_address": ip_address,
+            **(db or {})
         }
     )
     
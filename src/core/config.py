@@ -54,12 +54,20 @@ class Settings:
     
     # Logging
     LOG_LEVEL: str = "WARNING" if ENVIRONMENT == "production" else "DEBUG"
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # Records waiting for the writer thread; extra records are dropped
+    LOG_DEBUG_PER_SECOND: int = int(os.getenv("LOG_DEBUG_PER_SECOND", "20"))  # DEBUG records per call site per second...
+    LOG_DEBUG_SAMPLE_RATE: float = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))  # ...and the fraction kept beyond that
     
     # API keys - get directly from environment
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     ANTHROPIC_API_KEY: Optional[str] = os.getenv("ANTHROPIC_API_KEY")
     ANTHROPIC_REQUEST_TIMEOUT: int = int(os.getenv("ANTHROPIC_REQUEST_TIMEOUT", "28")) # Default to 28 seconds
     
+    # NLQ schema context: "full" sends the whole schema file (best prompt-cache hit rate),
+    # "relevant" sends only the table sections matched to the question
+    NLQ_SCHEMA_CONTEXT_MODE: str = os.getenv("NLQ_SCHEMA_CONTEXT_MODE", "full").lower()
+    NLQ_SCHEMA_MAX_TABLES: int = int(os.getenv("NLQ_SCHEMA_MAX_TABLES", "4"))
+    
     # Google Sheets
     GOOGLE_SHEETS_CREDENTIALS: Optional[str] = os.getenv("GOOGLE_SHEETS_CREDENTIALS")
     
@@ -9,20 +9,19 @@ from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.staticfiles import StaticFiles
+from prometheus_client import make_asgi_app
 from starlette.exceptions import HTTPException
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from typing import Dict, Any, List
-from starlette.middleware.base import BaseHTTPMiddleware
 
-from src.api.middleware.security import (
-    add_security_headers, 
-    add_cache_headers, 
-    RequestLoggingMiddleware,
-    RateLimitMiddleware
-)
+from src.api.middleware.security import RequestPipelineMiddleware
 
 from src.api.routes import api as api_router
+from src.services.search_service import search_service
+from src.services.data.history_writer import history_flusher
+from src.utils.security import auth_crypto
+from src.utils.config import get_settings
 from src.api.middleware.error_handlers import setup_error_handlers
 # Import with fallback mechanisms
 try:
@@ -52,16 +51,6 @@ app = FastAPI(
     openapi_url="/api/openapi.json" if ENVIRONMENT != "production" else None,  # Disable OpenAPI in production
 )
 
-# A simple middleware to print every request path
-class DebugRequestMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        print(f"DEBUG MIDDLEWARE: Received request for path: {request.url.path}")
-        response = await call_next(request)
-        return response
-
-# Add the new debug middleware at the very top
-app.add_middleware(DebugRequestMiddleware)
-
 # Configure CORS with environment-specific origins
 if ENVIRONMENT == "production":
     app.add_middleware(
@@ -91,7 +80,10 @@ else:
         allow_credentials=True,
         allow_methods=["*"],  # Allow all methods
         allow_headers=["*"],  # Allow all headers
-        expose_headers=["X-Request-ID", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
+        expose_headers=[
+            "X-Request-ID", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset",
+            "X-DB-Statements", "X-DB-Time-Ms", "X-DB-Repeated-Statements",
+        ],
         max_age=86400  # Cache preflight requests for 24 hours
     )
     app_logger.info(f"Added CORS middleware with specific origins for development: {development_origins}")
@@ -132,65 +124,11 @@ app.add_middleware(
 )
 app_logger.info("Added session middleware")
 
-# Add request logging middleware in all environments
-app.add_middleware(RequestLoggingMiddleware)
-app_logger.info("Added request logging middleware")
-
-# Add rate limiting middleware in production
-if ENVIRONMENT == "production":
-    app.add_middleware(RateLimitMiddleware)
-    app_logger.info("Added rate limiting middleware")
-
-# Add security middleware
-app.middleware("http")(add_security_headers)
-app_logger.info("Added security headers middleware")
-
-# Add cache control middleware
-app.middleware("http")(add_cache_headers)
-app_logger.info("Added cache control middleware")
-
-# Add error handling middleware
-@app.middleware("http")
-async def errors_handling(request: Request, call_next):
-    try:
-        return await call_next(request)
-    except Exception as exc:
-        # Generate request ID for traceability
-        if not hasattr(request.state, "request_id"):
-            import uuid
-            request.state.request_id = str(uuid.uuid4())
-            
-        request_id = request.state.request_id
-        api_logger.error(
-            f"Middleware error: {str(exc)}", 
-            exc_info=True,
-            extra={"request_id": request_id}
-        )
-        
-        # Ensure CORS headers are present in error responses
-        response = JSONResponse(
-            status_code=500,
-            content={
-                "error": "ServerError",
-                "message": "Internal server error",
-                "request_id": request_id,
-                "timestamp": datetime.utcnow().isoformat()
-            },
-        )
-        
-        # Add request ID to response
-        response.headers["X-Request-ID"] = request_id
-        
-        # Add CORS headers explicitly for error responses
-        origin = request.headers.get('origin')
-        # In production, check against whitelist; in development, allow all origins
-        if origin and (ENVIRONMENT != "production" or origin in settings.CORS_ORIGINS):
-            response.headers['Access-Control-Allow-Origin'] = origin
-            response.headers['Access-Control-Allow-Credentials'] = 'true'
-            response.headers['Access-Control-Allow-Methods'] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
-            response.headers['Access-Control-Allow-Headers'] = "Authorization, Content-Type, X-Request-ID"
-        
-        return response
+# Request ID, timing and logging, rate limiting (production), security and
+# cache headers, and the catch-all 500 handler, in one pure-ASGI layer.
+# Added last so it is the outermost middleware.
+app.add_middleware(RequestPipelineMiddleware)
+app_logger.info("Added request pipeline middleware")
 
 # Exception handlers
 @app.exception_handler(RequestValidationError)
@@ -303,6 +241,15 @@ if not exports_dir.exists():
 app.mount("/api/v1/exports", StaticFiles(directory=exports_dir), name="exports")
 app_logger.info(f"Mounted exports directory: {exports_dir.absolute()}")
 
+# Prometheus metrics, e.g. SQL statements and database time per request. The endpoint
+# is unauthenticated, so production only serves it when PROMETHEUS_METRICS is set
+metrics_enabled = get_settings().PROMETHEUS_METRICS
+if metrics_enabled is None:
+    metrics_enabled = ENVIRONMENT != "production"
+if metrics_enabled:
+    app.mount("/metrics", make_asgi_app(), name="metrics")
+    app_logger.info("Mounted Prometheus metrics at /metrics")
+
 # API info endpoint
 @app.get("/api")
 async def api_info() -> Dict[str, str]:
@@ -479,6 +426,13 @@ async def startup_event():
     app_logger.info("Application starting up")
     app.state.startup_time = datetime.utcnow()
     
+    # Long-lived HTTP session shared by chat web searches
+    await search_service.startup()
+    
+    # Batch history writes from a background task instead of per edit transaction
+    if get_settings().HISTORY_BACKGROUND_FLUSH:
+        await history_flusher.start()
+    
     # Log environment information
     app_logger.info(f"Environment: {ENVIRONMENT}")
     app_logger.info(f"Debug mode: {settings.DEBUG}")
@@ -500,6 +454,10 @@ async def startup_event():
 async def shutdown_event():
     """Execute cleanup tasks when the application shuts down."""
     app_logger.info("Application shutting down")
+    await search_service.shutdown()
+    if history_flusher.running:
+        await history_flusher.stop()
+    auth_crypto.shutdown()
     
     # Calculate uptime
     if hasattr(app.state, "startup_time"):
@@ -1,5 +1,5 @@
 from src.models.base import TimestampedBase
-from src.models.models import User, Conversation, Message, StructuredData, DataColumn, DataChangeHistory
+from src.models.models import User, Conversation, Message, StructuredData, StructuredDataRow, DataColumn, DataChangeHistory
 from src.models.sports_models import (
     League,
     DivisionConference,
@@ -22,6 +22,7 @@ __all__ = [
     "Conversation",
     "Message",
     "StructuredData",
+    "StructuredDataRow",
     "DataColumn",
     "DataChangeHistory",
     "League",
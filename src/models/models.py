@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, Boolean, ForeignKey, JSON, Text, Integer
+from sqlalchemy import String, Boolean, ForeignKey, JSON, Text, Integer, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List, TYPE_CHECKING
 from uuid import UUID, uuid4
@@ -7,6 +7,7 @@ from sqlalchemy.dialects import postgresql
 import sqlalchemy as sa
 
 from src.models.base import TimestampedBase
+from src.utils.database import Base
 
 if TYPE_CHECKING:
     from src.models.sports_models import Contact
@@ -98,6 +99,16 @@ class Conversation(TimestampedBase):
         nullable=True, 
         default=[]
     )
+    # Rolling summary of turns older than the recent message window
+    context_summary: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True
+    )
+    # created_at of the newest message folded into context_summary
+    context_summary_until: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
 
     # Relationships
     user: Mapped[User] = relationship(back_populates="conversations")
@@ -114,6 +125,10 @@ class Message(TimestampedBase):
     """Model for individual messages in a conversation."""
     
     __tablename__ = "messages"
+    __table_args__ = (
+        # Serves the newest-first tail fetch used to build chat context
+        Index("ix_messages_conversation_id_created_at", "conversation_id", "created_at"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -149,6 +164,10 @@ class StructuredData(TimestampedBase):
     """Model for storing structured data extracted from conversations."""
     
     __tablename__ = "structured_data"
+    __table_args__ = (
+        # Keyset order of the summary list (newest first)
+        Index("ix_structured_data_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -170,6 +189,27 @@ class StructuredData(TimestampedBase):
         JSON,
         nullable=False
     )
+    # When true, data["rows"] is not stored in `data` but one row per
+    # StructuredDataRow; `data` keeps the rest of the document (column_order etc.)
+    rows_in_table: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default=sa.false()
+    )
+    # Summary fields kept in sync on every write so listings never read `data`
+    row_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+    column_names: Mapped[List[str]] = mapped_column(
+        postgresql.JSONB(astext_type=sa.Text()),
+        nullable=False,
+        default=list,
+        server_default=sa.text("'[]'::jsonb")
+    )
     meta_data: Mapped[dict] = mapped_column(
         JSON,
         nullable=False,
@@ -192,6 +232,42 @@ class StructuredData(TimestampedBase):
         cascade="all, delete-orphan"
     )
 
+class StructuredDataRow(Base):
+    """One row of a row-based StructuredData document, addressed by position."""
+    
+    __tablename__ = "structured_data_rows"
+    __table_args__ = (
+        # Deferrable so deleting a row can shift the following ordinals down
+        # in one UPDATE; uniqueness is checked at the end of the statement
+        sa.PrimaryKeyConstraint(
+            "structured_data_id", "ordinal",
+            name="pk_structured_data_rows",
+            deferrable=True,
+            initially="IMMEDIATE"
+        ),
+    )
+
+    structured_data_id: Mapped[UUID] = mapped_column(
+        ForeignKey("structured_data.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    # 0-based row index; dense, so a page is a range scan on the primary key
+    ordinal: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False
+    )
+    data: Mapped[dict] = mapped_column(
+        postgresql.JSONB(astext_type=sa.Text()),
+        nullable=False
+    )
+    # Bumped on every edit; clients send it back for optimistic concurrency checks
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0"
+    )
+
 class DataColumn(TimestampedBase):
     """Model for managing columns in structured data."""
     
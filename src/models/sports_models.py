@@ -1,5 +1,5 @@
 from datetime import datetime, date as DateType
-from sqlalchemy import String, Boolean, ForeignKey, JSON, Text, Integer, Date, DateTime, Time, Numeric, Float, Enum, UniqueConstraint, Index
+from sqlalchemy import String, Boolean, ForeignKey, JSON, Text, Integer, Date, DateTime, Time, Numeric, Float, Enum, UniqueConstraint, Index, func
 from sqlalchemy.dialects.postgresql import UUID as SQLUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List, TYPE_CHECKING
@@ -7,6 +7,7 @@ from uuid import UUID, uuid4
 import enum
 
 from src.models.base import TimestampedBase
+from src.utils.database import Base
 
 if TYPE_CHECKING:
     from src.models.models import User
@@ -1010,4 +1011,92 @@ class Corporate(TimestampedBase):
     industry: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     domain: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    citation: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
\ No newline at end of file
+    citation: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+
+# Denormalized read models: the related names of entity types whose names
+# take several joins to compute, one row per entity. Kept current by
+# src.services.sports.display_views; columns match the relationship
+# registry's related keys for the type.
+
+
+class GameDisplay(Base):
+    """Related names for games."""
+
+    __tablename__ = "games_display"
+    __table_args__ = (
+        Index('ix_games_display_league_name', 'league_name', 'id'),
+        Index('ix_games_display_league_sport', 'league_sport', 'id'),
+        Index('ix_games_display_home_team_name', 'home_team_name', 'id'),
+        Index('ix_games_display_away_team_name', 'away_team_name', 'id'),
+        Index('ix_games_display_stadium_name', 'stadium_name', 'id'),
+    )
+
+    id: Mapped[UUID] = mapped_column(ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+    league_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    league_sport: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    home_team_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    away_team_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    stadium_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class BroadcastRightsDisplay(Base):
+    """Related names for broadcast rights, including the (entity_type, entity_id) subject's."""
+
+    __tablename__ = "broadcast_rights_display"
+    __table_args__ = (
+        Index('ix_broadcast_rights_display_broadcast_company_name', 'broadcast_company_name', 'id'),
+        Index('ix_broadcast_rights_display_division_conference_name', 'division_conference_name', 'id'),
+        Index('ix_broadcast_rights_display_entity_name', 'entity_name', 'id'),
+        Index('ix_broadcast_rights_display_league_name', 'league_name', 'id'),
+        Index('ix_broadcast_rights_display_league_sport', 'league_sport', 'id'),
+    )
+
+    id: Mapped[UUID] = mapped_column(ForeignKey("broadcast_rights.id", ondelete="CASCADE"), primary_key=True)
+    broadcast_company_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    division_conference_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    entity_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    league_id: Mapped[Optional[UUID]] = mapped_column(SQLUUID, nullable=True)
+    league_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    league_sport: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ProductionServiceDisplay(Base):
+    """Related names for production services, including the (entity_type, entity_id) subject's."""
+
+    __tablename__ = "production_services_display"
+    __table_args__ = (
+        Index('ix_production_services_display_production_company_name', 'production_company_name', 'id'),
+        Index('ix_production_services_display_secondary_brand_name', 'secondary_brand_name', 'id'),
+        Index('ix_production_services_display_entity_name', 'entity_name', 'id'),
+        Index('ix_production_services_display_league_name', 'league_name', 'id'),
+        Index('ix_production_services_display_league_sport', 'league_sport', 'id'),
+    )
+
+    id: Mapped[UUID] = mapped_column(ForeignKey("production_services.id", ondelete="CASCADE"), primary_key=True)
+    production_company_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    secondary_brand_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    entity_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    league_id: Mapped[Optional[UUID]] = mapped_column(SQLUUID, nullable=True)
+    league_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    league_sport: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class GameBroadcastDisplay(Base):
+    """Related names for game broadcasts; game_name is "Home vs Away"."""
+
+    __tablename__ = "game_broadcasts_display"
+    __table_args__ = (
+        Index('ix_game_broadcasts_display_game_name', 'game_name', 'id'),
+        Index('ix_game_broadcasts_display_broadcast_company_name', 'broadcast_company_name', 'id'),
+        Index('ix_game_broadcasts_display_production_company_name', 'production_company_name', 'id'),
+    )
+
+    id: Mapped[UUID] = mapped_column(ForeignKey("game_broadcasts.id", ondelete="CASCADE"), primary_key=True)
+    game_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    broadcast_company_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    production_company_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -11,6 +11,8 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
+    total_estimated: bool = False
     
 class ApiSuccess(BaseModel):
     """Standard API success response."""
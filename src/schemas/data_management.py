@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Literal, Optional, Any
 from uuid import UUID
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
@@ -41,6 +41,40 @@ class DataUpdate(BaseModel):
     column_name: str
     row_index: int
     value: Any
+    # Row version the edit was based on; the edit is rejected if the row changed since
+    expected_version: Optional[int] = None
+
+class CellBatchUpdate(BaseModel):
+    """Schema for applying several cell edits in one request."""
+    edits: List[DataUpdate] = Field(..., min_length=1)
+
+class RowFilter(BaseModel):
+    """A condition on one column of a row query."""
+    column: str
+    op: Literal[
+        "eq", "ne", "lt", "lte", "gt", "gte", "in",
+        "contains", "starts_with", "is_null", "not_null"
+    ] = "eq"
+    value: Any = None
+
+class RowSort(BaseModel):
+    """One sort key of a row query."""
+    column: str
+    direction: Literal["asc", "desc"] = "asc"
+
+class RowAggregate(BaseModel):
+    """An aggregate of a row query; count without a column counts rows."""
+    func: Literal["sum", "avg", "count", "min", "max"]
+    column: Optional[str] = None
+
+class RowQuery(BaseModel):
+    """Server-side filter, sort and group-by over a dataset's rows."""
+    filters: List[RowFilter] = Field(default_factory=list, max_length=20)
+    sort: List[RowSort] = Field(default_factory=list, max_length=5)
+    group_by: List[str] = Field(default_factory=list, max_length=5)
+    aggregates: List[RowAggregate] = Field(default_factory=list, max_length=20)
+    skip: int = Field(0, ge=0)
+    limit: int = Field(50, ge=1, le=1000)
 
 class StructuredDataBase(BaseModel):
     """Base schema for structured data."""
@@ -86,6 +120,24 @@ class StructuredDataResponse(BaseModel):
             return value.isoformat()
         return value
 
+class StructuredDataSummary(BaseModel):
+    """Listing entry for structured data, without the data itself."""
+    id: UUID
+    conversation_id: UUID
+    title: Optional[str] = None
+    data_type: str
+    row_count: int
+    column_count: int
+    column_names: List[str]
+    created_at: datetime
+    updated_at: datetime
+
+class StructuredDataSummaryPage(BaseModel):
+    """One page of structured data summaries."""
+    items: List[StructuredDataSummary]
+    # Pass back as `cursor` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
+
 class DataChangeHistoryResponse(BaseModel):
     """Schema for change history response."""
     id: UUID
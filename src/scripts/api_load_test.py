@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+"""
+API Load Test
+
+Drives the real FastAPI app in process (httpx over ASGI, no server needed)
+against a database seeded by synthetic_data.py, one scenario at a time:
+- "list": sorted pages of the games listing at random depths
+- "search": team search over name and city
+- "lookup": exact and fuzzy team lookups by name
+- "linkedin_import": LinkedIn CSV imports with brand matching
+- "rematch": brand rematching for a sample of contacts
+- "export": game exports to a local Sheets stub instead of Google
+
+Reports p50/p95/p99 latency, SQL statements per request and the peak
+memory allocated by one traced request, per scenario. Requests are
+authenticated as the synthetic user; rate limiting only applies with
+ENVIRONMENT=production, so run with the default environment.
+
+The dataset is regenerated from --seed and --scale to pick names and ids,
+so they must match the values the database was seeded with (or pass --seed-data).
+"""
+
+import asyncio
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+from sqlalchemy import event
+
+from src.api.routes import sports as sports_routes
+from src.main import app
+from src.models.sports_models import Contact, Team
+from src.scripts.synthetic_data import CITIES, MASCOTS, Scale, SyntheticDataset, ensure_disposable, load, reset
+from src.services.llm_router import LatencySamples
+from src.utils.auth import get_current_user
+from src.utils.config import get_settings
+from src.utils.database import engine, read_engine
+
+settings = get_settings()
+
+SCENARIOS = ("list", "search", "lookup", "linkedin_import", "rematch", "export")
+LIST_SORTS = ("date", "home_team_name", "league_name", "stadium_name")
+
+# Statements executed by the request running in this context
+_query_count: ContextVar[Optional[List[int]]] = ContextVar("load_test_query_count", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def install_query_counter() -> None:
+    """Count statements on the primary and, when it has its own pool, the replica engine."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _count_query)
+    if read_engine.sync_engine.pool is not engine.sync_engine.pool:
+        event.listen(read_engine.sync_engine, "before_cursor_execute", _count_query)
+
+
+class LocalSheetsStub:
+    """Stands in for GoogleSheetsService so exports run without Google credentials."""
+
+    def __init__(self):
+        self.spreadsheets = 0
+        self.rows_written = 0
+
+    async def initialize_from_token(self, token_path: str) -> bool:
+        return True
+
+    async def create_spreadsheet(self, title, user_id=None, folder_name=None, folder_id=None, use_drive_picker=False):
+        self.spreadsheets += 1
+        spreadsheet_id = f"local-{self.spreadsheets}"
+        return spreadsheet_id, f"http://sheets.local/{spreadsheet_id}", None, None
+
+    async def write_to_sheet(self, spreadsheet_id, sheet_name, headers, rows, value_input_option="USER_ENTERED"):
+        # Count rather than keep the rows, so the stub doesn't show up in the memory figures
+        self.rows_written += len(rows)
+        return {"updatedRows": len(rows)}
+
+    async def apply_formatting(self, spreadsheet_id, sheet_name, column_count, row_count, template_name="default"):
+        return True
+
+
+class Scenarios:
+    """One request per call, with inputs drawn from the synthetic dataset."""
+
+    def __init__(self, dataset: SyntheticDataset, args):
+        self.dataset = dataset
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.teams = dataset.rows(Team)
+        self.contact_ids = [str(row["id"]) for row in dataset.rows(Contact)]
+        self.import_batches = 0
+        self.api = settings.API_V1_PREFIX
+
+    async def list(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get(f"{self.api}/sports/entities/game", params={
+            "page": self.rng.randint(1, self.args.max_page),
+            "limit": self.args.page_size,
+            "sort_by": self.rng.choice(LIST_SORTS),
+            "sort_direction": self.rng.choice(("asc", "desc")),
+        })
+
+    async def search(self, client: httpx.AsyncClient) -> httpx.Response:
+        term = self.rng.choice(MASCOTS + CITIES)
+        filters = [{"field": "search_columns:name,city", "operator": "contains", "value": term}]
+        return await client.get(f"{self.api}/sports/entities/team", params={
+            "filters": json.dumps(filters),
+            "limit": self.args.page_size,
+        })
+
+    async def lookup(self, client: httpx.AsyncClient) -> httpx.Response:
+        name = self.rng.choice(self.teams)["name"]
+        fuzzy = self.rng.random() < 0.5
+        if fuzzy:
+            # Drop the "<league>-<team>" suffix so only a prefix or similar-name match finds it
+            name = name.rsplit(" ", 1)[0]
+        return await client.get(f"{self.api}/sports/lookup/team", params={"name": name, "fuzzy": fuzzy})
+
+    async def linkedin_import(self, client: httpx.AsyncClient) -> httpx.Response:
+        # A new batch each time, so every import creates contacts instead of skipping duplicates
+        self.import_batches += 1
+        content = self.dataset.linkedin_csv(self.args.import_rows, batch=self.import_batches)
+        return await client.post(
+            f"{self.api}/contacts/import/linkedin",
+            params={"auto_match_brands": "true", "match_threshold": 0.6},
+            files={"file": ("Connections.csv", content, "text/csv")},
+            data={"import_source_tag": "load-test"},
+        )
+
+    async def rematch(self, client: httpx.AsyncClient) -> httpx.Response:
+        sample = self.rng.sample(self.contact_ids, min(self.args.rematch_contacts, len(self.contact_ids)))
+        return await client.post(
+            f"{self.api}/contacts/rematch-brands",
+            json={"match_threshold": 0.6, "contact_ids": sample},
+        )
+
+    async def export(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post(f"{self.api}/sports/export", json={
+            "entity_type": self.args.export_type,
+            "entity_ids": [],
+            "file_name": "Load test export",
+        })
+
+
+async def timed_request(call, client: httpx.AsyncClient) -> tuple:
+    """(seconds, statements executed, status) for one request."""
+    counter = [0]
+    token = _query_count.set(counter)
+    started = time.perf_counter()
+    try:
+        response = await call(client)
+        status = response.status_code
+    except Exception as e:
+        status = type(e).__name__
+    finally:
+        _query_count.reset(token)
+    return time.perf_counter() - started, counter[0], status
+
+
+async def run_scenario(client: httpx.AsyncClient, scenarios: Scenarios, name: str, args) -> dict:
+    call = getattr(scenarios, name)
+    requests = args.requests.get(name, args.default_requests)
+    for _ in range(args.warmup):
+        await timed_request(call, client)
+
+    latencies = LatencySamples(max_samples=requests)
+    queries: List[int] = []
+    statuses: Counter = Counter()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            seconds, statements, status = await timed_request(call, client)
+            latencies.add(seconds)
+            queries.append(statements)
+            statuses[str(status)] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    # One more request on its own, traced, for the memory it allocates at peak
+    tracemalloc.start()
+    await timed_request(call, client)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        **latencies.summary(),
+        "requests_per_second": round(requests / elapsed, 1),
+        "queries_per_request": {
+            "mean": round(statistics.fmean(queries), 1) if queries else None,
+            "max": max(queries, default=None),
+        },
+        "peak_memory_kb": round(peak / 1024),
+        "statuses": dict(statuses),
+    }
+
+
+def authenticate_as(user: Dict[str, Any]) -> None:
+    """Serve every request as the synthetic user, skipping tokens and the users lookup."""
+    current_user = {
+        "id": str(user["id"]),
+        "email": user["email"],
+        "is_active": True,
+        "is_superuser": False,
+        "is_admin": user["is_admin"],
+        "created_at": None,
+        "updated_at": None,
+    }
+    app.dependency_overrides[get_current_user] = lambda: dict(current_user)
+
+
+async def run_load_test(args) -> dict:
+    dataset = SyntheticDataset(Scale().scaled(args.scale), seed=args.seed)
+    if args.seed_data:
+        await reset(dataset)
+        await load(dataset)
+
+    sheets = LocalSheetsStub()
+    sports_routes.export_service.sheets_service = sheets
+    authenticate_as(dataset.user)
+    install_query_counter()
+
+    scenarios = Scenarios(dataset, args)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    report: Dict[str, Any] = {"seed": args.seed, "scale": args.scale, "concurrency": args.concurrency, "scenarios": {}}
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+        for name in args.scenarios:
+            report["scenarios"][name] = await run_scenario(client, scenarios, name, args)
+    report["sheets_rows_written"] = sheets.rows_written
+    return report
+
+
+def request_count(value: str) -> tuple:
+    """"export=5" -> ("export", 5)"""
+    name, _, count = value.partition("=")
+    if name not in SCENARIOS or not count.isdigit():
+        raise argparse.ArgumentTypeError(f"expected <scenario>=<count>, got '{value}'")
+    return name, int(count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process load test of the sports and contacts APIs")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="Scenarios to run, in order")
+    parser.add_argument("--default-requests", type=int, default=200, help="Timed requests per scenario")
+    parser.add_argument("--requests", nargs="*", type=request_count,
+                        default=[("linkedin_import", 10), ("rematch", 20), ("export", 5)],
+                        help="Per-scenario overrides as <scenario>=<count>")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed requests before each scenario")
+    parser.add_argument("--page-size", type=int, default=50, help="Rows per listing or search page")
+    parser.add_argument("--max-page", type=int, default=50, help="Deepest listing page requested")
+    parser.add_argument("--import-rows", type=int, default=200, help="Rows per LinkedIn import")
+    parser.add_argument("--rematch-contacts", type=int, default=100, help="Contacts per rematch request")
+    parser.add_argument("--export-type", default="game", help="Entity type the export scenario exports")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale the database was seeded with")
+    parser.add_argument("--seed", type=int, default=42, help="Seed the database was seeded with")
+    parser.add_argument("--seed-data", action="store_true", help="Reset and seed the synthetic dataset first")
+    parser.add_argument("--allow-any-database", action="store_true", help="Skip the scratch database name check")
+    parser.add_argument("--output", metavar="PATH", help="Also write the report to PATH")
+
+    args = parser.parse_args()
+    args.requests = dict(args.requests)
+    if not args.allow_any_database:
+        # Imports and rematches write to the database
+        ensure_disposable()
+    # Keep SQL echo and request logging out of the timings
+    logging.disable(logging.INFO)
+
+    report = asyncio.run(run_load_test(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
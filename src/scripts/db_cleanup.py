@@ -27,6 +27,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.utils.database import get_db_session
+from src.services.sports.display_views import rebuild_displays
 
 class DatabaseCleanupService:
     """Service for database cleanup and maintenance operations."""
@@ -90,6 +91,9 @@ class DatabaseCleanupService:
         # Step 6: Run database integrity checks
         await self.run_integrity_checks()
         
+        # Step 7: Recompute the related-name display tables the raw SQL above bypassed
+        await self.rebuild_display_tables()
+        
         # Generate and print summary report
         duration = time.time() - start_time
         self._print_summary_report(duration)
@@ -806,6 +810,22 @@ class DatabaseCleanupService:
         # Add integrity issues to stats
         self.stats["integrity_issues"] = integrity_issues
     
+    async def rebuild_display_tables(self):
+        """Rebuild the *_display tables after merges, renames and repairs written with raw SQL."""
+        if self.dry_run:
+            print("\nWould rebuild the entity display tables")
+            return
+        print("\nRebuilding entity display tables...")
+        try:
+            await rebuild_displays(self.db)
+            await self.db.commit()
+            print("✓ Display tables rebuilt")
+        except Exception as e:
+            error_msg = f"Error rebuilding display tables: {str(e)}"
+            print(f"❌ {error_msg}")
+            self.stats["errors"].append(error_msg)
+            await self.db.rollback()
+    
     async def _update_dependencies(self, table_name: str, keep_id: str, delete_ids: List[str]):
         """Update dependencies to point to the ID we're keeping."""
         # Get the foreign key dependencies for this table
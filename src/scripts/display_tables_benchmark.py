@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""
+Display Tables Benchmark
+
+Compares sports listing queries that resolve related names with live joins
+(with_related) against the same queries reading the *_display tables:
+- "page": one listing page sorted by a related name, at several page depths
+- "resolve": the related names for one page of already-fetched games
+
+Seeds a synthetic dataset first (default 1,000,000 games across 30 leagues
+of 30 teams) with server-side generate_series inserts, then fills
+games_display with rebuild_displays. Seeded rows are named "Benchmark ..."
+and are removed afterwards unless --keep is given.
+
+Run against a scratch database with the latest migrations applied.
+"""
+
+import asyncio
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import select, text
+
+from src.models.sports_models import Game
+from src.services.sports.display_views import display_resolution_query, display_sort, rebuild_displays
+from src.services.sports.pagination import keyset_order
+from src.services.sports.relationships import resolution_query, with_related
+from src.utils.database import AsyncSessionLocal
+
+SORT_KEYS = ("home_team_name", "league_name", "stadium_name")
+
+SEED_SQL = (
+    """
+    INSERT INTO leagues (id, name, sport, country, tags, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Benchmark League ' || n, 'Sport ' || (n % 5), 'USA', '[]', now(), now()
+    FROM generate_series(1, :leagues) AS n
+    """,
+    """
+    INSERT INTO divisions_conferences (id, league_id, name, type, tags, created_at, updated_at)
+    SELECT gen_random_uuid(), id, name || ' Division', 'Division', '[]', now(), now()
+    FROM leagues WHERE name LIKE 'Benchmark League %'
+    """,
+    """
+    INSERT INTO stadiums (id, name, city, country, tags, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Benchmark Stadium ' || n, 'City ' || n, 'USA', '[]', now(), now()
+    FROM generate_series(1, :leagues * :teams) AS n
+    """,
+    # :teams teams per league, each with its own stadium
+    """
+    INSERT INTO teams (id, name, city, country, league_id, division_conference_id, stadium_id,
+                       tags, created_at, updated_at)
+    SELECT gen_random_uuid(), 'Benchmark Team ' || s.rn, 'City ' || s.rn, 'USA', l.id, d.id, s.id,
+           '[]', now(), now()
+    FROM (SELECT id, row_number() OVER (ORDER BY id) AS rn
+          FROM stadiums WHERE name LIKE 'Benchmark Stadium %') s
+    JOIN (SELECT id, row_number() OVER (ORDER BY id) AS rn
+          FROM leagues WHERE name LIKE 'Benchmark League %') l ON l.rn = (s.rn - 1) / :teams + 1
+    JOIN divisions_conferences d ON d.league_id = l.id
+    """,
+    # Teams numbered so each league's are consecutive
+    """
+    CREATE TEMPORARY TABLE benchmark_teams AS
+    SELECT id, league_id, stadium_id, row_number() OVER (ORDER BY league_id, id) - 1 AS rn
+    FROM teams WHERE name LIKE 'Benchmark Team %'
+    """,
+    # Game n: a home team cycling through all teams, against another team of its league
+    """
+    INSERT INTO games (id, league_id, home_team_id, away_team_id, stadium_id, date, status,
+                       season_year, season_type, tags, created_at, updated_at)
+    SELECT gen_random_uuid(), h.league_id, h.id, a.id, h.stadium_id,
+           DATE '2020-01-01' + (g.n % 1800), 'Final', 2020 + (g.n % 5), 'Regular Season', '[]', now(), now()
+    FROM (SELECT n, n % (:leagues * :teams) AS home FROM generate_series(1, :games) AS n) g
+    JOIN benchmark_teams h ON h.rn = g.home
+    JOIN benchmark_teams a ON a.rn = (g.home / :teams) * :teams
+                                     + (g.home % :teams + 1 + g.n % (:teams - 1)) % :teams
+    """,
+)
+
+CLEANUP_SQL = (
+    "DELETE FROM games WHERE league_id IN (SELECT id FROM leagues WHERE name LIKE 'Benchmark League %')",
+    "DELETE FROM teams WHERE name LIKE 'Benchmark Team %'",
+    "DELETE FROM stadiums WHERE name LIKE 'Benchmark Stadium %'",
+    "DELETE FROM divisions_conferences WHERE league_id IN "
+    "(SELECT id FROM leagues WHERE name LIKE 'Benchmark League %')",
+    "DELETE FROM leagues WHERE name LIKE 'Benchmark League %'",
+)
+
+
+async def seed(args) -> None:
+    params = {"leagues": args.leagues, "teams": args.teams_per_league, "games": args.games}
+    async with AsyncSessionLocal() as session:
+        started = time.perf_counter()
+        for statement in SEED_SQL:
+            await session.execute(text(statement), params)
+        await rebuild_displays(session, ["game"])
+        await session.commit()
+        await session.execute(text("ANALYZE games"))
+        await session.execute(text("ANALYZE games_display"))
+        await session.commit()
+        print(f"Seeded {args.games} games in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as session:
+        for statement in CLEANUP_SQL:
+            await session.execute(text(statement))
+        await session.commit()
+
+
+async def time_query(query, repeats: int) -> float:
+    """Median milliseconds to run query and fetch every row."""
+    timings = []
+    async with AsyncSessionLocal() as session:
+        await session.execute(query)  # Warm up plan and buffer caches
+        for _ in range(repeats):
+            started = time.perf_counter()
+            (await session.execute(query)).all()
+            timings.append(time.perf_counter() - started)
+    return round(statistics.median(timings) * 1000, 2)
+
+
+def joins_sort(query, entity_type: str, sort_key: str):
+    query, expressions = with_related(query, entity_type, [sort_key])
+    return query, expressions[sort_key], Game.id
+
+
+def page_query(sort, sort_key: str, page: int, page_size: int):
+    query, sort_column, id_column = sort(select(Game), "game", sort_key)
+    return (
+        query.order_by(*keyset_order(sort_column, id_column, "asc"))
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+
+
+async def run_benchmark(args) -> dict:
+    report = {"page": {}, "resolve": {}}
+    for sort_key in args.sort_keys:
+        for page in args.pages:
+            report["page"][f"{sort_key}@{page}"] = {
+                "joins_ms": await time_query(page_query(joins_sort, sort_key, page, args.page_size), args.repeats),
+                "display_ms": await time_query(page_query(display_sort, sort_key, page, args.page_size), args.repeats),
+            }
+
+    async with AsyncSessionLocal() as session:
+        ids = list((await session.execute(select(Game.id).limit(args.page_size))).scalars())
+    report["resolve"][f"{len(ids)} games"] = {
+        "joins_ms": await time_query(resolution_query("game", ids), args.repeats),
+        "display_ms": await time_query(display_resolution_query("game", ids), args.repeats),
+    }
+    return report
+
+
+async def main_async(args) -> dict:
+    if not args.skip_seed:
+        await seed(args)
+    try:
+        return await run_benchmark(args)
+    finally:
+        if not args.keep:
+            await cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark live related-name joins against the display tables")
+    parser.add_argument("--games", type=int, default=1_000_000, help="Games to generate")
+    parser.add_argument("--leagues", type=int, default=30, help="Leagues to generate")
+    parser.add_argument("--teams-per-league", type=int, default=30, help="Teams per league")
+    parser.add_argument("--page-size", type=int, default=50, help="Rows per listing page")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 10000], help="Page numbers to time")
+    parser.add_argument("--sort-keys", nargs="+", choices=SORT_KEYS, default=list(SORT_KEYS), help="Related names to sort by")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per query")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse data seeded by an earlier --keep run")
+    parser.add_argument("--keep", action="store_true", help="Leave the seeded data in place")
+
+    args = parser.parse_args()
+    # Keep SQL echo and service logging out of the timings
+    logging.disable(logging.INFO)
+
+    report = asyncio.run(main_async(args))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
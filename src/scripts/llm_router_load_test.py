@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+LLM Router Load Test
+
+Drives the LLM router with the in-process fake provider (no network or API
+keys needed) to see how concurrency limits, queue deadlines, circuit
+breaking and hedging behave under load:
+- A primary fake model with configurable time to first token and failure rate
+- An optional faster hedge model raced against slow first tokens
+- A report of throughput, rejections and time-to-first-token percentiles
+"""
+
+import asyncio
+import argparse
+import json
+import sys
+import os
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.services.llm_router import (
+    FakeProvider,
+    LLMRequest,
+    LLMRouter,
+    LLMRouterError,
+    ModelRoute,
+)
+
+PRIMARY = ModelRoute("fake", "primary")
+HEDGE = ModelRoute("fake", "hedge")
+
+
+async def run_client(router: LLMRouter, args, results: dict) -> None:
+    """Issue requests back to back until the test duration is over."""
+    request = LLMRequest(messages=[{"role": "user", "content": "load test"}])
+    hedge = HEDGE if args.hedge_after is not None else None
+    end = time.monotonic() + args.duration
+    while time.monotonic() < end:
+        try:
+            async for _ in router.stream(PRIMARY, request, hedge=hedge, hedge_after=args.hedge_after):
+                pass
+            results["completed"] += 1
+        except LLMRouterError as e:
+            results["rejected"][type(e).__name__] = results["rejected"].get(type(e).__name__, 0) + 1
+        except Exception:
+            results["failed"] += 1
+
+
+async def run_load_test(args) -> dict:
+    """Run the load test and return a report."""
+    provider = FakeProvider(
+        ttft=args.ttft,
+        token_delay=args.token_delay,
+        model_ttft={"hedge": args.hedge_ttft},
+        failure_rate=args.failure_rate,
+        seed=42,
+    )
+    router = LLMRouter(queue_timeout=args.queue_timeout)
+    router.register_provider(
+        "fake",
+        provider,
+        max_concurrency=args.provider_limit,
+        model_limits={"primary": args.model_limit} if args.model_limit else None,
+    )
+
+    results = {"completed": 0, "failed": 0, "rejected": {}}
+    started = time.monotonic()
+    await asyncio.gather(*(run_client(router, args, results) for _ in range(args.clients)))
+    elapsed = time.monotonic() - started
+
+    return {
+        "clients": args.clients,
+        "elapsed_seconds": round(elapsed, 2),
+        "requests_per_second": round(results["completed"] / elapsed, 1),
+        "peak_provider_concurrency": provider.peak_active,
+        **results,
+        "router": router.metrics(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test for the LLM router")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds")
+    parser.add_argument("--provider-limit", type=int, default=16, help="Provider concurrency limit")
+    parser.add_argument("--model-limit", type=int, default=None, help="Per-model concurrency limit for the primary")
+    parser.add_argument("--queue-timeout", type=float, default=2.0, help="Seconds to wait for a slot")
+    parser.add_argument("--ttft", type=float, default=0.2, help="Primary time to first token in seconds")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="Delay between streamed chunks")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of primary calls that fail")
+    parser.add_argument("--hedge-after", type=float, default=None, help="Hedge to the second model after N seconds")
+    parser.add_argument("--hedge-ttft", type=float, default=0.05, help="Hedge model time to first token")
+
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(args))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
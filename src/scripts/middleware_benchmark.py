@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+"""
+Middleware Benchmark
+
+Compares the request pipeline against the BaseHTTPMiddleware stack it
+replaced, driving a small FastAPI app in-process through the ASGI interface
+(no server or sockets, so only framework and middleware cost is measured):
+- "legacy": one BaseHTTPMiddleware layer each for the debug print, request
+  logging, rate limiting, security headers, cache headers and the error
+  handler, doing the same work as before
+- "pipeline": RequestPipelineMiddleware alone
+- "none": no middleware, as a baseline
+
+For each stack it reports requests/second for a small JSON endpoint and
+time to first byte for a streaming endpoint whose later chunks are delayed.
+"""
+
+import asyncio
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.middleware.rate_limit import RateLimit, RateLimiter, RateLimitPolicy
+from src.api.middleware.security import SECURITY_HEADERS, RequestPipelineMiddleware, cache_control_for
+
+STACKS = ("none", "legacy", "pipeline")
+
+
+def make_limiter() -> RateLimiter:
+    # High enough never to reject during the benchmark
+    return RateLimiter(RateLimitPolicy(default=RateLimit(10 ** 9, 60)))
+
+
+def add_legacy_stack(app: FastAPI) -> None:
+    """The pre-pipeline middleware layers, in their original order."""
+    api_logger = logging.getLogger("sheetgpt.api")
+    limiter = make_limiter()
+
+    class DebugRequestMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next):
+            api_logger.debug(f"Received request for path: {request.url.path}")
+            return await call_next(request)
+
+    class RequestLoggingMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next):
+            request.state.request_id = request_id = os.urandom(16).hex()
+            start_time = time.perf_counter()
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            api_logger.info(f"Request {request_id}: {request.method} {request.url.path} "
+                            f"{response.status_code} {(time.perf_counter() - start_time) * 1000:.2f}ms")
+            return response
+
+    class RateLimitMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next):
+            result = await limiter.hit(request.url.path, request.client.host if request.client else None)
+            response = await call_next(request)
+            response.headers["X-RateLimit-Limit"] = str(result.limit)
+            response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+            response.headers["X-RateLimit-Reset"] = str(result.reset_at)
+            return response
+
+    async def add_security_headers(request: Request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS:
+            response.headers[name] = value
+        return response
+
+    async def add_cache_headers(request: Request, call_next):
+        response = await call_next(request)
+        response.headers["Cache-Control"] = cache_control_for(request.url.path, request.method, True)
+        response.headers["Vary"] = "Accept, Accept-Encoding"
+        return response
+
+    async def errors_handling(request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception:
+            return JSONResponse(status_code=500, content={"error": "ServerError"})
+
+    app.add_middleware(DebugRequestMiddleware)
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(RateLimitMiddleware)
+    app.middleware("http")(add_security_headers)
+    app.middleware("http")(add_cache_headers)
+    app.middleware("http")(errors_handling)
+
+
+def build_app(stack: str, chunks: int, chunk_delay: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    @app.get("/api/v1/stream")
+    async def stream():
+        async def body():
+            for i in range(chunks):
+                if i:
+                    await asyncio.sleep(chunk_delay)
+                yield json.dumps({"chunk": i}).encode() + b"\n"
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+
+    if stack == "legacy":
+        add_legacy_stack(app)
+    elif stack == "pipeline":
+        app.add_middleware(
+            RequestPipelineMiddleware, limiter=make_limiter(), rate_limit=True, environment="production"
+        )
+    return app
+
+
+async def call(app, path: str) -> tuple:
+    """Run one GET through the ASGI app; returns (time to first body byte, total time)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    done = asyncio.Event()
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    started = time.perf_counter()
+    first_byte = None
+
+    async def send(message):
+        nonlocal first_byte
+        if message["type"] == "http.response.body":
+            if first_byte is None and message.get("body"):
+                first_byte = time.perf_counter() - started
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(scope, receive, send)
+    done.set()
+    return first_byte, time.perf_counter() - started
+
+
+async def measure_throughput(app, requests: int, concurrency: int) -> float:
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await call(app, "/api/v1/ping")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def measure_streaming(app, samples: int) -> dict:
+    results = [await call(app, "/api/v1/stream") for _ in range(samples)]
+    ttfb = sorted(first for first, _ in results)
+    return {
+        "ttfb_ms_median": round(statistics.median(ttfb) * 1000, 2),
+        "ttfb_ms_p95": round(ttfb[int(len(ttfb) * 0.95) - 1] * 1000, 2),
+        "total_ms_median": round(statistics.median(total for _, total in results) * 1000, 2),
+    }
+
+
+async def run_benchmark(args) -> dict:
+    report = {}
+    for stack in args.stacks:
+        app = build_app(stack, args.chunks, args.chunk_delay)
+        # Warm up (route compilation, middleware stack build)
+        await measure_throughput(app, 200, args.concurrency)
+        report[stack] = {
+            "requests_per_second": round(await measure_throughput(app, args.requests, args.concurrency), 1),
+            **await measure_streaming(app, args.stream_samples),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process benchmark of the HTTP middleware stack")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests for the throughput test")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent in-flight requests")
+    parser.add_argument("--stream-samples", type=int, default=20, help="Streaming requests to time")
+    parser.add_argument("--chunks", type=int, default=5, help="Chunks per streamed response")
+    parser.add_argument("--chunk-delay", type=float, default=0.05, help="Delay before each chunk after the first")
+    parser.add_argument("--stacks", nargs="+", choices=STACKS, default=list(STACKS), help="Stacks to compare")
+    parser.add_argument("--with-logging", action="store_true", help="Keep request logging enabled")
+
+    args = parser.parse_args()
+    if not args.with_logging:
+        # Measure middleware overhead, not log file I/O
+        logging.disable(logging.INFO)
+
+    report = asyncio.run(run_benchmark(args))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+"""
+Synthetic Data Generator
+
+Fills a disposable database with a deterministic sports and contacts dataset
+for load tests (see api_load_test.py):
+- Leagues with divisions, teams, stadiums and a season of games each
+- Broadcaster brands holding rights to leagues, teams and games
+- A synthetic user owning contacts, most of them employed at one of the brands
+- LinkedIn "Connections" CSV exports whose companies overlap the brands
+
+The same --seed and --scale always produce the same rows, ids included.
+Every seeded name starts with "Synthetic", and the contacts belong to
+synthetic-<seed>@example.com, so --reset can remove exactly what was seeded.
+
+Start a scratch Postgres (e.g. docker run --rm -p 5433:5432
+-e POSTGRES_PASSWORD=postgres postgres:15), point DATABASE_URL at a database
+whose name contains "bench", "load" or "test", and run alembic upgrade head
+before seeding.
+"""
+
+import asyncio
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, fields
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import make_url
+
+from src.models.models import User
+from src.models.sports_models import (
+    Brand, BroadcastRights, Contact, ContactBrandAssociation, DivisionConference,
+    Game, League, Stadium, Team
+)
+from src.services.sports.display_views import rebuild_displays
+from src.utils.config import get_settings
+from src.utils.database import AsyncSessionLocal
+
+settings = get_settings()
+
+# Database names --reset and seeding are allowed to write to
+DISPOSABLE_MARKERS = ("bench", "load", "test", "synthetic")
+
+SPORTS = ("Football", "Basketball", "Baseball", "Hockey", "Soccer")
+CITIES = (
+    "Austin", "Boston", "Chicago", "Denver", "Houston", "Miami", "Oakland",
+    "Phoenix", "Portland", "Seattle", "Toronto", "Vancouver",
+)
+MASCOTS = (
+    "Bears", "Comets", "Falcons", "Hawks", "Knights", "Lions", "Miners",
+    "Pilots", "Rangers", "Storm", "Tigers", "Wolves",
+)
+INDUSTRIES = ("Media", "Broadcasting", "Streaming", "Apparel", "Beverages", "Telecom")
+TERRITORIES = ("USA", "Canada", "UK", "Germany", "Brazil", "Japan")
+FIRST_NAMES = (
+    "Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery",
+    "Quinn", "Devon", "Sam", "Robin", "Drew", "Kai", "Rowan", "Skyler",
+)
+LAST_NAMES = (
+    "Smith", "Garcia", "Chen", "Okafor", "Novak", "Patel", "Silva", "Kim",
+    "Nguyen", "Rossi", "Müller", "Haddad", "Larsen", "Moreau", "Ito", "Walsh",
+)
+POSITIONS = (
+    "Head of Partnerships", "Media Buyer", "VP Marketing", "Account Executive",
+    "Director of Sponsorship", "Producer", "Rights Manager",
+)
+# Companies that match no brand, so imports also exercise the unmatched path
+OTHER_COMPANIES = ("Acme Consulting", "Northwind Traders", "Globex", "Initech", "Umbrella Group")
+
+LINKEDIN_HEADER = ("First Name", "Last Name", "URL", "Email Address", "Company", "Position", "Connected On")
+LINKEDIN_NOTES = (
+    "Notes:",
+    '"When exporting your connection data, you may notice that some of the email addresses are missing."',
+    "",
+)
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Row counts for --scale 1; scaled() multiplies the top-level counts."""
+    leagues: int = 8
+    divisions_per_league: int = 2
+    teams_per_league: int = 16
+    games_per_team: int = 40
+    brands: int = 400
+    rights_per_league: int = 30
+    contacts: int = 5000
+    brand_contact_ratio: float = 0.8  # Share of contacts working at a brand
+
+    # Per-league counts stay fixed so leagues look alike at every scale
+    SCALED = ("leagues", "brands", "contacts")
+
+    def scaled(self, factor: float) -> "Scale":
+        values = {field.name: getattr(self, field.name) for field in fields(self)}
+        for name in self.SCALED:
+            values[name] = max(1, round(values[name] * factor))
+        return Scale(**values)
+
+
+class SyntheticDataset:
+    """Rows for every seeded table, generated from one seeded random stream."""
+
+    def __init__(self, scale: Scale, seed: int = 42):
+        self.scale = scale
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tables: Dict[Any, List[Dict[str, Any]]] = {}
+        self._generate()
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    @property
+    def user(self) -> Dict[str, Any]:
+        return self.tables[User.__table__][0]
+
+    def rows(self, model: Any) -> List[Dict[str, Any]]:
+        return self.tables[model.__table__]
+
+    def _add(self, model: Any, row: Dict[str, Any]) -> Dict[str, Any]:
+        self.tables.setdefault(model.__table__, []).append(row)
+        return row
+
+    def _generate(self) -> None:
+        # Insertion order is foreign key order
+        scale, rng = self.scale, self.rng
+        self._add(User, {
+            "id": self._uuid(),
+            "email": f"synthetic-{self.seed}@example.com",
+            "hashed_password": "!",  # Not a valid hash, so nobody can sign in as it
+            "is_active": True,
+            "is_admin": True,
+        })
+
+        for league_number in range(1, scale.leagues + 1):
+            league = self._add(League, {
+                "id": self._uuid(),
+                "name": f"Synthetic League {league_number}",
+                "nickname": f"SL{league_number}",
+                "sport": SPORTS[league_number % len(SPORTS)],
+                "country": rng.choice(TERRITORIES),
+            })
+            divisions = [
+                self._add(DivisionConference, {
+                    "id": self._uuid(),
+                    "league_id": league["id"],
+                    "name": f"Synthetic League {league_number} Division {number}",
+                    "type": "Division",
+                })
+                for number in range(1, scale.divisions_per_league + 1)
+            ]
+            teams = []
+            for team_number in range(scale.teams_per_league):
+                city = CITIES[(league_number + team_number) % len(CITIES)]
+                stadium = self._add(Stadium, {
+                    "id": self._uuid(),
+                    "name": f"Synthetic {city} Arena {league_number}-{team_number}",
+                    "city": city,
+                    "country": league["country"],
+                    "capacity": rng.randrange(10_000, 80_000, 500),
+                })
+                teams.append(self._add(Team, {
+                    "id": self._uuid(),
+                    "league_id": league["id"],
+                    "division_conference_id": divisions[team_number % len(divisions)]["id"],
+                    "stadium_id": stadium["id"],
+                    "name": f"Synthetic {city} {rng.choice(MASCOTS)} {league_number}-{team_number}",
+                    "city": city,
+                    "country": league["country"],
+                    "founded_year": rng.randint(1880, 2020),
+                }))
+            self._generate_games(league, teams)
+
+        brands = [
+            self._add(Brand, {
+                "id": self._uuid(),
+                "name": f"Synthetic {rng.choice(CITIES)} {rng.choice(INDUSTRIES)} {number}",
+                "industry": rng.choice(INDUSTRIES),
+                "company_type": "Broadcaster" if number % 3 == 0 else None,
+                "country": rng.choice(TERRITORIES),
+            })
+            for number in range(1, scale.brands + 1)
+        ]
+        self._generate_rights(brands)
+        self._generate_contacts(brands)
+
+    def _generate_games(self, league: Dict[str, Any], teams: List[Dict[str, Any]]) -> None:
+        # Each team hosts half its games, against opponents from its own league
+        season_start = date(2025, 9, 1)
+        for home in teams:
+            for number in range(self.scale.games_per_team // 2):
+                away = self.rng.choice([team for team in teams if team is not home])
+                status = self.rng.choice(("Final", "Final", "Scheduled"))
+                self._add(Game, {
+                    "id": self._uuid(),
+                    "league_id": league["id"],
+                    "home_team_id": home["id"],
+                    "away_team_id": away["id"],
+                    "stadium_id": home["stadium_id"],
+                    "date": season_start + timedelta(days=self.rng.randrange(240)),
+                    "status": status,
+                    "home_score": self.rng.randint(0, 120) if status == "Final" else None,
+                    "away_score": self.rng.randint(0, 120) if status == "Final" else None,
+                    "season_year": 2025,
+                    "season_type": "Regular Season",
+                })
+
+    def _generate_rights(self, brands: List[Dict[str, Any]]) -> None:
+        broadcasters = [brand for brand in brands if brand["company_type"] == "Broadcaster"] or brands
+        subjects = {
+            "League": self.rows(League),
+            "Team": self.rows(Team),
+            "Game": self.rows(Game),
+        }
+        for _ in range(self.scale.rights_per_league * self.scale.leagues):
+            entity_type = self.rng.choice(("League", "Team", "Team", "Game"))
+            start = date(2020 + self.rng.randrange(6), 1, 1)
+            self._add(BroadcastRights, {
+                "id": self._uuid(),
+                "entity_type": entity_type,
+                "entity_id": self.rng.choice(subjects[entity_type])["id"],
+                "broadcast_company_id": self.rng.choice(broadcasters)["id"],
+                "territory": self.rng.choice(TERRITORIES),
+                "start_date": start,
+                "end_date": start + timedelta(days=365 * self.rng.randint(1, 8)),
+                "is_exclusive": self.rng.random() < 0.3,
+            })
+
+    def _person(self, number: int, brands: List[Dict[str, Any]]) -> Dict[str, Any]:
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        brand = self.rng.choice(brands) if self.rng.random() < self.scale.brand_contact_ratio else None
+        return {
+            "first_name": first,
+            "last_name": last,
+            "email": f"{first}.{last}.{number}@example.com".lower(),
+            "linkedin_url": f"https://www.linkedin.com/in/synthetic-{number}",
+            "company": brand["name"] if brand else self.rng.choice(OTHER_COMPANIES),
+            "position": self.rng.choice(POSITIONS),
+            "connected_on": date(2015, 1, 1) + timedelta(days=self.rng.randrange(3650)),
+            "brand": brand,
+        }
+
+    def _generate_contacts(self, brands: List[Dict[str, Any]]) -> None:
+        for number in range(self.scale.contacts):
+            person = self._person(number, brands)
+            brand = person.pop("brand")
+            contact = self._add(Contact, {
+                "id": self._uuid(),
+                "user_id": self.user["id"],
+                "import_source_tag": "synthetic",
+                **person,
+            })
+            if brand:
+                self._add(ContactBrandAssociation, {
+                    "id": self._uuid(),
+                    "contact_id": contact["id"],
+                    "brand_id": brand["id"],
+                    "confidence_score": 1.0,
+                })
+
+    def linkedin_csv(self, rows: int, batch: int = 0) -> str:
+        """A LinkedIn Connections export of new people; each batch is a different set."""
+        # Separate stream so exports never shift the seeded rows
+        rng = random.Random(f"{self.seed}-linkedin-{batch}")
+        brands = self.rows(Brand)
+        buffer = io.StringIO()
+        buffer.write("\n".join(LINKEDIN_NOTES) + "\n")
+        writer = csv.writer(buffer)
+        writer.writerow(LINKEDIN_HEADER)
+        for number in range(rows):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            company = rng.choice(brands)["name"] if rng.random() < self.scale.brand_contact_ratio else rng.choice(OTHER_COMPANIES)
+            connected_on = date(2015, 1, 1) + timedelta(days=rng.randrange(3650))
+            writer.writerow((
+                first,
+                last,
+                f"https://www.linkedin.com/in/synthetic-import-{batch}-{number}",
+                f"{first}.{last}.import{batch}.{number}@example.com".lower(),
+                company,
+                rng.choice(POSITIONS),
+                connected_on.strftime("%d %b %Y"),
+            ))
+        return buffer.getvalue()
+
+    def counts(self) -> Dict[str, int]:
+        return {table.name: len(rows) for table, rows in self.tables.items()}
+
+
+def ensure_disposable(database_url: str = settings.DATABASE_URL) -> str:
+    """Refuse to write to a database that doesn't look like a scratch one."""
+    name = make_url(database_url).database or ""
+    if not any(marker in name.lower() for marker in DISPOSABLE_MARKERS):
+        raise SystemExit(
+            f"Refusing to use database '{name}': its name must contain one of "
+            f"{', '.join(DISPOSABLE_MARKERS)} (or pass --allow-any-database)"
+        )
+    return name
+
+
+async def reset(dataset: SyntheticDataset) -> None:
+    """Delete what an earlier run with the same seed seeded, plus the user's imported contacts."""
+    synthetic = "Synthetic %"
+    user_ids = select(User.id).where(User.email == dataset.user["email"])
+    contact_ids = select(Contact.id).where(Contact.user_id.in_(user_ids))
+    league_ids = select(League.id).where(League.name.like(synthetic))
+    async with AsyncSessionLocal() as session:
+        for stmt in (
+            delete(ContactBrandAssociation).where(ContactBrandAssociation.contact_id.in_(contact_ids)),
+            delete(Contact).where(Contact.user_id.in_(user_ids)),
+            delete(User).where(User.email == dataset.user["email"]),
+            delete(BroadcastRights).where(
+                BroadcastRights.broadcast_company_id.in_(select(Brand.id).where(Brand.name.like(synthetic)))
+            ),
+            delete(Game).where(Game.league_id.in_(league_ids)),
+            delete(Team).where(Team.league_id.in_(league_ids)),
+            delete(Stadium).where(Stadium.name.like(synthetic)),
+            delete(DivisionConference).where(DivisionConference.league_id.in_(league_ids)),
+            delete(League).where(League.name.like(synthetic)),
+            delete(Brand).where(Brand.name.like(synthetic)),
+        ):
+            await session.execute(stmt)
+        await session.commit()
+
+
+async def load(dataset: SyntheticDataset, chunk_size: int = 5000) -> None:
+    """Insert the dataset with chunked Core inserts and rebuild the display tables."""
+    async with AsyncSessionLocal() as session:
+        for table, rows in dataset.tables.items():
+            for start in range(0, len(rows), chunk_size):
+                await session.execute(insert(table), rows[start:start + chunk_size])
+        # Core inserts skip the display table hooks
+        await rebuild_displays(session)
+        await session.commit()
+
+
+async def main_async(args) -> dict:
+    dataset = SyntheticDataset(Scale().scaled(args.scale), seed=args.seed)
+    if args.reset or args.reset_only:
+        await reset(dataset)
+    if args.reset_only:
+        return {"reset": True}
+
+    started = time.perf_counter()
+    await load(dataset, args.chunk_size)
+    return {
+        "seed": args.seed,
+        "scale": args.scale,
+        "user_id": str(dataset.user["id"]),
+        "rows": dataset.counts(),
+        "elapsed_seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a disposable database with deterministic sports and contacts data")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for leagues, brands and contacts")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed gives the same rows")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per INSERT")
+    parser.add_argument("--reset", action="store_true", help="Delete an earlier run's rows before seeding")
+    parser.add_argument("--reset-only", action="store_true", help="Delete an earlier run's rows and stop")
+    parser.add_argument("--linkedin-csv", metavar="PATH", help="Also write a LinkedIn export of new people to PATH")
+    parser.add_argument("--linkedin-rows", type=int, default=500, help="Rows in the --linkedin-csv export")
+    parser.add_argument("--allow-any-database", action="store_true", help="Skip the scratch database name check")
+
+    args = parser.parse_args()
+    if not args.allow_any_database:
+        ensure_disposable()
+    logging.disable(logging.INFO)
+
+    report = asyncio.run(main_async(args))
+    if args.linkedin_csv:
+        dataset = SyntheticDataset(Scale().scaled(args.scale), seed=args.seed)
+        with open(args.linkedin_csv, "w", newline="", encoding="utf-8") as f:
+            f.write(dataset.linkedin_csv(args.linkedin_rows))
+        report["linkedin_csv"] = args.linkedin_csv
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,36 @@
 import abc
 import re
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Any
 from src.services.anthropic_service import AnthropicService
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Static instructions for NLQ -> SQL. Kept identical across requests so the
+# provider can serve them from the prompt cache.
+SQL_GENERATION_RULES = """You are an expert SQL developer specializing in sports broadcasting databases. Convert the natural language query in the user message to a PostgreSQL SQL query, using the database schema provided below.
+
+Rules:
+1. Only generate a SELECT query - other operations are not allowed
+2. Use proper SQL syntax for PostgreSQL
+3. Return ONLY the final SQL query with no other text or explanation
+4. Do not use DROP, DELETE, TRUNCATE, ALTER, CREATE, INSERT, UPDATE, GRANT, or REVOKE commands
+5. Limit results to 100 rows unless otherwise specified
+6. For sports data queries:
+   - Always include explicit JOIN conditions with proper relationship handling
+   - Use LEFT JOINS when appropriate to prevent data exclusion
+   - Handle NULL values properly with COALESCE or IS NULL checks
+   - For broadcast rights, check for the right entity_type and division_conference_id
+   - Use CASE statements for conditional column display when needed
+7. When the user's query includes a specific string value intended for filtering a column (e.g., a name, a type, a status like 'In-House Production'), use that exact string value from the user's query in the SQL comparison (e.g., in `LOWER(column) = LOWER('User Provided Value')`). Preserve punctuation like hyphens from the user's value.
+
+IMPORTANT PostgreSQL Restrictions:
+1. When using SELECT DISTINCT, all ORDER BY columns must appear in the SELECT list
+2. For STRING_AGG with ORDER BY, ensure the ordering column is included in select list if using DISTINCT
+3. In CTEs with UNION, each SELECT must have the same column count and compatible data types
+4. All GROUP BY expressions must appear in the SELECT list, or be used in aggregate functions
+5. Window functions cannot be used with DISTINCT unless the DISTINCT is in a subquery"""
+
 class AIQueryProcessor(abc.ABC):
     """
     Abstract interface for AI-powered query processing tasks.
@@ -44,45 +69,54 @@ class AIQueryProcessor(abc.ABC):
         """
         pass
 
+    def get_token_usage(self) -> List[Dict[str, Any]]:
+        """
+        Returns token usage recorded for the calls made by this processor.
+
+        Each entry has a "stage" plus input, cached and output token counts.
+        Processors that don't track usage return an empty list.
+        """
+        return []
+
 class AnthropicAIProcessor(AIQueryProcessor):
     """
     Concrete implementation of AIQueryProcessor using the Anthropic (Claude) service.
+
+    The role description, rules and schema are sent as system blocks marked for
+    prompt caching, so repeated NLQ requests only pay full price for the short
+    per-query user message.
     """
     def __init__(self, anthropic_service: AnthropicService):
         self.anthropic_service = anthropic_service
+        self.token_usage: List[Dict[str, Any]] = []
+
+    def _record_usage(self, stage: str, usage: Dict[str, int]) -> None:
+        self.token_usage.append({"stage": stage, **usage})
+
+    def get_token_usage(self) -> List[Dict[str, Any]]:
+        return self.token_usage
 
     async def generate_sql_from_text(
         self, natural_language_query: str, schema_info: str, specialized_guidance: str
     ) -> str:
         logger.info(f"[AI_PROCESSOR_GENERATE_SQL] Received natural_language_query: '{natural_language_query}'")
-        prompt = f"""You are an expert SQL developer specializing in sports broadcasting databases. Convert the following natural language query to a PostgreSQL SQL query.
-
-Database Schema:
-{schema_info}
-
-Natural Language Query:
+        # Stable content first: it is cached up to each cache_control breakpoint
+        system_blocks = [
+            self.anthropic_service.cached_text_block(SQL_GENERATION_RULES),
+            self.anthropic_service.cached_text_block(f"Database Schema:\n{schema_info}"),
+        ]
+        prompt = f"""Natural Language Query:
 {natural_language_query}
 
 {specialized_guidance}
 
-Rules:
-1. Only generate a SELECT query - other operations are not allowed
-2. Use proper SQL syntax for PostgreSQL
-3. Return ONLY the final SQL query with no other text or explanation
-4. Do not use DROP, DELETE, TRUNCATE, ALTER, CREATE, INSERT, UPDATE, GRANT, or REVOKE commands
-5. Limit results to 100 rows unless otherwise specified
-6. For sports data queries:
-   - Always include explicit JOIN conditions with proper relationship handling
-   - Use LEFT JOINS when appropriate to prevent data exclusion
-   - Handle NULL values properly with COALESCE or IS NULL checks
-   - For broadcast rights, check for the right entity_type and division_conference_id
-   - Use CASE statements for conditional column display when needed
-7. When the user\'s query includes a specific string value intended for filtering a column (e.g., a name, a type, a status like \'In-House Production\'), use that exact string value from the user\'s query in the SQL comparison (e.g., in `LOWER(column) = LOWER(\'User Provided Value\')`). Preserve punctuation like hyphens from the user\'s value.
-
 SQL Query:"""
 
         try:
-            sql_query = await self.anthropic_service.generate_code(prompt, temperature=0.2)
+            sql_query, usage = await self.anthropic_service.generate_code_with_usage(
+                prompt, system_prompt=system_blocks, temperature=0.2
+            )
+            self._record_usage("generate_sql", usage)
             
             # Clean up the response - extract just the SQL if Claude wrapped it in markdown
             sql_query = re.sub(r'^```sql\s*', '', sql_query, flags=re.MULTILINE)
@@ -131,7 +165,8 @@ Response format:
 [Corrected SQL if INVALID]"""
 
         try:
-            validation_result = await self.anthropic_service.generate_code(prompt, temperature=0.1)
+            validation_result, usage = await self.anthropic_service.generate_code_with_usage(prompt, temperature=0.1)
+            self._record_usage("validate_sql", usage)
             
             is_valid = validation_result.startswith("VALID")
             
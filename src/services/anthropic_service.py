@@ -1,10 +1,18 @@
-from typing import AsyncGenerator, Dict, Any, Optional, List, Union
+from typing import AsyncGenerator, Dict, Any, Optional, List, Union, Tuple
 import logging
 import httpx
 import anthropic
 from anthropic.types import MessageParam, ContentBlockDeltaEvent
 from fastapi import HTTPException
 from src.core.config import settings
+from src.services.llm_router import (
+    AnthropicProvider,
+    LLMRequest,
+    LLMRouter,
+    LLMRouterError,
+    ModelRoute,
+    get_llm_router,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +35,7 @@ class AnthropicService:
         model: Optional[str] = None,
         default_max_tokens: int = DEFAULT_MAX_TOKENS,
         default_temperature: float = DEFAULT_TEMPERATURE,
+        router: Optional[LLMRouter] = None,
         # request_timeout: int = DEFAULT_REQUEST_TIMEOUT
     ):
         """
@@ -37,6 +46,7 @@ class AnthropicService:
             model: Claude model to use (defaults to DEFAULT_MODEL)
             default_max_tokens: Default max_tokens parameter for completions
             default_temperature: Default temperature parameter for completions
+            router: LLM router to send requests through (defaults to the shared router)
         """
         self.api_key = api_key or settings.ANTHROPIC_API_KEY
         self.model = model or self.DEFAULT_MODEL
@@ -45,22 +55,26 @@ class AnthropicService:
         self.request_timeout = settings.ANTHROPIC_REQUEST_TIMEOUT # Get from settings
         
         # Initialize clients
-        self._init_clients()
+        self._init_clients(router, api_key)
         
-    def _init_clients(self) -> None:
-        """Initialize API clients"""
+    def _init_clients(self, router: Optional[LLMRouter] = None, api_key: Optional[str] = None) -> None:
+        """Initialize the LLM router used for all Claude requests"""
         try:
-            # Pass timeout to the client constructor if possible, or use it per-request.
-            # For anthropic.Client, timeout is typically passed per-request.
-            self.client = anthropic.Client(
-                api_key=self.api_key,
-                # It's common for clients to also accept a default timeout here
-                # timeout=httpx.Timeout(self.request_timeout, connect=5.0)
-            )
+            if router is None and api_key:
+                # A service created with its own key gets its own router so
+                # its requests use (and are limited separately for) that key
+                router = LLMRouter()
+                router.register_provider("anthropic", AnthropicProvider(anthropic.AsyncAnthropic(api_key=self.api_key)))
+            self.router = router or get_llm_router()
+            if not self.router.has_provider("anthropic"):
+                raise AnthropicServiceError("Anthropic provider is not configured")
+            self.route = ModelRoute("anthropic", self.model)
             self.async_client = httpx.AsyncClient(
                 # timeout=httpx.Timeout(self.request_timeout, connect=5.0) # For async client if used directly
             )
-            logger.info(f"Initialized Anthropic client with model: {self.model} and request_timeout: {self.request_timeout}s")
+            logger.info(f"Initialized Anthropic service with model: {self.model} and request_timeout: {self.request_timeout}s")
+        except AnthropicServiceError:
+            raise
         except Exception as e:
             logger.error(f"Failed to initialize Anthropic client: {str(e)}")
             raise AnthropicServiceError(f"Client initialization failed: {str(e)}")
@@ -68,35 +82,32 @@ class AnthropicService:
     def _create_message_params(
         self, 
         prompt: str, 
-        system_prompt: Optional[str] = None,
+        system_prompt: Optional[Union[str, List[Dict[str, Any]]]] = None,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None
-    ) -> Dict[str, Any]:
+    ) -> LLMRequest:
         """
-        Create parameters for message creation
+        Create the router request for a single-turn prompt
         
         Args:
             prompt: The user prompt
-            system_prompt: Optional system prompt
+            system_prompt: Optional system prompt, either a string or a list of
+                text content blocks (used for prompt caching)
             max_tokens: Maximum tokens to generate (overrides default)
             temperature: Temperature for generation (overrides default)
             
         Returns:
-            Dictionary of parameters for message creation
+            LLMRequest for the router
         """
         messages: List[MessageParam] = [{"role": "user", "content": prompt}]
         
-        params = {
-            "model": self.model,
-            "max_tokens": max_tokens or self.default_max_tokens,
-            "temperature": temperature or self.default_temperature,
-            "messages": messages
-        }
-        
-        if system_prompt:
-            params["system"] = system_prompt
-            
-        return params
+        return LLMRequest(
+            messages=messages,
+            system=system_prompt or None,
+            max_tokens=max_tokens or self.default_max_tokens,
+            temperature=temperature or self.default_temperature,
+            timeout=self.request_timeout,
+        )
     
     def _format_code_review_prompt(self, code: str, context: str = "") -> str:
         """
@@ -128,17 +139,16 @@ Here's the code to review:
         Process a streaming response from Claude
         
         Args:
-            stream_generator: The stream generator from Claude API
+            stream_generator: Text chunk iterator from the LLM router
             
         Yields:
             Text chunks from the response
         """
         buffer = ""
         try:
-            async for chunk in stream_generator:
-                if chunk.type == "content_block_delta" and chunk.delta.text:
-                    buffer += chunk.delta.text
-                    yield chunk.delta.text
+            async for text in stream_generator:
+                buffer += text
+                yield text
         except Exception as e:
             logger.error(f"Streaming error: {str(e)}")
             if buffer:
@@ -170,16 +180,13 @@ Here's the code to review:
         try:
             prompt = self._format_code_review_prompt(code, context)
             
-            params = self._create_message_params(
+            request = self._create_message_params(
                 prompt=prompt,
                 max_tokens=max_tokens,
                 temperature=temperature
             )
-            params["stream"] = True
-            
-            message = await self.client.messages.create(**params, timeout=self.request_timeout)
             
-            async for text_chunk in self._handle_stream(message):
+            async for text_chunk in self._handle_stream(self.router.stream(self.route, request)):
                 yield text_chunk
                 
         except AnthropicServiceError as e:
@@ -189,6 +196,24 @@ Here's the code to review:
             logger.error(f"Unexpected error in code review: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Unexpected error during code review")
 
+    @staticmethod
+    def _generation_error(e: Exception) -> HTTPException:
+        """Map a failed code generation request to the HTTP error reported to the client."""
+        if isinstance(e, LLMRouterError):
+            logger.error(f"LLM router rejected request: {str(e)}")
+            return HTTPException(status_code=503, detail="Claude is at capacity or unavailable, please try again later")
+        if isinstance(e, anthropic.RateLimitError):
+            logger.error(f"Rate limit error: {str(e)}")
+            return HTTPException(status_code=429, detail="Rate limit exceeded, please try again later")
+        if isinstance(e, anthropic.APIConnectionError):
+            logger.error(f"API connection error: {str(e)}")
+            return HTTPException(status_code=503, detail="Connection to Anthropic API failed")
+        if isinstance(e, anthropic.APIError):
+            logger.error(f"Anthropic API error: {str(e)}")
+            return HTTPException(status_code=502, detail=f"Anthropic API error: {str(e)}")
+        logger.error(f"Unexpected error in code generation: {str(e)}")
+        return HTTPException(status_code=500, detail="Unexpected error during code generation")
+
     async def generate_code(
         self, 
         prompt: str, 
@@ -212,34 +237,84 @@ Here's the code to review:
             HTTPException: On API or processing errors
         """
         try:
-            params = self._create_message_params(
+            request = self._create_message_params(
                 prompt=prompt,
                 system_prompt=system_prompt,
                 max_tokens=max_tokens,
                 temperature=temperature
             )
             
-            message = self.client.messages.create(**params, timeout=self.request_timeout)
+            completion = await self.router.complete(self.route, request)
             
             # Extract and return the text content
-            if message.content and len(message.content) > 0:
-                return message.content[0].text
+            if completion.text:
+                return completion.text
             else:
                 logger.warning("Empty response from Claude API")
                 return ""
                 
-        except anthropic.RateLimitError as e:
-            logger.error(f"Rate limit error: {str(e)}")
-            raise HTTPException(status_code=429, detail="Rate limit exceeded, please try again later")
-        except anthropic.APIConnectionError as e:
-            logger.error(f"API connection error: {str(e)}")
-            raise HTTPException(status_code=503, detail="Connection to Anthropic API failed")
-        except anthropic.APIError as e:
-            logger.error(f"Anthropic API error: {str(e)}")
-            raise HTTPException(status_code=502, detail=f"Anthropic API error: {str(e)}")
         except Exception as e:
-            logger.error(f"Unexpected error in code generation: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error during code generation")
+            raise self._generation_error(e)
+    
+    @staticmethod
+    def cached_text_block(text: str) -> Dict[str, Any]:
+        """
+        Build a system content block marked for Anthropic prompt caching.
+        
+        Everything up to and including a block with cache_control is cached
+        by the API, so stable content must come before per-request content.
+        """
+        return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+    async def generate_code_with_usage(
+        self,
+        prompt: str,
+        system_prompt: Optional[Union[str, List[Dict[str, Any]]]] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Generate code with Claude (non-streaming) and report token usage
+        
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system prompt or list of system content blocks;
+                blocks built with cached_text_block() are served from the prompt cache
+            max_tokens: Maximum tokens to generate
+            temperature: Temperature for generation
+            
+        Returns:
+            Tuple of (generated text, usage dict with input_tokens,
+            cache_creation_input_tokens, cache_read_input_tokens and output_tokens)
+            
+        Raises:
+            HTTPException: On API or processing errors
+        """
+        try:
+            request = self._create_message_params(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            
+            completion = await self.router.complete(self.route, request)
+            usage = completion.usage
+            logger.info(
+                f"Claude usage: input={usage['input_tokens']} "
+                f"cache_read={usage['cache_read_input_tokens']} "
+                f"cache_write={usage['cache_creation_input_tokens']} "
+                f"output={usage['output_tokens']}"
+            )
+            
+            if completion.text:
+                return completion.text, usage
+            else:
+                logger.warning("Empty response from Claude API")
+                return "", usage
+                
+        except Exception as e:
+            raise self._generation_error(e)
     
     async def close(self):
         """Close any open resources"""
@@ -1,6 +1,5 @@
 from typing import Dict, List, Optional, Any, AsyncGenerator
 from uuid import UUID
-import aiohttp
 import anthropic
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -14,6 +13,15 @@ from src.schemas.chat import ConversationUpdate
 from src.utils.config import get_settings
 from src.utils.database import get_db
 from src.config.logging_config import chat_logger
+from src.services.search_service import search_service
+from src.services.llm_router import LLMRequest, ModelRoute, get_llm_router, parse_route
+from src.services.structured_extraction import StructuredDataExtractor, partial_delimiter_length
+from src.services.data.row_store import RowStore
+from src.services.chat_context import (
+    AnthropicSummarizer,
+    ConversationContextBuilder,
+    TruncatingSummarizer,
+)
 
 settings = get_settings()
 
@@ -35,6 +43,9 @@ class ChatService:
         self.logger = chat_logger
         self.logger.info("ChatService initializing...")
 
+        # Shared-session, cached web search (session opened at app startup)
+        self.search_service = search_service
+
         # Initialize Anthropic client
         self.anthropic_client = None
         self.claude_models = {}
@@ -54,76 +65,46 @@ class ChatService:
             self.anthropic_client = None
             self.claude_models = {}
 
-        # Initialize OpenAI client
-        self.openai_client = None
+        # Replies are streamed through the shared LLM router, which owns the
+        # provider clients, concurrency limits, circuit breakers and hedging
+        self.router = get_llm_router()
+        self.hedge_route = parse_route(settings.LLM_HEDGE_MODEL)
+        self.hedge_after = settings.LLM_HEDGE_AFTER_SECONDS
+        fallback_route = parse_route(settings.LLM_FALLBACK_MODEL)
+        self.fallback_routes = [fallback_route] if fallback_route else []
+
         self.openai_models = {}
         self.default_openai_model_name = "gpt-3.5-turbo"  # A default placeholder
 
-        if settings.OPENAI_API_KEY:
-            try:
-                import openai
-                self.openai_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-                self.openai_models = {
-                    "chatgpt_3_5_turbo": "gpt-3.5-turbo",
-                    "chatgpt_4_turbo": "gpt-4-turbo-preview",
-                    "chatgpt_4o": "gpt-4o",
-                }
-                self.default_openai_model_name = self.openai_models["chatgpt_3_5_turbo"]
-                self.logger.info("OpenAI client initialized.")
-            except ImportError:
-                self.logger.warning("OpenAI library not found. ChatGPT features will be unavailable.")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize OpenAI client: {e}", exc_info=True)
-                # Reset to safe defaults
-                self.openai_client = None
-                self.openai_models = {}
+        if self.router.has_provider("openai"):
+            self.openai_models = {
+                "chatgpt_3_5_turbo": "gpt-3.5-turbo",
+                "chatgpt_4_turbo": "gpt-4-turbo-preview",
+                "chatgpt_4o": "gpt-4o",
+            }
+            self.default_openai_model_name = self.openai_models["chatgpt_3_5_turbo"]
+            self.logger.info("OpenAI provider available.")
         else:
-            self.logger.warning("OPENAI_API_KEY not set. ChatGPT features will be unavailable.")
+            self.logger.warning("OpenAI provider not configured. ChatGPT features will be unavailable.")
+
+        # Recent-window + rolling summary context for each turn
+        if self.router.has_provider("anthropic") and "claude_haiku_3" in self.claude_models:
+            summarizer = AnthropicSummarizer(self.router, self.claude_models["claude_haiku_3"])
+        else:
+            summarizer = TruncatingSummarizer()
+        self.context_builder = ConversationContextBuilder(
+            summarizer,
+            recent_limit=settings.CHAT_CONTEXT_RECENT_MESSAGES,
+            token_budget=settings.CHAT_CONTEXT_TOKEN_BUDGET,
+            summary_token_budget=settings.CHAT_SUMMARY_TOKEN_BUDGET,
+        )
 
         self.logger.info("ChatService initialization complete.")
 
     async def perform_search(self, query: str) -> str:
-        """Perform a single web search with basic error handling."""
+        """Perform a single web search through the shared, cached search service."""
         self.logger.info(f"Starting web search for query: {query}")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            try:
-                encoded_query = query.replace(' ', '+')
-                search_url = f"https://api.duckduckgo.com/?q={encoded_query}&format=json&no_redirect=1&no_html=1"
-                self.logger.debug(f"Search URL: {search_url}")
-                
-                async with session.get(search_url, headers=headers, timeout=10) as response:
-                    if response.status != 200:
-                        error_msg = f"Search failed with status {response.status}"
-                        self.logger.error(error_msg)
-                        return error_msg
-                    
-                    response_text = await response.text()
-                    if response_text.startswith('(') and response_text.endswith(')'):
-                        response_text = response_text[1:-1]
-                    
-                    data = json.loads(response_text)
-                    topics = data.get('RelatedTopics', [])
-                    
-                    if not topics:
-                        self.logger.warning("No search results found")
-                        return "No results found"
-                    
-                    results = "\nSearch Results (source URLs only):\n"
-                    for idx, topic in enumerate(topics[:10], 1):
-                        if 'FirstURL' in topic:
-                            results += f"{idx}. {topic['FirstURL']}\n"
-                    
-                    self.logger.info(f"Found {len(topics[:10])} search results")
-                    return results
-                    
-            except Exception as e:
-                error_msg = f"Search error: {str(e)}"
-                self.logger.error(error_msg, exc_info=True)
-                return error_msg
+        return await self.search_service.search_text(query)
 
     async def handle_search(self, query: str) -> AsyncGenerator[str, None]:
         """Handle a single search operation with retries and timeouts."""
@@ -291,10 +272,13 @@ class ChatService:
                 self.logger.error(f"Conversation with ID {conversation_id} not found after adding message.")
                 raise ValueError(f"Conversation {conversation_id} not found.")
 
-            # Then, load the messages
-            messages = await self.get_conversation_messages(db, conversation_id)
-            recent_messages = messages[-15:]
-            self.logger.info(f"get_chat_response: Fetched {len(recent_messages)} recent messages")
+            # Then, load only the recent window plus the rolling summary of older turns
+            context = await self.context_builder.build(db, conversation)
+            recent_messages = context.messages
+            self.logger.info(
+                f"get_chat_response: Context has {len(recent_messages)} recent messages, "
+                f"summary: {bool(context.summary)}, ~{context.token_count} tokens"
+            )
 
             llm_provider = "claude"
             actual_model_name = self.default_anthropic_model_name
@@ -313,8 +297,8 @@ class ChatService:
 
             if llm_provider == 'chatgpt':
                 self.logger.info("get_chat_response: Entering ChatGPT processing block.")
-                if not self.openai_client:
-                    self.logger.error("get_chat_response: OpenAI client is not available. Aborting.")
+                if not self.router.has_provider("openai"):
+                    self.logger.error("get_chat_response: OpenAI provider is not available. Aborting.")
                     yield "[ERROR] OpenAI client not configured or library not installed.\n"
                     yield "[STREAM_END]\n"
                     yield "__STREAM_COMPLETE__"
@@ -337,34 +321,28 @@ class ChatService:
                         "Ensure all required fields from this structure are present in your JSON output."
                     ])
                 
+                if context.summary:
+                    openai_system_prompt_parts.append(f"Summary of the earlier conversation:\n{context.summary}")
+
                 openai_system_prompt = "\n".join(openai_system_prompt_parts)
                 self.logger.info(f"get_chat_response: OpenAI System Prompt: {openai_system_prompt}")
-                
-                openai_messages = []
-                if openai_system_prompt:
-                    openai_messages.append({"role": "system", "content": openai_system_prompt})
-                for msg in recent_messages:
-                    if msg.role in ["user", "assistant"] and hasattr(msg, 'content'):
-                        openai_messages.append({"role": msg.role, "content": msg.content})
-                self.logger.info(f"get_chat_response: Prepared {len(openai_messages)} messages for OpenAI.")
+                self.logger.info(f"get_chat_response: Prepared {len(recent_messages)} messages for OpenAI.")
 
                 yield "[RESPONSE_START]\n"
-                full_openai_response = ""
+                openai_response_parts: List[str] = []
                 try:
-                    stream = await self.openai_client.chat.completions.create(
-                        model=actual_model_name,
-                        messages=openai_messages,
-                        stream=True,
-                        temperature=0.5,
+                    stream = self.router.stream(
+                        ModelRoute("openai", actual_model_name),
+                        LLMRequest(messages=recent_messages, system=openai_system_prompt, temperature=0.5),
+                        fallbacks=self.fallback_routes,
                     )
                     
-                    async for chunk in stream:
-                        content = chunk.choices[0].delta.content or ""
-                        if content:
-                            full_openai_response += content
-                            yield content
+                    async for content in stream:
+                        openai_response_parts.append(content)
+                        yield content
                     
-                    await self.add_message(db, conversation_id, "assistant", full_openai_response)
+                    await self.add_message(db, conversation_id, "assistant", "".join(openai_response_parts))
+                    self.context_builder.schedule_summary_refresh(conversation_id)
                     self.logger.info("ChatGPT response received and sent.")
 
                 except Exception as e:
@@ -396,85 +374,114 @@ class ChatService:
                     1. Add a line containing only '---DATA---'
                     2. Then provide data in this exact format: {json.dumps(structured_format)}
                     3. Ensure all required fields are present and properly formatted"""
+            if context.summary:
+                system_prompt += f"\n\nSummary of the earlier conversation:\n{context.summary}"
             self.logger.info(f"get_chat_response: System instructions (Claude): {system_prompt}")
             
-            anthropic_messages = []
-            for msg in recent_messages:
-                if msg.role in ["user", "assistant"]:
-                    anthropic_messages.append({"role": msg.role, "content": msg.content})
+            anthropic_messages = list(recent_messages)
             
             self.logger.info(f"get_chat_response: Sending request to Claude API with {len(anthropic_messages)} messages")
             if anthropic_messages: self.logger.info(f"get_chat_response: Last message (Claude): {anthropic_messages[-1]['content'][:100]}...")
             
             yield "[RESPONSE_START]\n"
             
-            message_stream = await self.anthropic_client.messages.create(
-                model=actual_model_name,
-                max_tokens=15000, 
-                system=system_prompt,
-                messages=anthropic_messages,
-                temperature=0.3,
-                stream=True
+            message_stream = self.router.stream(
+                ModelRoute("anthropic", actual_model_name),
+                LLMRequest(messages=anthropic_messages, system=system_prompt, max_tokens=15000, temperature=0.3),
+                hedge=self.hedge_route,
+                hedge_after=self.hedge_after,
+                fallbacks=self.fallback_routes,
             )
             
-            full_response = ""
+            # Collect output in a list (joined once at the end) and parse the
+            # ---DATA--- block incrementally so it is saved as soon as its JSON closes
+            response_parts: List[str] = []
+            extractor = StructuredDataExtractor()
+            structured_data_saved = False
             buffer = ""
-            async for chunk in message_stream:
-                if chunk.type == "content_block_delta" and chunk.delta.type == "text_delta":
-                    content = chunk.delta.text
-                    self.logger.debug(f"Received chunk from Claude: {len(content)} chars")
-                    buffer += content
-                    
-                    while '[SEARCH]' in buffer and '[/SEARCH]' in buffer:
-                        start = buffer.find('[SEARCH]')
-                        end = buffer.find('[/SEARCH]')
-                        if start > -1 and end > start:
-                            pre_search = buffer[:start]
-                            search_query = buffer[start + 8:end].strip()
-                            post_search = buffer[end + 9:]
-                            if pre_search: full_response += pre_search; yield pre_search
-                            self.logger.info(f"Starting search for: {search_query}")
-                            try:
-                                search_result = await self.perform_search(search_query)
-                                result_block = f"\n=== Sources ===\n{search_result}\n================\n"
-                                full_response += result_block; yield result_block
-                                await asyncio.sleep(0.5)
-                            except Exception as e:
-                                error_msg = f"\nSearch failed: {str(e)}\n"; full_response += error_msg; yield error_msg
-                            buffer = post_search
-                        else: break
-                    
-                    while '. ' in buffer:
-                        idx = buffer.find('. ') + 2
-                        sentence = buffer[:idx]; buffer = buffer[idx:]
-                        full_response += sentence; yield sentence
-                        await asyncio.sleep(0.1)
-                    
-                    if len(buffer) > 100:
-                        chunk_to_send = buffer; full_response += chunk_to_send; yield chunk_to_send; buffer = ""
-                        await asyncio.sleep(0.1)
+            # Searches run concurrently in the background; their source blocks are
+            # emitted as they complete instead of stalling the token stream
+            searches = self.search_service.batch()
+
+            def sources_block(search_result: str) -> str:
+                return f"\n=== Sources ===\n{search_result}\n================\n"
+
+            async def emit(text: str):
+                # Everything after the delimiter is parsed as JSON, so outstanding
+                # searches are finished and their sources emitted ahead of it
+                if not extractor.found_delimiter and extractor.delimiter in text:
+                    idx = text.find(extractor.delimiter)
+                    if idx:
+                        response_parts.append(text[:idx]); extractor.feed(text[:idx]); yield text[:idx]
+                        text = text[idx:]
+                    for _, search_result in searches.pop_completed() + await searches.finish():
+                        result_block = sources_block(search_result)
+                        response_parts.append(result_block); yield result_block
+                response_parts.append(text); extractor.feed(text); yield text
+
+            async for content in message_stream:
+                self.logger.debug(f"Received chunk from Claude: {len(content)} chars")
+                buffer += content
+                
+                while '[SEARCH]' in buffer and '[/SEARCH]' in buffer:
+                    start = buffer.find('[SEARCH]')
+                    end = buffer.find('[/SEARCH]')
+                    if start > -1 and end > start:
+                        pre_search = buffer[:start]
+                        search_query = buffer[start + 8:end].strip()
+                        post_search = buffer[end + 9:]
+                        if pre_search:
+                            async for piece in emit(pre_search): yield piece
+                        self.logger.info(f"Starting search for: {search_query}")
+                        searches.start(search_query)
+                        buffer = post_search
+                    else: break
+
+                if not extractor.found_delimiter:
+                    for _, search_result in searches.pop_completed():
+                        result_block = sources_block(search_result)
+                        response_parts.append(result_block); yield result_block
+                
+                while '. ' in buffer:
+                    idx = buffer.find('. ') + 2
+                    sentence = buffer[:idx]; buffer = buffer[idx:]
+                    async for piece in emit(sentence): yield piece
+                    await asyncio.sleep(0.1)
+                
+                if len(buffer) > 100:
+                    # Hold back a possible split delimiter so sources never land inside it
+                    cut = len(buffer) - partial_delimiter_length(buffer)
+                    chunk_to_send = buffer[:cut]; buffer = buffer[cut:]
+                    async for piece in emit(chunk_to_send): yield piece
+                    await asyncio.sleep(0.1)
+
+                if extractor.complete and not structured_data_saved:
+                    await self.save_structured_data(db, conversation_id, extractor.data, structured_format)
+                    structured_data_saved = True
             
-            if buffer: full_response += buffer; yield buffer
+            if buffer:
+                async for piece in emit(buffer): yield piece
+            if searches.pending:
+                self.logger.info(f"get_chat_response: Waiting for {searches.pending} pending searches")
+            late_results = searches.pop_completed() + await searches.finish()
+            if extractor.found_delimiter:
+                # Searches started inside the data block; their sources would corrupt the JSON
+                if late_results:
+                    self.logger.warning(f"get_chat_response: Dropping {len(late_results)} search results started after the data delimiter")
+            else:
+                for _, search_result in late_results:
+                    result_block = sources_block(search_result)
+                    response_parts.append(result_block); yield result_block
             self.logger.info("get_chat_response: Claude stream complete, saving response")
-            await self.add_message(db, conversation_id, "assistant", full_response)
+            await self.add_message(db, conversation_id, "assistant", "".join(response_parts))
+            self.context_builder.schedule_summary_refresh(conversation_id)
             
-            if "---DATA---" in full_response:
+            if extractor.found_delimiter and not structured_data_saved:
                 self.logger.info("get_chat_response: Processing structured data")
                 try:
-                    _, data_part = full_response.split("---DATA---")
-                    data = json.loads(data_part.strip())
-                    
-                    structured_data = StructuredData(
-                        conversation_id=conversation_id,
-                        data_type="chat_extraction",
-                        schema_version="1.0",
-                        data=data,
-                        meta_data={"format": structured_format} if structured_format else {}
-                    )
-                    db.add(structured_data)
-                    await db.commit()
-                    self.logger.info("get_chat_response: Structured data saved")
-                    
+                    extractor.finish()
+                    await self.save_structured_data(db, conversation_id, extractor.data, structured_format)
+                    structured_data_saved = True
                 except Exception as e:
                     error_msg = f"\nError processing structured data: {str(e)}\n"
                     self.logger.error(f"get_chat_response: Structured data error: {str(e)}")
@@ -493,6 +500,29 @@ class ChatService:
             yield "[STREAM_END]\n"
             yield "__STREAM_COMPLETE__"
 
+    async def save_structured_data(
+        self,
+        db: AsyncSession,
+        conversation_id: UUID,
+        data: Any,
+        structured_format: Optional[Dict] = None
+    ) -> StructuredData:
+        """Persist structured data extracted from a chat response."""
+        structured_data = StructuredData(
+            conversation_id=conversation_id,
+            data_type="chat_extraction",
+            schema_version="1.0",
+            data=data,
+            meta_data={"format": structured_format} if structured_format else {}
+        )
+        db.add(structured_data)
+        await db.flush()
+        # Row-based payloads keep their rows in the row table
+        await RowStore(db).store_document(structured_data, data)
+        await db.commit()
+        self.logger.info("get_chat_response: Structured data saved")
+        return structured_data
+
     async def update_conversation(
         self,
         db: AsyncSession,
@@ -0,0 +1,275 @@
+"""
+Context window construction for chat requests.
+
+Only the most recent messages of a conversation are loaded (newest first via
+the (conversation_id, created_at) index); older turns are represented by a
+rolling summary stored on the Conversation row. Both the DB work and the
+prompt size per turn are therefore bounded regardless of thread length.
+"""
+import abc
+import asyncio
+import logging
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Conversation, Message
+from src.services.llm_router import LLMRequest, LLMRouter, ModelRoute
+from src.utils.database import get_db_session
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English text with Claude/GPT tokenizers
+_CHARS_PER_TOKEN = 4
+# Role markers and message framing cost a few tokens per message
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Cheap local token estimate; no API round trip."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, keep: str = "end") -> str:
+    """Trim text to roughly max_tokens, keeping either its start or its end."""
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[-max_chars:] if keep == "end" else text[:max_chars]
+
+
+@dataclass
+class ContextWindow:
+    """Messages and summary that make up the prompt context for one turn."""
+    messages: List[Dict[str, str]] = field(default_factory=list)
+    summary: Optional[str] = None
+    token_count: int = 0
+
+
+class ConversationSummarizer(abc.ABC):
+    """Folds older conversation turns into a bounded rolling summary."""
+
+    @abc.abstractmethod
+    async def summarize(
+        self, previous_summary: Optional[str], messages: List[Message], token_budget: int
+    ) -> str:
+        """
+        Return a new summary covering previous_summary plus messages.
+
+        Args:
+            previous_summary: The summary so far, if any.
+            messages: Messages (oldest first) leaving the recent window.
+            token_budget: Maximum size of the returned summary in tokens.
+        """
+        pass
+
+
+class TruncatingSummarizer(ConversationSummarizer):
+    """
+    Extractive fallback used when no LLM client is available.
+
+    Appends a clipped line per message and keeps the newest part of the
+    result within the token budget.
+    """
+
+    def __init__(self, max_chars_per_message: int = 300):
+        self.max_chars_per_message = max_chars_per_message
+
+    async def summarize(
+        self, previous_summary: Optional[str], messages: List[Message], token_budget: int
+    ) -> str:
+        lines = [previous_summary] if previous_summary else []
+        for msg in messages:
+            content = " ".join(msg.content.split())
+            if len(content) > self.max_chars_per_message:
+                content = content[:self.max_chars_per_message] + "..."
+            lines.append(f"{msg.role}: {content}")
+        return truncate_to_tokens("\n".join(lines), token_budget, keep="end")
+
+
+class AnthropicSummarizer(ConversationSummarizer):
+    """
+    Summarizes with a small Claude model, falling back to truncation on error.
+
+    Requests go through the LLM router, so summaries share the provider's
+    concurrency limits, queue deadlines and circuit breaker with chat replies.
+    """
+
+    def __init__(self, router: LLMRouter, model: str):
+        self.router = router
+        self.route = ModelRoute("anthropic", model)
+        self.fallback = TruncatingSummarizer()
+
+    async def summarize(
+        self, previous_summary: Optional[str], messages: List[Message], token_budget: int
+    ) -> str:
+        transcript = "\n\n".join(
+            f"{msg.role.upper()}: {truncate_to_tokens(msg.content, token_budget, keep='start')}"
+            for msg in messages
+        )
+        prompt = f"""Update the running summary of a research conversation about sports data.
+Keep facts, entities, numbers, decisions and open questions; drop pleasantries and search result listings.
+Respond with the updated summary only, at most {token_budget} tokens.
+
+Current summary:
+{previous_summary or "(none)"}
+
+New turns to fold in:
+{transcript}"""
+        try:
+            completion = await self.router.complete(self.route, LLMRequest(
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=token_budget,
+                temperature=0,
+            ))
+            summary = completion.text.strip()
+            if summary:
+                return truncate_to_tokens(summary, token_budget, keep="start")
+        except Exception as e:
+            logger.warning(f"LLM summarization failed, using truncating summary: {e}")
+        return await self.fallback.summarize(previous_summary, messages, token_budget)
+
+
+class ConversationContextBuilder:
+    """
+    Builds the per-turn context window and maintains the rolling summary.
+
+    Args:
+        summarizer: Strategy used to fold old turns into the summary.
+        recent_limit: Maximum number of recent messages to load.
+        token_budget: Total token budget for summary plus recent messages.
+        summary_token_budget: Maximum size of the stored summary.
+        fold_batch_size: Maximum number of messages folded per refresh, so a
+            long pre-existing thread catches up over a few turns instead of
+            in one expensive pass.
+    """
+
+    def __init__(
+        self,
+        summarizer: ConversationSummarizer,
+        recent_limit: int = 15,
+        token_budget: int = 12000,
+        summary_token_budget: int = 1000,
+        fold_batch_size: int = 20,
+    ):
+        self.summarizer = summarizer
+        self.recent_limit = recent_limit
+        self.token_budget = token_budget
+        self.summary_token_budget = summary_token_budget
+        self.fold_batch_size = fold_batch_size
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    async def get_recent_messages(
+        self, db: AsyncSession, conversation_id: UUID, limit: Optional[int] = None
+    ) -> List[Message]:
+        """Fetch the newest messages with an indexed descending scan, returned oldest first."""
+        stmt = (
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at.desc())
+            .limit(limit or self.recent_limit)
+        )
+        result = await db.execute(stmt)
+        return list(reversed(result.scalars().all()))
+
+    async def build(self, db: AsyncSession, conversation: Conversation) -> ContextWindow:
+        """
+        Assemble the context for the next LLM call.
+
+        Recent user/assistant messages are added newest first until the budget
+        left after the summary is used up; the list always starts with a user
+        message as the Anthropic API requires.
+        """
+        summary = conversation.context_summary
+        if summary:
+            summary = truncate_to_tokens(summary, self.summary_token_budget, keep="end")
+        used = estimate_tokens(summary)
+
+        recent = await self.get_recent_messages(db, conversation.id)
+        selected: List[Dict[str, str]] = []
+        for msg in reversed(recent):
+            if msg.role not in ("user", "assistant"):
+                continue
+            cost = estimate_tokens(msg.content) + _MESSAGE_OVERHEAD_TOKENS
+            # Always keep the newest message even if it alone exceeds the budget
+            if selected and used + cost > self.token_budget:
+                break
+            selected.append({"role": msg.role, "content": msg.content})
+            used += cost
+        selected.reverse()
+
+        while selected and selected[0]["role"] != "user":
+            used -= estimate_tokens(selected[0]["content"]) + _MESSAGE_OVERHEAD_TOKENS
+            selected.pop(0)
+
+        return ContextWindow(messages=selected, summary=summary, token_count=used)
+
+    async def refresh_summary(self, db: AsyncSession, conversation_id: UUID) -> bool:
+        """
+        Fold messages that have left the recent window into the rolling summary.
+
+        Returns True if the summary was updated.
+        """
+        conversation = await db.get(Conversation, conversation_id)
+        if not conversation:
+            return False
+
+        # created_at of the oldest message still inside the recent window
+        boundary_stmt = (
+            select(Message.created_at)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at.desc())
+            .offset(self.recent_limit - 1)
+            .limit(1)
+        )
+        boundary: Optional[datetime] = (await db.execute(boundary_stmt)).scalar_one_or_none()
+        if boundary is None:
+            return False
+
+        # Roles are filtered in SQL: a batch of only system/tool rows would
+        # otherwise fold nothing and never move context_summary_until past them
+        stmt = (
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .where(Message.created_at < boundary)
+            .where(Message.role.in_(("user", "assistant")))
+            .order_by(Message.created_at)
+            .limit(self.fold_batch_size)
+        )
+        if conversation.context_summary_until is not None:
+            stmt = stmt.where(Message.created_at > conversation.context_summary_until)
+        to_fold = list((await db.execute(stmt)).scalars().all())
+        if not to_fold:
+            return False
+
+        conversation.context_summary = await self.summarizer.summarize(
+            conversation.context_summary, to_fold, self.summary_token_budget
+        )
+        conversation.context_summary_until = to_fold[-1].created_at
+        await db.commit()
+        logger.info(
+            f"Folded {len(to_fold)} messages into summary for conversation {conversation_id} "
+            f"(~{estimate_tokens(conversation.context_summary)} tokens)"
+        )
+        return True
+
+    def schedule_summary_refresh(self, conversation_id: UUID) -> None:
+        """Refresh the summary in the background with its own session, off the response path."""
+        async def _run() -> None:
+            try:
+                async with get_db_session() as session:
+                    await self.refresh_summary(session, conversation_id)
+            except Exception as e:
+                logger.error(f"Summary refresh failed for conversation {conversation_id}: {e}", exc_info=True)
+
+        task = asyncio.create_task(_run())
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
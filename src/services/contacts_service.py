@@ -4,6 +4,7 @@ from datetime import datetime, date
 import re
 import csv
 import io
+import logging
 from difflib import SequenceMatcher
 from pydantic import EmailStr
 from dateutil import parser as dateutil_parser
@@ -16,6 +17,8 @@ from src.models.sports_models import Contact, ContactBrandAssociation, Brand, Le
 from src.schemas.contacts import ContactCreate, ContactUpdate, ContactImportStats
 from src.utils.errors import EntityNotFoundError, DuplicateEntityError, ValidationError
 
+logger = logging.getLogger(__name__)
+
 class ContactsService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -131,7 +134,7 @@ class ContactsService:
         await self.db.commit()
         
         deleted_count = result.rowcount
-        print(f"User {user_id} deleted {deleted_count} contacts. Contact IDs: {contact_ids}")
+        logger.debug(f"User {user_id} deleted {deleted_count} contacts. Contact IDs: {contact_ids}")
         return deleted_count
     
     async def list_contacts(
@@ -361,15 +364,15 @@ class ContactsService:
                         ):
                             try:
                                 connected_on = datetime.strptime(connected_on_str, fmt).date()
-                                print(f"Parsed date '{connected_on_str}' with format '{fmt}' -> {connected_on}")
+                                logger.debug(f"Parsed date '{connected_on_str}' with format '{fmt}' -> {connected_on}")
                                 break
                             except ValueError:
                                 continue
                         
                         if connected_on is None:
-                            print(f"Unable to parse date: '{connected_on_str}'")
+                            logger.error(f"Unable to parse date: '{connected_on_str}'")
                     except Exception as e:
-                        print(f"Date parsing error for '{connected_on_str}': {str(e)}")
+                        logger.debug(f"Date parsing error for '{connected_on_str}': {str(e)}")
                         pass
                 
                 # Validate required fields
@@ -551,15 +554,15 @@ class ContactsService:
                         ):
                             try:
                                 connected_on = datetime.strptime(connected_on_str, fmt).date()
-                                print(f"Parsed date '{connected_on_str}' with format '{fmt}' -> {connected_on}")
+                                logger.debug(f"Parsed date '{connected_on_str}' with format '{fmt}' -> {connected_on}")
                                 break
                             except ValueError:
                                 continue
                         
                         if connected_on is None:
-                            print(f"Unable to parse date: '{connected_on_str}'")
+                            logger.error(f"Unable to parse date: '{connected_on_str}'")
                     except Exception as e:
-                        print(f"Date parsing error for '{connected_on_str}': {str(e)}")
+                        logger.debug(f"Date parsing error for '{connected_on_str}': {str(e)}")
                         pass
                 
                 # Validate required fields
@@ -812,7 +815,7 @@ class ContactsService:
                 
             except Exception as e:
                 # Log error querying this specific model
-                print(f"Error matching '{normalized_name}' against {entity_type_str}: {e}")
+                logger.error(f"Error matching '{normalized_name}' against {entity_type_str}: {e}")
         
         return matches
 
@@ -858,11 +861,11 @@ class ContactsService:
                 self.db.add(new_representative_brand)
                 await self.db.flush() # Flush to get the new ID and ensure it exists before potential use
                 await self.db.refresh(new_representative_brand) # Refresh to load all attributes
-                print(f"Created representative brand for {entity_type} '{entity_name}'")
+                logger.debug(f"Created representative brand for {entity_type} '{entity_name}'")
                 return new_representative_brand
             except Exception as e:
                 # Handle potential unique constraint violation or other DB errors during creation
-                print(f"Error creating representative brand for {entity_type} '{entity_name}': {e}")
+                logger.error(f"Error creating representative brand for {entity_type} '{entity_name}': {e}")
                 # Attempt to fetch again in case of race condition (rare with asyncpg, but possible)
                 try:
                     result = await self.db.execute(query) # Re-execute the initial query
@@ -870,7 +873,7 @@ class ContactsService:
                     if existing_brand:
                         return existing_brand
                 except Exception as fetch_err:
-                     print(f"Error re-fetching representative brand after creation failed: {fetch_err}")
+                     logger.error(f"Error re-fetching representative brand after creation failed: {fetch_err}")
                 await self.db.rollback() # Rollback the failed creation attempt
                 return None
 
@@ -954,7 +957,7 @@ class ContactsService:
         
         # Debug output for troubleshooting
         if not normalized.get("first_name") or not normalized.get("last_name"):
-            print(f"WARNING: Missing name fields after normalization: {row}")
+            logger.warning(f"Missing name fields after normalization: {row}")
             
         return normalized
     
@@ -1059,9 +1062,9 @@ class ContactsService:
                 # This removes the crashing EmailStr() call.
                 validated_email_str: Optional[str] = email if email else None
                 if validated_email_str:
-                     print(f"Batch import, row {i+1}: Using email for processing: {validated_email_str}")
+                     logger.debug(f"Batch import, row {i+1}: Using email for processing: {validated_email_str}")
                 else:
-                     print(f"No valid email provided for contact {first_name} {last_name}, proceeding without email.")
+                     logger.debug(f"No valid email provided for contact {first_name} {last_name}, proceeding without email.")
 
                 query = select(Contact).where(
                     and_(
@@ -1225,7 +1228,7 @@ class ContactsService:
                 # Use dateutil.parser for robust date parsing
                 connected_on_date = dateutil_parser.parse(connected_on_str).date()
             except (ValueError, TypeError) as e: # Catches parsing errors and potential type errors if str is not what parser expects
-                print(f"Warning: Invalid date format for connected_on: '{connected_on_str}' for contact {first_name} {last_name}. Error: {e}")
+                logger.warning(f"Invalid date format for connected_on: '{connected_on_str}' for contact {first_name} {last_name}. Error: {e}")
                 # Proceed with connected_on_date as None
         
         # Use the stripped email string directly. 
@@ -1234,9 +1237,9 @@ class ContactsService:
         # This removes the crashing EmailStr() call.
         validated_email_str: Optional[str] = email if email else None
         if validated_email_str:
-             print(f"Using email for processing: {validated_email_str}")
+             logger.debug(f"Using email for processing: {validated_email_str}")
         else:
-             print(f"No valid email provided for contact {first_name} {last_name}, proceeding without email.")
+             logger.debug(f"No valid email provided for contact {first_name} {last_name}, proceeding without email.")
 
         query = select(Contact).where(
             and_(
@@ -1373,7 +1376,7 @@ class ContactsService:
         processed_contact_ids = set()
         
         # --- Add Logging --- 
-        print(f"--- Starting Rematch for user {user_id} with threshold {match_threshold} ---")
+        logger.debug(f"--- Starting Rematch for user {user_id} with threshold {match_threshold} ---")
         
         for contact in contacts:
             processed_contact_ids.add(contact.id)
@@ -1383,30 +1386,30 @@ class ContactsService:
             stats["contacts_with_company"] += 1
             
             # --- Add Logging --- 
-            print(f"\nProcessing Contact ID: {contact.id}, Company: '{contact.company}'")
+            logger.debug(f"Processing Contact ID: {contact.id}, Company: '{contact.company}'")
             
             # --- Get Existing and Desired Associations --- 
             existing_assocs_map: Dict[UUID, ContactBrandAssociation] = {assoc.brand_id: assoc for assoc in contact.brand_associations}
             existing_brand_ids = set(existing_assocs_map.keys())
             # --- Add Logging --- 
-            print(f"  Existing Brand IDs: {existing_brand_ids}")
+            logger.debug(f"  Existing Brand IDs: {existing_brand_ids}")
             
             # Find all potential associations based on the *new* threshold
             desired_matches = await self._find_brand_associations(contact.company, match_threshold)
             desired_brand_ids_map: Dict[UUID, float] = {match["id"]: match["confidence"] for match in desired_matches}
             desired_brand_ids = set(desired_brand_ids_map.keys())
             # --- Add Logging --- 
-            print(f"  Desired Matches (Threshold: {match_threshold}): {desired_matches}")
-            print(f"  Desired Brand IDs: {desired_brand_ids}")
+            logger.debug(f"  Desired Matches (Threshold: {match_threshold}): {desired_matches}")
+            logger.debug(f"  Desired Brand IDs: {desired_brand_ids}")
 
             # --- Determine Changes --- 
             brand_ids_to_add = desired_brand_ids - existing_brand_ids
             brand_ids_to_remove = existing_brand_ids - desired_brand_ids
             brand_ids_to_keep = existing_brand_ids.intersection(desired_brand_ids)
             # --- Add Logging --- 
-            print(f"  Brand IDs to Add: {brand_ids_to_add}")
-            print(f"  Brand IDs to Remove: {brand_ids_to_remove}")
-            print(f"  Brand IDs to Keep: {brand_ids_to_keep}")
+            logger.debug(f"  Brand IDs to Add: {brand_ids_to_add}")
+            logger.debug(f"  Brand IDs to Remove: {brand_ids_to_remove}")
+            logger.debug(f"  Brand IDs to Keep: {brand_ids_to_keep}")
 
             stats["associations_kept"] += len(brand_ids_to_keep)
 
@@ -1443,28 +1446,28 @@ class ContactsService:
             # Delete old associations
             if assocs_to_delete:
                 # --- Add Logging --- 
-                print(f"\nAttempting to DELETE {len(assocs_to_delete)} associations...")
+                logger.debug(f"Attempting to DELETE {len(assocs_to_delete)} associations...")
                 for assoc in assocs_to_delete:
                     await self.db.delete(assoc)
             else:
                  # --- Add Logging --- 
-                 print("\nNo associations marked for DELETION.")
+                 logger.debug("No associations marked for DELETION.")
 
             # Add new associations
             if brands_to_add:
                 # --- Add Logging --- 
-                print(f"Attempting to ADD {len(brands_to_add)} associations...")
+                logger.debug(f"Attempting to ADD {len(brands_to_add)} associations...")
                 self.db.add_all(brands_to_add)
             else:
                 # --- Add Logging --- 
-                print("No associations marked for ADDITION.")
+                logger.debug("No associations marked for ADDITION.")
                 
             # Commit additions and deletions
             if assocs_to_delete or brands_to_add:
                 await self.db.commit()
-                print("Committed additions and deletions.")
+                logger.debug("Committed additions and deletions.")
             else:
-                print("No association changes to commit.")
+                logger.debug("No association changes to commit.")
 
             # --- Update Primary Flags (After commit) --- 
             # Re-query contacts we processed to update primary flags accurately
@@ -1504,14 +1507,14 @@ class ContactsService:
                             assoc.is_primary = (assoc.id == new_primary_id)
 
                 if needs_primary_commit:
-                    print("Updating primary flags...")
+                    logger.debug("Updating primary flags...")
                     await self.db.commit()
-                    print("Committed primary flag updates.")
+                    logger.debug("Committed primary flag updates.")
 
         except Exception as e:
             await self.db.rollback()
             stats["errors"].append(f"Error during DB operations: {str(e)}")
-            print(f"Error during rematch DB operations: {e}")
+            logger.error(f"Error during rematch DB operations: {e}")
             # Re-raise or handle as needed
 
         # Recalculate total associations after commit
@@ -1521,7 +1524,7 @@ class ContactsService:
         stats["total_brand_associations_after"] = count_result.scalar() or 0
         
         # --- Add Logging --- 
-        print(f"--- Finished Rematch. Final Stats: {stats} ---")
+        logger.debug(f"--- Finished Rematch. Final Stats: {stats} ---")
         return stats
 
     async def get_brand_contact_count(self, user_id: UUID, brand_id: UUID) -> int:
@@ -1628,7 +1631,7 @@ class ContactsService:
         await self.db.commit()
         
         updated_count = result.rowcount
-        print(f"User {user_id} updated import_source_tag for {updated_count} contacts to '{new_tag}'. Contact IDs: {contact_ids}")
+        logger.debug(f"User {user_id} updated import_source_tag for {updated_count} contacts to '{new_tag}'. Contact IDs: {contact_ids}")
         return updated_count
 
     async def get_contact_by_id(self, contact_id: UUID, user_id: UUID) -> Optional[Contact]:
@@ -0,0 +1,301 @@
+"""
+Parsing and validation for bulk row ingestion.
+
+Request bodies are read as a byte stream and turned into rows without
+buffering the whole upload: NDJSON is one JSON object (or array) per line,
+CSV starts with a header line and may contain quoted newlines. Rows are
+validated and coerced against the dataset's DataColumn definitions a
+batch at a time.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from src.models.models import DataColumn
+
+# Rows validated (and then written) together
+INGEST_BATCH_SIZE = 1000
+# Validation errors kept for the report
+MAX_REPORTED_ERRORS = 20
+# Longest line (or multi-line CSV record) accepted, so a stream without
+# newlines can't be buffered whole
+MAX_LINE_BYTES = 1 << 20
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+
+
+class IngestError(ValueError):
+    """The upload cannot be parsed."""
+
+
+@dataclass
+class RowError:
+    """A row that failed validation (row numbers are 1-based within the upload)."""
+    row: int
+    column: Optional[str]
+    message: str
+
+
+@dataclass
+class InvalidRow:
+    """Placeholder for a parsed row that is malformed (reported, not written)."""
+    message: str
+
+
+@dataclass
+class IngestReport:
+    """Outcome and throughput of one bulk ingestion."""
+    mode: str
+    format: str
+    rows_received: int = 0
+    rows_written: int = 0
+    rows_skipped: int = 0
+    chunks: int = 0
+    start_row: int = 0
+    new_columns: List[str] = field(default_factory=list)
+    errors: List[RowError] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return float(self.rows_written)
+        return round(self.rows_written / self.elapsed_seconds, 1)
+
+    def add_error(self, error: RowError) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(error)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "format": self.format,
+            "rows_received": self.rows_received,
+            "rows_written": self.rows_written,
+            "rows_skipped": self.rows_skipped,
+            "chunks": self.chunks,
+            "start_row": self.start_row,
+            "new_columns": self.new_columns,
+            "errors": [error.__dict__ for error in self.errors],
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+def _decode(line: bytes, line_number: int) -> str:
+    try:
+        return line.decode("utf-8-sig" if line_number == 1 else "utf-8").rstrip("\r")
+    except UnicodeDecodeError as e:
+        raise IngestError(f"Line {line_number} is not valid UTF-8: {e.reason}")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[str]:
+    """
+    Decode a byte stream into lines (without line endings).
+
+    Raises:
+        IngestError: If a line exceeds max_line_bytes or is not valid UTF-8.
+    """
+    pending = bytearray()
+    line_number = 0
+    async for chunk in chunks:
+        # Only the new chunk is scanned, so a long line isn't re-split per chunk
+        *lines, rest = chunk.split(b"\n")
+        if lines:
+            lines[0] = bytes(pending) + lines[0]
+            pending = bytearray()
+        pending += rest
+        for line in lines:
+            line_number += 1
+            if len(line) > max_line_bytes:
+                raise IngestError(f"Line {line_number} is longer than {max_line_bytes} bytes")
+            yield _decode(line, line_number)
+        if len(pending) > max_line_bytes:
+            raise IngestError(f"Line {line_number + 1} is longer than {max_line_bytes} bytes")
+    if pending:
+        yield _decode(bytes(pending), line_number + 1)
+
+
+async def iter_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[Any]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise IngestError(f"Line {line_number} is not valid JSON: {e.msg}")
+
+
+async def iter_csv(lines: AsyncIterator[str], max_record_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[Any]:
+    """
+    Rows of a CSV stream as dicts keyed by the header line.
+
+    A row with a different number of fields than the header is passed on as
+    an InvalidRow, so it is reported like any other validation error.
+    """
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    record_size = 0
+    quotes = 0
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        record.append(line)
+        record_size += len(line) + 1
+        quotes += line.count('"')
+        if record_size > max_record_bytes:
+            raise IngestError(
+                f"CSV record starting at line {line_number - len(record) + 1} "
+                f"is longer than {max_record_bytes} bytes"
+            )
+        # A record is complete once its quotes balance (quoted fields may span lines)
+        if quotes % 2:
+            continue
+        values = next(csv.reader(["\n".join(record)]), [])
+        record = []
+        record_size = quotes = 0
+        if not values or values == [""]:
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield InvalidRow(f"expected {len(header)} fields, got {len(values)}")
+            continue
+        yield dict(zip(header, values))
+    if record:
+        raise IngestError("CSV ends inside a quoted field")
+
+
+def parse_rows(fmt: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    if fmt == "ndjson":
+        return iter_ndjson(iter_lines(chunks))
+    if fmt == "csv":
+        return iter_csv(iter_lines(chunks))
+    raise IngestError(f"Unsupported format '{fmt}'; use one of {', '.join(SUPPORTED_FORMATS)}")
+
+
+async def iter_batches(rows: AsyncIterator[Any], size: int = INGEST_BATCH_SIZE) -> AsyncIterator[List[Any]]:
+    batch: List[Any] = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _coerce(value: Any, data_type: str) -> Any:
+    """Convert a cell to its column type; raises ValueError if it doesn't fit."""
+    if value is None or value == "":
+        return None
+    data_type = data_type.lower()
+    if data_type in ("number", "currency", "float", "decimal"):
+        if isinstance(value, bool):
+            raise ValueError("expected a number")
+        if isinstance(value, (int, float)):
+            return value
+        text = str(value).replace(",", "").replace("$", "").strip()
+        try:
+            number = Decimal(text)
+        except InvalidOperation:
+            raise ValueError("expected a number")
+        if not number.is_finite():
+            raise ValueError("expected a number")
+        return int(text) if text.lstrip("+-").isdigit() else float(number)
+    if data_type == "integer":
+        try:
+            return int(str(value).replace(",", "").strip())
+        except ValueError:
+            raise ValueError("expected an integer")
+    if data_type == "boolean":
+        if isinstance(value, bool):
+            return value
+        lowered = str(value).strip().lower()
+        if lowered in ("true", "t", "yes", "y", "1"):
+            return True
+        if lowered in ("false", "f", "no", "n", "0"):
+            return False
+        raise ValueError("expected a boolean")
+    if data_type == "date":
+        try:
+            return date.fromisoformat(str(value).strip()).isoformat()
+        except ValueError:
+            raise ValueError("expected an ISO date (YYYY-MM-DD)")
+    if data_type == "datetime":
+        try:
+            return datetime.fromisoformat(str(value).strip()).isoformat()
+        except ValueError:
+            raise ValueError("expected an ISO datetime")
+    if data_type in ("object", "array"):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+class RowValidator:
+    """Validates and coerces rows against a dataset's column definitions."""
+
+    def __init__(self, columns: Iterable[DataColumn], column_order: List[str]):
+        self.types = {col.name: col.data_type for col in columns if col.is_active}
+        self.column_order = list(column_order)
+
+    def validate(
+        self, batch: List[Any], first_row: int
+    ) -> Tuple[List[Dict[str, Any]], List[RowError], List[str]]:
+        """
+        Validate a batch of parsed rows.
+
+        Args:
+            batch: Rows as dicts, or lists in column_order.
+            first_row: 1-based number of the batch's first row in the upload.
+
+        Returns:
+            Tuple of (valid rows, errors, column names seen for the first time).
+        """
+        valid: List[Dict[str, Any]] = []
+        errors: List[RowError] = []
+        new_columns: List[str] = []
+        for offset, raw in enumerate(batch):
+            row_number = first_row + offset
+            if isinstance(raw, InvalidRow):
+                errors.append(RowError(row_number, None, raw.message))
+                continue
+            if isinstance(raw, list):
+                if len(raw) > len(self.column_order):
+                    errors.append(RowError(row_number, None, "more values than columns"))
+                    continue
+                raw = dict(zip(self.column_order, raw))
+            if not isinstance(raw, dict):
+                errors.append(RowError(row_number, None, "expected an object"))
+                continue
+
+            row: Dict[str, Any] = {}
+            row_errors: List[RowError] = []
+            for name, value in raw.items():
+                name = str(name)
+                data_type = self.types.get(name)
+                if data_type is None:
+                    row[name] = value
+                    continue
+                try:
+                    row[name] = _coerce(value, data_type)
+                except ValueError as e:
+                    row_errors.append(RowError(row_number, name, str(e)))
+            if row_errors:
+                errors.extend(row_errors)
+                continue
+
+            for name in row:
+                if name not in self.column_order:
+                    self.column_order.append(name)
+                    new_columns.append(name)
+            valid.append(row)
+        return valid, errors, new_columns
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.models import DataColumn
 from src.schemas.data_management import ColumnCreate, ColumnUpdate, ColumnResponse
 from .history_service import HistoryService
+from .row_indexes import RowIndexes
 from .structured_data_service import StructuredDataService
 
 
@@ -44,8 +45,6 @@ class ColumnService:
             structured_data_id=structured_data.id, **column.model_dump()
         )
         self.db.add(new_column)
-        await self.db.commit()
-        await self.db.refresh(new_column)
 
         await self.history_service.record_change(
             structured_data_id=structured_data.id,
@@ -54,6 +53,8 @@ class ColumnService:
             column_name=column.name,
             meta_data=column.model_dump(),
         )
+        await self.db.commit()
+        await self.db.refresh(new_column)
 
         return new_column
 
@@ -91,9 +92,6 @@ class ColumnService:
         for key, value in update_data.items():
             setattr(column, key, value)
 
-        await self.db.commit()
-        await self.db.refresh(column)
-
         await self.history_service.record_change(
             structured_data_id=structured_data.id,
             user_id=user_id,
@@ -101,6 +99,14 @@ class ColumnService:
             column_name=column_name,
             meta_data={"old_values": old_values, "new_values": update_data},
         )
+        await self.db.commit()
+        await self.db.refresh(column)
+
+        # Indexes of the old name or data_type no longer match any query
+        if update_data.get("name", column_name) != column_name or (
+            "data_type" in update_data and update_data["data_type"] != old_values["data_type"]
+        ):
+            await RowIndexes().drop(structured_data.id, column_name)
 
         return column
 
@@ -129,7 +135,6 @@ class ColumnService:
             )
 
         await self.db.delete(column)
-        await self.db.commit()
 
         await self.history_service.record_change(
             structured_data_id=structured_data.id,
@@ -138,3 +143,5 @@ class ColumnService:
             column_name=column_name,
             meta_data={"column_config": column.meta_data},
         )
+        await self.db.commit()
+        await RowIndexes().drop(structured_data.id, column_name)
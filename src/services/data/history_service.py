@@ -5,6 +5,10 @@ from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.models import DataChangeHistory
+from src.utils.config import get_settings
+from .history_writer import SessionHistoryWriter, history_flusher, make_entry
+
+settings = get_settings()
 
 
 class HistoryService:
@@ -23,9 +27,19 @@ class HistoryService:
         old_value: Optional[str] = None,
         new_value: Optional[str] = None,
         meta_data: Optional[Dict] = None,
+        background: bool = True,
     ) -> None:
-        """Record a change in the history."""
-        change = DataChangeHistory(
+        """
+        Record a change in the history.
+
+        The entry is buffered and written with the caller's next commit, in
+        the same transaction as the change itself. When HISTORY_BACKGROUND_FLUSH
+        is on it is instead handed to the background flusher after that commit;
+        pass background=False for entries that must be written in the
+        transaction (for example before the rows they reference are deleted).
+        It does not commit.
+        """
+        entry = make_entry(
             structured_data_id=structured_data_id,
             user_id=user_id,
             change_type=change_type,
@@ -33,15 +47,25 @@ class HistoryService:
             row_index=row_index,
             old_value=old_value,
             new_value=new_value,
-            meta_data=meta_data or {},
+            meta_data=meta_data,
         )
-        self.db.add(change)
-        await self.db.commit()
+        writer = SessionHistoryWriter.for_session(self.db)
+        if background and settings.HISTORY_BACKGROUND_FLUSH and history_flusher.running:
+            writer.defer(entry)
+        else:
+            writer.add(entry)
+
+    async def flush(self) -> None:
+        """Write buffered entries in the current transaction without committing."""
+        writer = SessionHistoryWriter.existing(self.db)
+        if writer is not None and len(writer.buffer):
+            await self.db.run_sync(writer.write)
 
     async def get_change_history(
         self, structured_data_id: UUID, limit: int = 50, offset: int = 0
     ) -> List[DataChangeHistory]:
         """Get change history for structured data."""
+        await self.flush()
         query = (
             select(DataChangeHistory)
             .where(DataChangeHistory.structured_data_id == structured_data_id)
@@ -0,0 +1,284 @@
+"""
+Buffered writing of data change history.
+
+Changes are collected in a HistoryBuffer and written with one multi-row
+INSERT instead of one INSERT (and commit) per change. There are two ways
+to drain a buffer:
+
+- SessionHistoryWriter attaches a buffer to an AsyncSession and writes it
+  in that session's transaction just before it commits, so history commits
+  (or rolls back) together with the data change it describes.
+- HistoryFlusher is a background task that writes buffered entries from
+  many requests in its own transaction every few hundred milliseconds.
+  It is meant for high-frequency edit streams where per-request history
+  writes dominate, at the cost of history no longer being atomic with the
+  edit. Entries still wait in the session's writer until the edit commits
+  (and are dropped if it rolls back), so the flusher only ever sees
+  history of committed changes.
+
+Both buffers compact consecutive UPDATE_CELL entries on the same cell by
+the same user within a time window into a single entry that keeps the
+first old_value and the last new_value.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.models.models import DataChangeHistory
+from src.utils.config import get_settings
+from src.utils.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def make_entry(
+    structured_data_id: UUID,
+    user_id: UUID,
+    change_type: str,
+    column_name: Optional[str] = None,
+    row_index: Optional[int] = None,
+    old_value: Optional[str] = None,
+    new_value: Optional[str] = None,
+    meta_data: Optional[Dict] = None,
+) -> Dict[str, Any]:
+    """Column values for one data_change_history row."""
+    now = datetime.utcnow()
+    return {
+        "id": uuid4(),
+        "structured_data_id": structured_data_id,
+        "user_id": user_id,
+        "change_type": change_type,
+        "column_name": column_name,
+        "row_index": row_index,
+        "old_value": old_value,
+        "new_value": new_value,
+        "meta_data": meta_data or {},
+        "tags": [],
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+class HistoryBuffer:
+    """Pending history entries with cell-edit compaction."""
+
+    def __init__(self, compaction_window: float = 0.0):
+        self.compaction_window = compaction_window
+        self._entries: List[Dict[str, Any]] = []
+        # Latest pending entry per dataset, the only one a new edit may merge into
+        self._last_by_dataset: Dict[UUID, Dict[str, Any]] = {}
+        self.compacted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        last = self._last_by_dataset.get(entry["structured_data_id"])
+        if last is not None and self._can_merge(last, entry):
+            last["new_value"] = entry["new_value"]
+            last["updated_at"] = entry["created_at"]
+            last["meta_data"] = {
+                **last["meta_data"],
+                "merged_changes": last["meta_data"].get("merged_changes", 1) + 1,
+            }
+            self.compacted += 1
+            return
+        self._entries.append(entry)
+        self._last_by_dataset[entry["structured_data_id"]] = entry
+
+    def _can_merge(self, last: Dict[str, Any], entry: Dict[str, Any]) -> bool:
+        if self.compaction_window <= 0:
+            return False
+        return (
+            last["change_type"] == "UPDATE_CELL"
+            and entry["change_type"] == "UPDATE_CELL"
+            and last["user_id"] == entry["user_id"]
+            and last["row_index"] == entry["row_index"]
+            and last["column_name"] == entry["column_name"]
+            # Bounded from the first merged edit so a steady stream still gets split
+            and (entry["created_at"] - last["created_at"]).total_seconds() <= self.compaction_window
+        )
+
+    def drain(self) -> List[Dict[str, Any]]:
+        entries, self._entries = self._entries, []
+        self._last_by_dataset.clear()
+        return entries
+
+    def clear(self) -> None:
+        self.drain()
+
+
+def insert_statement(entries: List[Dict[str, Any]]):
+    """One multi-row INSERT for the given entries."""
+    return insert(DataChangeHistory).values(entries)
+
+
+class SessionHistoryWriter:
+    """
+    History buffer bound to one session's transaction.
+
+    Entries are written right before the session commits and discarded if
+    it rolls back. Deferred entries are handed to the background flusher
+    once the session has committed, and likewise discarded on rollback.
+    """
+
+    _INFO_KEY = "history_writer"
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        compaction_window: float,
+        flusher: Optional["HistoryFlusher"] = None,
+    ):
+        self.buffer = HistoryBuffer(compaction_window)
+        self.deferred = HistoryBuffer(compaction_window)
+        self.flusher = flusher or history_flusher
+        sync_session = session.sync_session
+        event.listen(sync_session, "before_commit", self._before_commit)
+        event.listen(sync_session, "after_commit", self._after_commit)
+        event.listen(sync_session, "after_rollback", self._after_rollback)
+
+    @classmethod
+    def existing(cls, session: AsyncSession) -> Optional["SessionHistoryWriter"]:
+        """The writer already attached to a session, if any."""
+        return session.info.get(cls._INFO_KEY)
+
+    @classmethod
+    def for_session(cls, session: AsyncSession) -> "SessionHistoryWriter":
+        writer = cls.existing(session)
+        if writer is None:
+            writer = cls(session, settings.HISTORY_COMPACTION_WINDOW_SECONDS)
+            session.info[cls._INFO_KEY] = writer
+        return writer
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        self.buffer.add(entry)
+
+    def defer(self, entry: Dict[str, Any]) -> None:
+        """Queue an entry for the background flusher once the transaction commits."""
+        self.deferred.add(entry)
+
+    def write(self, session: Session) -> None:
+        """Write pending entries in the session's current transaction."""
+        entries = self.buffer.drain()
+        if entries:
+            session.execute(insert_statement(entries))
+
+    def _before_commit(self, session: Session) -> None:
+        if not len(self.buffer):
+            return
+        # Flush pending ORM changes first so history lands after the rows it references
+        session.flush()
+        self.write(session)
+
+    def _after_commit(self, session: Session) -> None:
+        for entry in self.deferred.drain():
+            self.flusher.submit(entry)
+
+    def _after_rollback(self, session: Session) -> None:
+        self.buffer.clear()
+        self.deferred.clear()
+
+
+class HistoryFlusher:
+    """Background task writing history entries in batches."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        interval: float = 0.5,
+        max_batch: int = 500,
+        compaction_window: float = 0.0,
+    ):
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.interval = interval
+        self.max_batch = max_batch
+        self.buffer = HistoryBuffer(compaction_window)
+        self.written = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info("History flusher started")
+
+    async def stop(self) -> None:
+        """Stop the task and write whatever is still buffered."""
+        if self._task is not None:
+            # Let an in-progress write finish rather than cancelling it
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        logger.info(f"History flusher stopped ({self.written} entries written)")
+
+    def submit(self, entry: Dict[str, Any]) -> None:
+        self.buffer.add(entry)
+        if len(self.buffer) >= self.max_batch:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write all buffered entries now; returns how many were written."""
+        entries = self.buffer.drain()
+        written = 0
+        for offset in range(0, len(entries), self.max_batch):
+            written += await self._write(entries[offset:offset + self.max_batch])
+        self.written += written
+        return written
+
+    async def _write(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Write a batch in its own transaction.
+
+        A failed batch is split in half and retried, so one bad entry (say,
+        history of a dataset deleted in the meantime) only loses itself.
+        """
+        try:
+            async with self.session_factory() as session:
+                await session.execute(insert_statement(entries))
+                await session.commit()
+            return len(entries)
+        except Exception as e:
+            if len(entries) == 1:
+                entry = entries[0]
+                logger.error(
+                    f"Dropping {entry['change_type']} history entry for "
+                    f"{entry['structured_data_id']}: {str(e)}"
+                )
+                return 0
+        middle = len(entries) // 2
+        return await self._write(entries[:middle]) + await self._write(entries[middle:])
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+
+# Shared instance; started by the app startup hook when HISTORY_BACKGROUND_FLUSH is on
+history_flusher = HistoryFlusher(
+    interval=settings.HISTORY_FLUSH_INTERVAL_SECONDS,
+    max_batch=settings.HISTORY_FLUSH_MAX_BATCH,
+    compaction_window=settings.HISTORY_COMPACTION_WINDOW_SECONDS,
+)
@@ -0,0 +1,114 @@
+"""
+Per-dataset expression indexes on structured_data_rows.
+
+RowQueryBuilder.index_statement() names every index after its dataset and
+column (see row_query.index_prefix), which is how this module finds them
+again: to enforce ROW_QUERY_MAX_INDEXES_PER_DATASET, to replace an index
+whose column was retyped, and to drop them when the column or the dataset
+goes away.
+
+Indexes are built and dropped CONCURRENTLY on an autocommit connection, so
+they never block writes to other datasets; callers run these after their
+own transaction has committed. A concurrent build that fails leaves an
+INVALID index behind, which is dropped and rebuilt rather than mistaken for
+an existing index by IF NOT EXISTS.
+"""
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.utils.config import get_settings
+from src.utils.database import engine as default_engine
+from .row_query import RowQueryBuilder, RowQueryError, index_prefix
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_INDEXES_SQL = text(
+    "SELECT c.relname, i.indisvalid FROM pg_index i "
+    "JOIN pg_class c ON c.oid = i.indexrelid "
+    "WHERE i.indrelid = 'structured_data_rows'::regclass "
+    "AND left(c.relname, :length) = :prefix"
+)
+
+
+class RowIndexes:
+    """Creates and drops the column indexes of datasets."""
+
+    def __init__(self, engine: Optional[AsyncEngine] = None):
+        self.engine = engine or default_engine
+
+    @asynccontextmanager
+    async def _autocommit(self) -> AsyncIterator[AsyncConnection]:
+        # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+        async with self.engine.connect() as conn:
+            yield await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+    @staticmethod
+    async def _list(conn: AsyncConnection, prefix: str) -> Dict[str, bool]:
+        """Index name -> whether it is valid, for the indexes starting with prefix."""
+        result = await conn.execute(_INDEXES_SQL, {"length": len(prefix), "prefix": prefix})
+        return {name: valid for name, valid in result.all()}
+
+    @staticmethod
+    async def _drop(conn: AsyncConnection, names: Iterable[str]) -> None:
+        for name in names:
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+    async def build(self, builder: RowQueryBuilder, column_name: str) -> Dict[str, object]:
+        """
+        Build the index for one column, replacing stale or invalid ones.
+
+        Raises:
+            RowQueryError: Unknown column, or the dataset already has
+                ROW_QUERY_MAX_INDEXES_PER_DATASET indexes.
+        """
+        index_name, ddl = builder.index_statement(column_name)
+        column_prefix = index_prefix(builder.data_id, column_name)
+        async with self._autocommit() as conn:
+            existing = await self._list(conn, index_prefix(builder.data_id))
+            # Indexes of the column's previous data_type, and a failed earlier build
+            stale = [
+                name for name, valid in existing.items()
+                if name.startswith(column_prefix) and (name != index_name or not valid)
+            ]
+            await self._drop(conn, stale)
+            kept = set(existing) - set(stale)
+            if index_name not in kept and len(kept) >= settings.ROW_QUERY_MAX_INDEXES_PER_DATASET:
+                raise RowQueryError(
+                    f"Datasets can index at most {settings.ROW_QUERY_MAX_INDEXES_PER_DATASET} columns; "
+                    "drop or retype an indexed column first"
+                )
+
+            try:
+                await conn.execute(text(ddl))
+            except DBAPIError:
+                await self._drop(conn, [index_name])
+                raise
+            # Another request may still be building the same index
+            valid = (await self._list(conn, index_name)).get(index_name, False)
+
+        return {"index": index_name, "column": column_name, "valid": valid}
+
+    async def drop(self, data_id: UUID, column_name: Optional[str] = None) -> int:
+        """
+        Drop the indexes of a dataset, or of one of its columns; returns how many.
+
+        Runs after the caller's change has committed, so a failure is logged
+        rather than raised; the next build() of the column replaces leftovers.
+        """
+        try:
+            async with self._autocommit() as conn:
+                names = list(await self._list(conn, index_prefix(data_id, column_name)))
+                await self._drop(conn, names)
+        except Exception as e:
+            logger.error(f"Failed to drop row indexes of dataset {data_id}: {str(e)}")
+            return 0
+        if names:
+            logger.info(f"Dropped {len(names)} row indexes of dataset {data_id}")
+        return len(names)
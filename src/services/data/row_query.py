@@ -0,0 +1,273 @@
+"""
+Sort, filter and aggregate the rows of a dataset inside Postgres.
+
+Queries run directly against structured_data_rows, so the browser only
+receives the page (or the groups) it asked for. Cell values are read with
+data ->> 'column' (or data ->> index for array rows) and typed by the
+column's DataColumn.data_type: number/currency columns go through the
+row_value_numeric() SQL function and boolean columns through
+row_value_boolean(), both immutable, so they can back expression indexes.
+Everything else compares as text, which also orders ISO dates correctly.
+
+Column names and the dataset ID are rendered as SQL literals rather than
+bind parameters. That is what lets the planner match a query against a
+per-dataset expression index created by index_statement(); all
+user-supplied values are still bound.
+"""
+import hashlib
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import TextClause, text
+
+from src.schemas.data_management import RowAggregate, RowFilter, RowQuery, RowSort
+
+NUMERIC_TYPES = {"number", "currency", "integer", "float", "decimal"}
+BOOLEAN_TYPES = {"boolean"}
+BOOLEAN_AGGREGATES = {"min": "bool_and", "max": "bool_or"}
+INDEX_PREFIX = "ix_sdr_"
+
+
+class RowQueryError(ValueError):
+    """A row query refers to unknown columns or has values of the wrong type."""
+
+
+def quote_literal(value: str) -> str:
+    """
+    Quote a string as a SQL literal for use in text() (standard_conforming_strings).
+
+    Colons are escaped so text() doesn't read ":name" inside the literal as
+    a bind parameter.
+    """
+    if "\x00" in value:
+        raise RowQueryError("Column names cannot contain NUL characters")
+    return "'" + value.replace("'", "''").replace(":", "\\:") + "'"
+
+
+def index_prefix(data_id: UUID, column_name: Optional[str] = None) -> str:
+    """
+    Name prefix of the expression indexes of a dataset, or of one of its columns.
+
+    Index names are ix_sdr_<dataset>_<column digest>_<expression digest>, so
+    a column whose data_type changes gets a new index name and the old one
+    can still be found (and dropped) by prefix.
+    """
+    prefix = f"{INDEX_PREFIX}{data_id.hex}_"
+    if column_name is not None:
+        prefix += hashlib.md5(column_name.encode()).hexdigest()[:8] + "_"
+    return prefix
+
+
+def _like_pattern(value: str, prefix: bool) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+
+@dataclass
+class ColumnRef:
+    """A dataset column as a typed SQL expression."""
+    name: str
+    text_sql: str
+    kind: str  # "text", "numeric" or "boolean"
+
+    @property
+    def sql(self) -> str:
+        if self.kind == "numeric":
+            return f"row_value_numeric({self.text_sql})"
+        if self.kind == "boolean":
+            return f"row_value_boolean({self.text_sql})"
+        return self.text_sql
+
+
+class RowQueryBuilder:
+    """Builds the SQL for one dataset's row queries."""
+
+    def __init__(
+        self,
+        data_id: UUID,
+        column_names: Sequence[str],
+        column_types: Optional[Dict[str, str]] = None,
+        array_rows: bool = False,
+    ):
+        self.data_id = UUID(str(data_id))
+        self.column_names = list(column_names)
+        self.column_types = column_types or {}
+        self.array_rows = array_rows
+        self._params: Dict[str, Any] = {}
+
+    def column(self, name: str) -> ColumnRef:
+        if self.column_names and name not in self.column_names:
+            raise RowQueryError(f"Unknown column '{name}'")
+        if self.array_rows:
+            if name not in self.column_names:
+                raise RowQueryError(f"Unknown column '{name}'")
+            text_sql = f"(data ->> {self.column_names.index(name)})"
+        else:
+            text_sql = f"(data ->> {quote_literal(name)})"
+        data_type = (self.column_types.get(name) or "string").lower()
+        if data_type in NUMERIC_TYPES:
+            kind = "numeric"
+        elif data_type in BOOLEAN_TYPES:
+            kind = "boolean"
+        else:
+            kind = "text"
+        return ColumnRef(name=name, text_sql=text_sql, kind=kind)
+
+    def _bind(self, value: Any) -> str:
+        key = f"p{len(self._params)}"
+        self._params[key] = value
+        return f":{key}"
+
+    @staticmethod
+    def _typed_value(column: ColumnRef, value: Any) -> Any:
+        if value is None:
+            raise RowQueryError(f"A value is required to filter '{column.name}'")
+        if column.kind == "numeric":
+            try:
+                return Decimal(str(value).replace(",", "").replace("$", "").strip())
+            except InvalidOperation:
+                raise RowQueryError(f"'{value}' is not a number (column '{column.name}')")
+        if column.kind == "boolean":
+            if isinstance(value, bool):
+                return value
+            lowered = str(value).strip().lower()
+            if lowered in ("true", "t", "yes", "y", "1"):
+                return True
+            if lowered in ("false", "f", "no", "n", "0"):
+                return False
+            raise RowQueryError(f"'{value}' is not a boolean (column '{column.name}')")
+        return str(value)
+
+    def _filter_sql(self, row_filter: RowFilter) -> str:
+        column = self.column(row_filter.column)
+        op = row_filter.op
+        if op == "is_null":
+            return f"{column.sql} IS NULL"
+        if op == "not_null":
+            return f"{column.sql} IS NOT NULL"
+        if op in ("contains", "starts_with"):
+            pattern = _like_pattern(str(row_filter.value), prefix=op == "starts_with")
+            return f"{column.text_sql} ILIKE {self._bind(pattern)}"
+        if op == "in":
+            values = row_filter.value if isinstance(row_filter.value, list) else [row_filter.value]
+            typed = [self._typed_value(column, value) for value in values]
+            sql_type = {"numeric": "numeric[]", "boolean": "boolean[]"}.get(column.kind, "text[]")
+            return f"{column.sql} = ANY(CAST({self._bind(typed)} AS {sql_type}))"
+        operator = {"eq": "=", "ne": "<>", "lt": "<", "lte": "<=", "gt": ">", "gte": ">="}[op]
+        return f"{column.sql} {operator} {self._bind(self._typed_value(column, row_filter.value))}"
+
+    def _where_sql(self, filters: Sequence[RowFilter]) -> str:
+        clauses = [f"structured_data_id = {quote_literal(str(self.data_id))}"]
+        clauses.extend(self._filter_sql(row_filter) for row_filter in filters)
+        return " AND ".join(clauses)
+
+    @staticmethod
+    def _direction(sort: RowSort) -> str:
+        # Default null placement (last ascending, first descending) so one
+        # ascending index serves both directions
+        return "DESC" if sort.direction == "desc" else "ASC"
+
+    def rows_statement(self, query: RowQuery) -> TextClause:
+        """
+        Filtered, sorted page of rows.
+
+        The total is left to count_statement(): a count(*) OVER () here would
+        force every match to be read before the LIMIT, defeating index scans.
+        """
+        self._params = {}
+        where = self._where_sql(query.filters)
+        order = [f"{self.column(sort.column).sql} {self._direction(sort)}" for sort in query.sort]
+        # Row order is the tie-breaker so pages are stable; it follows the
+        # last sort's direction to match a backward scan of (expr, ordinal)
+        order.append(f"ordinal {self._direction(query.sort[-1])}" if query.sort else "ordinal")
+        sql = (
+            "SELECT ordinal, data, version "
+            f"FROM structured_data_rows WHERE {where} "
+            f"ORDER BY {', '.join(order)} "
+            f"LIMIT {self._bind(query.limit)} OFFSET {self._bind(query.skip)}"
+        )
+        return text(sql).bindparams(**self._params)
+
+    def count_statement(self, query: RowQuery) -> TextClause:
+        self._params = {}
+        where = self._where_sql(query.filters)
+        return text(f"SELECT count(*) FROM structured_data_rows WHERE {where}").bindparams(**self._params)
+
+    @staticmethod
+    def aggregate_key(aggregate: RowAggregate) -> str:
+        return f"{aggregate.func}({aggregate.column})" if aggregate.column else aggregate.func
+
+    def _aggregate_sql(self, aggregate: RowAggregate) -> str:
+        if aggregate.column is None:
+            if aggregate.func != "count":
+                raise RowQueryError(f"{aggregate.func} needs a column")
+            return "count(*)"
+        column = self.column(aggregate.column)
+        if aggregate.func in ("sum", "avg"):
+            # Totals are numeric even for columns not typed as numbers
+            return f"{aggregate.func}(row_value_numeric({column.text_sql}))"
+        if column.kind == "boolean" and aggregate.func in BOOLEAN_AGGREGATES:
+            # Postgres has no min/max over booleans; false sorts before true
+            return f"{BOOLEAN_AGGREGATES[aggregate.func]}({column.sql})"
+        return f"{aggregate.func}({column.sql})"
+
+    def groups_statement(self, query: RowQuery) -> Tuple[TextClause, List[str]]:
+        """
+        Grouped aggregates (or overall totals without group_by).
+
+        Returns:
+            The statement and the output key for each selected expression.
+        """
+        self._params = {}
+        where = self._where_sql(query.filters)
+        select_sql: List[str] = []
+        keys: List[str] = []
+        group_positions: List[str] = []
+        for name in query.group_by:
+            select_sql.append(self.column(name).sql)
+            keys.append(name)
+            group_positions.append(str(len(select_sql)))
+        for aggregate in query.aggregates:
+            select_sql.append(self._aggregate_sql(aggregate))
+            keys.append(self.aggregate_key(aggregate))
+        select_sql.append("count(*)")
+        keys.append("row_count")
+
+        order = []
+        sorted_positions = set()
+        for sort in query.sort:
+            if sort.column not in keys:
+                raise RowQueryError(f"Cannot sort groups by '{sort.column}'; use a group_by column or aggregate")
+            position = str(keys.index(sort.column) + 1)
+            sorted_positions.add(position)
+            order.append(f"{position} {self._direction(sort)}")
+        order.extend(position for position in group_positions if position not in sorted_positions)
+
+        sql = (
+            f"SELECT {', '.join(select_sql)}, count(*) OVER () AS total "
+            f"FROM structured_data_rows WHERE {where}"
+        )
+        if group_positions:
+            sql += f" GROUP BY {', '.join(group_positions)}"
+        if order:
+            sql += f" ORDER BY {', '.join(order)}"
+        sql += f" LIMIT {self._bind(query.limit)} OFFSET {self._bind(query.skip)}"
+        return text(sql).bindparams(**self._params), keys
+
+    def index_statement(self, name: str) -> Tuple[str, str]:
+        """
+        DDL for an expression index on one column of this dataset.
+
+        Returns:
+            Tuple of (index name, CREATE INDEX statement).
+        """
+        column = self.column(name)
+        index_name = index_prefix(self.data_id, name) + hashlib.md5(column.sql.encode()).hexdigest()[:8]
+        ddl = (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+            f"ON structured_data_rows (({column.sql}), ordinal) "
+            f"WHERE structured_data_id = {quote_literal(str(self.data_id))}"
+        )
+        return index_name, ddl
@@ -1,12 +1,22 @@
-from typing import Any, Dict
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.models.models import StructuredData
+from src.schemas.data_management import RowQuery
+from src.utils.config import get_settings
+from .bulk_ingest import IngestError, IngestReport, RowValidator, iter_batches, parse_rows
 from .history_service import HistoryService
+from .row_indexes import RowIndexes
+from .row_query import RowQueryBuilder, RowQueryError
+from .row_store import PatchedRow, RowStore, split_rows
 from .structured_data_service import StructuredDataService
 
+settings = get_settings()
 
 class RowService:
     """Service for managing data rows."""
@@ -15,28 +25,160 @@ class RowService:
         self.db = db
         self.structured_data_service = StructuredDataService(db)
         self.history_service = HistoryService(db)
+        self.row_store = RowStore(db)
+        self.row_indexes = RowIndexes()
+
+    async def _get_row_based_data(self, data_id: UUID, user_id: UUID) -> StructuredData:
+        """Load structured data for modification and make sure its rows are in the row table."""
+        structured_data = await self.structured_data_service._get_structured_data(
+            data_id
+        )
+
+        # Verify user authorization
+        if structured_data.conversation.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to modify this data",
+            )
+
+        if not await self.row_store.ensure_row_table(structured_data):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Data is not in row-based format",
+            )
+
+        return structured_data
 
     async def get_rows(
         self, data_id: UUID, user_id: UUID, skip: int = 0, limit: int = 50
     ) -> Dict[str, Any]:
         """Get rows for structured data with pagination."""
-        data = await self.structured_data_service.get_data_by_id(data_id, user_id)
-
-        if not isinstance(data.data, dict) or "rows" not in data.data:
+        structured_data = await self.structured_data_service._get_structured_data(
+            data_id
+        )
+        if structured_data.conversation.user_id != user_id:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Data is not in row-based format",
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this data",
             )
 
-        total_rows = len(data.data["rows"])
-        rows = data.data["rows"][skip : skip + limit]
+        document = structured_data.data if isinstance(structured_data.data, dict) else {}
+        if structured_data.rows_in_table:
+            total_rows = await self.row_store.count(data_id)
+            rows, versions = await self.row_store.get_range(data_id, skip, limit)
+        else:
+            # Legacy document with inline rows (moved to the row table on first write)
+            inline_rows = split_rows(structured_data.data)[1]
+            if inline_rows is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Data is not in row-based format",
+                )
+            total_rows = len(inline_rows)
+            rows = inline_rows[skip : skip + limit]
+            versions = [0] * len(rows)
 
         return {
             "total": total_rows,
             "rows": rows,
-            "column_order": data.data.get("column_order", []),
+            # Row versions for optimistic concurrency on later edits
+            "versions": versions,
+            "column_order": document.get("column_order", []),
         }
 
+    async def _query_builder(self, data_id: UUID, user_id: UUID) -> RowQueryBuilder:
+        """Row query builder for a dataset the user owns, typed by its DataColumns."""
+        structured_data = await self.structured_data_service._get_structured_data(
+            data_id
+        )
+        if structured_data.conversation.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this data",
+            )
+
+        if not structured_data.rows_in_table:
+            # Legacy inline rows are moved to the row table so they can be queried
+            if not await self.row_store.ensure_row_table(structured_data):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Data is not in row-based format",
+                )
+            await self.db.commit()
+
+        return RowQueryBuilder(
+            structured_data.id,
+            column_names=structured_data.column_names or [],
+            column_types={
+                col.name: col.data_type for col in structured_data.columns if col.is_active
+            },
+            array_rows=await self.row_store.row_shape(structured_data.id) == "array",
+        )
+
+    async def query_rows(
+        self, data_id: UUID, user_id: UUID, query: RowQuery
+    ) -> Dict[str, Any]:
+        """
+        Filter, sort and aggregate a dataset's rows in the database.
+
+        Args:
+            data_id: The structured data ID.
+            user_id: The requesting user.
+            query: Filters, sort keys, and optionally group_by/aggregates.
+
+        Returns:
+            Without aggregates: the page of matching rows with their indexes
+            and versions, plus the total match count. With group_by or
+            aggregates: one dict per group and the total number of groups.
+        """
+        builder = await self._query_builder(data_id, user_id)
+        try:
+            if query.group_by or query.aggregates:
+                statement, keys = builder.groups_statement(query)
+                result = await self.db.execute(statement)
+                records = result.all()
+                return {
+                    "total": records[0][-1] if records else 0,
+                    "groups": [dict(zip(keys, record[:-1])) for record in records],
+                }
+
+            result = await self.db.execute(builder.rows_statement(query))
+            records = result.all()
+            total = await self.db.execute(builder.count_statement(query))
+        except RowQueryError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except DBAPIError as e:
+            # e.g. aggregating a column whose stored values don't fit the function
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Query could not be run: {e.orig}",
+            )
+
+        return {
+            "total": total.scalar_one(),
+            "rows": [record.data for record in records],
+            "row_indexes": [record.ordinal for record in records],
+            "versions": [record.version for record in records],
+            "column_order": builder.column_names,
+        }
+
+    async def create_column_index(
+        self, data_id: UUID, user_id: UUID, column_name: str
+    ) -> Dict[str, Any]:
+        """
+        Build an expression index for sorting/filtering one column of a dataset.
+
+        The index is partial to the dataset and built CONCURRENTLY, so writes
+        to other datasets are not blocked while it builds. A dataset may have
+        at most ROW_QUERY_MAX_INDEXES_PER_DATASET of them.
+        """
+        builder = await self._query_builder(data_id, user_id)
+        try:
+            return await self.row_indexes.build(builder, column_name)
+        except RowQueryError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     async def add_row(
         self, data_id: UUID, user_id: UUID, row_data: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -52,20 +194,23 @@ class RowService:
                 detail="Not authorized to modify this data",
             )
 
-        if (
-            not isinstance(structured_data.data, dict)
-            or "rows" not in structured_data.data
-        ):
-            structured_data.data = {"rows": [], "column_order": list(row_data.keys())}
+        if not await self.row_store.ensure_row_table(structured_data):
+            await self.row_store.store_document(
+                structured_data, {"rows": [], "column_order": list(row_data.keys())}
+            )
 
         # Ensure all columns exist
-        for col_name in row_data.keys():
-            if col_name not in structured_data.data.get("column_order", []):
-                structured_data.data["column_order"].append(col_name)
+        column_order = list(structured_data.data.get("column_order", []))
+        new_columns = [col for col in row_data.keys() if col not in column_order]
+        if new_columns:
+            structured_data.data = {
+                **structured_data.data,
+                "column_order": column_order + new_columns,
+            }
+            structured_data.column_names = column_order + new_columns
 
         # Add the new row
-        structured_data.data["rows"].append(row_data)
-        await self.db.commit()
+        await self.row_store.append(structured_data.id, row_data)
 
         await self.history_service.record_change(
             structured_data_id=structured_data.id,
@@ -73,82 +218,232 @@ class RowService:
             change_type="ADD_ROW",
             meta_data={"row_data": row_data},
         )
+        await self.db.commit()
 
         return row_data
 
-    async def update_row(
-        self, data_id: UUID, user_id: UUID, row_index: int, row_data: Dict[str, Any]
+    async def ingest_rows(
+        self,
+        data_id: UUID,
+        user_id: UUID,
+        chunks: AsyncIterator[bytes],
+        fmt: str = "ndjson",
+        mode: str = "append",
+        skip_invalid: bool = False,
     ) -> Dict[str, Any]:
-        """Update a row in structured data."""
+        """
+        Append or replace rows from an NDJSON or CSV stream.
+
+        Rows are parsed as the body streams in, validated against the
+        dataset's DataColumns a batch at a time and inserted in chunks, all
+        in one transaction with a single history entry.
+
+        Args:
+            data_id: The structured data ID.
+            user_id: The uploading user.
+            chunks: The request body.
+            fmt: "ndjson" or "csv".
+            mode: "append" to add after the existing rows, "replace" to swap them out.
+            skip_invalid: Skip rows that fail validation instead of rejecting the upload.
+
+        Returns:
+            The ingestion report (counts, first errors, throughput).
+        """
+        if mode not in ("append", "replace"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="mode must be 'append' or 'replace'",
+            )
+
         structured_data = await self.structured_data_service._get_structured_data(
             data_id
         )
-
-        # Verify user authorization
         if structured_data.conversation.user_id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to modify this data",
             )
 
-        if (
-            not isinstance(structured_data.data, dict)
-            or "rows" not in structured_data.data
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Data is not in row-based format",
+        started = time.perf_counter()
+        if not await self.row_store.ensure_row_table(structured_data):
+            await self.row_store.store_document(
+                structured_data, {"rows": [], "column_order": structured_data.column_names or []}
             )
-
-        if row_index < 0 or row_index >= len(structured_data.data["rows"]):
+        await self.row_store.lock_dataset(structured_data.id)
+        array_rows = mode == "append" and await self.row_store.row_shape(structured_data.id) == "array"
+        if mode == "replace":
+            await self.row_store.replace_rows(structured_data.id, [])
+            start = 0
+        else:
+            start = await self.row_store.count(structured_data.id)
+
+        validator = RowValidator(
+            structured_data.columns,
+            structured_data.data.get("column_order") or structured_data.column_names or [],
+        )
+        report = IngestReport(mode=mode, format=fmt, start_row=start)
+        next_index = start
+        try:
+            async for batch in iter_batches(parse_rows(fmt, chunks)):
+                rows, errors, new_columns = validator.validate(batch, report.rows_received + 1)
+                report.rows_received += len(batch)
+                if report.rows_received > settings.BULK_INGEST_MAX_ROWS:
+                    raise IngestError(f"Uploads are limited to {settings.BULK_INGEST_MAX_ROWS} rows")
+                for error in errors:
+                    report.add_error(error)
+                if errors and not skip_invalid:
+                    break
+                report.rows_skipped += len(batch) - len(rows)
+                report.new_columns.extend(new_columns)
+                if array_rows:
+                    rows = [[row.get(name) for name in validator.column_order] for row in rows]
+                await self.row_store.insert_rows(structured_data.id, rows, start=next_index)
+                next_index += len(rows)
+                report.rows_written += len(rows)
+                report.chunks += 1
+        except IngestError as e:
+            await self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        if report.errors and not skip_invalid:
+            await self.db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Row index out of range"
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"message": "Rows failed validation; nothing was written", **report.to_dict()},
             )
 
-        old_row = structured_data.data["rows"][row_index].copy()
-        structured_data.data["rows"][row_index].update(row_data)
+        structured_data.data = {**structured_data.data, "column_order": validator.column_order}
+        structured_data.column_names = validator.column_order
+        structured_data.row_count = next_index
+
+        await self.history_service.record_change(
+            structured_data_id=structured_data.id,
+            user_id=user_id,
+            change_type=f"BULK_{mode.upper()}",
+            meta_data={
+                "format": fmt,
+                "start_row": start,
+                "rows_written": report.rows_written,
+                "rows_skipped": report.rows_skipped,
+                "new_columns": report.new_columns,
+            },
+        )
         await self.db.commit()
 
+        report.elapsed_seconds = time.perf_counter() - started
+        return report.to_dict()
+
+    async def _apply_edits(
+        self, data_id: UUID, edits: List[Dict[str, Any]]
+    ) -> Dict[int, PatchedRow]:
+        """
+        Patch cells in the database and fail the whole batch if any row was not updated.
+
+        Returns:
+            Patched rows keyed by row index.
+        """
+        patched = {
+            row.row_index: row for row in await self.row_store.patch_rows(data_id, edits)
+        }
+        failed = sorted({edit["row_index"] for edit in edits} - patched.keys())
+        if not failed:
+            return patched
+
+        versions = await self.row_store.get_versions(data_id, failed)
+        await self.db.rollback()
+        expected = {
+            edit["row_index"]: edit["expected_version"]
+            for edit in edits
+            if edit.get("expected_version") is not None
+        }
+        for row_index in failed:
+            if row_index not in versions:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Row index {row_index} out of range",
+                )
+            if row_index in expected and expected[row_index] != versions[row_index]:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=(
+                        f"Row {row_index} was modified by another edit "
+                        f"(expected version {expected[row_index]}, current version {versions[row_index]})"
+                    ),
+                )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Rows {failed} are not key/value rows and cannot be edited by column",
+        )
+
+    async def update_row(
+        self,
+        data_id: UUID,
+        user_id: UUID,
+        row_index: int,
+        row_data: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Update a row in structured data."""
+        structured_data = await self._get_row_based_data(data_id, user_id)
+
+        if not row_data:
+            row = await self.row_store.get_row(structured_data.id, row_index)
+            if row is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Row index out of range"
+                )
+            return row
+
+        edits = [
+            {
+                "row_index": row_index,
+                "column_name": column_name,
+                "value": value,
+                "expected_version": expected_version,
+            }
+            for column_name, value in row_data.items()
+        ]
+        patched = (await self._apply_edits(structured_data.id, edits))[row_index]
+
         await self.history_service.record_change(
             structured_data_id=structured_data.id,
             user_id=user_id,
             change_type="UPDATE_ROW",
             row_index=row_index,
-            meta_data={"old_data": old_row, "new_data": row_data},
+            meta_data={"old_data": patched.old_data, "new_data": row_data},
         )
+        await self.db.commit()
 
-        return structured_data.data["rows"][row_index]
+        return patched.data
 
-    async def delete_row(self, data_id: UUID, user_id: UUID, row_index: int) -> None:
+    async def delete_row(
+        self,
+        data_id: UUID,
+        user_id: UUID,
+        row_index: int,
+        expected_version: Optional[int] = None,
+    ) -> None:
         """Delete a row from structured data."""
-        structured_data = await self.structured_data_service._get_structured_data(
-            data_id
-        )
+        structured_data = await self._get_row_based_data(data_id, user_id)
 
-        # Verify user authorization
-        if structured_data.conversation.user_id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to modify this data",
-            )
-
-        if (
-            not isinstance(structured_data.data, dict)
-            or "rows" not in structured_data.data
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Data is not in row-based format",
-            )
-
-        if row_index < 0 or row_index >= len(structured_data.data["rows"]):
+        deleted_row = await self.row_store.delete_row(
+            structured_data.id, row_index, expected_version
+        )
+        if deleted_row is None:
+            versions = await self.row_store.get_versions(structured_data.id, [row_index])
+            await self.db.rollback()
+            if row_index in versions:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=(
+                        f"Row {row_index} was modified by another edit "
+                        f"(expected version {expected_version}, current version {versions[row_index]})"
+                    ),
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Row index out of range"
             )
 
-        deleted_row = structured_data.data["rows"].pop(row_index)
-        await self.db.commit()
-
         await self.history_service.record_change(
             structured_data_id=structured_data.id,
             user_id=user_id,
@@ -156,40 +451,28 @@ class RowService:
             row_index=row_index,
             meta_data={"deleted_row": deleted_row},
         )
+        await self.db.commit()
 
     async def update_cell(
-        self, data_id: UUID, user_id: UUID, column_name: str, row_index: int, value: Any
+        self,
+        data_id: UUID,
+        user_id: UUID,
+        column_name: str,
+        row_index: int,
+        value: Any,
+        expected_version: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Update a cell value."""
-        structured_data = await self.structured_data_service._get_structured_data(
-            data_id
-        )
+        structured_data = await self._get_row_based_data(data_id, user_id)
 
-        # Verify user authorization
-        if structured_data.conversation.user_id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to modify this data",
-            )
-
-        if (
-            not isinstance(structured_data.data, dict)
-            or "rows" not in structured_data.data
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Data is not in row-based format",
-            )
-
-        if row_index < 0 or row_index >= len(structured_data.data["rows"]):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Row index out of range"
-            )
-
-        row = structured_data.data["rows"][row_index]
-        old_value = row.get(column_name)
-        row[column_name] = value
-        await self.db.commit()
+        edit = {
+            "row_index": row_index,
+            "column_name": column_name,
+            "value": value,
+            "expected_version": expected_version,
+        }
+        patched = (await self._apply_edits(structured_data.id, [edit]))[row_index]
+        old_value = patched.old_data.get(column_name)
 
         await self.history_service.record_change(
             structured_data_id=structured_data.id,
@@ -200,5 +483,51 @@ class RowService:
             old_value=str(old_value) if old_value is not None else None,
             new_value=str(value),
         )
+        await self.db.commit()
+
+        return patched.data
+
+    async def update_cells(
+        self, data_id: UUID, user_id: UUID, edits: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Apply many cell edits in one statement with a single history entry.
+
+        Args:
+            data_id: The structured data ID.
+            user_id: The editing user.
+            edits: Dicts with row_index, column_name, value and optional
+                expected_version. Either every edit applies or none do.
+
+        Returns:
+            Dict with the updated rows and their new versions.
+        """
+        structured_data = await self._get_row_based_data(data_id, user_id)
+
+        patched = await self._apply_edits(structured_data.id, edits)
+
+        await self.history_service.record_change(
+            structured_data_id=structured_data.id,
+            user_id=user_id,
+            change_type="UPDATE_CELLS",
+            meta_data={
+                "edits": [
+                    {
+                        "row_index": edit["row_index"],
+                        "column_name": edit["column_name"],
+                        "old_value": patched[edit["row_index"]].old_data.get(edit["column_name"]),
+                        "new_value": edit["value"],
+                    }
+                    for edit in edits
+                ]
+            },
+        )
+        await self.db.commit()
 
-        return row
+        return {
+            "updated": len(edits),
+            "rows": [
+                {"row_index": row.row_index, "data": row.data, "version": row.version}
+                for row in sorted(patched.values(), key=lambda r: r.row_index)
+            ],
+        }
@@ -0,0 +1,338 @@
+"""
+Row-level storage for row-based StructuredData documents.
+
+A document shaped like {"rows": [...], "column_order": [...], ...} keeps its
+rows in structured_data_rows, one row per (structured_data_id, ordinal), and
+everything else in StructuredData.data. Ordinals are dense 0-based row
+indexes, so a page of rows is a primary-key range scan and a cell edit
+touches a single row instead of rewriting the whole document.
+
+Edits are applied inside the database: a cell or row edit is a JSONB merge
+(data || patch) on the target rows, guarded by each row's version, so the
+application never reads a row just to change part of it.
+"""
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import StructuredData, StructuredDataRow
+
+# Rows per multi-row INSERT when writing a whole dataset
+INSERT_BATCH_SIZE = 1000
+
+
+# Applies a batch of cell edits in one statement. Edits are grouped per row
+# into a patch object (later edits of the same cell win), rows whose version
+# doesn't match are skipped, and the pre-edit row is returned for history.
+_PATCH_ROWS_SQL = text("""
+    WITH edits AS (
+        SELECT e.row_index, e.column_name, e.value, e.expected_version, e.position
+        FROM jsonb_to_recordset(CAST(:edits AS jsonb))
+            AS e(row_index int, column_name text, value jsonb, expected_version int, position int)
+    ),
+    patches AS (
+        SELECT row_index,
+               jsonb_object_agg(column_name, value ORDER BY position) AS patch,
+               min(expected_version) AS min_version,
+               max(expected_version) AS max_version
+        FROM edits
+        GROUP BY row_index
+    ),
+    previous AS (
+        SELECT r.ordinal, r.data, p.patch
+        FROM structured_data_rows r
+        JOIN patches p ON p.row_index = r.ordinal
+        WHERE r.structured_data_id = :data_id
+          AND jsonb_typeof(r.data) = 'object'
+          AND (p.max_version IS NULL OR (r.version = p.min_version AND r.version = p.max_version))
+        FOR UPDATE OF r
+    )
+    UPDATE structured_data_rows AS r
+    SET data = r.data || previous.patch,
+        version = r.version + 1
+    FROM previous
+    WHERE r.structured_data_id = :data_id AND r.ordinal = previous.ordinal
+    RETURNING r.ordinal, previous.data AS old_data, r.data, r.version
+""")
+
+
+@dataclass
+class PatchedRow:
+    """A row changed by RowStore.patch_rows."""
+    row_index: int
+    old_data: Dict[str, Any]
+    data: Dict[str, Any]
+    version: int
+
+
+def split_rows(document: Any) -> Tuple[Any, Optional[List[Any]]]:
+    """
+    Separate the rows of a row-based document from the rest of it.
+
+    Returns:
+        Tuple of (document without "rows", rows), or (document, None) when the
+        document is not row-based.
+    """
+    if isinstance(document, dict) and isinstance(document.get("rows"), list):
+        rest = {key: value for key, value in document.items() if key != "rows"}
+        return rest, document["rows"]
+    return document, None
+
+
+def join_rows(document: Dict[str, Any], rows: List[Any]) -> Dict[str, Any]:
+    """Rebuild the full document from its stored parts."""
+    return {**document, "rows": rows}
+
+
+def column_names_of(document: Any, rows: Optional[Sequence[Any]] = None) -> List[str]:
+    """
+    Column names of a document for its summary.
+
+    Uses column_order, then headers, then the keys of the first row.
+    """
+    if isinstance(document, dict):
+        for key in ("column_order", "headers"):
+            if isinstance(document.get(key), list):
+                return [str(name) for name in document[key]]
+    if rows and isinstance(rows[0], dict):
+        return list(rows[0].keys())
+    return []
+
+
+class RowStore:
+    """Reads and writes the rows of row-based StructuredData."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def lock_dataset(self, data_id: UUID) -> None:
+        """Lock the parent record so appends/deletes don't race on ordinals."""
+        await self.db.execute(
+            select(StructuredData.id).where(StructuredData.id == data_id).with_for_update()
+        )
+
+    async def count(self, data_id: UUID) -> int:
+        result = await self.db.execute(
+            select(func.count()).select_from(StructuredDataRow).where(
+                StructuredDataRow.structured_data_id == data_id
+            )
+        )
+        return result.scalar_one()
+
+    async def get_range(self, data_id: UUID, skip: int, limit: int) -> Tuple[List[Any], List[int]]:
+        """
+        Rows skip..skip+limit-1 in order.
+
+        Returns:
+            Tuple of (rows, row versions).
+        """
+        skip = max(skip, 0)
+        result = await self.db.execute(
+            select(StructuredDataRow.data, StructuredDataRow.version)
+            .where(
+                StructuredDataRow.structured_data_id == data_id,
+                StructuredDataRow.ordinal >= skip,
+                StructuredDataRow.ordinal < skip + max(limit, 0),
+            )
+            .order_by(StructuredDataRow.ordinal)
+        )
+        page = result.all()
+        return [row for row, _ in page], [version for _, version in page]
+
+    async def get_all(self, data_id: UUID) -> List[Any]:
+        result = await self.db.execute(
+            select(StructuredDataRow.data)
+            .where(StructuredDataRow.structured_data_id == data_id)
+            .order_by(StructuredDataRow.ordinal)
+        )
+        return list(result.scalars().all())
+
+    async def get_all_for(self, data_ids: Sequence[UUID]) -> Dict[UUID, List[Any]]:
+        """Rows for several datasets in one query, keyed by dataset ID."""
+        rows: Dict[UUID, List[Any]] = {data_id: [] for data_id in data_ids}
+        if not data_ids:
+            return rows
+        result = await self.db.execute(
+            select(StructuredDataRow.structured_data_id, StructuredDataRow.data)
+            .where(StructuredDataRow.structured_data_id.in_(data_ids))
+            .order_by(StructuredDataRow.structured_data_id, StructuredDataRow.ordinal)
+        )
+        for data_id, row in result.all():
+            rows[data_id].append(row)
+        return rows
+
+    async def get_row(self, data_id: UUID, row_index: int) -> Optional[Any]:
+        """A single row by index, or None if out of range."""
+        result = await self.db.execute(
+            select(StructuredDataRow.data).where(
+                StructuredDataRow.structured_data_id == data_id,
+                StructuredDataRow.ordinal == row_index,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def row_shape(self, data_id: UUID) -> Optional[str]:
+        """JSON type of the first row ("object", "array", ...), or None if there are no rows."""
+        result = await self.db.execute(
+            select(func.jsonb_typeof(StructuredDataRow.data)).where(
+                StructuredDataRow.structured_data_id == data_id,
+                StructuredDataRow.ordinal == 0,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_versions(self, data_id: UUID, row_indexes: Sequence[int]) -> Dict[int, int]:
+        """Current versions of the given rows (missing rows are absent)."""
+        result = await self.db.execute(
+            select(StructuredDataRow.ordinal, StructuredDataRow.version).where(
+                StructuredDataRow.structured_data_id == data_id,
+                StructuredDataRow.ordinal.in_(row_indexes),
+            )
+        )
+        return dict(result.all())
+
+    async def insert_rows(self, data_id: UUID, rows: Sequence[Any], start: int = 0) -> None:
+        """Insert rows with ordinals start, start+1, ... in batched multi-row INSERTs."""
+        for offset in range(0, len(rows), INSERT_BATCH_SIZE):
+            batch = rows[offset:offset + INSERT_BATCH_SIZE]
+            await self.db.execute(
+                insert(StructuredDataRow),
+                [
+                    {"structured_data_id": data_id, "ordinal": start + offset + i, "data": row}
+                    for i, row in enumerate(batch)
+                ],
+            )
+
+    async def replace_rows(self, data_id: UUID, rows: Sequence[Any]) -> None:
+        await self.db.execute(
+            delete(StructuredDataRow).where(StructuredDataRow.structured_data_id == data_id)
+        )
+        await self.insert_rows(data_id, rows)
+
+    async def append(self, data_id: UUID, row: Any) -> int:
+        """Append a row and return its index."""
+        await self.lock_dataset(data_id)
+        result = await self.db.execute(
+            select(func.coalesce(func.max(StructuredDataRow.ordinal) + 1, 0)).where(
+                StructuredDataRow.structured_data_id == data_id
+            )
+        )
+        row_index = result.scalar_one()
+        await self.insert_rows(data_id, [row], start=row_index)
+        await self._add_to_row_count(data_id, 1)
+        return row_index
+
+    async def _add_to_row_count(self, data_id: UUID, delta: int) -> None:
+        await self.db.execute(
+            update(StructuredData)
+            .where(StructuredData.id == data_id)
+            .values(row_count=StructuredData.row_count + delta, updated_at=func.now())
+        )
+
+    async def patch_rows(self, data_id: UUID, edits: Sequence[Dict[str, Any]]) -> List[PatchedRow]:
+        """
+        Apply cell edits in the database with one UPDATE.
+
+        Args:
+            data_id: The dataset.
+            edits: Dicts with row_index, column_name, value and optionally
+                expected_version. Several edits may target the same row.
+
+        Returns:
+            The rows that were changed. Rows that don't exist, aren't objects,
+            or whose version doesn't match an expected_version are left
+            untouched and omitted, so callers should compare against the
+            requested row indexes.
+        """
+        payload = [
+            {
+                "row_index": edit["row_index"],
+                "column_name": edit["column_name"],
+                "value": edit["value"],
+                "expected_version": edit.get("expected_version"),
+                "position": position,
+            }
+            for position, edit in enumerate(edits)
+        ]
+        result = await self.db.execute(
+            _PATCH_ROWS_SQL,
+            {"data_id": data_id, "edits": json.dumps(payload, default=str)},
+        )
+        return [
+            PatchedRow(row_index=ordinal, old_data=old_data, data=data, version=version)
+            for ordinal, old_data, data, version in result.all()
+        ]
+
+    async def delete_row(
+        self, data_id: UUID, row_index: int, expected_version: Optional[int] = None
+    ) -> Optional[Any]:
+        """
+        Delete a row, shift the following rows up, and return the deleted row.
+
+        Returns None if the row doesn't exist or its version differs from
+        expected_version.
+        """
+        await self.lock_dataset(data_id)
+        query = delete(StructuredDataRow).where(
+            StructuredDataRow.structured_data_id == data_id,
+            StructuredDataRow.ordinal == row_index,
+        )
+        if expected_version is not None:
+            query = query.where(StructuredDataRow.version == expected_version)
+        result = await self.db.execute(query.returning(StructuredDataRow.data))
+        deleted = result.scalar_one_or_none()
+        if deleted is None:
+            return None
+        await self.db.execute(
+            update(StructuredDataRow)
+            .where(
+                StructuredDataRow.structured_data_id == data_id,
+                StructuredDataRow.ordinal > row_index,
+            )
+            .values(ordinal=StructuredDataRow.ordinal - 1)
+        )
+        await self._add_to_row_count(data_id, -1)
+        return deleted
+
+    async def store_document(self, structured_data: StructuredData, document: Any) -> None:
+        """
+        Set a dataset's document, moving its rows (if any) into the row table.
+
+        The StructuredData must already have an ID (flushed or loaded).
+        """
+        rest, rows = split_rows(document)
+        structured_data.row_count = len(rows or [])
+        structured_data.column_names = column_names_of(document, rows)
+        if rows is None:
+            if structured_data.rows_in_table:
+                await self.replace_rows(structured_data.id, [])
+            structured_data.data = document
+            structured_data.rows_in_table = False
+            return
+        structured_data.data = rest
+        structured_data.rows_in_table = True
+        await self.replace_rows(structured_data.id, rows)
+
+    async def ensure_row_table(self, structured_data: StructuredData) -> bool:
+        """
+        Move inline rows of a legacy row-based document into the row table.
+
+        Returns:
+            True if the dataset is row-based (its rows are in the table).
+        """
+        if structured_data.rows_in_table:
+            return True
+        if split_rows(structured_data.data)[1] is None:
+            return False
+        await self.store_document(structured_data, structured_data.data)
+        return True
+
+    async def load_document(self, structured_data: StructuredData) -> Any:
+        """The full document for a dataset, with rows reattached."""
+        if not structured_data.rows_in_table:
+            return structured_data.data
+        return join_rows(structured_data.data or {}, await self.get_all(structured_data.id))
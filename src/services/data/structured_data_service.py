@@ -1,8 +1,11 @@
-from typing import Any, Dict, List, Optional
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import desc, select, text
+from sqlalchemy import desc, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -10,9 +13,13 @@ from src.models.models import Conversation, StructuredData
 from src.schemas.data_management import (
     StructuredDataCreate,
     StructuredDataResponse,
+    StructuredDataSummary,
+    StructuredDataSummaryPage,
     StructuredDataUpdate,
 )
 from src.services.data.history_service import HistoryService
+from src.services.data.row_indexes import RowIndexes
+from src.services.data.row_store import RowStore, join_rows
 
 
 class StructuredDataService:
@@ -21,6 +28,7 @@ class StructuredDataService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.history_service = HistoryService(db)
+        self.row_store = RowStore(db)
 
     async def _get_structured_data(self, structured_data_id: UUID) -> StructuredData:
         """Get structured data by ID without user verification."""
@@ -73,14 +81,104 @@ class StructuredDataService:
         result = await self.db.execute(query)
         data_list = result.scalars().all()
 
+        # Fetch the rows of all row-based datasets in one query
+        rows_by_id = await self.row_store.get_all_for(
+            [data.id for data in data_list if data.rows_in_table]
+        )
+
         # Process the data within the database session context
         response_data = []
         for data in data_list:
-            data_dict = self._prepare_data_response(data)
+            data_dict = self._prepare_data_response(data, rows_by_id.get(data.id))
             response_data.append(StructuredDataResponse.model_validate(data_dict))
 
         return response_data
 
+    async def get_data_summaries(
+        self, user_id: UUID, limit: int = 50, cursor: Optional[str] = None
+    ) -> StructuredDataSummaryPage:
+        """
+        List a user's structured data without loading the data itself.
+
+        Only metadata columns are selected (the data document, its rows and
+        its column configs are never read), and pages are fetched by keyset on
+        (created_at, id) so deep pages cost the same as the first.
+
+        Args:
+            user_id: The owner.
+            limit: Page size.
+            cursor: next_cursor from the previous page.
+
+        Returns:
+            A page of summaries, newest first.
+        """
+        query = (
+            select(
+                StructuredData.id,
+                StructuredData.conversation_id,
+                Conversation.title,
+                StructuredData.data_type,
+                StructuredData.row_count,
+                StructuredData.column_names,
+                StructuredData.created_at,
+                StructuredData.updated_at,
+            )
+            .join(Conversation, StructuredData.conversation_id == Conversation.id)
+            .where(
+                Conversation.user_id == user_id,
+                StructuredData.deleted_at.is_(None),
+            )
+            .order_by(desc(StructuredData.created_at), desc(StructuredData.id))
+            .limit(limit + 1)
+        )
+        if cursor:
+            created_at, last_id = self._decode_cursor(cursor)
+            query = query.where(
+                or_(
+                    StructuredData.created_at < created_at,
+                    (StructuredData.created_at == created_at) & (StructuredData.id < last_id),
+                )
+            )
+
+        result = await self.db.execute(query)
+        records = result.all()
+
+        items = [
+            StructuredDataSummary(
+                id=record.id,
+                conversation_id=record.conversation_id,
+                title=record.title,
+                data_type=record.data_type,
+                row_count=record.row_count,
+                column_count=len(record.column_names or []),
+                column_names=record.column_names or [],
+                created_at=record.created_at,
+                updated_at=record.updated_at,
+            )
+            for record in records[:limit]
+        ]
+        next_cursor = None
+        if len(records) > limit:
+            next_cursor = self._encode_cursor(items[-1].created_at, items[-1].id)
+
+        return StructuredDataSummaryPage(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def _encode_cursor(created_at: datetime, data_id: UUID) -> str:
+        payload = json.dumps([created_at.isoformat(), str(data_id)])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+        try:
+            created_at, data_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(created_at), UUID(data_id)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
     async def get_data_by_id(
         self, data_id: UUID, user_id: UUID
     ) -> StructuredDataResponse:
@@ -92,10 +190,18 @@ class StructuredDataService:
                 detail="Not authorized to access this data",
             )
 
-        data_dict = self._prepare_data_response(data)
+        data_dict = self._prepare_data_response(data, await self._get_rows(data))
         return StructuredDataResponse.model_validate(data_dict)
 
-    def _prepare_data_response(self, data: StructuredData) -> Dict[str, Any]:
+    async def _get_rows(self, data: StructuredData) -> Optional[List[Any]]:
+        """Rows of a row-based dataset, or None if its document is stored inline."""
+        if not data.rows_in_table:
+            return None
+        return await self.row_store.get_all(data.id)
+
+    def _prepare_data_response(
+        self, data: StructuredData, rows: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
         """Prepare structured data response dictionary."""
         columns_list = []
         for col in data.columns:
@@ -117,7 +223,7 @@ class StructuredDataService:
             "conversation_id": data.conversation_id,
             "data_type": data.data_type,
             "schema_version": data.schema_version,
-            "data": data.data,
+            "data": join_rows(data.data, rows or []) if data.rows_in_table else data.data,
             "meta_data": data.meta_data,
             "created_at": data.created_at,
             "updated_at": data.updated_at,
@@ -143,6 +249,9 @@ class StructuredDataService:
         # Flush to get the ID without committing the transaction
         await self.db.flush()
 
+        # Rows go to the row table; the rest of the document stays on the record
+        await self.row_store.store_document(structured_data, data.data)
+
         # Record the change history
         await self.history_service.record_change(
             structured_data_id=structured_data.id,
@@ -174,10 +283,10 @@ class StructuredDataService:
 
         update_data = data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
-            setattr(structured_data, key, value)
-
-        await self.db.commit()
-        await self.db.refresh(structured_data)
+            if key == "data":
+                await self.row_store.store_document(structured_data, value)
+            else:
+                setattr(structured_data, key, value)
 
         await self.history_service.record_change(
             structured_data_id=structured_data.id,
@@ -185,6 +294,8 @@ class StructuredDataService:
             change_type="UPDATE_DATA",
             meta_data={"updated_fields": list(update_data.keys())},
         )
+        await self.db.commit()
+        await self.db.refresh(structured_data)
 
         return structured_data
 
@@ -218,22 +329,26 @@ class StructuredDataService:
                 detail="Not authorized to access this data",
             )
 
-        if soft_delete:
-            from datetime import datetime
-
-            structured_data.deleted_at = datetime.utcnow()
-            await self.db.commit()
-        else:
-            await self.db.delete(structured_data)
-            await self.db.commit()
-
         await self.history_service.record_change(
             structured_data_id=structured_data.id,
             user_id=user_id,
             change_type="DELETE_DATA",
             meta_data={"soft_delete": soft_delete},
+            # A hard delete flushes the entry before the record goes; the flusher would run too late
+            background=soft_delete,
         )
 
+        if soft_delete:
+            structured_data.deleted_at = datetime.utcnow()
+            await self.db.commit()
+        else:
+            # Flush the history first; deleting the record cascades to it
+            await self.history_service.flush()
+            await self.db.delete(structured_data)
+            await self.db.commit()
+            # The rows are gone; their per-dataset indexes on the shared table aren't
+            await RowIndexes().drop(structured_data.id)
+
     async def get_data_by_message_id(
         self, message_id: UUID, user_id: UUID
     ) -> StructuredDataResponse:
@@ -263,5 +378,5 @@ class StructuredDataService:
                 detail="Structured data not found for this message",
             )
 
-        data_dict = self._prepare_data_response(data)
+        data_dict = self._prepare_data_response(data, await self._get_rows(data))
         return StructuredDataResponse.model_validate(data_dict)
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,8 +6,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas.data_management import (
     ColumnCreate,
     ColumnUpdate,
+    DataUpdate,
+    RowQuery,
     StructuredDataCreate,
     StructuredDataResponse,
+    StructuredDataSummaryPage,
     StructuredDataUpdate,
 )
 from src.services.data import (
@@ -34,6 +37,12 @@ class DataManagementService:
         """Get all structured data for a user."""
         return await self.structured_data_service.get_all_data(user_id)
 
+    async def get_data_summaries(
+        self, user_id: UUID, limit: int = 50, cursor: Optional[str] = None
+    ) -> StructuredDataSummaryPage:
+        """List structured data metadata for a user, one keyset page at a time."""
+        return await self.structured_data_service.get_data_summaries(user_id, limit, cursor)
+
     async def get_data_by_id(
         self, data_id: UUID, user_id: UUID
     ) -> StructuredDataResponse:
@@ -114,28 +123,81 @@ class DataManagementService:
         """Get rows for structured data with pagination."""
         return await self.row_service.get_rows(data_id, user_id, skip, limit)
 
+    async def query_rows(
+        self, data_id: UUID, user_id: UUID, query: RowQuery
+    ) -> Dict[str, Any]:
+        """Filter, sort and aggregate rows in the database."""
+        return await self.row_service.query_rows(data_id, user_id, query)
+
+    async def create_column_index(
+        self, data_id: UUID, user_id: UUID, column_name: str
+    ) -> Dict[str, Any]:
+        """Index a column of a dataset for server-side sorting and filtering."""
+        return await self.row_service.create_column_index(data_id, user_id, column_name)
+
     async def add_row(
         self, data_id: UUID, user_id: UUID, row_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Add a new row to structured data."""
         return await self.row_service.add_row(data_id, user_id, row_data)
 
+    async def ingest_rows(
+        self,
+        data_id: UUID,
+        user_id: UUID,
+        chunks: AsyncIterator[bytes],
+        fmt: str = "ndjson",
+        mode: str = "append",
+        skip_invalid: bool = False,
+    ) -> Dict[str, Any]:
+        """Bulk append or replace rows from an NDJSON or CSV stream."""
+        return await self.row_service.ingest_rows(
+            data_id, user_id, chunks, fmt, mode, skip_invalid
+        )
+
     async def update_row(
-        self, data_id: UUID, user_id: UUID, row_index: int, row_data: Dict[str, Any]
+        self,
+        data_id: UUID,
+        user_id: UUID,
+        row_index: int,
+        row_data: Dict[str, Any],
+        expected_version: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Update a row in structured data."""
-        return await self.row_service.update_row(data_id, user_id, row_index, row_data)
+        return await self.row_service.update_row(
+            data_id, user_id, row_index, row_data, expected_version
+        )
 
-    async def delete_row(self, data_id: UUID, user_id: UUID, row_index: int) -> None:
+    async def delete_row(
+        self,
+        data_id: UUID,
+        user_id: UUID,
+        row_index: int,
+        expected_version: Optional[int] = None,
+    ) -> None:
         """Delete a row from structured data."""
-        await self.row_service.delete_row(data_id, user_id, row_index)
+        await self.row_service.delete_row(data_id, user_id, row_index, expected_version)
 
     async def update_cell(
-        self, data_id: UUID, user_id: UUID, column_name: str, row_index: int, value: Any
+        self,
+        data_id: UUID,
+        user_id: UUID,
+        column_name: str,
+        row_index: int,
+        value: Any,
+        expected_version: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Update a cell value."""
         return await self.row_service.update_cell(
-            data_id, user_id, column_name, row_index, value
+            data_id, user_id, column_name, row_index, value, expected_version
+        )
+
+    async def update_cells(
+        self, data_id: UUID, user_id: UUID, edits: List[DataUpdate]
+    ) -> Dict[str, Any]:
+        """Apply a batch of cell edits atomically."""
+        return await self.row_service.update_cells(
+            data_id, user_id, [edit.model_dump() for edit in edits]
         )
 
     # History Operations
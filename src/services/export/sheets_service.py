@@ -5,11 +5,14 @@ from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 import os.path
 import json
+import logging
 from fastapi import HTTPException
 from urllib.parse import urlencode
 
 from .template_service import SheetTemplate
 
+logger = logging.getLogger(__name__)
+
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
 class GoogleSheetsService:
@@ -58,43 +61,42 @@ class GoogleSheetsService:
     async def initialize_from_token(self, token_path: str) -> bool:
         """Initialize service from saved token."""
         try:
-            print(f"DEBUG: Initializing from token: {token_path}")
+            logger.debug(f"Initializing from token: {token_path}")
             if os.path.exists(token_path):
-                print(f"DEBUG: Token file exists")
+                logger.debug(f"Token file exists")
                 with open(token_path, 'r') as token:
                     creds_data = json.load(token)
-                    print(f"DEBUG: Loaded token data with keys: {list(creds_data.keys())}")
+                    logger.debug(f"Loaded token data with keys: {list(creds_data.keys())}")
                     self.credentials = Credentials.from_authorized_user_info(creds_data, SCOPES)
-                    print(f"DEBUG: Created credentials object")
+                    logger.debug(f"Created credentials object")
 
                 if self.credentials and self.credentials.valid:
-                    print(f"DEBUG: Credentials are valid")
+                    logger.debug(f"Credentials are valid")
                     self.service = build('sheets', 'v4', credentials=self.credentials)
-                    print(f"DEBUG: Built service")
+                    logger.debug(f"Built service")
                     return True
                 elif self.credentials and self.credentials.expired and self.credentials.refresh_token:
-                    print(f"DEBUG: Credentials expired, refreshing")
+                    logger.debug(f"Credentials expired, refreshing")
                     self.credentials.refresh(Request())
-                    print(f"DEBUG: Credentials refreshed")
+                    logger.debug(f"Credentials refreshed")
                     with open(token_path, 'w') as token:
                         token.write(self.credentials.to_json())
-                        print(f"DEBUG: Saved refreshed token")
+                        logger.debug(f"Saved refreshed token")
                     self.service = build('sheets', 'v4', credentials=self.credentials)
-                    print(f"DEBUG: Built service after refresh")
+                    logger.debug(f"Built service after refresh")
                     return True
                 else:
-                    print(f"DEBUG: Credentials invalid or missing refresh token")
-                    print(f"DEBUG: Valid: {self.credentials.valid if self.credentials else 'No credentials'}")
-                    print(f"DEBUG: Expired: {self.credentials.expired if self.credentials else 'No credentials'}")
-                    print(f"DEBUG: Has refresh token: {bool(self.credentials.refresh_token) if self.credentials else 'No credentials'}")
+                    logger.debug(f"Credentials invalid or missing refresh token")
+                    logger.debug(f"Valid: {self.credentials.valid if self.credentials else 'No credentials'}")
+                    logger.debug(f"Expired: {self.credentials.expired if self.credentials else 'No credentials'}")
+                    logger.debug(f"Has refresh token: {bool(self.credentials.refresh_token) if self.credentials else 'No credentials'}")
             else:
-                print(f"DEBUG: Token file does not exist: {token_path}")
+                logger.debug(f"Token file does not exist: {token_path}")
             return False
         except Exception as e:
-            print(f"DEBUG: Error in initialize_from_token: {str(e)}")
-            print(f"DEBUG: Error type: {type(e)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Error in initialize_from_token: {str(e)}")
+            logger.debug(f"Error type: {type(e)}")
+            logger.debug("Traceback:", exc_info=True)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to initialize from token: {str(e)}"
@@ -109,9 +111,9 @@ class GoogleSheetsService:
             import random
             from googleapiclient.errors import HttpError
             
-            print(f"DEBUG: Creating spreadsheet with title: {title} and pre-populated data")
-            print(f"DEBUG: Data length: {len(data)}")
-            print(f"DEBUG: First few rows: {data[:2] if data else 'No data'}")
+            logger.debug(f"Creating spreadsheet with title: {title} and pre-populated data")
+            logger.debug(f"Data length: {len(data)}")
+            logger.debug(f"First few rows: {data[:2] if data else 'No data'}")
             
             # Define the column count and row count
             col_count = len(data[0]) if data and data[0] else 1
@@ -120,7 +122,7 @@ class GoogleSheetsService:
             # Approach 1: Try creating an empty spreadsheet and then adding data in one batch update
             # This reduces API complexity and potential failure points
             try:
-                print(f"DEBUG: Trying two-step approach (create empty + batch update)")
+                logger.debug(f"Trying two-step approach (create empty + batch update)")
                 
                 # First create an empty spreadsheet with proper dimensions
                 sheets_body = {
@@ -143,17 +145,17 @@ class GoogleSheetsService:
                 # Step 1: Create the empty spreadsheet
                 while retry < max_retries:
                     try:
-                        print(f"DEBUG: Creating empty spreadsheet")
+                        logger.debug(f"Creating empty spreadsheet")
                         request = self.service.spreadsheets().create(body=sheets_body)
                         response = request.execute()
                         spreadsheet_id = response['spreadsheetId']
                         spreadsheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
-                        print(f"DEBUG: Created empty spreadsheet with ID: {spreadsheet_id}")
+                        logger.debug(f"Created empty spreadsheet with ID: {spreadsheet_id}")
                         break
                     except HttpError as error:
                         if error.resp.status == 429 and retry < max_retries - 1:
                             wait_time = (2 ** retry) + (random.random() * 0.5)
-                            print(f"DEBUG: Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                            logger.debug(f"Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                             time.sleep(wait_time)
                             retry += 1
                         else:
@@ -166,7 +168,7 @@ class GoogleSheetsService:
                 retry = 0
                 while retry < max_retries:
                     try:
-                        print(f"DEBUG: Adding data with batch update")
+                        logger.debug(f"Adding data with batch update")
                         batch_body = {
                             'valueInputOption': 'USER_ENTERED',
                             'data': [{
@@ -180,22 +182,22 @@ class GoogleSheetsService:
                             body=batch_body
                         ).execute()
                         
-                        print(f"DEBUG: Successfully added data with batch update: {batch_response}")
+                        logger.debug(f"Successfully added data with batch update: {batch_response}")
                         return spreadsheet_id, spreadsheet_url
                     except HttpError as error:
                         if error.resp.status == 429 and retry < max_retries - 1:
                             wait_time = (2 ** retry) + (random.random() * 0.5)
-                            print(f"DEBUG: Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                            logger.debug(f"Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                             time.sleep(wait_time)
                             retry += 1
                         else:
                             # For non-rate limit errors or exhausted retries, try the original approach
-                            print(f"DEBUG: Batch update failed: {str(error)}")
-                            print(f"DEBUG: Falling back to original approach")
+                            logger.debug(f"Batch update failed: {str(error)}")
+                            logger.debug(f"Falling back to original approach")
                             raise ValueError("Batch update failed")
             except Exception as two_step_error:
-                print(f"DEBUG: Two-step approach failed: {str(two_step_error)}")
-                print(f"DEBUG: Falling back to original approach (pre-populated creation)")
+                logger.debug(f"Two-step approach failed: {str(two_step_error)}")
+                logger.debug(f"Falling back to original approach (pre-populated creation)")
             
             # Original approach: Create spreadsheet with pre-populated data
             sheets_body = {
@@ -229,7 +231,7 @@ class GoogleSheetsService:
                 ]
             }
             
-            print(f"DEBUG: Calling spreadsheets().create() API with pre-populated data")
+            logger.debug(f"Calling spreadsheets().create() API with pre-populated data")
             # Implement exponential backoff for the original approach
             max_retries = 5
             retry = 0
@@ -237,17 +239,17 @@ class GoogleSheetsService:
             while retry < max_retries:
                 try:
                     request = self.service.spreadsheets().create(body=sheets_body)
-                    print(f"DEBUG: Executing API request")
+                    logger.debug(f"Executing API request")
                     response = request.execute()
-                    print(f"DEBUG: API response keys: {response.keys()}")
+                    logger.debug(f"API response keys: {response.keys()}")
                     spreadsheet_id = response['spreadsheetId']
                     spreadsheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
-                    print(f"DEBUG: Created spreadsheet with ID: {spreadsheet_id}")
+                    logger.debug(f"Created spreadsheet with ID: {spreadsheet_id}")
                     return spreadsheet_id, spreadsheet_url
                 except HttpError as error:
                     if error.resp.status == 429 and retry < max_retries - 1:
                         wait_time = (2 ** retry) + (random.random() * 0.5)
-                        print(f"DEBUG: Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                        logger.debug(f"Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                         time.sleep(wait_time)
                         retry += 1
                     else:
@@ -255,10 +257,9 @@ class GoogleSheetsService:
             
             raise HTTPException(status_code=429, detail="Rate limit exceeded after multiple retries")
         except Exception as e:
-            print(f"DEBUG: Error in create_spreadsheet_with_data: {str(e)}")
-            print(f"DEBUG: Error type: {type(e)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Error in create_spreadsheet_with_data: {str(e)}")
+            logger.debug(f"Error type: {type(e)}")
+            logger.debug("Traceback:", exc_info=True)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to create spreadsheet with data: {str(e)}"
@@ -302,13 +303,13 @@ class GoogleSheetsService:
             # Handle folder operations based on user preference
             if folder_id:
                 # Use the provided folder ID directly
-                print(f"DEBUG: Using provided folder ID: {folder_id}")
+                logger.debug(f"Using provided folder ID: {folder_id}")
                 output_folder_id = folder_id
                 folder_url = f"https://drive.google.com/drive/folders/{folder_id}"
             elif use_drive_picker:
                 # For Google Drive picker implementation, we'll return special URLs that
                 # the frontend can use to trigger the Google Drive picker
-                print(f"DEBUG: Using Google Drive picker for folder selection")
+                logger.debug(f"Using Google Drive picker for folder selection")
                 # We'll let the actual file creation happen first, then we can move it
                 # to the selected folder via a separate API call after the picker selection
                 output_folder_id = "USE_PICKER"
@@ -330,7 +331,7 @@ class GoogleSheetsService:
                             if items:
                                 # Use the first matching folder
                                 output_folder_id = items[0]['id']
-                                print(f"DEBUG: Found existing folder with ID: {output_folder_id}")
+                                logger.debug(f"Found existing folder with ID: {output_folder_id}")
                                 break
                             else:
                                 # Create a new folder with retry logic
@@ -340,28 +341,28 @@ class GoogleSheetsService:
                                 }
                                 folder = drive_service.files().create(body=folder_metadata, fields='id').execute()
                                 output_folder_id = folder.get('id')
-                                print(f"DEBUG: Created new folder with ID: {output_folder_id}")
+                                logger.debug(f"Created new folder with ID: {output_folder_id}")
                                 break
                         except HttpError as error:
                             if error.resp.status == 429 and retry < max_retries - 1:
                                 wait_time = (2 ** retry) + (random.random() * 0.5)
-                                print(f"DEBUG: Rate limit hit in folder operation, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                                logger.debug(f"Rate limit hit in folder operation, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                                 time.sleep(wait_time)
                                 retry += 1
                             else:
-                                print(f"DEBUG: Non-recoverable error in folder operation: {str(error)}")
+                                logger.debug(f"Non-recoverable error in folder operation: {str(error)}")
                                 # Continue without folder if there's an error
                                 break
                     
                     if output_folder_id:
                         folder_url = f"https://drive.google.com/drive/folders/{output_folder_id}"
-                        print(f"DEBUG: Folder URL: {folder_url}")
+                        logger.debug(f"Folder URL: {folder_url}")
                 except Exception as folder_error:
-                    print(f"DEBUG: Error creating/accessing folder: {str(folder_error)}")
+                    logger.debug(f"Error creating/accessing folder: {str(folder_error)}")
                     # Continue without folder if there's an error
             
             # Create spreadsheet with retry logic
-            print(f"DEBUG: Creating spreadsheet with title: {title}")
+            logger.debug(f"Creating spreadsheet with title: {title}")
             spreadsheet = {
                 'properties': {
                     'title': title
@@ -371,18 +372,18 @@ class GoogleSheetsService:
             retry = 0
             while retry < max_retries:
                 try:
-                    print(f"DEBUG: Calling spreadsheets().create() API")
+                    logger.debug(f"Calling spreadsheets().create() API")
                     request = self.service.spreadsheets().create(body=spreadsheet)
-                    print(f"DEBUG: Executing API request")
+                    logger.debug(f"Executing API request")
                     response = request.execute()
-                    print(f"DEBUG: API response: {response}")
+                    logger.debug(f"API response: {response}")
                     spreadsheet_id = response['spreadsheetId']
                     spreadsheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
                     break
                 except HttpError as error:
                     if error.resp.status == 429 and retry < max_retries - 1:
                         wait_time = (2 ** retry) + (random.random() * 0.5)
-                        print(f"DEBUG: Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                        logger.debug(f"Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                         time.sleep(wait_time)
                         retry += 1
                     else:
@@ -407,28 +408,27 @@ class GoogleSheetsService:
                                 addParents=output_folder_id,
                                 fields='id, parents'
                             ).execute()
-                            print(f"DEBUG: Moved spreadsheet to folder: {output_folder_id}")
+                            logger.debug(f"Moved spreadsheet to folder: {output_folder_id}")
                             break
                         except HttpError as error:
                             if error.resp.status == 429 and retry < max_retries - 1:
                                 wait_time = (2 ** retry) + (random.random() * 0.5)
-                                print(f"DEBUG: Rate limit hit in move operation, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                                logger.debug(f"Rate limit hit in move operation, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                                 time.sleep(wait_time)
                                 retry += 1
                             else:
-                                print(f"DEBUG: Non-recoverable error in move operation: {str(error)}")
+                                logger.debug(f"Non-recoverable error in move operation: {str(error)}")
                                 # Continue even if move fails
                                 break
                 except Exception as move_error:
-                    print(f"DEBUG: Error moving spreadsheet to folder: {str(move_error)}")
+                    logger.debug(f"Error moving spreadsheet to folder: {str(move_error)}")
                     # Continue even if move fails
             
             return spreadsheet_id, spreadsheet_url, output_folder_id, folder_url
         except Exception as e:
-            print(f"DEBUG: Error in create_spreadsheet: {str(e)}")
-            print(f"DEBUG: Error type: {type(e)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Error in create_spreadsheet: {str(e)}")
+            logger.debug(f"Error type: {type(e)}")
+            logger.debug("Traceback:", exc_info=True)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to create spreadsheet: {str(e)}"
@@ -449,11 +449,11 @@ class GoogleSheetsService:
             import random
             from googleapiclient.errors import HttpError
             
-            print(f"DEBUG: Appending values to spreadsheet {spreadsheet_id}")
-            print(f"DEBUG: Range: {range_name}")
-            print(f"DEBUG: Value input option: {value_input_option}")
-            print(f"DEBUG: Values length: {len(values) if values else 0}")
-            print(f"DEBUG: First row sample: {values[0] if values and len(values) > 0 else 'No data'}")
+            logger.debug(f"Appending values to spreadsheet {spreadsheet_id}")
+            logger.debug(f"Range: {range_name}")
+            logger.debug(f"Value input option: {value_input_option}")
+            logger.debug(f"Values length: {len(values) if values else 0}")
+            logger.debug(f"First row sample: {values[0] if values and len(values) > 0 else 'No data'}")
             
             # Filter out None or undefined values
             filtered_values = []
@@ -470,15 +470,15 @@ class GoogleSheetsService:
                         filtered_row.append(cell)
                 filtered_values.append(filtered_row)
                 
-            print(f"DEBUG: Filtered values length: {len(filtered_values)}")
-            print(f"DEBUG: First filtered row: {filtered_values[0] if filtered_values else 'No data'}")
+            logger.debug(f"Filtered values length: {len(filtered_values)}")
+            logger.debug(f"First filtered row: {filtered_values[0] if filtered_values else 'No data'}")
             
             body = {
                 'values': filtered_values
             }
             
             # Try batch append to improve performance if possible
-            print(f"DEBUG: Making API request to append values")
+            logger.debug(f"Making API request to append values")
             
             # Implement exponential backoff with retry for rate limiting
             max_retries = 5
@@ -494,16 +494,16 @@ class GoogleSheetsService:
                         body=body
                     )
                     
-                    print(f"DEBUG: Executing API request")
+                    logger.debug(f"Executing API request")
                     response = request.execute()
-                    print(f"DEBUG: API response: {response}")
+                    logger.debug(f"API response: {response}")
                     return response
                     
                 except HttpError as error:
                     if error.resp.status == 429 and retry < max_retries - 1:
                         # Calculate exponential backoff with jitter
                         wait_time = (2 ** retry) + (random.random() * 0.5)
-                        print(f"DEBUG: Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                        logger.debug(f"Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                         time.sleep(wait_time)
                         retry += 1
                     else:
@@ -512,10 +512,9 @@ class GoogleSheetsService:
             
             raise HTTPException(status_code=429, detail="Rate limit exceeded after multiple retries")
         except Exception as e:
-            print(f"DEBUG: Error appending values: {str(e)}")
-            print(f"DEBUG: Error type: {type(e)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Error appending values: {str(e)}")
+            logger.debug(f"Error type: {type(e)}")
+            logger.debug("Traceback:", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to append to spreadsheet: {str(e)}")
     
     async def update_values(
@@ -533,11 +532,11 @@ class GoogleSheetsService:
             import random
             from googleapiclient.errors import HttpError
             
-            print(f"DEBUG: Updating values in spreadsheet {spreadsheet_id}")
-            print(f"DEBUG: Range: {range_name}")
-            print(f"DEBUG: Value input option: {value_input_option}")
-            print(f"DEBUG: Values length: {len(values) if values else 0}")
-            print(f"DEBUG: First row sample: {values[0] if values and len(values) > 0 else 'No data'}")
+            logger.debug(f"Updating values in spreadsheet {spreadsheet_id}")
+            logger.debug(f"Range: {range_name}")
+            logger.debug(f"Value input option: {value_input_option}")
+            logger.debug(f"Values length: {len(values) if values else 0}")
+            logger.debug(f"First row sample: {values[0] if values and len(values) > 0 else 'No data'}")
             
             # Filter out None or undefined values
             filtered_values = []
@@ -554,8 +553,8 @@ class GoogleSheetsService:
                         filtered_row.append(cell)
                 filtered_values.append(filtered_row)
                 
-            print(f"DEBUG: Filtered values length: {len(filtered_values)}")
-            print(f"DEBUG: First filtered row: {filtered_values[0] if filtered_values else 'No data'}")
+            logger.debug(f"Filtered values length: {len(filtered_values)}")
+            logger.debug(f"First filtered row: {filtered_values[0] if filtered_values else 'No data'}")
             
             body = {
                 'values': filtered_values
@@ -563,7 +562,7 @@ class GoogleSheetsService:
             
             # Try batch update for better performance
             try:
-                print(f"DEBUG: Attempting to use batchUpdate for better performance")
+                logger.debug(f"Attempting to use batchUpdate for better performance")
                 batch_body = {
                     'valueInputOption': value_input_option,
                     'data': [
@@ -584,27 +583,27 @@ class GoogleSheetsService:
                             spreadsheetId=spreadsheet_id,
                             body=batch_body
                         ).execute()
-                        print(f"DEBUG: Batch update successful: {batch_response}")
+                        logger.debug(f"Batch update successful: {batch_response}")
                         return batch_response
                     except HttpError as error:
                         if error.resp.status == 429 and retry < max_retries - 1:
                             # Calculate exponential backoff with jitter
                             wait_time = (2 ** retry) + (random.random() * 0.5)
-                            print(f"DEBUG: Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                            logger.debug(f"Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                             time.sleep(wait_time)
                             retry += 1
                         else:
                             # Only re-raise if it's not a 429 or we've exhausted retries
-                            print(f"DEBUG: HttpError in batch update: {str(error)}")
-                            print(f"DEBUG: Falling back to regular update")
+                            logger.debug(f"HttpError in batch update: {str(error)}")
+                            logger.debug(f"Falling back to regular update")
                             raise ValueError("Batch update failed")
             except Exception as batch_error:
-                print(f"DEBUG: Error with batch update: {str(batch_error)}")
-                print(f"DEBUG: Falling back to regular update")
+                logger.debug(f"Error with batch update: {str(batch_error)}")
+                logger.debug(f"Falling back to regular update")
                 # Continue to regular update
             
             # Regular update with retry logic
-            print(f"DEBUG: Making API request to update values (regular method)")
+            logger.debug(f"Making API request to update values (regular method)")
             max_retries = 5
             retry = 0
             
@@ -617,13 +616,13 @@ class GoogleSheetsService:
                         body=body
                     )
                     
-                    print(f"DEBUG: Executing API request")
+                    logger.debug(f"Executing API request")
                     response = request.execute()
-                    print(f"DEBUG: API response: {response}")
+                    logger.debug(f"API response: {response}")
                     
                     # If no update happened, try using append instead of update
                     if response.get('updatedCells', 0) == 0:
-                        print(f"DEBUG: No cells updated, trying append method instead")
+                        logger.debug(f"No cells updated, trying append method instead")
                         
                         # Append with retry logic
                         append_retry = 0
@@ -636,19 +635,19 @@ class GoogleSheetsService:
                                     body=body
                                 )
                                 append_response = append_request.execute()
-                                print(f"DEBUG: Append API response: {append_response}")
+                                logger.debug(f"Append API response: {append_response}")
                                 return append_response
                             except HttpError as append_error:
                                 if append_error.resp.status == 429 and append_retry < max_retries - 1:
                                     wait_time = (2 ** append_retry) + (random.random() * 0.5)
-                                    print(f"DEBUG: Append rate limit hit, retrying in {wait_time:.2f}s")
+                                    logger.debug(f"Append rate limit hit, retrying in {wait_time:.2f}s")
                                     time.sleep(wait_time)
                                     append_retry += 1
                                 else:
                                     raise
                             
                         # If we've exhausted all retries
-                        print(f"DEBUG: Exhausted append retries")
+                        logger.debug(f"Exhausted append retries")
                     
                     return response
                     
@@ -656,7 +655,7 @@ class GoogleSheetsService:
                     if error.resp.status == 429 and retry < max_retries - 1:
                         # Calculate exponential backoff with jitter
                         wait_time = (2 ** retry) + (random.random() * 0.5)
-                        print(f"DEBUG: Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                        logger.debug(f"Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                         time.sleep(wait_time)
                         retry += 1
                     else:
@@ -665,10 +664,9 @@ class GoogleSheetsService:
             
             raise HTTPException(status_code=429, detail="Rate limit exceeded after multiple retries")
         except Exception as e:
-            print(f"DEBUG: Error updating values: {str(e)}")
-            print(f"DEBUG: Error type: {type(e)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Error updating values: {str(e)}")
+            logger.debug(f"Error type: {type(e)}")
+            logger.debug("Traceback:", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to update spreadsheet: {str(e)}")
 
     async def get_values(
@@ -710,10 +708,10 @@ class GoogleSheetsService:
                 start_cell = parts[0]
                 end_cell = parts[1] if len(parts) > 1 else start_cell
                 
-                print(f"DEBUG: Parsing range: {range_name}")
-                print(f"DEBUG: Start cell: {start_cell}, End cell: {end_cell}")
+                logger.debug(f"Parsing range: {range_name}")
+                logger.debug(f"Start cell: {start_cell}, End cell: {end_cell}")
             except Exception as e:
-                print(f"DEBUG: Error parsing range '{range_name}': {str(e)}")
+                logger.debug(f"Error parsing range '{range_name}': {str(e)}")
                 # Provide default range if parsing fails
                 start_cell = "A1"
                 end_cell = "Z10"
@@ -782,7 +780,7 @@ class GoogleSheetsService:
                     if error.resp.status == 429 and retry < max_retries - 1:
                         # Calculate exponential backoff with jitter
                         wait_time = (2 ** retry) + (random.random() * 0.5)
-                        print(f"DEBUG: Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                        logger.debug(f"Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                         time.sleep(wait_time)
                         retry += 1
                     else:
@@ -791,9 +789,8 @@ class GoogleSheetsService:
             
             raise HTTPException(status_code=429, detail="Rate limit exceeded after multiple retries")
         except Exception as e:
-            print(f"DEBUG: Error in format_range: {str(e)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Error in format_range: {str(e)}")
+            logger.debug("Traceback:", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to format spreadsheet: {str(e)}")
 
     async def create_spreadsheet_with_template(
@@ -813,14 +810,14 @@ class GoogleSheetsService:
             if data:
                 # Try creating a spreadsheet with pre-populated data
                 try:
-                    print(f"DEBUG: Attempting to create spreadsheet with pre-populated data")
+                    logger.debug(f"Attempting to create spreadsheet with pre-populated data")
                     spreadsheet_id, spreadsheet_url = await self.create_spreadsheet_with_data(title, data)
-                    print(f"DEBUG: Successfully created spreadsheet with pre-populated data!")
-                    print(f"DEBUG: Spreadsheet ID: {spreadsheet_id}")
-                    print(f"DEBUG: Spreadsheet URL: {spreadsheet_url}")
+                    logger.debug(f"Successfully created spreadsheet with pre-populated data!")
+                    logger.debug(f"Spreadsheet ID: {spreadsheet_id}")
+                    logger.debug(f"Spreadsheet URL: {spreadsheet_url}")
                     
                     # Return early since data is already populated
-                    print(f"DEBUG: Returning early since data is already populated")
+                    logger.debug(f"Returning early since data is already populated")
                     
                     # Just apply formatting if we created with data
                     try:
@@ -838,7 +835,7 @@ class GoogleSheetsService:
                             try:
                                 await self.format_range(spreadsheet_id, header_range, header_format)
                             except Exception as e:
-                                print(f"DEBUG: Error applying header formatting: {str(e)}")
+                                logger.debug(f"Error applying header formatting: {str(e)}")
                         
                         # Apply body formatting
                         body_format = await self.template_service.get_formatting(template_name, "body")
@@ -846,9 +843,9 @@ class GoogleSheetsService:
                             try:
                                 await self.format_range(spreadsheet_id, data_range, body_format)
                             except Exception as e:
-                                print(f"DEBUG: Error applying body formatting: {str(e)}")
+                                logger.debug(f"Error applying body formatting: {str(e)}")
                     except Exception as format_error:
-                        print(f"DEBUG: Error applying formatting after data population: {str(format_error)}")
+                        logger.debug(f"Error applying formatting after data population: {str(format_error)}")
                         
                     return {
                         "spreadsheet_id": spreadsheet_id,
@@ -857,54 +854,54 @@ class GoogleSheetsService:
                         "template": template_name
                     }
                 except Exception as data_error:
-                    print(f"DEBUG: Error creating spreadsheet with pre-populated data: {str(data_error)}")
-                    print(f"DEBUG: Falling back to regular spreadsheet creation")
+                    logger.debug(f"Error creating spreadsheet with pre-populated data: {str(data_error)}")
+                    logger.debug(f"Falling back to regular spreadsheet creation")
             
             # Regular spreadsheet creation without pre-populated data
-            print(f"DEBUG: Creating spreadsheet with title: {title}")
-            print(f"DEBUG: Using folder_id: {folder_id}, use_drive_picker: {use_drive_picker}")
+            logger.debug(f"Creating spreadsheet with title: {title}")
+            logger.debug(f"Using folder_id: {folder_id}, use_drive_picker: {use_drive_picker}")
             spreadsheet_id, spreadsheet_url, created_folder_id, folder_url = await self.create_spreadsheet(
                 title=title, 
                 user_id=user_id,
                 folder_id=folder_id,
                 use_drive_picker=use_drive_picker
             )
-            print(f"DEBUG: Created spreadsheet with ID: {spreadsheet_id}")
+            logger.debug(f"Created spreadsheet with ID: {spreadsheet_id}")
             
             # Get the spreadsheet URL
-            print(f"DEBUG: Spreadsheet URL: {spreadsheet_url}")
+            logger.debug(f"Spreadsheet URL: {spreadsheet_url}")
             
             # Apply template formatting and data
             if data:
-                print(f"DEBUG: Applying template formatting to data with {len(data)} rows")
-                print(f"DEBUG: Data structure: {type(data)}")
+                logger.debug(f"Applying template formatting to data with {len(data)} rows")
+                logger.debug(f"Data structure: {type(data)}")
                 
                 # Verify data structure and do basic validation
                 if not isinstance(data, list):
-                    print(f"DEBUG: Data is not a list, converting to list")
+                    logger.debug(f"Data is not a list, converting to list")
                     data = [data]
                 
                 if len(data) > 0:
-                    print(f"DEBUG: First row type: {type(data[0])}")
-                    print(f"DEBUG: First row sample: {data[0]}")
+                    logger.debug(f"First row type: {type(data[0])}")
+                    logger.debug(f"First row sample: {data[0]}")
                     
                     # Ensure all rows are lists
                     validated_data = []
                     for i, row in enumerate(data):
                         if row is None:
-                            print(f"DEBUG: Row {i} is None, adding empty row")
+                            logger.debug(f"Row {i} is None, adding empty row")
                             validated_data.append([""])
                         elif not isinstance(row, list):
-                            print(f"DEBUG: Row {i} is not a list, converting to list")
+                            logger.debug(f"Row {i} is not a list, converting to list")
                             validated_data.append([row])
                         else:
                             validated_data.append(row)
                     
                     data = validated_data
-                    print(f"DEBUG: After validation - data length: {len(data)}")
-                    print(f"DEBUG: After validation - first row sample: {data[0] if data else 'No data'}")
+                    logger.debug(f"After validation - data length: {len(data)}")
+                    logger.debug(f"After validation - first row sample: {data[0] if data else 'No data'}")
                 else:
-                    print(f"DEBUG: Data list is empty, adding a default row")
+                    logger.debug(f"Data list is empty, adding a default row")
                     data = [["No Data"]]
                 # Calculate ranges based on data size (with safety checks)
                 try:
@@ -912,60 +909,60 @@ class GoogleSheetsService:
                     last_column = chr(65 + min(col_count - 1, 25))  # Limit to 'Z' (column 26)
                     row_count = len(data)
                 
-                    print(f"DEBUG: Calculating ranges for data with {col_count} columns and {row_count} rows")
-                    print(f"DEBUG: Last column is {last_column}")
+                    logger.debug(f"Calculating ranges for data with {col_count} columns and {row_count} rows")
+                    logger.debug(f"Last column is {last_column}")
                 
                     header_range = f"A1:{last_column}1"
                     data_range = f"A2:{last_column}{row_count + 1}"
                     
-                    print(f"DEBUG: Calculated header range: {header_range}")
-                    print(f"DEBUG: Calculated data range: {data_range}")
+                    logger.debug(f"Calculated header range: {header_range}")
+                    logger.debug(f"Calculated data range: {data_range}")
                 except Exception as e:
-                    print(f"DEBUG: Error calculating ranges: {str(e)}")
+                    logger.debug(f"Error calculating ranges: {str(e)}")
                     # Provide default ranges
                     header_range = "A1:Z1"
                     data_range = "A2:Z100"
                 
-                print(f"DEBUG: Header range: {header_range}")
-                print(f"DEBUG: Data range: {data_range}")
+                logger.debug(f"Header range: {header_range}")
+                logger.debug(f"Data range: {data_range}")
                 
                 # Apply header formatting
-                print(f"DEBUG: Getting header formatting for template: {template_name}")
+                logger.debug(f"Getting header formatting for template: {template_name}")
                 header_format = await self.template_service.get_formatting(template_name, "header")
                 if header_format:
-                    print(f"DEBUG: Applying header formatting")
+                    logger.debug(f"Applying header formatting")
                     await self.format_range(spreadsheet_id, header_range, header_format)
                 
                 # Apply body formatting
-                print(f"DEBUG: Getting body formatting for template: {template_name}")
+                logger.debug(f"Getting body formatting for template: {template_name}")
                 body_format = await self.template_service.get_formatting(template_name, "body")
                 if body_format:
-                    print(f"DEBUG: Applying body formatting")
+                    logger.debug(f"Applying body formatting")
                     await self.format_range(spreadsheet_id, data_range, body_format)
                 
                 # Apply alternate row formatting if available
-                print(f"DEBUG: Getting alternate row formatting for template: {template_name}")
+                logger.debug(f"Getting alternate row formatting for template: {template_name}")
                 alternate_format = await self.template_service.get_formatting(template_name, "alternateRow")
                 if alternate_format:
-                    print(f"DEBUG: Applying alternate row formatting")
+                    logger.debug(f"Applying alternate row formatting")
                     for i in range(3, len(data) + 1, 2):  # Start from row 3 (second data row)
                         try:
                             col_count = len(data[0]) if data[0] else 1
                             last_column = chr(65 + min(col_count - 1, 25))  # Limit to 'Z' (column 26)
                             alt_range = f"A{i}:{last_column}{i}"
-                            print(f"DEBUG: Alternate row range: {alt_range}")
+                            logger.debug(f"Alternate row range: {alt_range}")
                         except Exception as e:
-                            print(f"DEBUG: Error calculating alternate row range: {str(e)}")
+                            logger.debug(f"Error calculating alternate row range: {str(e)}")
                             alt_range = f"A{i}:Z{i}"
                         await self.format_range(spreadsheet_id, alt_range, alternate_format)
                 
                 # Update the data
-                print(f"DEBUG: Updating data in spreadsheet")
+                logger.debug(f"Updating data in spreadsheet")
                 # Calculate safe range for updating values
                 try:
                     # Make sure we have at least one row of data
                     if not data or len(data) == 0:
-                        print(f"DEBUG: No data to update, adding default row")
+                        logger.debug(f"No data to update, adding default row")
                         data = [["No Data"]]
                     
                     # Calculate the row and column count
@@ -976,43 +973,43 @@ class GoogleSheetsService:
                     # A1 notation needs to be "Sheet1!A1:Z10" format
                     # For new sheets, we can use just "A1:Z10" since it will default to the first sheet
                     update_range = f"A1:{last_column}{row_count}"
-                    print(f"DEBUG: Update values range: {update_range}")
-                    print(f"DEBUG: Column count: {col_count}, Row count: {row_count}")
-                    print(f"DEBUG: Data dimensions: {len(data)} rows x {len(data[0]) if data and len(data) > 0 else 0} columns")
+                    logger.debug(f"Update values range: {update_range}")
+                    logger.debug(f"Column count: {col_count}, Row count: {row_count}")
+                    logger.debug(f"Data dimensions: {len(data)} rows x {len(data[0]) if data and len(data) > 0 else 0} columns")
                     
                     # Also print the first few cells for verification
                     if data and len(data) > 0:
                         for i in range(min(3, len(data))):
                             row_content = data[i][:3] if len(data[i]) > 3 else data[i]
-                            print(f"DEBUG: Row {i}: {row_content}")
+                            logger.debug(f"Row {i}: {row_content}")
                 except Exception as e:
-                    print(f"DEBUG: Error calculating update range: {str(e)}")
-                    print(f"DEBUG: Using default range A1:Z100 instead")
+                    logger.debug(f"Error calculating update range: {str(e)}")
+                    logger.debug(f"Using default range A1:Z100 instead")
                     update_range = "A1:Z100"
                 
                 # Try using a low-level direct approach to write data
-                print(f"DEBUG: Using direct low-level approach to write data")
+                logger.debug(f"Using direct low-level approach to write data")
                 
                 # Attempt to write data directly with detailed logging
                 try:
                     # First verify we can get basic info about the sheet
-                    print(f"DEBUG: Getting spreadsheet metadata")
+                    logger.debug(f"Getting spreadsheet metadata")
                     sheet_info = self.service.spreadsheets().get(
                         spreadsheetId=spreadsheet_id
                     ).execute()
-                    print(f"DEBUG: Sheet info: Sheet title={sheet_info.get('properties', {}).get('title', 'Unknown')}")
+                    logger.debug(f"Sheet info: Sheet title={sheet_info.get('properties', {}).get('title', 'Unknown')}")
                     
                     # Now try writing data row by row for maximum reliability
                     success_count = 0
                     for i, row in enumerate(data):
                         if i > 100:  # Limit to first 100 rows for testing
-                            print(f"DEBUG: Stopping after 100 rows")
+                            logger.debug(f"Stopping after 100 rows")
                             break
                             
                         try:
                             # Calculate the range for this specific row
                             row_range = f"A{i+1}"
-                            print(f"DEBUG: Writing row {i} to range {row_range}: {row[:3]}...")
+                            logger.debug(f"Writing row {i} to range {row_range}: {row[:3]}...")
                             
                             # Use update for this specific row
                             row_result = self.service.spreadsheets().values().update(
@@ -1026,15 +1023,15 @@ class GoogleSheetsService:
                             if row_result.get('updatedCells', 0) > 0:
                                 success_count += 1
                                 if i % 10 == 0:  # Only log every 10 rows
-                                    print(f"DEBUG: Successfully wrote row {i}")
+                                    logger.debug(f"Successfully wrote row {i}")
                         except Exception as row_error:
-                            print(f"DEBUG: Error writing row {i}: {str(row_error)}")
+                            logger.debug(f"Error writing row {i}: {str(row_error)}")
                     
-                    print(f"DEBUG: Direct row-by-row write completed. Success: {success_count}/{len(data)} rows")
+                    logger.debug(f"Direct row-by-row write completed. Success: {success_count}/{len(data)} rows")
                     
                     # After row-by-row write, try a single batch update as well
                     try:
-                        print(f"DEBUG: Trying batch update as well")
+                        logger.debug(f"Trying batch update as well")
                         batch_result = self.service.spreadsheets().values().batchUpdate(
                             spreadsheetId=spreadsheet_id,
                             body={
@@ -1047,15 +1044,15 @@ class GoogleSheetsService:
                                 ]
                             }
                         ).execute()
-                        print(f"DEBUG: Batch update result: {batch_result}")
+                        logger.debug(f"Batch update result: {batch_result}")
                     except Exception as batch_error:
-                        print(f"DEBUG: Error in batch update: {str(batch_error)}")
+                        logger.debug(f"Error in batch update: {str(batch_error)}")
                 
                 except Exception as direct_error:
-                    print(f"DEBUG: Error in direct low-level approach: {str(direct_error)}")
+                    logger.debug(f"Error in direct low-level approach: {str(direct_error)}")
                     
                     # Final fallback - try a simple test write with raw API call
-                    print(f"DEBUG: Attempting simple test write as last resort")
+                    logger.debug(f"Attempting simple test write as last resort")
                     try:
                         # Write test values to A1:B2
                         test_result = self.service.spreadsheets().values().update(
@@ -1069,11 +1066,11 @@ class GoogleSheetsService:
                                 ]
                             }
                         ).execute()
-                        print(f"DEBUG: Test write result: {test_result}")
+                        logger.debug(f"Test write result: {test_result}")
                     except Exception as test_error:
-                        print(f"DEBUG: Error in test write: {str(test_error)}")
+                        logger.debug(f"Error in test write: {str(test_error)}")
             
-            print(f"DEBUG: Successfully created spreadsheet with template")
+            logger.debug(f"Successfully created spreadsheet with template")
             return {
                 "spreadsheet_id": spreadsheet_id,
                 "spreadsheetUrl": spreadsheet_url,
@@ -1082,10 +1079,9 @@ class GoogleSheetsService:
             }
             
         except Exception as e:
-            print(f"DEBUG: Error in create_spreadsheet_with_template: {str(e)}")
-            print(f"DEBUG: Error type: {type(e)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Error in create_spreadsheet_with_template: {str(e)}")
+            logger.debug(f"Error type: {type(e)}")
+            logger.debug("Traceback:", exc_info=True)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to create spreadsheet with template: {str(e)}"
@@ -1169,11 +1165,11 @@ class GoogleSheetsService:
             
             # Combine headers and rows
             values = [headers] + rows
-            print(f"DEBUG: Writing data with {len(values)} rows, {len(headers)} columns")
+            logger.debug(f"Writing data with {len(values)} rows, {len(headers)} columns")
             
             # Calculate range
             range_name = f"{sheet_name}!A1:{chr(65 + len(headers) - 1)}{len(rows) + 1}"
-            print(f"DEBUG: Using range: {range_name}")
+            logger.debug(f"Using range: {range_name}")
             
             # Implement exponential backoff with retry for rate limiting
             max_retries = 5
@@ -1197,23 +1193,23 @@ class GoogleSheetsService:
                         body=batch_body
                     ).execute()
                     
-                    print(f"DEBUG: Successfully wrote {len(values)} rows in one batch update")
+                    logger.debug(f"Successfully wrote {len(values)} rows in one batch update")
                     return response
                     
                 except HttpError as error:
                     if error.resp.status == 429 and retry < max_retries - 1:
                         # Calculate exponential backoff with jitter
                         wait_time = (2 ** retry) + (random.random() * 0.5)
-                        print(f"DEBUG: Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                        logger.debug(f"Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                         time.sleep(wait_time)
                         retry += 1
                     else:
                         # Re-raise the error if it's not a rate limit or we've exceeded retries
                         raise
                 except Exception as e:
-                    print(f"DEBUG: Unexpected error in batch update: {str(e)}")
+                    logger.debug(f"Unexpected error in batch update: {str(e)}")
                     # Fall back to regular update
-                    print(f"DEBUG: Falling back to regular update method")
+                    logger.debug(f"Falling back to regular update method")
                     return await self.update_values(
                         spreadsheet_id,
                         range_name,
@@ -1222,7 +1218,7 @@ class GoogleSheetsService:
                     )
             
             # If we've exhausted retries, fall back to regular update
-            print(f"DEBUG: Exhausted retries, falling back to regular update method")
+            logger.debug(f"Exhausted retries, falling back to regular update method")
             return await self.update_values(
                 spreadsheet_id,
                 range_name,
@@ -1230,9 +1226,8 @@ class GoogleSheetsService:
                 value_input_option
             )
         except Exception as e:
-            print(f"DEBUG: Error in write_to_sheet: {str(e)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Error in write_to_sheet: {str(e)}")
+            logger.debug("Traceback:", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to write to sheet: {str(e)}")
     
     async def apply_formatting(
@@ -1344,14 +1339,14 @@ class GoogleSheetsService:
                         body=body
                     ).execute()
                     
-                    print(f"DEBUG: Successfully applied batch formatting with {len(batch_requests)} operations")
+                    logger.debug(f"Successfully applied batch formatting with {len(batch_requests)} operations")
                     return {"status": "success", "operations": len(batch_requests)}
                     
                 except HttpError as error:
                     if error.resp.status == 429 and retry < max_retries - 1:
                         # Calculate exponential backoff with jitter
                         wait_time = (2 ** retry) + (random.random() * 0.5)
-                        print(f"DEBUG: Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
+                        logger.debug(f"Rate limit hit, retrying in {wait_time:.2f}s (retry {retry+1}/{max_retries})")
                         time.sleep(wait_time)
                         retry += 1
                     else:
@@ -1360,7 +1355,6 @@ class GoogleSheetsService:
             
             return {"status": "success"}
         except Exception as e:
-            print(f"DEBUG: Error in apply_formatting: {str(e)}")
-            import traceback
-            print(f"DEBUG: Traceback: {traceback.format_exc()}")
+            logger.debug(f"Error in apply_formatting: {str(e)}")
+            logger.debug("Traceback:", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to apply formatting: {str(e)}") 
\ No newline at end of file
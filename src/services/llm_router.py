@@ -0,0 +1,819 @@
+"""
+Routing layer between the chat/NLQ services and the LLM providers.
+
+Every call names a ModelRoute ("provider:model"). The router bounds how many
+requests are in flight per provider and per model (callers queue for a slot
+until a deadline), trips a circuit breaker per route after repeated failures,
+can hedge a slow stream by starting the same request on a second model, and
+falls back to other routes when a route fails before producing output. Time
+to first token is recorded per route.
+
+FakeProvider runs entirely in-process so the router can be exercised and
+load-tested without network access or API keys.
+"""
+import abc
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.utils.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+SystemPrompt = Union[str, List[Dict[str, Any]]]
+
+
+class LLMRouterError(Exception):
+    """Base class for errors raised by the router itself (not by a provider)."""
+    pass
+
+
+class UnknownProviderError(LLMRouterError):
+    """Raised when a route names a provider that has not been registered."""
+    pass
+
+
+class QueueTimeoutError(LLMRouterError):
+    """Raised when no concurrency slot frees up before the queue deadline."""
+    pass
+
+
+class CircuitOpenError(LLMRouterError):
+    """Raised when a route's circuit breaker is rejecting requests."""
+    pass
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """A provider name plus the provider's model identifier."""
+    provider: str
+    model: str
+
+    @classmethod
+    def parse(cls, value: str) -> "ModelRoute":
+        """Parse "provider:model" (e.g. "anthropic:claude-3-haiku-20240307")."""
+        provider, sep, model = value.partition(":")
+        if not sep or not provider or not model:
+            raise ValueError(f"Invalid model route '{value}', expected 'provider:model'")
+        return cls(provider.strip(), model.strip())
+
+    def __str__(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+
+@dataclass
+class LLMRequest:
+    """Provider-neutral request: Anthropic-style messages plus a system prompt."""
+    messages: List[Dict[str, Any]]
+    system: Optional[SystemPrompt] = None
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    # Per-request timeout for non-streaming calls
+    timeout: Optional[float] = None
+
+
+@dataclass
+class LLMCompletion:
+    """Result of a non-streaming call."""
+    text: str
+    usage: Dict[str, int]
+    route: ModelRoute
+
+
+def system_prompt_text(system: Optional[SystemPrompt]) -> str:
+    """Flatten a system prompt given as content blocks into plain text."""
+    if not system:
+        return ""
+    if isinstance(system, str):
+        return system
+    return "\n\n".join(block.get("text", "") for block in system)
+
+
+class LLMProvider(abc.ABC):
+    """Interface for an LLM backend."""
+
+    @abc.abstractmethod
+    def stream(self, model: str, request: LLMRequest) -> AsyncIterator[str]:
+        """
+        Stream the response text.
+
+        Args:
+            model: Provider-specific model identifier.
+            request: The request to send.
+
+        Returns:
+            Async iterator of text chunks.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def complete(self, model: str, request: LLMRequest) -> Tuple[str, Dict[str, int]]:
+        """
+        Run a non-streaming request.
+
+        Returns:
+            Tuple of (response text, token usage dict).
+        """
+        pass
+
+
+class AnthropicProvider(LLMProvider):
+    """Claude models through anthropic.AsyncAnthropic."""
+
+    DEFAULT_MAX_TOKENS = 4096
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def _params(self, model: str, request: LLMRequest) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            "model": model,
+            "max_tokens": request.max_tokens or self.DEFAULT_MAX_TOKENS,
+            "messages": request.messages,
+        }
+        if request.system:
+            params["system"] = request.system
+        if request.temperature is not None:
+            params["temperature"] = request.temperature
+        return params
+
+    @staticmethod
+    def usage_from_message(message: Any) -> Dict[str, int]:
+        """Pull the token counts (including prompt cache counters) off a response."""
+        usage = getattr(message, "usage", None)
+        return {
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        }
+
+    async def stream(self, model: str, request: LLMRequest) -> AsyncIterator[str]:
+        message_stream = await self.client.messages.create(**self._params(model, request), stream=True)
+        try:
+            async for event in message_stream:
+                if event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    yield event.delta.text
+        finally:
+            await message_stream.close()
+
+    async def complete(self, model: str, request: LLMRequest) -> Tuple[str, Dict[str, int]]:
+        params = self._params(model, request)
+        if request.timeout:
+            params["timeout"] = request.timeout
+        message = await self.client.messages.create(**params)
+        text = message.content[0].text if message.content else ""
+        return text, self.usage_from_message(message)
+
+
+class OpenAIProvider(LLMProvider):
+    """ChatGPT models through openai.AsyncOpenAI."""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def _params(self, model: str, request: LLMRequest) -> Dict[str, Any]:
+        messages = list(request.messages)
+        system = system_prompt_text(request.system)
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        params: Dict[str, Any] = {"model": model, "messages": messages}
+        if request.max_tokens:
+            params["max_tokens"] = request.max_tokens
+        if request.temperature is not None:
+            params["temperature"] = request.temperature
+        return params
+
+    async def stream(self, model: str, request: LLMRequest) -> AsyncIterator[str]:
+        chunk_stream = await self.client.chat.completions.create(**self._params(model, request), stream=True)
+        try:
+            async for chunk in chunk_stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content or ""
+                if content:
+                    yield content
+        finally:
+            await chunk_stream.close()
+
+    async def complete(self, model: str, request: LLMRequest) -> Tuple[str, Dict[str, int]]:
+        params = self._params(model, request)
+        if request.timeout:
+            params["timeout"] = request.timeout
+        response = await self.client.chat.completions.create(**params)
+        usage = getattr(response, "usage", None)
+        return response.choices[0].message.content or "", {
+            "input_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        }
+
+
+class FakeProvider(LLMProvider):
+    """
+    In-process provider for tests and offline load tests.
+
+    Streams a canned reply word by word after a configurable time to first
+    token (overridable per model), optionally failing a fraction of calls.
+    Tracks call counts and peak concurrency so limits can be asserted.
+    """
+
+    def __init__(
+        self,
+        reply: str = "This is a simulated response from the fake provider.",
+        ttft: float = 0.05,
+        token_delay: float = 0.0,
+        model_ttft: Optional[Dict[str, float]] = None,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.reply = reply
+        self.ttft = ttft
+        self.token_delay = token_delay
+        self.model_ttft = model_ttft or {}
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self.calls: List[str] = []
+        self.active = 0
+        self.peak_active = 0
+
+    def _chunks(self) -> List[str]:
+        words = self.reply.split(" ")
+        return [word + " " for word in words[:-1]] + [words[-1]]
+
+    async def _start(self, model: str) -> None:
+        self.calls.append(model)
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        await asyncio.sleep(self.model_ttft.get(model, self.ttft))
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise RuntimeError(f"Simulated failure from fake model {model}")
+
+    async def stream(self, model: str, request: LLMRequest) -> AsyncIterator[str]:
+        try:
+            await self._start(model)
+            for chunk in self._chunks():
+                yield chunk
+                if self.token_delay:
+                    await asyncio.sleep(self.token_delay)
+        finally:
+            self.active -= 1
+
+    async def complete(self, model: str, request: LLMRequest) -> Tuple[str, Dict[str, int]]:
+        try:
+            await self._start(model)
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay * len(self._chunks()))
+        finally:
+            self.active -= 1
+        return self.reply, {"input_tokens": 0, "output_tokens": len(self._chunks())}
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests are rejected; once reset_timeout has passed a single probe
+    request is let through (half-open) and its outcome closes or re-opens
+    the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def would_allow(self) -> bool:
+        """Check without claiming the half-open probe."""
+        state = self.state
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self._probe_in_flight)
+
+    def allow(self) -> bool:
+        """Return True if a request may proceed, claiming the probe when half-open."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """Give back a claimed probe without recording an outcome (e.g. on cancellation)."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probe_in_flight or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+
+class LatencySamples:
+    """Bounded window of latency samples with percentile summaries."""
+
+    def __init__(self, max_samples: int = 1000):
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 1)
+        return {
+            "count": len(self._samples),
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99)),
+        }
+
+
+@dataclass
+class RouteMetrics:
+    """Counters and latency windows for one route."""
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    queue_timeouts: int = 0
+    circuit_rejections: int = 0
+    hedges_started: int = 0
+    hedges_won: int = 0
+    queued: int = 0
+    in_flight: int = 0
+    ttft: LatencySamples = field(default_factory=LatencySamples)
+    queue_wait: LatencySamples = field(default_factory=LatencySamples)
+    latency: LatencySamples = field(default_factory=LatencySamples)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "queue_timeouts": self.queue_timeouts,
+            "circuit_rejections": self.circuit_rejections,
+            "hedges_started": self.hedges_started,
+            "hedges_won": self.hedges_won,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "ttft": self.ttft.summary(),
+            "queue_wait": self.queue_wait.summary(),
+            "latency": self.latency.summary(),
+        }
+
+
+@dataclass
+class _ProviderEntry:
+    provider: LLMProvider
+    semaphore: asyncio.Semaphore
+    max_concurrency: int
+    model_semaphores: Dict[str, asyncio.Semaphore] = field(default_factory=dict)
+
+
+class _OpenStream:
+    """A provider stream that has produced its first chunk and holds its slots."""
+
+    def __init__(self, route: ModelRoute, first: Optional[str], chunks: AsyncIterator[str], release: Callable[[], None]):
+        self.route = route
+        self.first = first
+        self.chunks = chunks
+        self._release = release
+
+    async def close(self) -> None:
+        try:
+            await self.chunks.aclose()
+        finally:
+            self._release()
+
+
+class LLMRouter:
+    """Concurrency-limited, circuit-broken, optionally hedged access to LLM providers."""
+
+    def __init__(
+        self,
+        queue_timeout: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.queue_timeout = queue_timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._providers: Dict[str, _ProviderEntry] = {}
+        self._breakers: Dict[ModelRoute, CircuitBreaker] = {}
+        self._metrics: Dict[ModelRoute, RouteMetrics] = {}
+
+    def register_provider(
+        self,
+        name: str,
+        provider: LLMProvider,
+        max_concurrency: int = 16,
+        model_limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """
+        Register a provider under a name used in routes.
+
+        Args:
+            name: Provider name, e.g. "anthropic".
+            provider: The provider implementation.
+            max_concurrency: Requests allowed in flight across all of its models.
+            model_limits: Optional lower per-model limits, keyed by model id.
+        """
+        entry = _ProviderEntry(provider, asyncio.Semaphore(max_concurrency), max_concurrency)
+        for model, limit in (model_limits or {}).items():
+            entry.model_semaphores[model] = asyncio.Semaphore(limit)
+        self._providers[name] = entry
+        logger.info(f"Registered LLM provider '{name}' (max_concurrency={max_concurrency}, model_limits={model_limits or {}})")
+
+    def set_model_limit(self, route: ModelRoute, max_concurrency: int) -> None:
+        self._entry(route).model_semaphores[route.model] = asyncio.Semaphore(max_concurrency)
+
+    def has_provider(self, name: str) -> bool:
+        return name in self._providers
+
+    def _entry(self, route: ModelRoute) -> _ProviderEntry:
+        entry = self._providers.get(route.provider)
+        if entry is None:
+            raise UnknownProviderError(f"LLM provider '{route.provider}' is not configured")
+        return entry
+
+    def breaker(self, route: ModelRoute) -> CircuitBreaker:
+        if route not in self._breakers:
+            self._breakers[route] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self._breakers[route]
+
+    def route_metrics(self, route: ModelRoute) -> RouteMetrics:
+        if route not in self._metrics:
+            self._metrics[route] = RouteMetrics()
+        return self._metrics[route]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of per-route counters, TTFT/latency percentiles and breaker states."""
+        return {
+            "providers": {
+                name: {
+                    "max_concurrency": entry.max_concurrency,
+                    "model_limits": sorted(entry.model_semaphores),
+                }
+                for name, entry in self._providers.items()
+            },
+            "routes": {
+                str(route): {**metrics.snapshot(), "circuit": self.breaker(route).state}
+                for route, metrics in self._metrics.items()
+            },
+        }
+
+    async def _acquire(self, route: ModelRoute, deadline: float) -> Callable[[], None]:
+        """
+        Wait for a model slot and then a provider slot, until the deadline.
+
+        Returns:
+            A callable that releases the acquired slots.
+        """
+        entry = self._entry(route)
+        metrics = self.route_metrics(route)
+        semaphores = [s for s in (entry.model_semaphores.get(route.model), entry.semaphore) if s is not None]
+        acquired: List[asyncio.Semaphore] = []
+        queued_at = time.monotonic()
+        metrics.queued += 1
+        try:
+            for semaphore in semaphores:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    await asyncio.wait_for(semaphore.acquire(), remaining)
+                except asyncio.TimeoutError:
+                    metrics.queue_timeouts += 1
+                    raise QueueTimeoutError(f"No capacity for {route} within the queue deadline")
+                acquired.append(semaphore)
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+        finally:
+            metrics.queued -= 1
+
+        metrics.queue_wait.add(time.monotonic() - queued_at)
+        metrics.in_flight += 1
+
+        def release() -> None:
+            metrics.in_flight -= 1
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+        return release
+
+    async def _claim(self, route: ModelRoute, deadline: float) -> Callable[[], None]:
+        """
+        Check the breaker, wait for capacity and claim the half-open probe if due.
+
+        Returns:
+            A callable that releases the slots (and an unresolved probe claim).
+        """
+        breaker = self.breaker(route)
+        metrics = self.route_metrics(route)
+        metrics.requests += 1
+        # Fail fast rather than queueing behind an open circuit
+        if not breaker.would_allow():
+            metrics.circuit_rejections += 1
+            raise CircuitOpenError(f"Circuit open for {route}")
+        release_slots = await self._acquire(route, deadline)
+        probe = breaker.state == CircuitBreaker.HALF_OPEN
+        if not breaker.allow():
+            release_slots()
+            metrics.circuit_rejections += 1
+            raise CircuitOpenError(f"Circuit open for {route}")
+
+        def release() -> None:
+            release_slots()
+            # A probe that ended without an outcome (cancelled, closed early) frees
+            # the half-open slot; after an outcome this is a no-op
+            if probe:
+                breaker.release()
+
+        return release
+
+    def _record_failure(self, route: ModelRoute, error: BaseException) -> None:
+        if isinstance(error, asyncio.CancelledError):
+            return
+        self.breaker(route).record_failure()
+        self.route_metrics(route).failures += 1
+        logger.warning(f"LLM route {route} failed: {error}")
+
+    async def _open(self, route: ModelRoute, request: LLMRequest, deadline: float, started: float) -> _OpenStream:
+        """Start a stream on a route and wait for its first chunk."""
+        release = await self._claim(route, deadline)
+        chunks = self._entry(route).provider.stream(route.model, request)
+        try:
+            try:
+                first: Optional[str] = await chunks.__anext__()
+            except StopAsyncIteration:
+                first = None
+        except BaseException as e:
+            self._record_failure(route, e)
+            try:
+                await chunks.aclose()
+            finally:
+                release()
+            raise
+        self.route_metrics(route).ttft.add(time.monotonic() - started)
+        return _OpenStream(route, first, chunks, release)
+
+    async def _open_hedged(
+        self,
+        route: ModelRoute,
+        request: LLMRequest,
+        deadline: float,
+        started: float,
+        hedge: Optional[ModelRoute],
+        hedge_after: Optional[float],
+    ) -> _OpenStream:
+        """Open route; if no first chunk arrives within hedge_after, race it against hedge."""
+        if hedge is None or hedge_after is None or hedge == route:
+            return await self._open(route, request, deadline, started)
+
+        primary = asyncio.create_task(self._open(route, request, deadline, started))
+        tasks = {primary}
+        winner: Optional[asyncio.Task] = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if done:
+                winner = primary
+                return primary.result()
+
+            if self.has_provider(hedge.provider) and self.breaker(hedge).would_allow():
+                logger.info(f"No first token from {route} after {hedge_after}s, hedging to {hedge}")
+                self.route_metrics(route).hedges_started += 1
+                tasks.add(asyncio.create_task(self._open(hedge, request, deadline, started)))
+
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary if both finished in the same tick
+                for task in sorted(done, key=lambda t: t is not primary):
+                    if task.exception() is None:
+                        winner = task
+                        if task is not primary:
+                            self.route_metrics(route).hedges_won += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            losers = [t for t in tasks if t is not winner]
+            for task in losers:
+                task.cancel()
+            for outcome in await asyncio.gather(*losers, return_exceptions=True):
+                if isinstance(outcome, _OpenStream):
+                    await outcome.close()
+
+    async def stream(
+        self,
+        route: ModelRoute,
+        request: LLMRequest,
+        hedge: Optional[ModelRoute] = None,
+        hedge_after: Optional[float] = None,
+        fallbacks: Sequence[ModelRoute] = (),
+        queue_timeout: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response through the router.
+
+        Args:
+            route: Primary model route.
+            request: The request to send.
+            hedge: Optional second route raced against the primary when the
+                primary has not produced a first chunk after hedge_after seconds.
+            hedge_after: Hedging latency threshold in seconds (None disables hedging).
+            fallbacks: Routes tried in order if the primary (and hedge) fail
+                before producing output. Failures mid-stream are not retried.
+            queue_timeout: Seconds to wait for a concurrency slot per attempt
+                (defaults to the router's queue_timeout).
+
+        Yields:
+            Text chunks from whichever route won.
+        """
+        timeout = self.queue_timeout if queue_timeout is None else queue_timeout
+        started = time.monotonic()
+        opened: Optional[_OpenStream] = None
+        last_error: Optional[BaseException] = None
+        for index, candidate in enumerate([route, *fallbacks]):
+            try:
+                deadline = time.monotonic() + timeout
+                if index == 0:
+                    opened = await self._open_hedged(candidate, request, deadline, started, hedge, hedge_after)
+                else:
+                    opened = await self._open(candidate, request, deadline, started)
+                break
+            except Exception as e:
+                last_error = e
+                if index < len(fallbacks):
+                    logger.warning(f"LLM route {candidate} unavailable ({e}), falling back to {fallbacks[index]}")
+        if opened is None:
+            raise last_error
+
+        metrics = self.route_metrics(opened.route)
+        try:
+            if opened.first is not None:
+                yield opened.first
+            async for chunk in opened.chunks:
+                yield chunk
+        except Exception as e:
+            self._record_failure(opened.route, e)
+            raise
+        else:
+            self.breaker(opened.route).record_success()
+            metrics.successes += 1
+            metrics.latency.add(time.monotonic() - started)
+        finally:
+            # Also runs when the consumer stops iterating early
+            await opened.close()
+
+    async def complete(
+        self,
+        route: ModelRoute,
+        request: LLMRequest,
+        fallbacks: Sequence[ModelRoute] = (),
+        queue_timeout: Optional[float] = None,
+    ) -> LLMCompletion:
+        """
+        Run a non-streaming request through the router.
+
+        Args:
+            route: Primary model route.
+            request: The request to send.
+            fallbacks: Routes tried in order if the previous one fails.
+            queue_timeout: Seconds to wait for a concurrency slot per attempt.
+
+        Returns:
+            LLMCompletion with the text, usage and the route that served it.
+        """
+        timeout = self.queue_timeout if queue_timeout is None else queue_timeout
+        candidates = [route, *fallbacks]
+        last_error: Optional[BaseException] = None
+        for index, candidate in enumerate(candidates):
+            started = time.monotonic()
+            try:
+                release = await self._claim(candidate, started + timeout)
+            except Exception as e:
+                last_error = e
+                logger.warning(f"LLM route {candidate} unavailable: {e}")
+                continue
+            try:
+                text, usage = await self._entry(candidate).provider.complete(candidate.model, request)
+            except BaseException as e:
+                self._record_failure(candidate, e)
+                last_error = e
+                if isinstance(e, asyncio.CancelledError) or index == len(candidates) - 1:
+                    raise
+                logger.warning(f"LLM route {candidate} failed ({e}), falling back to {candidates[index + 1]}")
+                continue
+            finally:
+                release()
+            metrics = self.route_metrics(candidate)
+            self.breaker(candidate).record_success()
+            metrics.successes += 1
+            metrics.latency.add(time.monotonic() - started)
+            return LLMCompletion(text, usage, candidate)
+        raise last_error
+
+
+def parse_route(value: Optional[str]) -> Optional[ModelRoute]:
+    """Parse an optional "provider:model" setting, logging and ignoring bad values."""
+    if not value:
+        return None
+    try:
+        return ModelRoute.parse(value)
+    except ValueError as e:
+        logger.error(str(e))
+        return None
+
+
+def build_default_router() -> LLMRouter:
+    """Create a router with the providers configured in settings."""
+    settings = get_settings()
+    router = LLMRouter(
+        queue_timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+        failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.LLM_BREAKER_RESET_SECONDS,
+    )
+
+    model_limits: Dict[str, Dict[str, int]] = {}
+    for key, limit in settings.LLM_MODEL_CONCURRENCY.items():
+        model_route = parse_route(key)
+        if model_route:
+            model_limits.setdefault(model_route.provider, {})[model_route.model] = limit
+
+    try:
+        import anthropic
+        router.register_provider(
+            "anthropic",
+            AnthropicProvider(anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)),
+            max_concurrency=settings.LLM_ANTHROPIC_MAX_CONCURRENCY,
+            model_limits=model_limits.get("anthropic"),
+        )
+    except Exception as e:
+        logger.error(f"Failed to initialize Anthropic provider: {e}", exc_info=True)
+
+    if settings.OPENAI_API_KEY:
+        try:
+            import openai
+            router.register_provider(
+                "openai",
+                OpenAIProvider(openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)),
+                max_concurrency=settings.LLM_OPENAI_MAX_CONCURRENCY,
+                model_limits=model_limits.get("openai"),
+            )
+        except ImportError:
+            logger.warning("OpenAI library not found. ChatGPT features will be unavailable.")
+        except Exception as e:
+            logger.error(f"Failed to initialize OpenAI provider: {e}", exc_info=True)
+
+    if settings.LLM_FAKE_PROVIDER:
+        router.register_provider("fake", FakeProvider(), model_limits=model_limits.get("fake"))
+
+    return router
+
+
+_router: Optional[LLMRouter] = None
+
+
+def get_llm_router() -> LLMRouter:
+    """Process-wide router shared by the chat and NLQ services."""
+    global _router
+    if _router is None:
+        _router = build_default_router()
+    return _router
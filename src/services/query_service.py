@@ -8,6 +8,8 @@ from datetime import datetime, date, timedelta # Added timedelta for cache TTL
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.services.ai_query_processor import AIQueryProcessor # Import the new interface
+from src.services.schema_context import SchemaContextIndex
+from src.core.config import settings
 from pathlib import Path # Add Path
 
 logger = logging.getLogger(__name__)
@@ -17,6 +19,8 @@ _schema_cache: Optional[Tuple[datetime, str]] = None
 _SCHEMA_CACHE_TTL_SECONDS = 3600  # 1 hour
 _SCHEMA_FILE_PATH = Path(__file__).resolve().parent.parent / "config" / "database_schema_for_ai.md"
 _schema_file_last_modified_cache: Optional[datetime] = None
+# Keyword index over the schema file, rebuilt whenever the schema text changes
+_schema_index_cache: Optional[SchemaContextIndex] = None
 
 class QueryService:
     """
@@ -87,6 +91,33 @@ class QueryService:
         # It's better to have a clear error if the primary source (MD file) fails and no fallback is desired.
         raise ConnectionError(f"Failed to load schema information. Primary schema file missing or unreadable: {_SCHEMA_FILE_PATH}")
 
+    def _get_schema_index(self, schema_info: str) -> SchemaContextIndex:
+        """Return the keyword index for the given schema text, building it on first use."""
+        global _schema_index_cache
+        if _schema_index_cache is None or _schema_index_cache.md_content != schema_info:
+            logger.info("Building schema context index from schema information.")
+            _schema_index_cache = SchemaContextIndex(schema_info)
+        return _schema_index_cache
+
+    async def _get_schema_context(self, nl_query: str, schema_mode: Optional[str] = None) -> str:
+        """
+        Get the schema text to send with an NLQ request.
+
+        In "relevant" mode only the table sections matching the question (plus
+        the tables they reference) are included; "full" sends the whole file.
+        """
+        schema_info = await self._get_schema_info()
+        mode = (schema_mode or settings.NLQ_SCHEMA_CONTEXT_MODE).lower()
+        if mode != "relevant":
+            return schema_info
+
+        schema_index = self._get_schema_index(schema_info)
+        schema_context, tables = schema_index.render_for_question(
+            nl_query, max_tables=settings.NLQ_SCHEMA_MAX_TABLES
+        )
+        logger.info(f"Using schema sections for tables {tables} ({len(schema_context)} of {len(schema_info)} chars)")
+        return schema_context
+
     def _get_table_name_from_query(self, sql: str) -> Optional[str]:
         """Extracts the primary table name from a SQL query."""
         # This is a simplified regex and might not cover all SQL complexities
@@ -228,12 +259,14 @@ class QueryService:
             logger.warning(f"User SQL validation issues. Explanation: {explanation}. Corrected: {corrected_sql[:100]}...")
         return is_valid, corrected_sql, explanation
 
-    async def translate_natural_language_to_sql(self, nl_query: str) -> str:
+    async def translate_natural_language_to_sql(self, nl_query: str, schema_mode: Optional[str] = None) -> str:
         """Converts natural language to SQL, then validates the result."""
         logger.info(f"[QS_TRANSLATE_NLQ_TO_SQL] Received nl_query: '{nl_query}'")
-        schema_info = await self._get_schema_info()
+        schema_info = await self._get_schema_context(nl_query, schema_mode)
         
-        # Build specialized_guidance (ensure this logic is sound)
+        # Build specialized_guidance (ensure this logic is sound).
+        # Only per-query guidance goes here; the static PostgreSQL rules live in the
+        # AI processor's cached system prompt.
         specialized_guidance_parts = []
         common_sports_terms = ['NCAA', 'basketball', 'football', 'league', 'team', 'broadcast', 'rights', 'division', 'conference', 'sport', 'games']
         sports_entities_found = [term for term in common_sports_terms if re.search(rf'\b{term}\b', nl_query, re.IGNORECASE)]
@@ -253,12 +286,6 @@ class QueryService:
    - Look for matches in both league names AND division/conference names
    - Use COALESCE to handle NULL values in joins""")
         
-        specialized_guidance_parts.append("""IMPORTANT PostgreSQL Restrictions:
-1. When using SELECT DISTINCT, all ORDER BY columns must appear in the SELECT list
-2. For STRING_AGG with ORDER BY, ensure the ordering column is included in select list if using DISTINCT
-3. In CTEs with UNION, each SELECT must have the same column count and compatible data types
-4. All GROUP BY expressions must appear in the SELECT list, or be used in aggregate functions
-5. Window functions cannot be used with DISTINCT unless the DISTINCT is in a subquery""")
         specialized_guidance = "\n".join(specialized_guidance_parts)
 
         # Call AI Processor to generate SQL
@@ -281,7 +308,9 @@ class QueryService:
         # or the corrected_sql if the AI validator provided one and is_valid was true (which shouldn't happen with current validator logic, but defensive)
         return corrected_sql # The validator returns original SQL if valid, or corrected if it made changes and deemed it valid post-correction.
 
-    async def execute_natural_language_query(self, nl_query: str, limit: int = 100) -> Tuple[List[Dict[str, Any]], str]:
+    async def execute_natural_language_query(
+        self, nl_query: str, limit: int = 100, schema_mode: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], str]:
         """Processes an NLQ: translates+validates, then executes."""
         logger.info(f"[QS_EXECUTE_NLQ] Received nl_query: '{nl_query}'")
         sql_to_execute = ""
@@ -293,7 +322,7 @@ class QueryService:
         # else:
         # General case: Translate NLQ to SQL (includes validation)
         try:
-             sql_to_execute = await self.translate_natural_language_to_sql(nl_query)
+             sql_to_execute = await self.translate_natural_language_to_sql(nl_query, schema_mode)
         except ValueError as e:
              logger.error(f"Failed to translate NLQ '{nl_query[:50]}...' to SQL: {e}")
              # Propagate the error to the API layer
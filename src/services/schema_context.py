@@ -0,0 +1,192 @@
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Words that carry no signal when matching a question against the schema file
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "e", "eg",
+    "for", "from", "g", "get", "give", "has", "have", "how", "i", "if", "in", "is",
+    "it", "its", "list", "me", "my", "of", "on", "or", "please", "show", "that",
+    "the", "their", "them", "there", "these", "this", "to", "was", "what", "when",
+    "where", "which", "who", "with", "all", "any", "each", "id", "ids", "uuid",
+    "varchar", "timestamp", "nullable", "pk", "fk", "null", "table", "column",
+    "queries", "query", "should", "generally", "filter", "using", "deleted_at",
+}
+
+_TABLE_HEADER_RE = re.compile(r"^\*\*Table: `([^`]+)`\*\*\s*$", re.MULTILINE)
+_COLUMN_RE = re.compile(r"^\s*\*\s*`([^`]+)`\s*\(", re.MULTILINE)
+_REFERENCE_RE = re.compile(r"`([a-z_][a-z0-9_]*)\.id`")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Tables scoring below this fraction of the best match are treated as noise
+_MIN_RELATIVE_SCORE = 0.25
+
+# Weight of a keyword depending on where it appears in a table section
+_TABLE_NAME_WEIGHT = 4.0
+_COLUMN_NAME_WEIGHT = 1.5
+_DESCRIPTION_WEIGHT = 0.5
+
+
+def _stem(token: str) -> str:
+    """Very small plural stemmer so 'teams'/'team' and 'rights'/'right' match."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("es") and token[-3] in "sxz":
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords and stem."""
+    return [
+        _stem(token)
+        for token in _TOKEN_RE.findall(text.lower().replace("_", " "))
+        if token not in _STOPWORDS and len(token) > 1
+    ]
+
+
+@dataclass
+class SchemaSection:
+    """A single `**Table: ...**` block of the schema description file."""
+    table_name: str
+    text: str
+    weights: Dict[str, float] = field(default_factory=dict)
+    references: Set[str] = field(default_factory=set)
+
+
+class SchemaContextIndex:
+    """
+    Keyword index over the AI schema description file.
+
+    Splits the markdown into its preamble (general guidelines), one section
+    per table and a trailing footer, then scores every table section against
+    a natural language question with an IDF-weighted keyword match so that
+    only the relevant tables need to be sent to the model.
+    """
+
+    def __init__(self, md_content: str):
+        self.md_content = md_content
+        self.preamble = md_content
+        self.footer = ""
+        self.sections: Dict[str, SchemaSection] = {}
+        self._idf: Dict[str, float] = {}
+        self._parse(md_content)
+        self._build_index()
+
+    def _parse(self, md_content: str) -> None:
+        headers = list(_TABLE_HEADER_RE.finditer(md_content))
+        if not headers:
+            logger.warning("Schema description contains no table sections; index will be empty.")
+            return
+
+        self.preamble = md_content[:headers[0].start()].rstrip() + "\n"
+        for i, header in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(md_content)
+            block = md_content[header.start():end]
+            # Anything after a trailing horizontal rule belongs to the footer
+            if i + 1 == len(headers) and "\n---" in block:
+                block, footer = block.split("\n---", 1)
+                self.footer = "---" + footer
+            name = header.group(1)
+            self.sections[name] = SchemaSection(table_name=name, text=block.strip() + "\n")
+
+    def _build_index(self) -> None:
+        document_frequency: Dict[str, int] = {}
+        for name, section in self.sections.items():
+            weights: Dict[str, float] = {}
+
+            def add(tokens: List[str], weight: float) -> None:
+                for token in tokens:
+                    weights[token] = max(weights.get(token, 0.0), weight)
+
+            add(tokenize(section.text), _DESCRIPTION_WEIGHT)
+            add(tokenize(" ".join(_COLUMN_RE.findall(section.text))), _COLUMN_NAME_WEIGHT)
+            add(tokenize(name) + [_stem(name)], _TABLE_NAME_WEIGHT)
+
+            section.weights = weights
+            section.references = {
+                ref for ref in _REFERENCE_RE.findall(section.text) if ref != name
+            }
+            for token in weights:
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+
+        total = max(len(self.sections), 1)
+        self._idf = {
+            token: math.log(1 + total / count) for token, count in document_frequency.items()
+        }
+
+    def rank(self, question: str) -> List[Tuple[str, float]]:
+        """Return (table_name, score) pairs with a positive score, best first."""
+        tokens = set(tokenize(question))
+        # Also try multi-word table names written naturally ("broadcast rights")
+        tokens.update(_stem(t) for t in re.findall(r"[a-z]+(?:_[a-z]+)+", question.lower()))
+
+        scores = []
+        for name, section in self.sections.items():
+            score = sum(
+                section.weights[token] * self._idf.get(token, 0.0)
+                for token in tokens
+                if token in section.weights
+            )
+            if score > 0:
+                scores.append((name, score))
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores
+
+    def select_tables(
+        self, question: str, max_tables: int = 4, include_related: bool = True
+    ) -> List[str]:
+        """
+        Pick the tables most relevant to the question.
+
+        Tables referenced through foreign keys from the selected ones are
+        added so the model can still write the joins. Returns an empty list
+        when nothing in the question matches the schema.
+        """
+        scores = self.rank(question)
+        if not scores:
+            return []
+        cutoff = scores[0][1] * _MIN_RELATIVE_SCORE
+        ranked = [name for name, score in scores[:max_tables] if score >= cutoff]
+        if not include_related:
+            return ranked
+
+        selected = list(ranked)
+        for name in ranked:
+            for ref in sorted(self.sections[name].references):
+                if ref in self.sections and ref not in selected:
+                    selected.append(ref)
+        return selected
+
+    def render(self, table_names: Optional[List[str]] = None) -> str:
+        """Rebuild the schema text containing only the given tables (all if None)."""
+        if table_names is None or not self.sections:
+            return self.md_content
+
+        # Keep file order so the rendered text is stable for prompt caching
+        blocks = [
+            section.text for name, section in self.sections.items() if name in table_names
+        ]
+        parts = [self.preamble, "\n".join(blocks)]
+        if self.footer:
+            parts.append(self.footer)
+        return "\n".join(parts)
+
+    def render_for_question(self, question: str, max_tables: int = 4) -> Tuple[str, List[str]]:
+        """
+        Return the schema text restricted to the question's tables.
+
+        Falls back to the full schema if no table matches, so an unusual
+        phrasing never leaves the model without context.
+        """
+        tables = self.select_tables(question, max_tables=max_tables)
+        if not tables:
+            logger.info("No schema sections matched the question; using full schema.")
+            return self.md_content, list(self.sections.keys())
+        return self.render(tables), tables
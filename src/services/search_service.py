@@ -0,0 +1,272 @@
+"""
+Web search used by chat responses.
+
+One long-lived aiohttp session is created at application startup and shared
+by all searches; results are cached per normalized query for a TTL. The
+backend is pluggable so tests and benchmarks can use StubSearchBackend
+instead of hitting the network.
+"""
+import abc
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote_plus
+
+import aiohttp
+
+from src.utils.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a query: case- and whitespace-insensitive."""
+    return " ".join(query.lower().split())
+
+
+class SearchError(Exception):
+    """Raised by backends when a search cannot be completed."""
+    pass
+
+
+class SearchBackend(abc.ABC):
+    """Interface for a web search provider."""
+
+    @abc.abstractmethod
+    async def search(self, query: str, session: Optional[aiohttp.ClientSession]) -> List[str]:
+        """
+        Run a search and return result URLs.
+
+        Args:
+            query: The search query.
+            session: Shared HTTP session (backends that don't use HTTP may ignore it).
+        """
+        pass
+
+
+class DuckDuckGoSearchBackend(SearchBackend):
+    """Search backend using the DuckDuckGo instant answer API."""
+
+    def __init__(self, max_results: int = 10, timeout: float = 10.0):
+        self.max_results = max_results
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async def search(self, query: str, session: Optional[aiohttp.ClientSession]) -> List[str]:
+        search_url = (
+            f"https://api.duckduckgo.com/?q={quote_plus(query)}"
+            "&format=json&no_redirect=1&no_html=1"
+        )
+        logger.debug(f"Search URL: {search_url}")
+        async with session.get(search_url, headers={'User-Agent': _USER_AGENT}, timeout=self.timeout) as response:
+            if response.status != 200:
+                raise SearchError(f"Search failed with status {response.status}")
+
+            response_text = await response.text()
+            if response_text.startswith('(') and response_text.endswith(')'):
+                response_text = response_text[1:-1]
+
+            topics = json.loads(response_text).get('RelatedTopics', [])
+            return [topic['FirstURL'] for topic in topics[:self.max_results] if 'FirstURL' in topic]
+
+
+class StubSearchBackend(SearchBackend):
+    """
+    In-process backend for tests and benchmarks.
+
+    Returns canned results (or a deterministic URL per query) after an
+    optional artificial latency, and counts calls.
+    """
+
+    def __init__(self, results: Optional[Dict[str, List[str]]] = None, latency: float = 0.0):
+        self.results = results or {}
+        self.latency = latency
+        self.calls: List[str] = []
+
+    async def search(self, query: str, session: Optional[aiohttp.ClientSession]) -> List[str]:
+        self.calls.append(query)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        key = normalize_query(query)
+        if key in self.results:
+            return self.results[key]
+        return [f"https://example.com/search?q={quote_plus(key)}"]
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire after ttl_seconds."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: List[str]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SearchService:
+    """Shared-session, cached web search."""
+
+    def __init__(
+        self,
+        backend: Optional[SearchBackend] = None,
+        cache_ttl_seconds: float = settings.SEARCH_CACHE_TTL_SECONDS,
+        cache_max_entries: int = settings.SEARCH_CACHE_MAX_ENTRIES,
+    ):
+        self.backend = backend or DuckDuckGoSearchBackend()
+        self.cache = TTLCache(cache_ttl_seconds, cache_max_entries)
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Identical queries issued concurrently share one backend call
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def startup(self) -> None:
+        """Create the shared HTTP session (connection pool + DNS cache)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+            logger.info("Search HTTP session started")
+
+    async def shutdown(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Search HTTP session closed")
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Lazily start when used outside the app lifecycle (scripts, tests)
+        if self._session is None or self._session.closed:
+            await self.startup()
+        return self._session
+
+    async def search(self, query: str) -> List[str]:
+        """Return result URLs for a query, served from cache when possible."""
+        key = normalize_query(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.debug(f"Search cache hit for: {key}")
+            return cached
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            results = await self.backend.search(query, await self._get_session())
+            self.cache.set(key, results)
+            future.set_result(results)
+            return results
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited future doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    @staticmethod
+    def format_results(results: List[str]) -> str:
+        if not results:
+            return "No results found"
+        lines = [f"{idx}. {url}" for idx, url in enumerate(results, 1)]
+        return "\nSearch Results (source URLs only):\n" + "\n".join(lines) + "\n"
+
+    async def search_text(self, query: str) -> str:
+        """Search and format the results for the chat stream; errors become text."""
+        try:
+            return self.format_results(await self.search(query))
+        except Exception as e:
+            logger.error(f"Search error for '{query}': {e}", exc_info=True)
+            return f"Search error: {str(e)}"
+
+    def batch(self, deadline_seconds: float = settings.SEARCH_DEADLINE_SECONDS) -> "SearchBatch":
+        return SearchBatch(self, deadline_seconds)
+
+
+class SearchBatch:
+    """
+    Searches started while streaming one response.
+
+    Each search runs as its own task so the token stream isn't stalled;
+    results are collected as they complete, and whatever is still running
+    when the shared deadline passes is cancelled.
+    """
+
+    def __init__(self, service: SearchService, deadline_seconds: float):
+        self.service = service
+        self.deadline_seconds = deadline_seconds
+        self._deadline: Optional[float] = None
+        self._pending: List[Tuple[str, asyncio.Task]] = []
+
+    def start(self, query: str) -> None:
+        if self._deadline is None:
+            self._deadline = time.monotonic() + self.deadline_seconds
+        self._pending.append((query, asyncio.create_task(self.service.search_text(query))))
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @staticmethod
+    def _result_text(task: asyncio.Task) -> str:
+        if task.cancelled():
+            return "Search was cancelled"
+        return task.result()
+
+    def pop_completed(self) -> List[Tuple[str, str]]:
+        """Return (query, result text) for searches that have finished, in start order."""
+        done = [(q, t) for q, t in self._pending if t.done()]
+        self._pending = [(q, t) for q, t in self._pending if not t.done()]
+        return [(q, self._result_text(t)) for q, t in done]
+
+    async def finish(self) -> List[Tuple[str, str]]:
+        """Wait for remaining searches until the deadline; time out the rest."""
+        if not self._pending:
+            return []
+        remaining = max(0.0, self._deadline - time.monotonic())
+        await asyncio.wait([t for _, t in self._pending], timeout=remaining)
+
+        results = []
+        for query, task in self._pending:
+            if task.done():
+                results.append((query, self._result_text(task)))
+            else:
+                task.cancel()
+                logger.warning(f"Search for '{query}' missed the {self.deadline_seconds}s deadline")
+                results.append((query, f"Search timed out after {self.deadline_seconds} seconds"))
+        self._pending = []
+        return results
+
+
+# Shared instance; its session is opened/closed by the app startup/shutdown hooks
+search_service = SearchService()
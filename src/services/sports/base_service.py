@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Optional, Dict, Any, Type, Generic, TypeVar, Union, cast, Protocol
+from typing import List, Optional, Dict, Any, Tuple, Type, Generic, TypeVar, Union, cast, Protocol
 from uuid import UUID
 import logging
 from sqlalchemy import select, delete, update, func, or_
@@ -14,6 +14,29 @@ from src.utils.errors import (
     handle_database_errors
 )
 from src.services.sports.utils import normalize_entity_type
+from src.services.sports.entity_search import (
+    EXACT,
+    FUZZY,
+    EntityMatch,
+    contains_condition,
+    ranked_search,
+    to_matches,
+)
+from src.services.sports.bulk_upsert import (
+    BULK_UPSERT_CHUNK_SIZE,
+    BulkUpsertReport,
+    ChunkReport,
+    chunked,
+    column_keys,
+    drop_duplicates,
+    group_by_fields,
+    merge_duplicates,
+    natural_key,
+    required_columns,
+    upsert_statement,
+)
+from src.services.sports.pagination import apply_keyset, count_rows, next_page_cursor
+from src.services.sports.display_views import refresh_displays
 from src.models.base import TimestampedBase
 
 logger = logging.getLogger(__name__)
@@ -56,7 +79,7 @@ class BaseEntityService(Generic[ModelType]):
 
         # Separate search_columns filter
         if 'search_columns' in filters:
-            search_value = f"%{filters['search_columns']['value']}%"
+            search_value = str(filters['search_columns']['value'])
             search_columns = filters['search_columns']['columns']
             
             for col_name in search_columns:
@@ -64,7 +87,7 @@ class BaseEntityService(Generic[ModelType]):
                     column = getattr(self.model_class, col_name)
                     # Ensure we only apply ILIKE to string-based columns
                     if isinstance(column.type, (String, Text)):
-                        search_clauses.append(column.ilike(search_value))
+                        search_clauses.append(contains_condition(column, search_value))
             
             del filters['search_columns'] # Remove from normal processing
 
@@ -90,10 +113,15 @@ class BaseEntityService(Generic[ModelType]):
     @handle_database_errors
     async def get_entities(self, db: AsyncSession, filters: Optional[Dict[str, Any]] = None, 
                           page: int = 1, limit: int = 50, 
-                          sort_by: str = "id", sort_direction: str = "asc") -> Dict[str, Any]:
+                          sort_by: str = "id", sort_direction: str = "asc",
+                          cursor: Optional[str] = None, count_mode: str = "exact") -> Dict[str, Any]:
         """
         Get paginated entities with optional filtering.
         
+        Pages are ordered by the sort field then id. Pass the returned
+        next_cursor back as cursor to fetch the following page by keyset
+        instead of OFFSET; page is ignored when a cursor is given.
+        
         Args:
             db: Database session
             filters: Optional dictionary of field:value pairs to filter on
@@ -101,49 +129,51 @@ class BaseEntityService(Generic[ModelType]):
             limit: Number of items per page
             sort_by: Field to sort by
             sort_direction: Sort direction ("asc" or "desc")
+            cursor: Opaque cursor from a previous page's next_cursor
+            count_mode: "exact", "estimated", "cached" or "auto" (see pagination.count_rows)
             
         Returns:
             Dictionary with paginated results and metadata
+            
+        Raises:
+            InvalidCursorError: If the cursor doesn't belong to this sort
         """
         # Create base query
         query = select(self.model_class)
-        count_query = select(func.count()).select_from(self.model_class)
         
         # Add filters if provided
         if filters:
             conditions = self._prepare_filters(filters)
             if conditions:
                 query = query.where(*conditions)
-                count_query = count_query.where(*conditions)
         
         # Get total count with filters applied
-        total_count = await db.scalar(count_query)
+        total_count, estimated = await count_rows(db, query, self.model_class.__tablename__, count_mode)
         
         # Add sorting
-        if hasattr(self.model_class, sort_by):
-            sort_column = getattr(self.model_class, sort_by)
-            if sort_direction.lower() == "desc":
-                query = query.order_by(sort_column.desc())
-            else:
-                query = query.order_by(sort_column.asc())
-        else:
+        if not hasattr(self.model_class, sort_by):
             # Default to sorting by id if the requested column doesn't exist
             logger.warning(f"Sort column '{sort_by}' does not exist on {self.entity_type}, using default 'id'")
-            if hasattr(self.model_class, 'id'):
-                query = query.order_by(self.model_class.id.asc())
-                
-        # Add pagination
-        query = query.offset((page - 1) * limit).limit(limit)
+            sort_by = "id"
+        direction = "desc" if sort_direction.lower() == "desc" else "asc"
+        query = apply_keyset(
+            query, getattr(self.model_class, sort_by), self.model_class.id, direction, limit, cursor, sort_by
+        )
+        if not cursor:
+            query = query.offset((page - 1) * limit)
         
         result = await db.execute(query)
-        entities = result.scalars().all()
+        entities = list(result.scalars().all())
+        next_cursor = next_page_cursor(entities, limit, sort_by, direction)
         
         return {
             "items": [self._model_to_dict(entity) for entity in entities],
             "total": total_count or 0,
             "page": page,
             "size": limit,
-            "pages": math.ceil((total_count or 0) / limit) if limit > 0 else 0
+            "pages": math.ceil((total_count or 0) / limit) if limit > 0 else 0,
+            "next_cursor": next_cursor,
+            "total_estimated": estimated
         }
     
     @handle_database_errors
@@ -196,33 +226,9 @@ class BaseEntityService(Generic[ModelType]):
             logger.error(f"[BaseEntityService.get_entity_by_name] Model {self.model_class.__name__} does not have a 'name' attribute.")
             raise ValidationError(f"{self.entity_type} model does not have a 'name' attribute")
             
-        search_term_lower = name.lower()
-        logger.debug(f"[BaseEntityService.get_entity_by_name] Lowercased search term: '{search_term_lower}'")
-
-        conditions = []
-        if hasattr(self.model_class, 'name'):
-            conditions.append(func.lower(self.model_class.name) == search_term_lower)
-        
-        logger.debug(f"[BaseEntityService.get_entity_by_name] Initial condition: name == '{search_term_lower}'")
-
-        if hasattr(self.model_class, 'nickname'):
-            logger.debug(f"[BaseEntityService.get_entity_by_name] Model {self.model_class.__name__} has nickname attribute. Adding to conditions.")
-            conditions.append(func.lower(self.model_class.nickname) == search_term_lower)
-        else:
-            logger.debug(f"[BaseEntityService.get_entity_by_name] Model {self.model_class.__name__} does NOT have nickname attribute.")
-        
-        query = select(self.model_class).where(or_(*conditions))
-        
-        # Log the generated SQL query (for dialects that support it easily like PostgreSQL)
-        try:
-            from sqlalchemy.dialects import postgresql
-            compiled_query = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
-            logger.debug(f"[BaseEntityService.get_entity_by_name] Compiled SQL Query: {str(compiled_query)}")
-        except Exception as e:
-            logger.warning(f"[BaseEntityService.get_entity_by_name] Could not compile query for logging: {e}")
-
-        result = await db.execute(query)
-        entity = result.scalars().first()
+        # One query over name and nickname, served by the lower() indexes
+        matches = await self.search_entities(db, name, limit=1, fuzzy=False)
+        entity = matches[0].entity if matches else None
         
         if entity:
             logger.debug(f"[BaseEntityService.get_entity_by_name] Found entity: {entity}")
@@ -234,6 +240,35 @@ class BaseEntityService(Generic[ModelType]):
             
         return entity
         
+    @handle_database_errors
+    async def search_entities(self, db: AsyncSession, search_term: str, limit: int = 10,
+                              fuzzy: bool = True) -> List[EntityMatch]:
+        """
+        Rank entities by how well their name or nickname matches a search term.
+        
+        Args:
+            db: Database session
+            search_term: Name, nickname or fragment to search for
+            limit: Maximum number of matches to return
+            fuzzy: Include prefix, substring and trigram-similar matches; when
+                False only exact (case-insensitive) name/nickname matches count
+            
+        Returns:
+            Matches ordered best first: exact, then prefix, then substring, then
+            fuzzy, with trigram similarity breaking ties
+            
+        Raises:
+            ValidationError: If the model doesn't have a 'name' attribute
+        """
+        if not hasattr(self.model_class, 'name'):
+            raise ValidationError(f"{self.entity_type} model does not have a 'name' attribute for searching.")
+        if not search_term or not search_term.strip():
+            return []
+            
+        query = ranked_search(self.model_class, search_term, limit=limit, max_rank=FUZZY if fuzzy else EXACT)
+        result = await db.execute(query)
+        return to_matches(result.all())
+    
     @handle_database_errors
     async def find_entity(self, db: AsyncSession, search_term: str, raise_not_found: bool = False) -> Optional[ModelType]:
         """
@@ -268,46 +303,10 @@ class BaseEntityService(Generic[ModelType]):
                 raise ValidationError(f"{self.entity_type} model does not have a 'name' attribute for searching.")
             return None
             
-        search_term_lower = search_term.lower()
-
-        # Try exact match on name first (case insensitive)
-        query_name_exact = select(self.model_class).where(func.lower(self.model_class.name) == search_term_lower)
-        result_name_exact = await db.execute(query_name_exact)
-        entity_name_exact = result_name_exact.scalars().first()
-        if entity_name_exact:
-            return entity_name_exact
-            
-        # If model has nickname, try exact match on nickname (case insensitive)
-        if hasattr(self.model_class, 'nickname'):
-            query_nickname_exact = select(self.model_class).where(func.lower(self.model_class.nickname) == search_term_lower)
-            result_nickname_exact = await db.execute(query_nickname_exact)
-            entity_nickname_exact = result_nickname_exact.scalars().first()
-            if entity_nickname_exact:
-                return entity_nickname_exact
-            
-        # Try partial match (contains) on name and nickname (if available)
-        partial_match_conditions = [func.lower(self.model_class.name).contains(search_term_lower)]
-        if hasattr(self.model_class, 'nickname') and self.model_class.nickname is not None: # Check if nickname column exists and is not None type
-            partial_match_conditions.append(func.lower(self.model_class.nickname).contains(search_term_lower))
-        
-        query_partial = select(self.model_class).where(or_(*partial_match_conditions))
-        result_partial = await db.execute(query_partial)
-        entities_partial = result_partial.scalars().all()
-        
-        # If we have multiple partial matches, try to find a more precise one (exact word match)
-        if len(entities_partial) > 1:
-            for entity in entities_partial:
-                name_parts = entity.name.lower().split()
-                if search_term_lower in name_parts:
-                    return entity
-                if hasattr(entity, 'nickname') and entity.nickname:
-                    nickname_parts = entity.nickname.lower().split()
-                    if search_term_lower in nickname_parts:
-                        return entity
-        
-        # Otherwise return the first partial match if any
-        if entities_partial:
-            return entities_partial[0]
+        # Exact, prefix, substring and trigram matches in one ranked query
+        matches = await self.search_entities(db, search_term, limit=1)
+        if matches:
+            return matches[0].entity
             
         if raise_not_found:
             raise EntityNotFoundError(entity_type=self.entity_type, entity_name=search_term)
@@ -431,19 +430,140 @@ class BaseEntityService(Generic[ModelType]):
             update_if_exists: Whether to update existing entities with same name
             
         Returns:
-            List of created entities
+            List of created (or updated) entities; see bulk_upsert for per-chunk counts
+        """
+        report = await self.bulk_upsert(
+            db, entities_data,
+            validate_fields=validate_fields,
+            update_if_exists=update_if_exists
+        )
+        return report.entities
+    
+    @handle_database_errors
+    async def bulk_upsert(self, db: AsyncSession, entities_data: List[Dict[str, Any]],
+                          validate_fields: bool = True,
+                          update_if_exists: bool = True,
+                          chunk_size: int = BULK_UPSERT_CHUNK_SIZE) -> BulkUpsertReport:
         """
-        created_entities = []
+        Insert or update many entities with one INSERT ... ON CONFLICT per chunk.
         
-        for data in entities_data:
-            entity = await self.create_entity(
-                db, data, 
-                validate_fields=validate_fields,
-                update_if_exists=update_if_exists
-            )
-            created_entities.append(entity)
+        All chunks run in one transaction, each under a savepoint, so a chunk
+        that hits a database error (e.g. a missing foreign key) is reported as
+        failed without losing the others.
+        
+        Args:
+            db: Database session
+            entities_data: List of entity data dictionaries
+            validate_fields: Whether to validate that all fields exist on model
+            update_if_exists: Update rows matching an existing entity (by the
+                unique name, or case-insensitively by name for models without
+                one); when False those rows, and repeats within the batch, are
+                skipped and counted as failed
+            chunk_size: Rows per chunk
             
-        return created_entities
+        Returns:
+            Report with inserted/updated/failed counts per chunk and the written entities
+            
+        Raises:
+            ValidationError: If fields don't exist on model and validate_fields is True
+        """
+        # Field validation once for the whole batch
+        columns = column_keys(self.model_class)
+        unknown = set().union(*entities_data) - columns if entities_data else set()
+        if unknown and validate_fields:
+            raise ValidationError(f"Fields {sorted(unknown)} do not exist on {self.entity_type} model")
+        required = required_columns(self.model_class)
+        
+        natural = natural_key(self.model_class)
+        conflict_key = natural or ('id',)
+        match_by_name = natural is None and 'name' in columns
+        report = BulkUpsertReport(entity_type=self.entity_type, conflict_key=conflict_key)
+        
+        for chunk_index, chunk in enumerate(chunked(list(enumerate(entities_data)), chunk_size)):
+            chunk_report = ChunkReport(index=chunk_index, rows=len(chunk))
+            report.chunks.append(chunk_report)
+            
+            rows = []
+            for index, data in chunk:
+                row = {key: value for key, value in data.items() if key in columns}
+                missing = [col for col in required if row.get(col) is None]
+                if missing:
+                    chunk_report.failed += 1
+                    report.add_error(index, f"Missing required fields: {missing}")
+                    continue
+                rows.append((index, row))
+            if not rows:
+                continue
+            
+            written = []
+            duplicates = 0
+            try:
+                async with db.begin_nested():
+                    if match_by_name:
+                        await self._attach_existing_ids(db, rows)
+                    if update_if_exists:
+                        merged = merge_duplicates(rows, self._upsert_key(conflict_key))
+                        chunk_report.updated += len(rows) - len(merged)
+                        rows = merged
+                    else:
+                        kept = drop_duplicates(rows, self._upsert_key(conflict_key))
+                        duplicates = len(rows) - len(kept)
+                        rows = kept
+                    for group in group_by_fields(rows):
+                        stmt = upsert_statement(self.model_class, group[0][1].keys(), conflict_key, update_if_exists)
+                        result = await db.execute(stmt, [row for _, row in group])
+                        written.extend(result.all())
+                    # Core upserts skip the flush hooks that keep display tables current
+                    await refresh_displays(db, self.model_class, (entity.id for entity, _ in written))
+            except SQLAlchemyError as e:
+                logger.warning(f"Bulk upsert chunk {chunk_index} of {self.entity_type} failed: {e}")
+                chunk_report.updated = 0
+                chunk_report.failed = chunk_report.rows
+                chunk_report.error = str(getattr(e, 'orig', None) or e)
+                continue
+            
+            inserted = sum(1 for _, was_inserted in written if was_inserted)
+            chunk_report.inserted += inserted
+            chunk_report.updated += len(written) - inserted
+            skipped = len(rows) - len(written) + duplicates
+            if skipped:
+                chunk_report.failed += skipped
+                chunk_report.error = f"{skipped} rows already exist"
+            report.entities.extend(entity for entity, _ in written)
+        
+        await db.commit()
+        logger.info(
+            f"Bulk upsert of {len(entities_data)} {self.entity_type} rows: {report.inserted} inserted, "
+            f"{report.updated} updated, {report.failed} failed in {len(report.chunks)} chunks"
+        )
+        return report
+    
+    async def _attach_existing_ids(self, db: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """Give rows without an id the id of the existing entity with the same name (case-insensitive)."""
+        names = {row['name'].lower() for _, row in rows if 'id' not in row and isinstance(row.get('name'), str)}
+        if not names:
+            return
+        name_lower = func.lower(self.model_class.name)
+        result = await db.execute(select(self.model_class.id, name_lower).where(name_lower.in_(names)))
+        existing: Dict[str, Any] = {}
+        for entity_id, name in result.all():
+            existing.setdefault(name, entity_id)
+        for _, row in rows:
+            if 'id' not in row and isinstance(row.get('name'), str) and row['name'].lower() in existing:
+                row['id'] = existing[row['name'].lower()]
+    
+    @staticmethod
+    def _upsert_key(conflict_key: Tuple[str, ...]):
+        """Key identifying rows that would hit the same existing entity."""
+        def key_of(row: Dict[str, Any]):
+            if conflict_key != ('id',):
+                return tuple(row.get(col) for col in conflict_key)
+            if 'id' in row:
+                return ('id', row['id'])
+            if isinstance(row.get('name'), str):
+                return ('name', row['name'].lower())
+            return ('row', id(row))
+        return key_of
         
     @handle_database_errors
     async def bulk_update(self, db: AsyncSession, entity_ids: List[UUID], 
@@ -471,6 +591,7 @@ class BaseEntityService(Generic[ModelType]):
             ).values(**common_data)
             
             result = await db.execute(stmt)
+            await refresh_displays(db, self.model_class, entity_ids)
             await db.commit()
             
             return result.rowcount
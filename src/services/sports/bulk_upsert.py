@@ -0,0 +1,179 @@
+"""
+Set-based bulk upsert for sports entities.
+
+Rows are written a chunk at a time with one INSERT ... ON CONFLICT ...
+RETURNING per chunk (per distinct set of supplied fields, so an update never
+overwrites a column the caller didn't send). The conflict target is the
+model's unique name constraint where it has one, e.g. (name) for teams or
+(league_id, name) for divisions/conferences. Models without one are matched
+to existing rows by lower(name) in a single query per chunk and upserted on
+their primary key.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, Type
+
+from sqlalchemy import UniqueConstraint, func, inspect, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# Rows per INSERT statement
+BULK_UPSERT_CHUNK_SIZE = 500
+# Row failures kept for the report
+MAX_REPORTED_ERRORS = 20
+
+# Never changed by an upsert's DO UPDATE
+IMMUTABLE_COLUMNS = ("id", "created_at")
+
+
+@dataclass
+class RowFailure:
+    """A row that was not written (rows are 0-based indexes into the input)."""
+    row: int
+    message: str
+
+
+@dataclass
+class ChunkReport:
+    """Outcome of one chunk."""
+    index: int
+    rows: int
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkUpsertReport:
+    """Outcome of a bulk upsert; entities are the written rows, in no particular order."""
+    entity_type: str
+    conflict_key: Tuple[str, ...]
+    chunks: List[ChunkReport] = field(default_factory=list)
+    errors: List[RowFailure] = field(default_factory=list)
+    entities: List[Any] = field(default_factory=list)
+
+    @property
+    def inserted(self) -> int:
+        return sum(chunk.inserted for chunk in self.chunks)
+
+    @property
+    def updated(self) -> int:
+        return sum(chunk.updated for chunk in self.chunks)
+
+    @property
+    def failed(self) -> int:
+        return sum(chunk.failed for chunk in self.chunks)
+
+    def add_error(self, row: int, message: str) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowFailure(row, message))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "entity_type": self.entity_type,
+            "conflict_key": list(self.conflict_key),
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "failed": self.failed,
+            "chunks": [chunk.__dict__ for chunk in self.chunks],
+            "errors": [error.__dict__ for error in self.errors],
+        }
+
+
+def column_keys(model_class: Type[Any]) -> Set[str]:
+    """Attribute keys of the model's mapped columns."""
+    return {attr.key for attr in inspect(model_class).column_attrs}
+
+
+def required_columns(model_class: Type[Any]) -> List[str]:
+    """Columns a row must supply: NOT NULL without a Python or server default."""
+    return [
+        column.key for column in model_class.__table__.columns
+        if not column.nullable and column.default is None and column.server_default is None
+    ]
+
+
+def natural_key(model_class: Type[Any]) -> Optional[Tuple[str, ...]]:
+    """The smallest unique constraint that includes name, if the table has one."""
+    table = model_class.__table__
+    candidates = [
+        tuple(column.key for column in constraint.columns)
+        for constraint in table.constraints if isinstance(constraint, UniqueConstraint)
+    ]
+    candidates += [tuple(column.key for column in index.columns) for index in table.indexes if index.unique]
+    candidates += [(column.key,) for column in table.columns if column.unique]
+    candidates = [key for key in candidates if "name" in key]
+    return min(candidates, key=len) if candidates else None
+
+
+def chunked(rows: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def merge_duplicates(rows: List[Tuple[int, Dict[str, Any]]],
+                     key_of: Callable[[Dict[str, Any]], Hashable]) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Collapse rows sharing a conflict key, later values winning.
+
+    One INSERT ... ON CONFLICT DO UPDATE cannot touch the same row twice.
+    """
+    merged: Dict[Hashable, Tuple[int, Dict[str, Any]]] = {}
+    for index, row in rows:
+        row_key = key_of(row)
+        if row_key in merged:
+            merged[row_key][1].update(row)
+        else:
+            merged[row_key] = (index, dict(row))
+    return list(merged.values())
+
+
+def drop_duplicates(rows: List[Tuple[int, Dict[str, Any]]],
+                    key_of: Callable[[Dict[str, Any]], Hashable]) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Keep the first of the rows sharing a conflict key.
+
+    For inserts that skip existing entities: rows without an id never
+    conflict on ON CONFLICT (id), so repeats of a new name would all be inserted.
+    """
+    kept: Dict[Hashable, Tuple[int, Dict[str, Any]]] = {}
+    for index, row in rows:
+        kept.setdefault(key_of(row), (index, row))
+    return list(kept.values())
+
+
+def group_by_fields(rows: List[Tuple[int, Dict[str, Any]]]) -> List[List[Tuple[int, Dict[str, Any]]]]:
+    """Split rows by the set of fields they supply, keeping input order within each group."""
+    groups: Dict[frozenset, List[Tuple[int, Dict[str, Any]]]] = {}
+    for index, row in rows:
+        groups.setdefault(frozenset(row), []).append((index, row))
+    return list(groups.values())
+
+
+def upsert_statement(model_class: Type[Any], fields: Iterable[str], conflict_key: Tuple[str, ...],
+                     update_if_exists: bool):
+    """
+    INSERT ... ON CONFLICT for rows supplying the given fields.
+
+    Returns the written entities plus an "inserted" flag (xmax = 0 only for
+    freshly inserted tuples). With update_if_exists False, conflicting rows are
+    skipped and so are missing from the RETURNING rows.
+    """
+    stmt = pg_insert(model_class)
+    if update_if_exists:
+        set_ = {
+            col: stmt.excluded[col] for col in fields
+            if col not in conflict_key and col not in IMMUTABLE_COLUMNS
+        }
+        if hasattr(model_class, "updated_at") and "updated_at" not in set_:
+            set_["updated_at"] = func.now()
+        if not set_:
+            # DO UPDATE with a no-op so the existing row is still returned
+            set_ = {conflict_key[0]: stmt.excluded[conflict_key[0]]}
+        stmt = stmt.on_conflict_do_update(index_elements=list(conflict_key), set_=set_)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_key))
+    return (
+        stmt.returning(model_class, literal_column("xmax = 0").label("inserted"))
+        .execution_options(populate_existing=True)
+    )
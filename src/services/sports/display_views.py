@@ -0,0 +1,229 @@
+"""
+Denormalized display tables for the related names that are costly to resolve.
+
+Games, broadcast rights, production services and game broadcasts each have a
+*_display table (GameDisplay etc.) holding the registry's related keys for
+every entity, so listings, searches and exports read one row by primary key
+instead of joining up to eleven tables. Cheaper types (teams, players, ...)
+keep resolving through with_related.
+
+The tables are kept current in the writing transaction:
+- ORM flushes of any table a display row reads from refresh the affected
+  display rows (session events below)
+- BaseEntityService.bulk_upsert and bulk_update, which write with Core
+  statements, call refresh_displays themselves
+
+Every entity has a display row: an AFTER INSERT trigger on each source table
+adds it even for raw SQL inserts, so listings inner-join the display table
+and sort on its bare columns, which the (name, id) indexes return in order.
+A write that bypasses both (raw SQL, another service's update() statement)
+leaves stale names until rebuild_displays runs; scripts writing with raw SQL
+(db_cleanup.py) rebuild the tables when they finish. ENTITY_DISPLAY_TABLES=False
+stops reading the tables and refreshing their names; rebuild them before
+turning it back on.
+"""
+
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
+
+from sqlalchemy import Select, and_, event, func, or_, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from src.models.sports_models import (
+    BroadcastRightsDisplay, Game, GameBroadcastDisplay, GameDisplay, League,
+    ProductionServiceDisplay, Team
+)
+from src.services.sports.relationships import (
+    DISPLAY_NAME, LEAGUE_FALLBACK_FK, POLYMORPHIC_TARGETS, is_polymorphic,
+    registry_key, related_fields, related_keys, with_related
+)
+from src.services.sports.utils import get_model_for_entity_type
+from src.utils.config import get_settings
+
+settings = get_settings()
+
+DISPLAY_MODELS: Dict[str, Type[Any]] = {
+    "game": GameDisplay,
+    "broadcast": BroadcastRightsDisplay,
+    "production": ProductionServiceDisplay,
+    "game_broadcast": GameBroadcastDisplay,
+}
+
+# session.info key for rows flushed but not yet refreshed
+_PENDING_KEY = "display_sources"
+
+
+def display_model(entity_type: str) -> Optional[Type[Any]]:
+    """The display table listings read entity_type's related names from, if any."""
+    if not settings.ENTITY_DISPLAY_TABLES:
+        return None
+    return DISPLAY_MODELS.get(registry_key(entity_type))
+
+
+def _join_display(query: Select, entity_type: str, display: Type[Any]) -> Tuple[Select, Any]:
+    model = get_model_for_entity_type(entity_type)
+    display = aliased(display)
+    return query.join(display, display.id == model.id), display
+
+
+def display_related(query: Select, entity_type: str, keys: Optional[Sequence[str]] = None) -> Tuple[Select, Dict[str, Any]]:
+    """with_related, reading from the entity type's display table when it has one."""
+    display = display_model(entity_type)
+    if display is None:
+        return with_related(query, entity_type, keys)
+    query, display = _join_display(query, entity_type, display)
+    return query, {key: getattr(display, key) for key in (related_keys(entity_type) if keys is None else keys)}
+
+
+def display_sort(query: Select, entity_type: str, key: str) -> Tuple[Select, Any, Any]:
+    """
+    Join what sorting entity_type by the related name key needs.
+
+    Returns:
+        The query, the sort expression and the id to break ties on. With a
+        display table these are its bare (key, id) columns, so its
+        ix_<display>_<key> index serves keyset pages.
+    """
+    display = display_model(entity_type)
+    if display is None:
+        query, expressions = with_related(query, entity_type, [key])
+        return query, expressions[key], get_model_for_entity_type(entity_type).id
+    query, display = _join_display(query, entity_type, display)
+    return query, getattr(display, key), display.id
+
+
+def display_resolution_query(entity_type: str, ids: Sequence[Any]) -> Select:
+    """resolution_query's columns, read from the display table."""
+    display = DISPLAY_MODELS[registry_key(entity_type)]
+    return (
+        select(display.id, *(getattr(display, key).label(key) for key in related_keys(entity_type)))
+        .where(display.id.in_(ids))
+    )
+
+
+def refresh_statement(entity_type: str, condition: Any):
+    """INSERT ... ON CONFLICT recomputing the display rows of the entities matching condition."""
+    display = DISPLAY_MODELS[registry_key(entity_type)]
+    model = get_model_for_entity_type(entity_type)
+    keys = related_keys(entity_type)
+    query, expressions = with_related(select(model.id), entity_type, keys)
+    query = query.add_columns(*(expressions[key] for key in keys)).where(condition)
+
+    stmt = pg_insert(display).from_select(["id", *keys], query)
+    return stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={**{key: stmt.excluded[key] for key in keys}, "refreshed_at": func.now()},
+    )
+
+
+def _display_sources(target: Type[Any], changed: Type[Any], ids: Sequence[Any]) -> Optional[Any]:
+    """Ids (or a subquery of them) of target rows whose display value reads from the changed rows."""
+    if target is changed:
+        return ids
+    if target is Game and changed is Team:
+        # Games show as "home vs away"
+        return select(Game.id).where(or_(Game.home_team_id.in_(ids), Game.away_team_id.in_(ids)))
+    return None
+
+
+def stale_condition(entity_type: str, changed: Type[Any], ids: Sequence[Any]) -> Optional[Any]:
+    """Which of entity_type's display rows read from the given rows of the changed model."""
+    model = get_model_for_entity_type(entity_type)
+    fields = related_fields(entity_type)
+    conditions = [model.id.in_(ids)] if model is changed else []
+
+    for field in fields:
+        sources = _display_sources(field.target, changed, ids) if field.column == DISPLAY_NAME else (
+            ids if field.target is changed else None
+        )
+        if sources is not None:
+            conditions.append(getattr(model, field.fk).in_(sources))
+
+    if is_polymorphic(entity_type):
+        kind = func.lower(model.entity_type)
+        for subject in POLYMORPHIC_TARGETS:
+            sources = _display_sources(subject.model, changed, ids)
+            if sources is None and changed is League and subject.league_fk:
+                # The subject's league was renamed
+                sources = select(subject.model.id).where(getattr(subject.model, subject.league_fk).in_(ids))
+            if sources is not None:
+                conditions.append(and_(kind.in_(subject.entity_types), model.entity_id.in_(sources)))
+
+        fallback_fk = LEAGUE_FALLBACK_FK.get(registry_key(entity_type))
+        if fallback_fk and changed is League:
+            target = next(field.target for field in fields if field.fk == fallback_fk)
+            conditions.append(getattr(model, fallback_fk).in_(select(target.id).where(target.league_id.in_(ids))))
+
+    return or_(*conditions) if conditions else None
+
+
+def refresh_statements(changed: Type[Any], ids: Iterable[Any]) -> List[Any]:
+    """Statements refreshing every display row that reads from the given rows."""
+    ids = list(ids)
+    if not ids:
+        return []
+    statements = []
+    for entity_type in DISPLAY_MODELS:
+        condition = stale_condition(entity_type, changed, ids)
+        if condition is not None:
+            statements.append(refresh_statement(entity_type, condition))
+    return statements
+
+
+async def refresh_displays(db: AsyncSession, changed: Type[Any], ids: Iterable[Any]) -> None:
+    """Refresh the display rows reading from rows written outside the unit of work."""
+    if not settings.ENTITY_DISPLAY_TABLES:
+        return
+    for stmt in refresh_statements(changed, ids):
+        await db.execute(stmt)
+
+
+async def rebuild_displays(db: AsyncSession, entity_types: Optional[Sequence[str]] = None) -> None:
+    """
+    Recompute whole display tables, e.g. after a backfill or writes that bypassed the hooks.
+
+    The upsert covers every entity, so it also adds any missing display rows.
+    """
+    for entity_type in entity_types or DISPLAY_MODELS:
+        await db.execute(refresh_statement(entity_type, true()))
+
+
+def _source_models() -> Set[Type[Any]]:
+    """Every model a display row reads from."""
+    models = {Team, League}
+    for entity_type in DISPLAY_MODELS:
+        models.add(get_model_for_entity_type(entity_type))
+        models.update(field.target for field in related_fields(entity_type))
+        if is_polymorphic(entity_type):
+            models.update(subject.model for subject in POLYMORPHIC_TARGETS)
+    return models
+
+
+SOURCE_MODELS = frozenset(_source_models())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_display_sources(session: Session, flush_context) -> None:
+    # Pre-flush state is still visible here; the refresh runs once the flush has executed
+    if not settings.ENTITY_DISPLAY_TABLES:
+        return
+    pending: Dict[Type[Any], Set[Any]] = session.info.setdefault(_PENDING_KEY, {})
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if type(obj) not in SOURCE_MODELS:
+            continue
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        pending.setdefault(type(obj), set()).add(obj.id)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _refresh_display_sources(session: Session, flush_context) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    connection = session.connection()
+    for model, ids in pending.items():
+        for stmt in refresh_statements(model, ids):
+            connection.execute(stmt)
@@ -0,0 +1,114 @@
+"""
+Ranked name search for sports entities.
+
+Builds single queries that resolve a search term against an entity's name and
+nickname columns. Every condition is written against an indexed expression so
+Postgres can combine index scans instead of scanning the table:
+- lower(name) = term and lower(name) LIKE 'term%' use the lower() btree
+  indexes (text_pattern_ops)
+- name ILIKE '%term%' and name % term use the pg_trgm GIN indexes
+
+The indexes are created by the add_entity_name_search_indexes migration.
+"""
+
+from typing import Any, List, NamedTuple, Type
+
+from sqlalchemy import Select, case, func, literal, or_, select
+from sqlalchemy.types import String, Text
+
+# Match kinds, best first; the rank is the index into this tuple
+MATCH_KINDS = ("exact", "prefix", "contains", "fuzzy")
+EXACT, PREFIX, CONTAINS, FUZZY = range(len(MATCH_KINDS))
+
+NAME_COLUMNS = ("name", "nickname")
+
+
+class EntityMatch(NamedTuple):
+    """An entity returned by a ranked search."""
+    entity: Any
+    match: str
+    score: float
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def name_columns(model_class: Type[Any]) -> List[Any]:
+    """The searchable name columns a model has, name first."""
+    return [getattr(model_class, col) for col in NAME_COLUMNS if hasattr(model_class, col)]
+
+
+def is_text_column(column: Any) -> bool:
+    return isinstance(getattr(column, "type", None), (String, Text))
+
+
+def contains_condition(column: Any, value: str):
+    """Case-insensitive substring match that the trigram index can serve."""
+    return column.ilike(f"%{escape_like(value)}%", escape="\\")
+
+
+def prefix_condition(column: Any, value: str):
+    """Case-insensitive prefix match that the lower() pattern index can serve."""
+    return func.lower(column).like(f"{escape_like(value.lower())}%", escape="\\")
+
+
+def search_condition(columns: List[Any], value: str):
+    """OR of substring matches across columns, for list search filters."""
+    return or_(*(contains_condition(column, value) for column in columns))
+
+
+def ranked_search(model_class: Type[Any], term: str, limit: int = 10,
+                  max_rank: int = FUZZY) -> Select:
+    """
+    Build one query returning (entity, rank, score) rows, best match first.
+
+    Args:
+        model_class: Model with a name (and optionally nickname) column
+        term: Search term
+        limit: Maximum number of rows to return
+        max_rank: Worst match kind to include, e.g. EXACT for exact
+            name/nickname matches only
+
+    Returns:
+        A select ordered by rank, then trigram similarity, then name
+    """
+    columns = name_columns(model_class)
+    if not columns:
+        raise ValueError(f"{model_class.__name__} has no name column to search")
+
+    term = term.strip()
+    term_lower = term.lower()
+    lowered = [func.lower(column) for column in columns]
+
+    exact = [col == term_lower for col in lowered]
+    prefix = [prefix_condition(column, term) for column in columns]
+    contains = [contains_condition(column, term) for column in columns]
+    fuzzy = [column.op("%")(term) for column in columns]
+
+    tiers = [exact, prefix, contains, fuzzy][:max_rank + 1]
+    rank = case(
+        *((or_(*conditions), literal(kind)) for kind, conditions in enumerate(tiers)),
+        else_=literal(FUZZY),
+    ).label("rank")
+
+    if max_rank == EXACT:
+        # Exact lookups don't need pg_trgm at all
+        score = literal(1.0).label("score")
+    else:
+        # greatest() skips NULLs, so a missing nickname doesn't null the score
+        similarities = [func.similarity(column, term) for column in columns]
+        score = (func.greatest(*similarities) if len(similarities) > 1 else similarities[0]).label("score")
+
+    return (
+        select(model_class, rank, score)
+        .where(or_(*(condition for conditions in tiers for condition in conditions)))
+        .order_by(rank.asc(), score.desc(), columns[0].asc())
+        .limit(limit)
+    )
+
+
+def to_matches(rows: List[Any]) -> List[EntityMatch]:
+    """Turn (entity, rank, score) rows into EntityMatch tuples."""
+    return [EntityMatch(entity, MATCH_KINDS[rank], float(score or 0.0)) for entity, rank, score in rows]
@@ -6,7 +6,7 @@ import math
 from sqlalchemy import select, func, or_, desc, asc, inspect, column, text
 from sqlalchemy.types import String, Text,  VARCHAR # Import string types for checking
 from sqlalchemy.orm import aliased, contains_eager, selectinload # Added aliased and contains_eager
-from sqlalchemy.exc import SQLAlchemyError, NoResultFound, IntegrityError
+from sqlalchemy.exc import NoResultFound, IntegrityError
 from sqlalchemy.sql.expression import literal_column
 
 from src.models.sports_models import (
@@ -32,6 +32,16 @@ from src.schemas.sports import (
 )
 from src.services.sports.utils import ENTITY_TYPES, get_model_for_entity_type
 from src.services.sports.entity_name_resolver import EntityNameResolver
+from src.services.sports.bulk_upsert import column_keys
+from src.services.sports.pagination import InvalidCursorError, apply_keyset, count_rows, next_page_cursor, next_row_cursor
+from src.services.sports.display_views import display_related, display_sort
+from src.services.sports.relationships import is_related_key
+from src.services.sports.entity_search import (
+    contains_condition,
+    is_text_column,
+    prefix_condition,
+    search_condition,
+)
 from src.services.sports.league_service import LeagueService
 from src.services.sports.team_service import TeamService
 from src.services.sports.player_service import PlayerService
@@ -44,61 +54,11 @@ from src.services.sports.game_broadcast_service import GameBroadcastService
 from src.services.sports.league_executive_service import LeagueExecutiveService
 from src.services.sports.division_conference_service import DivisionConferenceService
 from src.services.sports.corporate_service import CorporateService
-from src.utils.database import get_db_session as get_session # Added import
+from src.utils.database import get_read_db_session
 from src.services.sports.base_service import BaseEntityService # Corrected import path
 
 logger = logging.getLogger(__name__)
 
-# Define the relationship map for searchable related fields
-# Path items are relationship attribute names (strings) on the *current* model in the traversal
-# Target_fields are attribute names (strings) on the *final* model in the path
-SEARCH_RELATIONSHIP_MAP = {
-    # BroadcastRights (entity_type="broadcast")
-    ("broadcast", "league_name"): {
-        "path_attrs": ["division_conference", "league"], 
-        "target_fields": ["name", "nickname"]
-    },
-    ("broadcast", "league_sport"): { 
-        "path_attrs": ["division_conference", "league"], 
-        "target_fields": ["sport"]
-    },
-    ("broadcast", "division_conference_name"): {
-        "path_attrs": ["division_conference"],
-        "target_fields": ["name", "nickname"]
-    },
-    ("broadcast", "broadcast_company_name"): {
-        "path_attrs": ["broadcaster"], # broadcaster is relationship from BroadcastRights to Brand
-        "target_fields": ["name"]
-    },
-    # ("broadcast", "entity_name"): { ... deferred for now due to polymorphism ... }
-
-    # ProductionService (entity_type="production")
-    ("production", "production_company_name"): {
-        "path_attrs": ["production_company"], # production_company is relationship to Brand
-        "target_fields": ["name"]
-    },
-    ("production", "secondary_brand_name"): {
-        "path_attrs": ["secondary_brand"],    # secondary_brand is relationship to Brand
-        "target_fields": ["name"]
-    },
-    # ("production", "entity_name"): { ... deferred for now due to polymorphism ... }
-
-    # Team (entity_type="team")
-    ("team", "league_name"): {
-        "path_attrs": ["league"],
-        "target_fields": ["name", "nickname"]
-    },
-    ("team", "division_conference_name"): {
-        "path_attrs": ["division_conference"],
-        "target_fields": ["name", "nickname"]
-    },
-    ("team", "stadium_name"): {
-        "path_attrs": ["stadium"],
-        "target_fields": ["name"]
-    }
-    # TODO: Add more mappings for other entity_types and their relevant related fields
-}
-
 class SportsService:
     """Facade service for managing sports entities."""
     
@@ -120,72 +80,19 @@ class SportsService:
         Returns a configuration for sorting by relationship fields.
         Returns None if sort_by is not a relationship field.
         """
-        # Map of entity types to their relationship fields and join configurations
-        RELATIONSHIP_SORTS = {
-            "division_conference": {
-                "league_name": {"join_model": League, "join_field": "league_id", "sort_field": "name"},
-                "league_sport": {"join_model": League, "join_field": "league_id", "sort_field": "sport"},
-            },
-            "team": {
-                "league_name": {"join_model": League, "join_field": "league_id", "sort_field": "name"},
-                "league_sport": {"join_model": League, "join_field": "league_id", "sort_field": "sport"},
-                "division_conference_name": {"join_model": DivisionConference, "join_field": "division_conference_id", "sort_field": "name"},
-                "stadium_name": {"join_model": Stadium, "join_field": "stadium_id", "sort_field": "name"},
-            },
-            "player": {
-                "team_name": {"join_model": Team, "join_field": "team_id", "sort_field": "name"},
-            },
-            "game": {
-                "league_name": {"join_model": League, "join_field": "league_id", "sort_field": "name"},
-                "league_sport": {"join_model": League, "join_field": "league_id", "sort_field": "sport"},
-                "home_team_name": {"join_model": Team, "join_field": "home_team_id", "sort_field": "name"},
-                "away_team_name": {"join_model": Team, "join_field": "away_team_id", "sort_field": "name"},
-                "stadium_name": {"join_model": Stadium, "join_field": "stadium_id", "sort_field": "name"},
-            },
-            "game_broadcast": {
-                "game_name": {"join_model": Game, "join_field": "game_id", "sort_field": "name"},
-                "broadcast_company_name": {"join_model": Brand, "join_field": "broadcast_company_id", "sort_field": "name"},
-                "production_company_name": {"join_model": Brand, "join_field": "production_company_id", "sort_field": "name"},
-            },
-            "broadcast": {
-                "broadcast_company_name": {"join_model": Brand, "join_field": "broadcast_company_id", "sort_field": "name"},
-                "entity_name": None,  # Special case, depends on entity_type
-                "league_name": None,  # Special case, populated based on relationships
-                "league_sport": None,  # Special case, populated based on relationships
-            },
-            "production": {
-                "production_company_name": {"join_model": Brand, "join_field": "production_company_id", "sort_field": "name"},
-                "entity_name": None,  # Special case, depends on entity_type
-                "league_name": None,  # Special case, populated based on relationships
-                "league_sport": None,  # Special case, populated based on relationships
-            },
-            "league_executive": {
-                "league_name": {"join_model": League, "join_field": "league_id", "sort_field": "name"},
-                "league_sport": {"join_model": League, "join_field": "league_id", "sort_field": "sport"},
-            },
-            "brand_relationship": {
-                "brand_name": {"join_model": Brand, "join_field": "brand_id", "sort_field": "name"},
-                "entity_name": None,  # Special case, depends on entity_type
-            },
-        }
-        
-        # Special handling for polymorphic relationships and their related fields
-        if entity_type in ["broadcast", "production", "brand_relationship"]:
-            # Fields that require special handling for polymorphic entity types
-            polymorphic_fields = ["entity_name", "league_name", "league_sport"]
-            
-            if sort_by in polymorphic_fields:
-                # In this case, we can't do direct sorting at the database level due to polymorphic relationship
-                # Return a special flag to handle this in the main method
-                return {"special_case": "polymorphic", "entity_type": entity_type, "sort_field": sort_by}
-            
-        if entity_type in RELATIONSHIP_SORTS and sort_by in RELATIONSHIP_SORTS[entity_type]:
-            return RELATIONSHIP_SORTS[entity_type][sort_by]
+        # Includes the subject fields of broadcast rights and production services,
+        # which are resolved through (entity_type, entity_id)
+        if is_related_key(entity_type, sort_by):
+            return {"related_key": sort_by, "entity_type": entity_type, "sort_field": sort_by}
         
         return None
         
-    async def get_entities(self, db: AsyncSession, entity_type: str, page: int = 1, limit: int = 50, sort_by: str = "id", sort_direction: str = "asc") -> Optional[Dict[str, Any]]:
-        """Get paginated entities of a specific type."""
+    async def get_entities(self, db: AsyncSession, entity_type: str, page: int = 1, limit: int = 50, sort_by: str = "id", sort_direction: str = "asc",
+                           cursor: Optional[str] = None, count_mode: str = "exact") -> Optional[Dict[str, Any]]:
+        """
+        Get paginated entities of a specific type.
+        next_cursor can be passed back as cursor to page by keyset, whether sorting by an own column or a related name.
+        """
         if entity_type not in self.ENTITY_TYPES:
             raise ValueError(f"Invalid entity type: {entity_type}")
         
@@ -194,9 +101,7 @@ class SportsService:
             raise ValueError(f"No model class found for entity type: {entity_type}")
 
         # Get total count
-        count_query = select(func.count()).select_from(model_class)
-        total_count_result = await db.execute(count_query)
-        total_count = total_count_result.scalar() or 0
+        total_count, estimated = await count_rows(db, select(model_class), model_class.__tablename__, count_mode)
         
         # Handle sorting for Creator and Management, which do not have a 'name' field
         if entity_type in ["creator", "management"] and sort_by == "name":
@@ -207,133 +112,56 @@ class SportsService:
         
         logger.info(f"Sorting {entity_type} by {sort_by} ({sort_direction}) - Relationship sort config: {relationship_sort}")
         
-        # Handle regular relationship sort (non-polymorphic)
-        if relationship_sort and not relationship_sort.get("special_case"):
-            join_model = relationship_sort.get("join_model")
-            join_field = relationship_sort.get("join_field")
-            sort_field = relationship_sort.get("sort_field")
-
-            if join_model and join_field and sort_field:
-                logger.info(f"Processing relationship sort with join_model={join_model.__name__}, join_field={join_field}, sort_field={sort_field}")
-                
-                query = (
-                    select(model_class, getattr(join_model, sort_field).label(sort_by))
-                    .outerjoin(join_model, getattr(model_class, join_field) == join_model.id)
-                )
-                
-                sort_order = getattr(join_model, sort_field).desc().nulls_last() if sort_direction.lower() == "desc" else getattr(join_model, sort_field).asc().nulls_last()
-                query = query.order_by(sort_order)
-                
-                query = query.offset((page - 1) * limit).limit(limit)
-                
-                result = await db.execute(query)
-                rows = result.all()
-                
-                entities_with_joined = []
-                for row in rows:
-                    entity = row[0]
-                    joined_value = row[1]
-                    
-                    entity_dict = self._model_to_dict(entity)
-                    if entity_dict:
-                        entity_dict[sort_by] = joined_value
-                        entities_with_joined.append(entity_dict)
-                
-                total_pages = math.ceil(total_count / limit) if total_count > 0 else 0
-                return {
-                    "items": entities_with_joined,
-                    "total": total_count,
-                    "page": page,
-                    "size": limit,
-                    "pages": total_pages
-                }
-            else:
-                logger.error(f"Invalid relationship sort config for {entity_type} by {sort_by}: {relationship_sort}")
-                # Fallback to default sorting, which will be handled below
+        # Handle relationship sort: join the related tables and sort in SQL
+        if relationship_sort:
+            query, sort_expression, id_column = display_sort(select(model_class), entity_type, sort_by)
+            direction = "desc" if sort_direction.lower() == "desc" else "asc"
+
+            query = apply_keyset(
+                query.add_columns(sort_expression.label(sort_by)), sort_expression, id_column, direction, limit, cursor, sort_by
+            )
+            if not cursor:
+                query = query.offset((page - 1) * limit)
 
-        # Handle special case for polymorphic relationships
-        elif relationship_sort and relationship_sort.get("special_case") == "polymorphic":
-            logger.info(f"Processing polymorphic relationship sort for {entity_type} by {sort_by}")
-            
-            buffer_limit = limit * 3
-            query = select(model_class).offset((page - 1) * limit).limit(buffer_limit)
-            
             result = await db.execute(query)
-            entities = result.scalars().all()
-            entities_dicts = [self._model_to_dict(entity) for entity in entities if entity]
-            
-            # Process them to add the related names
-            processed_entities = await EntityNameResolver.get_entities_with_related_names(
-                db, entity_type, [d for d in entities_dicts if d is not None])
-            
-            # Now sort the processed entities by the requested field
-            def get_sort_key(entity: Dict[str, Any]) -> str:
-                value = entity.get(sort_by)
-                if value is None:
-                    return ""
-                return str(value).lower()
-            
-            sorted_entities = sorted(processed_entities, key=get_sort_key, reverse=(sort_direction.lower() == "desc"))
-            
-            paginated_entities = sorted_entities[:limit]
-            
-            logger.info(f"Returning {len(paginated_entities)} entities after in-memory sorting by {sort_by}")
-            
+            rows = list(result.all())
+            next_cursor = next_row_cursor(rows, limit, sort_by, direction)
+
+            entities_with_joined = []
+            for row in rows:
+                entity = row[0]
+                joined_value = row[1]
+
+                entity_dict = self._model_to_dict(entity)
+                if entity_dict:
+                    entity_dict[sort_by] = joined_value
+                    entities_with_joined.append(entity_dict)
+
             total_pages = math.ceil(total_count / limit) if total_count > 0 else 0
             return {
-                "items": paginated_entities,
+                "items": entities_with_joined,
                 "total": total_count,
                 "page": page,
                 "size": limit,
-                "pages": total_pages
+                "pages": total_pages,
+                "next_cursor": next_cursor,
+                "total_estimated": estimated
             }
-            
+
         # Standard handling for direct model fields or fallback from failed relationship sort
-        query = select(model_class)
-        
-        # Original query construction
-        sort_attr = getattr(model_class, sort_by, None)
-        if sort_attr:
-            sort_column = sort_attr
-            if sort_direction.lower() == "desc":
-                query = query.order_by(sort_column.desc())
-            else:
-                query = query.order_by(sort_column.asc())
-        else:
+        if sort_by not in column_keys(model_class):
             logger.warning(f"Field {sort_by} not found in {entity_type} model, defaulting to id sorting")
-            sort_column = getattr(model_class, "id")
-            if sort_direction.lower() == "desc":
-                query = query.order_by(sort_column.desc())
-            else:
-                query = query.order_by(sort_column.asc())
+            sort_by = "id"
+        direction = "desc" if sort_direction.lower() == "desc" else "asc"
 
-        paginated_query = query.offset((page - 1) * limit).limit(limit)
+        # Ordered by the sort column then id; a cursor continues by keyset instead of OFFSET
+        query = apply_keyset(select(model_class), getattr(model_class, sort_by), model_class.id, direction, limit, cursor, sort_by)
+        if not cursor:
+            query = query.offset((page - 1) * limit)
 
-        try:
-            # First attempt to execute the query as constructed
-            result = await db.execute(paginated_query)
-            entities = result.scalars().all()
-        except SQLAlchemyError as e:
-            # Check if the error is due to an undefined column, which likely means a schema mismatch
-            if "undefined_column" in str(e).lower() or "does not exist" in str(e).lower():
-                logger.warning(f"Sorting by '{sort_by}' failed for {entity_type}, likely due to a schema mismatch. Error: {e}. Falling back to sorting by 'id'.")
-                
-                # Construct a fallback query, sorting by 'id'
-                fallback_query = select(model_class)
-                id_sort_column = getattr(model_class, "id")
-                if sort_direction.lower() == "desc":
-                    fallback_query = fallback_query.order_by(id_sort_column.desc())
-                else:
-                    fallback_query = fallback_query.order_by(id_sort_column.asc())
-                
-                paginated_fallback_query = fallback_query.offset((page - 1) * limit).limit(limit)
-                
-                # Execute the fallback query
-                result = await db.execute(paginated_fallback_query)
-                entities = result.scalars().all()
-            else:
-                # If it's a different SQL error, re-raise it
-                raise
+        result = await db.execute(query)
+        entities = list(result.scalars().all())
+        next_cursor = next_page_cursor(entities, limit, sort_by, direction)
 
         logger.info(f"Returning {len(entities)} entities for {entity_type}")
         
@@ -343,7 +171,9 @@ class SportsService:
             "total": total_count,
             "page": page,
             "size": limit,
-            "pages": total_pages
+            "pages": total_pages,
+            "next_cursor": next_cursor,
+            "total_estimated": estimated
         }
     
     def _model_to_dict(self, model_instance: Any) -> Optional[Dict[str, Any]]:
@@ -379,10 +209,35 @@ class SportsService:
         filters: Optional[List[Dict[str, Any]]] = None,
         include_related: bool = True
     ) -> Tuple[List[Dict[str, Any]], int]:
+        result = await self.list_entities_with_related_names(
+            entity_type, page, page_size, sort_field, sort_direction, filters, include_related
+        )
+        return result["items"], result["total"]
+
+    async def list_entities_with_related_names(
+        self,
+        entity_type: str,
+        page: int = 1,
+        page_size: int = 10,
+        sort_field: Optional[str] = None,
+        sort_direction: Optional[str] = "asc",
+        filters: Optional[List[Dict[str, Any]]] = None,
+        include_related: bool = True,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
+    ) -> Dict[str, Any]:
+        """
+        One page of entities with related names resolved.
+
+        Sorting and searching on the entity's own columns or on registry
+        related names (league_name, and entity_name on broadcast rights and
+        production services) run in SQL: just the page is fetched and
+        resolved. next_cursor continues by keyset when sorting on either.
+        """
         logger.debug(f"Service: Getting entities for {entity_type} with page={page}, page_size={page_size}, sort_field={sort_field}, sort_direction={sort_direction}, filters={filters}, include_related={include_related}")
         
         if entity_type == 'corporate':
-            async with get_session() as session:
+            async with get_read_db_session() as session:
                 # Use the CorporateService to get all corporate entities
                 all_corporates = await self.corporate_service.get_all(session)
                 
@@ -408,9 +263,9 @@ class SportsService:
                 
                 # Convert to dicts for response, filtering out any None results
                 corporate_dicts = [d for d in (self._model_to_dict(c) for c in paginated_corporates) if d is not None]
-                return corporate_dicts, total_count
+                return {"items": corporate_dicts, "total": total_count, "next_cursor": None, "total_estimated": False}
 
-        async with get_session() as session:
+        async with get_read_db_session() as session:
             model_class = self.ENTITY_TYPES.get(entity_type)
             if not model_class:
                 logger.error(f"Service: Invalid entity type: {entity_type}")
@@ -448,7 +303,7 @@ class SportsService:
                             if hasattr(model_class, col_name):
                                 column_attr = getattr(model_class, col_name)
                                 if isinstance(column_attr.type, (String, Text, VARCHAR)):
-                                    or_conditions.append(func.lower(column_attr).contains(str(value).lower()))
+                                    or_conditions.append(contains_condition(column_attr, str(value)))
                                 else:
                                     logger.warning(f"Column '{col_name}' is not a string type, skipping for text search.")
                             else:
@@ -466,9 +321,9 @@ class SportsService:
                         elif operator == "lt":
                             query = query.where(column_attr < value)
                         elif operator == "contains" and isinstance(column_attr.type, (String, Text, VARCHAR)):
-                            query = query.where(func.lower(column_attr).contains(str(value).lower()))
+                            query = query.where(contains_condition(column_attr, str(value)))
                         elif operator == "startswith" and isinstance(column_attr.type, (String, Text, VARCHAR)):
-                            query = query.where(func.lower(column_attr).startswith(str(value).lower()))
+                            query = query.where(prefix_condition(column_attr, str(value)))
                         elif operator == "endswith" and isinstance(column_attr.type, (String, Text, VARCHAR)):
                             query = query.where(func.lower(column_attr).endswith(str(value).lower()))
                     else:
@@ -477,6 +332,52 @@ class SportsService:
                 filtered_subquery = query.distinct().subquery()
                 total_query = select(func.count()).select_from(filtered_subquery)
 
+            # 2b. When every search column is a text column on the model or a
+            # registry-resolved name, search in SQL (the trigram indexes serve
+            # the model's own columns)
+            if search_filter and search_filter.get("value"):
+                search_columns = search_filter.get("field", "").split("search_columns:")[1].split(',')
+                columns = [getattr(model_class, col, None) for col in search_columns]
+                joined = [col for col, attr in zip(search_columns, columns) if attr is None]
+                if columns and all(
+                    is_text_column(attr) if attr is not None else is_related_key(entity_type, col)
+                    for col, attr in zip(search_columns, columns)
+                ):
+                    if joined:
+                        query, expressions = display_related(query, entity_type, joined)
+                        columns = [attr if attr is not None else expressions[col] for col, attr in zip(search_columns, columns)]
+                    query = query.where(search_condition(columns, str(search_filter["value"])))
+                    search_filter = None
+
+            # 3a. Sorting on one of the table's own columns or a related name:
+            # page in SQL and resolve related names for that page only
+            sort_key = sort_field or "id"
+            own_column = sort_key in column_keys(model_class)
+            if search_filter is None and (own_column or is_related_key(entity_type, sort_key)):
+                direction = "desc" if str(sort_direction).lower() == "desc" else "asc"
+                total_count, estimated = await count_rows(session, query, model_class.__tablename__, count_mode)
+                if own_column:
+                    page_query, sort_column, id_column = query, getattr(model_class, sort_key), model_class.id
+                else:
+                    page_query, sort_column, id_column = display_sort(query, entity_type, sort_key)
+                page_query = apply_keyset(
+                    page_query.add_columns(sort_column), sort_column, id_column, direction, page_size, cursor, sort_key
+                )
+                if not cursor:
+                    page_query = page_query.offset((page - 1) * page_size)
+                rows = list((await session.execute(page_query)).all())
+                next_cursor = next_row_cursor(rows, page_size, sort_key, direction)
+                page_entities = [row[0] for row in rows]
+
+                entity_dicts = [d for d in (self._model_to_dict(e) for e in page_entities) if d is not None]
+                if include_related:
+                    entity_dicts = await EntityNameResolver.get_entities_with_related_names(
+                        session, entity_type, entity_dicts
+                    )
+                return {"items": entity_dicts, "total": total_count, "next_cursor": next_cursor, "total_estimated": estimated}
+            if cursor:
+                raise InvalidCursorError(f"Cursor pagination is not available when sorting {entity_type} by '{sort_field}'")
+
             # 3. Fetch all entities matching the base filters (no pagination yet)
             all_entities_result = await session.execute(query)
             all_entities = all_entities_result.scalars().all()
@@ -523,7 +424,7 @@ class SportsService:
             end_index = start_index + page_size
             paginated_entities = final_filtered_entities[start_index:end_index]
 
-            return paginated_entities, total_count
+            return {"items": paginated_entities, "total": total_count, "next_cursor": None, "total_estimated": False}
     
     # League methods
     async def get_leagues(self, db: AsyncSession) -> List[League]:
@@ -639,10 +540,13 @@ class SportsService:
     # the same functionality.
     
     # Entity by name lookup
-    async def get_entity_by_name(self, db: AsyncSession, entity_type: str, name: str, league_id: Optional[UUID] = None) -> Optional[dict]:
+    async def get_entity_by_name(self, db: AsyncSession, entity_type: str, name: str, league_id: Optional[UUID] = None,
+                                 fuzzy: bool = False) -> Optional[dict]:
         """
         Get an entity by name.
         Delegates to specific services or handles special cases like division/conference lookup by league.
+        With fuzzy, standard entity types return the best prefix/substring/trigram match when there is no
+        exact one, tagged with '_match' and '_score'.
         """
         logger.debug(f"[SportsService.get_entity_by_name] Called for entity_type: {entity_type}, name: '{name}', league_id: {league_id}")
         
@@ -808,12 +712,15 @@ class SportsService:
             return None
             
         elif entity_type == 'brand':
-            # This can likely use self.brand_service.get_brand_by_name if such a method exists
-            # For now, let's assume the existing direct logic for 'brand' in facade is okay,
-            # or refactor it to use self.brand_service.get_entity_by_name if BrandService inherits from BaseEntityService.
-            # To ensure consistency, ideally it should call:
-            brand_entity = await self.brand_service.get_entity_by_name(db, name, raise_not_found=False)
-            return self._model_to_dict(brand_entity) if brand_entity else None
+            # BrandService inherits BaseEntityService, so use its ranked name search
+            matches = await self.brand_service.search_entities(db, name, limit=1, fuzzy=fuzzy)
+            if not matches:
+                return None
+            brand_dict = self._model_to_dict(matches[0].entity)
+            if brand_dict and fuzzy:
+                brand_dict['_match'] = matches[0].match
+                brand_dict['_score'] = matches[0].score
+            return brand_dict
 
         if entity_type.lower() in ('championship', 'playoff', 'playoffs', 'tournament'):
             # For championships, playoffs, and tournaments, we return a special object with the name and type
@@ -830,51 +737,32 @@ class SportsService:
             }
         
         # Delegate to specific services for standard entity types
-        entity: Optional[Any] = None
         if entity_type == 'league':
-            entity = await self.league_service.get_league_by_name(db, name) # Correctly uses LeagueService
+            service = self.league_service
         elif entity_type == 'team':
-            entity = await self.team_service.get_entity_by_name(db, name) # Assuming TeamService has get_team_by_name
+            service = self.team_service
         elif entity_type == 'division_conference':
-            # Assuming DivisionConferenceService has get_division_conference_by_name
-            division_conference_service = DivisionConferenceService() # Instantiate if not already in self
-            entity = await division_conference_service.get_entity_by_name(db, name) # Use get_entity_by_name
+            service = DivisionConferenceService()
         elif entity_type == 'stadium':
-            entity = await self.stadium_service.get_entity_by_name(db, name) # Assuming StadiumService has get_stadium_by_name
-        # Add other specific entity type delegations here as needed
-        # e.g., player, game etc.
-        
+            service = self.stadium_service
         else:
-            # Fallback to generic model lookup if no specific service handler implemented yet for this path
-            # This block should ideally be phased out as specific service methods are used.
-            logger.warning(f"[SportsService.get_entity_by_name] No specific service handler for '{entity_type}', using generic model lookup.")
+            # Generic lookup for entity types without a dedicated service here
             if entity_type not in self.ENTITY_TYPES:
                 raise ValueError(f"Invalid entity type: {entity_type}")
             model_class = self.ENTITY_TYPES[entity_type]
             if not model_class: # Should not happen if ENTITY_TYPES is correct
                  raise ValueError(f"Entity type {entity_type} does not have a dedicated model")
+            service = BaseEntityService(model_class)
 
-            # This is the problematic part that was only querying by name
-            # The specific services (e.g., LeagueService) should now call the enhanced BaseEntityService.get_entity_by_name
-            # So, this direct query is redundant if delegation above is comprehensive.
-            # If we reach here, it means delegation wasn't set up for this entity_type.
-            # For safety, we can call the base method on a temp base service instance if we know the model_class.
-            # However, it's better to ensure delegation.
-            # For now, let's assume the delegation above will cover the main cases like 'league'.
-            # If a type reaches here, it means it's not covered by specific delegation.
-            # The old query:
-            # query = select(model_class).where(func.lower(model_class.name) == func.lower(name))
-            # result = await db.execute(query)
-            # entity = result.scalars().first()
-            # We should avoid this direct query if possible.
-            # If the entity_type is valid and has a service, it should have been handled.
-            # If it's a valid type but no explicit service path, we could instantiate a BaseEntityService for it.
-            base_service_instance = BaseEntityService(model_class)
-            entity = await base_service_instance.get_entity_by_name(db, name, raise_not_found=False)
-
+        # One ranked query; without fuzzy only exact name/nickname matches count
+        matches = await service.search_entities(db, name, limit=1, fuzzy=fuzzy)
+        entity = matches[0].entity if matches else None
 
         if entity:
             entity_dict = self._model_to_dict(entity)
+            if entity_dict and fuzzy:
+                entity_dict['_match'] = matches[0].match
+                entity_dict['_score'] = matches[0].score
             if entity_dict and entity_type == 'division_conference' and hasattr(entity, 'league_id') and entity.league_id:
                 league = await self.league_service.get_league(db, entity.league_id)
                 if league:
@@ -883,6 +771,26 @@ class SportsService:
         
         return None
         
+    async def bulk_upsert_entities(self, db: AsyncSession, entity_type: str, entities_data: List[Dict[str, Any]],
+                                   update_if_exists: bool = True) -> Dict[str, Any]:
+        """
+        Insert or update many entities of one type, matched to existing rows by name.
+        Returns inserted/updated/failed counts per chunk.
+        """
+        model_class = self.ENTITY_TYPES.get(entity_type)
+        if not model_class:
+            raise ValueError(f"Invalid entity type: {entity_type}")
+
+        # Broadcast and production companies are brands with a company_type
+        company_type = {"broadcast_company": "Broadcaster", "production_company": "Production Company"}.get(entity_type)
+        if company_type:
+            entities_data = [{"company_type": company_type, **data} for data in entities_data]
+
+        report = await BaseEntityService(model_class).bulk_upsert(
+            db, entities_data, update_if_exists=update_if_exists
+        )
+        return report.to_dict()
+
     # BroadcastRights methods
     async def get_broadcast_rights(self, db: AsyncSession, entity_type: Optional[str] = None, entity_id: Optional[UUID] = None, company_id: Optional[UUID] = None) -> List[BroadcastRights]:
         """Get all broadcast rights, optionally filtered."""
@@ -0,0 +1,241 @@
+"""
+Keyset pagination and cheap row counts for entity listings.
+
+A cursor is an opaque token holding the sort field, direction and the last
+row's (sort value, id). The next page is fetched with
+WHERE (sort, id) > (last sort, last id) ORDER BY sort, id LIMIT n, so it
+costs the same at any depth when the sort column is indexed, unlike
+OFFSET, which reads and discards every earlier row.
+
+Counts come in several modes:
+- "exact": SELECT count(*) with the listing's filters
+- "estimated": pg_class.reltuples for unfiltered listings (as fresh as the
+  last ANALYZE/autovacuum), exact otherwise
+- "cached": an exact unfiltered count reused for ENTITY_COUNT_CACHE_TTL seconds
+- "auto": exact for small tables, estimated once the estimate passes
+  ENTITY_COUNT_ESTIMATE_THRESHOLD
+"""
+
+import base64
+import json
+import time
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, func, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.utils.config import get_settings
+from src.utils.errors import ValidationError
+
+COUNT_MODES = ("exact", "estimated", "cached", "auto")
+
+_DECODERS = {
+    "uuid": UUID,
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": dt_time.fromisoformat,
+    "decimal": Decimal,
+}
+
+
+class InvalidCursorError(ValidationError):
+    """The cursor is malformed or was issued for a different sort."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return {"t": "uuid", "v": str(value)}
+    if isinstance(value, datetime):
+        return {"t": "datetime", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {"t": "date", "v": value.isoformat()}
+    if isinstance(value, dt_time):
+        return {"t": "time", "v": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"t": "decimal", "v": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _DECODERS[value["t"]](value["v"])
+    return value
+
+
+def encode_cursor(sort_field: str, direction: str, sort_value: Any, row_id: Any) -> str:
+    """Opaque cursor pointing just past the given row."""
+    payload = {
+        "s": sort_field,
+        "d": direction,
+        "v": _encode_value(sort_value),
+        "i": _encode_value(row_id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_field: str, direction: str) -> Tuple[Any, Any]:
+    """
+    Return the (sort value, id) a cursor points past.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for a
+            different sort field or direction
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        sort_value, row_id = _decode_value(payload["v"]), _decode_value(payload["i"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}") from e
+    if payload.get("s") != sort_field or payload.get("d") != direction:
+        raise InvalidCursorError("Cursor was issued for a different sort; start again from the first page")
+    return sort_value, row_id
+
+
+def _nullable(sort_column: Any) -> bool:
+    """Whether a sort expression can be NULL; only plain NOT NULL columns are known not to be."""
+    return getattr(getattr(sort_column, "expression", sort_column), "nullable", True)
+
+
+def keyset_order(sort_column: Any, id_column: Any, direction: str) -> List[Any]:
+    """
+    ORDER BY for keyset pages: sort column then id, both in the same direction.
+
+    NULLs keep Postgres' default placement (last ascending, first
+    descending), which is the order a plain btree index returns in either
+    scan direction.
+    """
+    if direction == "desc":
+        return [sort_column.desc().nulls_first(), id_column.desc()]
+    return [sort_column.asc().nulls_last(), id_column.asc()]
+
+
+def keyset_condition(sort_column: Any, id_column: Any, direction: str, sort_value: Any, row_id: Any):
+    """
+    Rows after (sort_value, row_id) in keyset_order.
+
+    Past the NULLs (descending) or on NOT NULL columns this is a single row
+    comparison the index can range-scan. Ascending on a nullable column the
+    trailing NULLs have to be ORed in.
+    """
+    after = (lambda a, b: a < b) if direction == "desc" else (lambda a, b: a > b)
+    if sort_column is id_column:
+        return after(id_column, row_id)
+    if sort_value is None:
+        in_nulls = sort_column.is_(None) & after(id_column, row_id)
+        # Descending, the non-NULL values still follow the leading NULLs
+        return in_nulls if direction == "asc" else or_(in_nulls, sort_column.is_not(None))
+    seek = after(tuple_(sort_column, id_column), tuple_(sort_value, row_id))
+    if direction == "asc" and _nullable(sort_column):
+        return or_(seek, sort_column.is_(None))
+    return seek
+
+
+def apply_keyset(query: Select, sort_column: Any, id_column: Any, direction: str,
+                 limit: int, cursor: Optional[str] = None, sort_field: Optional[str] = None) -> Select:
+    """
+    Order a query for keyset pagination and fetch one extra row to detect the next page.
+
+    Raises:
+        InvalidCursorError: If the cursor doesn't belong to this sort
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_field or sort_column.key, direction)
+        query = query.where(keyset_condition(sort_column, id_column, direction, sort_value, row_id))
+    return query.order_by(*keyset_order(sort_column, id_column, direction)).limit(limit + 1)
+
+
+def next_page_cursor(entities: List[Any], limit: int, sort_field: str, direction: str) -> Optional[str]:
+    """Cursor for the page after a keyset page fetched with limit + 1 rows (trims the extra row)."""
+    if len(entities) <= limit:
+        return None
+    del entities[limit:]
+    last = entities[-1]
+    return encode_cursor(sort_field, direction, getattr(last, sort_field), last.id)
+
+
+def next_row_cursor(rows: List[Any], limit: int, sort_field: str, direction: str) -> Optional[str]:
+    """next_page_cursor for (entity, sort value) rows, as fetched when the sort is a joined column."""
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    entity, sort_value = rows[-1][0], rows[-1][-1]
+    return encode_cursor(sort_field, direction, sort_value, entity.id)
+
+
+class CountCache:
+    """Exact unfiltered row counts, reused for a short TTL."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._counts: Dict[str, Tuple[float, int]] = {}
+
+    def get(self, table: str, now: Optional[float] = None) -> Optional[int]:
+        entry = self._counts.get(table)
+        if entry is None:
+            return None
+        expires_at, count = entry
+        if (now if now is not None else time.monotonic()) >= expires_at:
+            del self._counts[table]
+            return None
+        return count
+
+    def put(self, table: str, count: int, now: Optional[float] = None) -> None:
+        self._counts[table] = ((now if now is not None else time.monotonic()) + self.ttl, count)
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        if table is None:
+            self._counts.clear()
+        else:
+            self._counts.pop(table, None)
+
+
+count_cache = CountCache(ttl=get_settings().ENTITY_COUNT_CACHE_TTL)
+
+
+async def estimated_row_count(db: AsyncSession, table: str) -> Optional[int]:
+    """Planner estimate of a table's rows; None if the table has never been analyzed."""
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    )
+    estimate = result.scalar()
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+async def count_rows(db: AsyncSession, query: Select, table: str, mode: str = "exact") -> Tuple[int, bool]:
+    """
+    Count the rows a listing query matches.
+
+    Args:
+        db: Database session
+        query: The listing query, before ordering and pagination
+        table: Name of the listed table
+        mode: One of COUNT_MODES; anything but "exact" only applies to
+            unfiltered listings
+
+    Returns:
+        (count, whether the count is an estimate)
+    """
+    if mode not in COUNT_MODES:
+        raise ValueError(f"Invalid count mode '{mode}', expected one of {', '.join(COUNT_MODES)}")
+
+    unfiltered = query.whereclause is None
+    if unfiltered and mode in ("estimated", "auto"):
+        estimate = await estimated_row_count(db, table)
+        if estimate is not None and (mode == "estimated" or estimate >= get_settings().ENTITY_COUNT_ESTIMATE_THRESHOLD):
+            return estimate, True
+    if unfiltered and mode == "cached":
+        cached = count_cache.get(table)
+        if cached is not None:
+            return cached, False
+
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    count = (await db.execute(count_query)).scalar() or 0
+    if unfiltered and mode == "cached":
+        count_cache.put(table, count)
+    return count, False
@@ -0,0 +1,248 @@
+"""
+Declarative map of the related names shown alongside sports entities.
+
+Each entity type lists the foreign keys whose target's display column is
+shown with it, e.g. a team's league_id -> League.name as league_name. This
+one registry drives:
+- the batched query that resolves every related name for a page of
+  entities in one round trip (EntityNameResolver)
+- the SQL expressions listings sort and search by
+  (SportsService.get_entities, list_entities_with_related_names)
+- the related-name fields kept in exports (EntityNameResolver.clean_entity_fields)
+
+Broadcast rights and production services point at their subject through
+(entity_type, entity_id) rather than a foreign key. POLYMORPHIC_TARGETS maps
+those entity_type values to tables so the same query also resolves
+entity_name and the subject's league, and listings sort by them in SQL
+like any other related name.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import Select, and_, case, func, literal, select
+from sqlalchemy.orm import aliased
+
+from src.models.sports_models import (
+    Brand, DivisionConference, Game, League, Stadium, Team
+)
+from src.services.sports.utils import get_model_for_entity_type
+
+# Display column marker for targets without a name column of their own
+DISPLAY_NAME = "display_name"
+
+
+class RelatedField(NamedTuple):
+    """A related name: fk column on the entity -> target model's display column, shown as key."""
+    fk: str
+    target: Type[Any]
+    column: str
+    key: str
+
+
+class PolymorphicTarget(NamedTuple):
+    """A table that (entity_type, entity_id) can point at."""
+    entity_types: Tuple[str, ...]  # Lower-cased entity_type values
+    model: Type[Any]
+    league_fk: Optional[str]  # None when the target is itself a league
+
+
+def _league(fk: str = "league_id") -> Tuple[RelatedField, RelatedField]:
+    return (
+        RelatedField(fk, League, "name", "league_name"),
+        RelatedField(fk, League, "sport", "league_sport"),
+    )
+
+
+RELATED_FIELDS: Dict[str, Tuple[RelatedField, ...]] = {
+    "team": (
+        *_league(),
+        RelatedField("division_conference_id", DivisionConference, "name", "division_conference_name"),
+        RelatedField("stadium_id", Stadium, "name", "stadium_name"),
+    ),
+    "division_conference": _league(),
+    "player": (
+        RelatedField("team_id", Team, "name", "team_name"),
+    ),
+    "game": (
+        *_league(),
+        RelatedField("home_team_id", Team, "name", "home_team_name"),
+        RelatedField("away_team_id", Team, "name", "away_team_name"),
+        RelatedField("stadium_id", Stadium, "name", "stadium_name"),
+    ),
+    "broadcast": (
+        RelatedField("broadcast_company_id", Brand, "name", "broadcast_company_name"),
+        RelatedField("division_conference_id", DivisionConference, "name", "division_conference_name"),
+    ),
+    "production": (
+        RelatedField("production_company_id", Brand, "name", "production_company_name"),
+        RelatedField("secondary_brand_id", Brand, "name", "secondary_brand_name"),
+    ),
+    "game_broadcast": (
+        RelatedField("game_id", Game, DISPLAY_NAME, "game_name"),
+        RelatedField("broadcast_company_id", Brand, "name", "broadcast_company_name"),
+        RelatedField("production_company_id", Brand, "name", "production_company_name"),
+    ),
+    "league_executive": _league(),
+    "stadium": (
+        RelatedField("host_broadcaster_id", Brand, "name", "host_broadcaster_name"),
+    ),
+}
+
+# Entity types whose subject is (entity_type, entity_id), and the keys resolved from it
+POLYMORPHIC_TYPES = ("broadcast", "production")
+POLYMORPHIC_KEYS = ("entity_name", "league_id", "league_name", "league_sport")
+
+POLYMORPHIC_TARGETS = (
+    PolymorphicTarget(("league",), League, None),
+    PolymorphicTarget(("team",), Team, "league_id"),
+    PolymorphicTarget(("division", "conference", "division_conference"), DivisionConference, "league_id"),
+    PolymorphicTarget(("game",), Game, "league_id"),
+)
+
+# Where a polymorphic entity's league comes from when its subject has none
+LEAGUE_FALLBACK_FK = {
+    "broadcast": "division_conference_id",
+}
+
+# Subjects without a table; the entity_type itself is the name
+SPECIAL_SUBJECT_TYPES = ('championship', 'playoff', 'playoffs', 'tournament')
+
+# Polymorphic types that name special subjects after their entity_type, and
+# the entity_name shown when nothing resolves
+SUBJECT_NAME_FALLBACK = {
+    "production": "Unknown Entity",
+}
+
+ENTITY_TYPE_ALIASES = {
+    "teams": "team",
+    "divisions_conferences": "division_conference",
+    "players": "player",
+    "games": "game",
+    "broadcast_right": "broadcast",
+    "broadcast_rights": "broadcast",
+    "production_service": "production",
+    "production_services": "production",
+    "game_broadcasts": "game_broadcast",
+    "league_executives": "league_executive",
+    "stadiums": "stadium",
+    "brands": "brand",
+}
+
+
+def registry_key(entity_type: str) -> str:
+    """The registry's name for an entity type (e.g. broadcast_rights -> broadcast)."""
+    return ENTITY_TYPE_ALIASES.get(entity_type, entity_type)
+
+
+def related_fields(entity_type: str) -> Tuple[RelatedField, ...]:
+    return RELATED_FIELDS.get(registry_key(entity_type), ())
+
+
+def related_field(entity_type: str, key: str) -> Optional[RelatedField]:
+    """The related field shown as key, if the entity type has one."""
+    return next((field for field in related_fields(entity_type) if field.key == key), None)
+
+
+def is_polymorphic(entity_type: str) -> bool:
+    return registry_key(entity_type) in POLYMORPHIC_TYPES
+
+
+def related_keys(entity_type: str) -> List[str]:
+    """Every key the registry resolves for an entity type."""
+    keys = [field.key for field in related_fields(entity_type)]
+    if is_polymorphic(entity_type):
+        keys += [key for key in POLYMORPHIC_KEYS if key not in keys]
+    return keys
+
+
+def is_related_key(entity_type: str, key: str) -> bool:
+    """Whether key is resolved by the registry, so with_related can sort and filter by it."""
+    return key in related_keys(entity_type)
+
+
+def display_expression(target: Any, column: str):
+    """SQL for a target row's display value; games show as "home vs away"."""
+    if column != DISPLAY_NAME:
+        return getattr(target, column)
+    home, away = aliased(Team), aliased(Team)
+    home_name = select(home.name).where(home.id == target.home_team_id).scalar_subquery()
+    away_name = select(away.name).where(away.id == target.away_team_id).scalar_subquery()
+    return home_name + " vs " + away_name
+
+
+def _target_display_column(model: Type[Any]) -> str:
+    return DISPLAY_NAME if model is Game else "name"
+
+
+def with_related(query: Select, entity_type: str, keys: Optional[Sequence[str]] = None) -> Tuple[Select, Dict[str, Any]]:
+    """
+    Outer-join the tables behind related keys onto a query over the entity's model.
+
+    Each foreign key is joined once, however many of its columns are used.
+    The joins are many-to-one, so they never duplicate entity rows.
+
+    Args:
+        query: A select over the entity type's model
+        entity_type: Entity type the query lists
+        keys: Related keys needed; all of them when None
+
+    Returns:
+        (query with the joins, key -> SQL expression)
+    """
+    model = get_model_for_entity_type(entity_type)
+    wanted = set(related_keys(entity_type) if keys is None else keys)
+    polymorphic = is_polymorphic(entity_type) and bool(wanted & set(POLYMORPHIC_KEYS))
+
+    fields = [field for field in related_fields(entity_type) if field.key in wanted]
+    fallback_fk = LEAGUE_FALLBACK_FK.get(registry_key(entity_type)) if polymorphic else None
+    if fallback_fk and all(field.fk != fallback_fk for field in fields):
+        # Joined only to supply the fallback league
+        fields += [field for field in related_fields(entity_type) if field.fk == fallback_fk][:1]
+
+    targets: Dict[str, Any] = {}
+    expressions: Dict[str, Any] = {}
+    for field in fields:
+        target = targets.get(field.fk)
+        if target is None:
+            target = targets[field.fk] = aliased(field.target)
+            query = query.outerjoin(target, getattr(model, field.fk) == target.id)
+        if field.key in wanted:
+            expressions[field.key] = display_expression(target, field.column)
+
+    if polymorphic:
+        kind = func.lower(model.entity_type)
+        names, league_ids = [], []
+        for subject in POLYMORPHIC_TARGETS:
+            target = aliased(subject.model)
+            query = query.outerjoin(target, and_(kind.in_(subject.entity_types), target.id == model.entity_id))
+            names.append(display_expression(target, _target_display_column(subject.model)))
+            league_ids.append(target.id if subject.league_fk is None else getattr(target, subject.league_fk))
+        if fallback_fk:
+            league_ids.append(targets[fallback_fk].league_id)
+
+        name_fallback = SUBJECT_NAME_FALLBACK.get(registry_key(entity_type))
+        if name_fallback:
+            special_name = case((kind.in_(SPECIAL_SUBJECT_TYPES), func.initcap(model.entity_type)))
+            names = [special_name, *names, literal(name_fallback)]
+
+        league = aliased(League)
+        query = query.outerjoin(league, league.id == func.coalesce(*league_ids))
+        polymorphic_expressions = {
+            "entity_name": func.coalesce(*names),
+            "league_id": league.id,
+            "league_name": league.name,
+            "league_sport": league.sport,
+        }
+        expressions.update({key: expr for key, expr in polymorphic_expressions.items() if key in wanted})
+
+    return query, expressions
+
+
+def resolution_query(entity_type: str, ids: Sequence[Any]) -> Select:
+    """One query returning the entity id and every related key for the given entities."""
+    model = get_model_for_entity_type(entity_type)
+    query, expressions = with_related(select(model.id), entity_type)
+    return (
+        query.add_columns(*(expr.label(key) for key, expr in expressions.items()))
+        .where(model.id.in_(ids))
+    )
@@ -0,0 +1,133 @@
+"""
+Incremental extraction of the structured data block from a streamed reply.
+
+Replies with structured data look like "<prose>\n---DATA---\n<json>". The
+extractor watches the stream for the delimiter (which may be split across
+chunks) and then scans the JSON as it arrives, so the value is parsed the
+moment its closing bracket streams in rather than after the whole reply.
+"""
+import io
+import json
+from typing import Any, Optional
+
+DATA_DELIMITER = "---DATA---"
+
+
+def partial_delimiter_length(text: str, delimiter: str = DATA_DELIMITER) -> int:
+    """Length of the longest suffix of text that could be the start of the delimiter."""
+    for n in range(min(len(delimiter) - 1, len(text)), 0, -1):
+        if text.endswith(delimiter[:n]):
+            return n
+    return 0
+
+
+class IncrementalJSONParser:
+    """
+    Finds the end of a top-level JSON object/array across chunks.
+
+    Tracks nesting depth and string/escape state so each character is
+    scanned once; the buffered text is only handed to json.loads once the
+    top-level value has closed. Anything before the opening bracket (such
+    as whitespace or a ```json fence) is skipped.
+    """
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.started = False
+        self.complete = False
+        self.value: Any = None
+        self.remainder = ""
+
+    def feed(self, text: str) -> bool:
+        """Consume a chunk; returns True once the top-level value is complete."""
+        if self.complete:
+            self.remainder += text
+            return True
+
+        start = 0
+        if not self.started:
+            positions = [p for p in (text.find("{"), text.find("[")) if p != -1]
+            if not positions:
+                return False
+            start = min(positions)
+            self.started = True
+
+        for i in range(start, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.write(text[start:i + 1])
+                    self.remainder = text[i + 1:]
+                    self.complete = True
+                    self.value = json.loads(self._buffer.getvalue())
+                    return True
+
+        self._buffer.write(text[start:])
+        return False
+
+
+class StructuredDataExtractor:
+    """Detects the data delimiter in a text stream and parses the JSON after it."""
+
+    def __init__(self, delimiter: str = DATA_DELIMITER):
+        self.delimiter = delimiter
+        # Tail of pre-delimiter text that could be the start of a split delimiter
+        self._tail = ""
+        self.found_delimiter = False
+        self.parser = IncrementalJSONParser()
+        self.error: Optional[Exception] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.parser.complete
+
+    @property
+    def data(self) -> Any:
+        return self.parser.value
+
+    def feed(self, text: str) -> None:
+        """Consume the next chunk of the streamed reply."""
+        if self.error is not None or self.complete:
+            return
+
+        if not self.found_delimiter:
+            window = self._tail + text
+            idx = window.find(self.delimiter)
+            if idx == -1:
+                self._tail = window[-(len(self.delimiter) - 1):]
+                return
+            self.found_delimiter = True
+            self._tail = ""
+            text = window[idx + len(self.delimiter):]
+
+        try:
+            self.parser.feed(text)
+        except ValueError as e:
+            self.error = e
+
+    def finish(self) -> None:
+        """
+        Call when the stream ends.
+
+        Raises:
+            ValueError: If a data block was started but never produced valid JSON.
+        """
+        if self.error is not None:
+            raise ValueError(f"Invalid structured data JSON: {self.error}")
+        if self.found_delimiter and not self.complete:
+            raise ValueError("Structured data JSON was not closed before the stream ended")
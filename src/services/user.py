@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.models import User
 from src.schemas.auth import UserCreate, UserLogin, TokenResponse
 from src.utils.config import get_settings
-from src.utils.security import verify_password, get_password_hash, create_access_token
+from src.utils.security import verify_password_async, get_password_hash_async, create_access_token
 
 settings = get_settings()
 # Define a longer expiry for refresh tokens (e.g., 7 days)
@@ -37,7 +37,7 @@ class UserService:
         # Create new user
         user = User(
             email=user_data.email,
-            hashed_password=get_password_hash(user_data.password)
+            hashed_password=await get_password_hash_async(user_data.password)
         )
         self.db.add(user)
         await self.db.commit()
@@ -61,7 +61,7 @@ class UserService:
             )
         
         logger.info(f"User found, verifying password for: {user_data.email}")
-        password_verification = verify_password(user_data.password, user.hashed_password)
+        password_verification = await verify_password_async(user_data.password, user.hashed_password)
         logger.info(f"Password verification result: {password_verification}")
         
         if not password_verification:
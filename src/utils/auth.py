@@ -1,43 +1,142 @@
+from collections import OrderedDict
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from uuid import UUID
+import time
 
+from src.models.models import User
+from src.utils.config import get_settings
 from src.utils.database import get_db
-from src.utils.security import get_current_user_id
+from src.utils.security import get_current_token_subject
 from src.services.user import UserService
 
+settings = get_settings()
+
+PrincipalKey = Tuple[UUID, Optional[int]]
+
+
+def user_to_dict(user: User) -> Dict[str, Any]:
+    """The user information handed to protected routes."""
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "is_active": user.is_active,
+        "is_superuser": user.is_superuser,
+        "is_admin": user.is_admin,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None
+    }
+
+
+class PrincipalCache:
+    """
+    Authenticated users, so get_current_user doesn't query Postgres per request.
+
+    Keyed by (user ID, token iat): a token issued after a change, e.g. a new
+    login, always reads the user afresh. Entries live for ttl seconds and the
+    least recently used are evicted beyond max_size. Changes to a user made
+    through the ORM in this process invalidate its entries immediately (see
+    the User event listeners below); the TTL bounds how long other workers
+    keep serving the old rights.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 10):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[PrincipalKey, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: PrincipalKey, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        user_dict, expires_at = entry
+        if expires_at <= (time.monotonic() if now is None else now):
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return user_dict
+
+    def put(self, key: PrincipalKey, user_dict: Dict[str, Any], now: Optional[float] = None) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (user_dict, (time.monotonic() if now is None else now) + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[UUID] = None) -> None:
+        """Drop a user's entries (every token), or every entry if no user is given."""
+        self.invalidations += 1
+        if user_id is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    principal_cache.invalidate(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_bulk_user_changes(orm_execute_state) -> None:
+    # update(User)/delete(User) statements don't load the rows they change
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and \
+            orm_execute_state.bind_mapper is inspect(User):
+        principal_cache.invalidate()
+
+
 async def get_current_user(
-    current_user_id: UUID = Depends(get_current_user_id),
+    subject: PrincipalKey = Depends(get_current_token_subject),
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Get current authenticated user information.
-    
+
     This function is used as a dependency in protected routes to ensure
-    the user is authenticated and to provide user information.
-    
+    the user is authenticated and to provide user information. Users are
+    served from principal_cache when possible.
+
     Returns:
         Dict[str, Any]: User information as a dictionary
     """
-    user_service = UserService(db)
-    user = await user_service.get_user_by_id(current_user_id)
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    # Convert user model to dictionary
-    user_dict = {
-        "id": str(user.id),
-        "email": user.email,
-        "is_active": user.is_active,
-        "is_superuser": user.is_superuser,
-        "is_admin": user.is_admin,
-        "created_at": user.created_at.isoformat() if user.created_at else None,
-        "updated_at": user.updated_at.isoformat() if user.updated_at else None
-    }
-    
-    return user_dict 
\ No newline at end of file
+    user_dict = principal_cache.get(subject)
+    if user_dict is None:
+        user_service = UserService(db)
+        user = await user_service.get_user_by_id(subject[0])
+
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+
+        user_dict = user_to_dict(user)
+        principal_cache.put(subject, user_dict)
+
+    # Routes get their own copy so they can't alter the cached entry
+    return dict(user_dict)
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     """Application settings managed through environment variables."""
@@ -14,10 +14,31 @@ class Settings(BaseSettings):
     SECRET_KEY: str = ""
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    AUTH_CRYPTO_WORKERS: int = 4  # Threads for bcrypt hashing/verification
+    AUTH_CRYPTO_MAX_PENDING: int = 64  # bcrypt jobs queued or running before new ones get a 503
+    JWT_CACHE_SIZE: int = 10000  # Verified tokens remembered until they expire; 0 disables
+    PRINCIPAL_CACHE_SIZE: int = 10000  # Authenticated users kept by get_current_user; 0 disables
+    PRINCIPAL_CACHE_TTL: int = 10  # Seconds a cached user is trusted; bounds how long other workers miss a revocation
     ENCRYPTION_KEY: Optional[str] = None
     
     # Database
     DATABASE_URL: str = ""
+    DATABASE_READ_URL: Optional[str] = None  # Read replica for opted-in read paths; None reads from the primary
+    DATABASE_POOL_SIZE: int = 5  # Connections kept open per engine
+    DATABASE_MAX_OVERFLOW: int = 10  # Extra connections opened under load, closed when returned
+    DATABASE_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a connection before failing
+    DATABASE_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced; -1 never
+    DATABASE_PRE_PING: str = "idle"  # "always", "idle" (only connections unused for DATABASE_PRE_PING_IDLE_SECONDS) or "never"
+    DATABASE_PRE_PING_IDLE_SECONDS: float = 30.0
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection; 0 for pgbouncer transaction pooling
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 100  # SQLAlchemy's asyncpg statement cache per connection; 0 disables
+
+    # SQL instrumentation (per-request statement counts, timings and N+1 detection)
+    SQL_SLOW_QUERY_MS: float = 500.0  # Statements slower than this are logged with their request ID
+    SQL_DUPLICATE_THRESHOLD: int = 10  # One statement fingerprint run this often in a request is flagged as N+1
+    SQL_SLOWEST_PER_REQUEST: int = 3  # Slowest statements kept for the request log
+    SQL_LOG_MAX_CHARS: int = 300  # Longer SQL is truncated in logs
+    PROMETHEUS_METRICS: Optional[bool] = None  # Serve unauthenticated Prometheus metrics at /metrics; None: all but ENVIRONMENT=production
     
     # OpenAI (kept for compatibility with other parts of the system)
     OPENAI_API_KEY: Optional[str] = None
@@ -25,6 +46,56 @@ class Settings(BaseSettings):
     # Anthropic (primary LLM provider)
     ANTHROPIC_API_KEY: str = ""
     
+    # Chat context window
+    CHAT_CONTEXT_RECENT_MESSAGES: int = 15
+    CHAT_CONTEXT_TOKEN_BUDGET: int = 12000
+    CHAT_SUMMARY_TOKEN_BUDGET: int = 1000
+    
+    # Chat web search
+    SEARCH_CACHE_TTL_SECONDS: int = 900
+    SEARCH_CACHE_MAX_ENTRIES: int = 512
+    SEARCH_DEADLINE_SECONDS: float = 10.0
+
+    # LLM router: concurrency limits, queueing, circuit breaking and hedging
+    LLM_ANTHROPIC_MAX_CONCURRENCY: int = 16
+    LLM_OPENAI_MAX_CONCURRENCY: int = 16
+    LLM_MODEL_CONCURRENCY: Dict[str, int] = {}  # "provider:model" -> limit
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    LLM_HEDGE_MODEL: Optional[str] = None  # "provider:model" raced against slow streams
+    LLM_HEDGE_AFTER_SECONDS: Optional[float] = None  # None disables hedging
+    LLM_FALLBACK_MODEL: Optional[str] = None  # "provider:model" used when the primary fails
+    LLM_FAKE_PROVIDER: bool = False  # Register the in-process "fake" provider
+
+    # Data change history
+    HISTORY_COMPACTION_WINDOW_SECONDS: float = 5.0  # 0 disables merging repeated cell edits
+    HISTORY_BACKGROUND_FLUSH: bool = False  # Write history from a background task, outside the edit transaction
+    HISTORY_FLUSH_INTERVAL_SECONDS: float = 0.5
+    HISTORY_FLUSH_MAX_BATCH: int = 500
+
+    # Bulk row ingestion
+    BULK_INGEST_MAX_ROWS: int = 500000
+
+    # Server-side row queries
+    ROW_QUERY_MAX_INDEXES_PER_DATASET: int = 3  # Column indexes one dataset may add to the shared structured_data_rows
+
+    # Sports entity listings
+    ENTITY_COUNT_CACHE_TTL: int = 60  # Seconds an exact unfiltered count is reused in "cached" mode
+    ENTITY_COUNT_ESTIMATE_THRESHOLD: int = 100000  # "auto" mode switches to pg_class estimates above this
+    ENTITY_DISPLAY_TABLES: bool = True  # Read and maintain the *_display related-name tables
+
+    # Rate limiting (applied in production)
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "postgres" (shared by all workers)
+    RATE_LIMIT_DEFAULT: str = "60/minute"
+    RATE_LIMIT_ROUTES: Dict[str, str] = {  # path substring -> limit, first match wins
+        "/auth/": "10/minute",
+        "/sheets/": "30/minute",
+        "/export/": "30/minute",
+    }
+    RATE_LIMIT_USERS: Dict[str, str] = {}  # user ID -> limit, replaces the route limits
+    RATE_LIMIT_MAX_KEYS: int = 100000  # Memory backend only
+
     # Google Sheets
     GOOGLE_SHEETS_CREDENTIALS: Optional[str] = None
     
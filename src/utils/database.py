@@ -1,44 +1,165 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from typing import AsyncGenerator
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Any, AsyncGenerator, Dict, Tuple
 from contextlib import asynccontextmanager
+import logging
+import time
 
 from src.utils.config import get_settings
+from src.utils.query_stats import instrument_engine
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Create async engine with proper SSL configuration for asyncpg
 import os
 import ssl
 
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
 # Extract database URL
 db_url = settings.DATABASE_URL
 
 # Also export a standard DB URL for synchronous operations (used in dev mode)
 SQLALCHEMY_DATABASE_URL = db_url.replace('postgresql+asyncpg://', 'postgresql://')
 
-# Configure SSL for asyncpg correctly
-connect_args = {}
-if 'sslmode' in db_url or 'ssl=true' in db_url:
+
+def _ssl_connect_args(url: str) -> Tuple[str, Dict[str, Any]]:
+    """Strip sslmode/ssl=true from a URL (asyncpg rejects them) and return the matching connect args."""
+    if 'sslmode' not in url and 'ssl=true' not in url:
+        return url, {}
+
     # For production with SSL, use SSL context instead of sslmode
     ssl_context = ssl.create_default_context()
     ssl_context.check_hostname = False
     ssl_context.verify_mode = ssl.CERT_NONE
-    connect_args = {"ssl": ssl_context}
-    
+
     # Remove sslmode or ssl=true from the URL as it's not compatible with asyncpg
-    db_url = db_url.replace('?sslmode=require', '')
-    db_url = db_url.replace('&sslmode=require', '')
-    db_url = db_url.replace('?ssl=true', '')
-    db_url = db_url.replace('&ssl=true', '')
+    for param in ('?sslmode=require', '&sslmode=require', '?ssl=true', '&ssl=true'):
+        url = url.replace(param, '')
+    return url, {"ssl": ssl_context}
+
+
+class MeteredAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long checkouts take.
+
+    A checkout's time covers waiting for a free connection, opening a new
+    one when the pool may grow, and any pre-ping.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        self.checkouts += 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return connection
+
+    def metrics(self) -> Dict[str, Any]:
+        capacity = self.size() + max(self._max_overflow, 0)
+        checked_out = self.checkedout()
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": checked_out,
+            "checked_in": self.checkedin(),
+            "overflow": self.overflow(),
+            "utilization": round(checked_out / capacity, 3) if capacity else 0.0,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.wait_seconds / (self.checkouts or 1) * 1000, 2),
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+        }
+
+
+def _ping_idle_connections(engine: AsyncEngine, idle_seconds: float) -> None:
+    """Pre-ping only connections that sat in the pool longer than idle_seconds."""
+    pool = engine.sync_engine.pool
+    dialect = engine.sync_engine.dialect
+
+    @event.listens_for(pool, "checkin")
+    def _record_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(pool, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # The pool discards the connection and retries with a fresh one
+            raise exc.DisconnectionError(f"Idle connection failed pre-ping: {e}") from e
+
+
+def create_db_engine(url: str, name: str = "primary") -> AsyncEngine:
+    """
+    Create an async engine with the pool and statement cache settings from Settings.
+
+    Args:
+        url: postgresql+asyncpg URL
+        name: Pool name used in logs and metrics
+
+    Returns:
+        The configured engine
+    """
+    if settings.DATABASE_PRE_PING not in PRE_PING_STRATEGIES:
+        raise ValueError(f"DATABASE_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}")
+
+    url, connect_args = _ssl_connect_args(url)
+    connect_args.update({
+        # asyncpg's own per-connection cache, and SQLAlchemy's in front of it
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE,
+    })
+
+    new_engine = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        poolclass=MeteredAsyncPool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_PRE_PING == "always",
+        pool_logging_name=name,
+        connect_args=connect_args
+    )
+    if settings.DATABASE_PRE_PING == "idle":
+        _ping_idle_connections(new_engine, settings.DATABASE_PRE_PING_IDLE_SECONDS)
+    return new_engine
+
 
 # Create async engine with proper configuration
-engine = create_async_engine(
-    db_url,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,  # Enable connection pool "pre-ping" feature
-    connect_args=connect_args
-)
+engine = create_db_engine(db_url)
+# Per-request statement counts and slow statement logging
+instrument_engine(engine.sync_engine)
+
+# Read-only engine for listing, export and query-console reads. Without a
+# replica it shares the primary's pool; either way its transactions are
+# READ ONLY, so a stray write fails instead of landing on the wrong server.
+if settings.DATABASE_READ_URL:
+    read_engine = create_db_engine(settings.DATABASE_READ_URL, name="replica")
+    instrument_engine(read_engine.sync_engine)
+else:
+    read_engine = engine
+read_engine = read_engine.execution_options(postgresql_readonly=True)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -49,6 +170,23 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+
+def pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Checkout wait times and utilization of each connection pool."""
+    metrics = {"primary": engine.sync_engine.pool.metrics()}
+    if read_engine.sync_engine.pool is not engine.sync_engine.pool:
+        metrics["replica"] = read_engine.sync_engine.pool.metrics()
+    return metrics
+
+
 class Base(DeclarativeBase):
     """Base class for all database models."""
     pass
@@ -64,14 +202,23 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         # The close is handled by the context manager
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for read-only sessions, served by the replica when one is configured."""
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
 @asynccontextmanager
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Context manager for getting a database session.
-    
+
     This is different from get_db() which is a dependency for FastAPI.
     This function returns a context manager that can be used with 'async with'.
-    
+
     Example:
         async with get_db_session() as session:
             result = await session.execute(query)
@@ -86,5 +233,17 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     finally:
         await session.close()
 
+@asynccontextmanager
+async def get_read_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Context manager for a read-only session, like get_db_session() for reads."""
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        await session.close()
+
 # Export all models
-__all__ = ["Base", "engine", "get_db", "get_db_session", "SQLALCHEMY_DATABASE_URL"]
\ No newline at end of file
+__all__ = [
+    "Base", "engine", "read_engine", "get_db", "get_read_db", "get_db_session",
+    "get_read_db_session", "pool_metrics", "SQLALCHEMY_DATABASE_URL"
+]
@@ -0,0 +1,199 @@
+"""
+Per-request SQL statement statistics.
+
+Engine events time every statement. While RequestPipelineMiddleware serves
+a request, the statements are added to that request's QueryStats:
+- how many statements ran and the total time spent in them
+- the slowest few, by fingerprint (the SQL with its values replaced by ?)
+- how often each fingerprint repeated, so N+1 loops stand out
+
+Statements slower than SQL_SLOW_QUERY_MS are logged whether or not a
+request is being tracked. Per-request totals are published as Prometheus
+metrics labelled by route template.
+"""
+
+import heapq
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import prometheus_client
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.utils.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger("sheetgpt.db")
+
+# conn.info key for the start times of the statements running on a connection
+_STARTED_KEY = "query_started"
+
+_FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),  # String literals
+    (re.compile(r"\$\d+|%\(\w+\)s"), "?"),  # asyncpg and psycopg bind parameters
+    (re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b"), "?"),  # Numbers, but not the digits in names like teams_1
+    (re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE), "IN (?, ...)"),  # IN lists of any length
+    (re.compile(r"\s+"), " "),
+)
+
+REQUEST_STATEMENTS = prometheus_client.Histogram(
+    "sheetgpt_request_db_statements",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000),
+)
+REQUEST_DB_SECONDS = prometheus_client.Histogram(
+    "sheetgpt_request_db_seconds",
+    "Time spent executing SQL statements per HTTP request",
+    ["route"],
+)
+REPEATED_STATEMENT_REQUESTS = prometheus_client.Counter(
+    "sheetgpt_request_repeated_statements_total",
+    "HTTP requests that ran one statement fingerprint SQL_DUPLICATE_THRESHOLD times or more",
+    ["route"],
+)
+SLOW_STATEMENTS = prometheus_client.Counter(
+    "sheetgpt_db_slow_statements_total",
+    "SQL statements slower than SQL_SLOW_QUERY_MS",
+)
+
+
+def fingerprint(statement: str) -> str:
+    """The statement with literals and parameters replaced, so repeats of one query compare equal."""
+    for pattern, replacement in _FINGERPRINT_RULES:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def _truncate(sql: str) -> str:
+    limit = settings.SQL_LOG_MAX_CHARS
+    return sql if len(sql) <= limit else sql[:limit] + "..."
+
+
+class QueryStats:
+    """The SQL statements run on behalf of one request."""
+
+    def __init__(self, request_id: str, keep_slowest: Optional[int] = None):
+        self.request_id = request_id
+        self.statements = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter = Counter()
+        self._keep_slowest = settings.SQL_SLOWEST_PER_REQUEST if keep_slowest is None else keep_slowest
+        self._slowest: List[Tuple[float, str]] = []  # Min-heap of (seconds, fingerprint)
+
+    def record(self, statement: str, seconds: float) -> None:
+        key = fingerprint(statement)
+        self.statements += 1
+        self.seconds += seconds
+        self.fingerprints[key] += 1
+        if len(self._slowest) < self._keep_slowest:
+            heapq.heappush(self._slowest, (seconds, key))
+        elif self._slowest and seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, key))
+
+    def slowest(self) -> List[Dict[str, Any]]:
+        return [
+            {"ms": round(seconds * 1000, 2), "sql": _truncate(key)}
+            for seconds, key in sorted(self._slowest, reverse=True)
+        ]
+
+    def repeated(self) -> Dict[str, int]:
+        """Fingerprints run SQL_DUPLICATE_THRESHOLD times or more, most repeated first."""
+        threshold = settings.SQL_DUPLICATE_THRESHOLD
+        return {key: count for key, count in self.fingerprints.most_common() if count >= threshold}
+
+    def summary(self) -> Dict[str, Any]:
+        """Fields for the request log."""
+        return {
+            "db_statements": self.statements,
+            "db_time_ms": round(self.seconds * 1000, 2),
+            "db_slowest": self.slowest(),
+            "db_repeated": {_truncate(key): count for key, count in self.repeated().items()},
+        }
+
+    def headers(self) -> List[Tuple[str, str]]:
+        """Response headers; a streamed response only counts the statements run before it started."""
+        return [
+            ("X-DB-Statements", str(self.statements)),
+            ("X-DB-Time-Ms", f"{self.seconds * 1000:.2f}"),
+            ("X-DB-Repeated-Statements", str(len(self.repeated()))),
+        ]
+
+    def publish(self, route: str) -> None:
+        """Record the request in the Prometheus metrics and warn about likely N+1 loops."""
+        REQUEST_STATEMENTS.labels(route).observe(self.statements)
+        REQUEST_DB_SECONDS.labels(route).observe(self.seconds)
+        repeated = self.repeated()
+        if repeated:
+            REPEATED_STATEMENT_REQUESTS.labels(route).inc()
+            key, count = next(iter(repeated.items()))
+            logger.warning(
+                f"Request {self.request_id} ({route}) ran one statement {count} times: {_truncate(key)}",
+                extra={"request_id": self.request_id, "route": route, "db_repeated": self.summary()["db_repeated"]},
+            )
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Statistics of the request being served, if any."""
+    return _current.get()
+
+
+@contextmanager
+def track_queries(request_id: str) -> Iterator[QueryStats]:
+    """Collect the statements run in this context (and tasks started from it) into a new QueryStats."""
+    stats = QueryStats(request_id)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    seconds = time.perf_counter() - conn.info[_STARTED_KEY].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+    if seconds * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        SLOW_STATEMENTS.inc()
+        request_id = stats.request_id if stats is not None else None
+        logger.warning(
+            f"Slow statement ({seconds * 1000:.1f}ms, request {request_id}): {_truncate(fingerprint(statement))}",
+            extra={"request_id": request_id, "duration_ms": round(seconds * 1000, 2)},
+        )
+
+
+def _handle_error(context) -> None:
+    # Failed statements never reach after_cursor_execute
+    conn = context.connection
+    if conn is not None and conn.info.get(_STARTED_KEY):
+        conn.info[_STARTED_KEY].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time the statements of a (sync) engine; the async engine's is its .sync_engine."""
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
+
+
+__all__ = [
+    "QueryStats", "current_query_stats", "fingerprint", "instrument_engine", "track_queries",
+]
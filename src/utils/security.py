@@ -1,6 +1,11 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union, Dict, Any
+from typing import Callable, Optional, Tuple, TypeVar, Union, Dict, Any
 from uuid import UUID
+import asyncio
+import hashlib
+import logging
 import os
 import base64
 import json
@@ -20,6 +25,9 @@ from src.utils.config import get_settings
 from src.utils.database import get_db
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 # Security configurations
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -42,27 +50,111 @@ class TokenData(BaseModel):
     user_id: Optional[UUID] = None
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    import logging
-    logger = logging.getLogger("auth")
-    
+    """Verify a password against its hash (blocking; use verify_password_async in handlers)."""
     try:
-        # Log the first 3 chars of the password and hash for debugging
-        logger.info(f"Verifying password - Input starts with: {plain_password[:3] if len(plain_password) > 3 else '*****'}")
-        logger.info(f"Hash starts with: {hashed_password[:10] if len(hashed_password) > 10 else '*****'}")
-        
-        result = pwd_context.verify(plain_password, hashed_password)
-        logger.info(f"Password verification result: {result}")
-        return result
+        return pwd_context.verify(plain_password, hashed_password)
     except Exception as e:
         logger.error(f"Password verification error: {str(e)}")
         # Return False on error to maintain security
         return False
 
 def get_password_hash(password: str) -> str:
-    """Generate password hash."""
+    """Generate password hash (blocking; use get_password_hash_async in handlers)."""
     return pwd_context.hash(password)
 
+
+class AuthCryptoExecutor:
+    """
+    Runs bcrypt hashing and verification off the event loop.
+
+    Each bcrypt call costs 100-300 ms of CPU. bcrypt releases the GIL while
+    it works, so a small thread pool gives real parallelism without blocking
+    in-flight requests. At most max_pending jobs may be queued or running;
+    beyond that callers get a 503 rather than queueing behind a login burst.
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 64):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="auth-crypto")
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker."""
+        return max(0, self.pending - self.workers)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning(f"Auth crypto pool saturated ({self.pending} jobs pending)")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        submitted = time.perf_counter()
+        timing: Dict[str, float] = {}
+
+        def job() -> T:
+            timing["started"] = time.perf_counter()
+            return func(*args)
+
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, job)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            finished = time.perf_counter()
+            started = timing.get("started", finished)
+            self._wait_seconds += started - submitted
+            self._run_seconds += finished - started
+
+    def metrics(self) -> Dict[str, Any]:
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queue_depth": self.queue_depth,
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2),
+            "avg_run_ms": round(self._run_seconds / completed * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+auth_crypto = AuthCryptoExecutor(settings.AUTH_CRYPTO_WORKERS, settings.AUTH_CRYPTO_MAX_PENDING)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the auth crypto pool."""
+    return await auth_crypto.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the auth crypto pool."""
+    return await auth_crypto.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
@@ -72,7 +164,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(
         to_encode,
         settings.SECRET_KEY,
@@ -80,8 +172,70 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     )
     return encoded_jwt
 
-def decode_token_and_get_user_id(token: str) -> Optional[UUID]:
-    """Decodes a JWT token and extracts the user ID (sub)."""
+class VerifiedTokenCache:
+    """
+    Subjects of tokens whose signature has already been verified.
+
+    Keyed by the SHA-256 of the token (the token itself is never kept), and
+    each entry lives until the token's own exp, so a cached token is never
+    accepted after it would have failed verification. Least recently used
+    entries are evicted beyond max_size.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[UUID, Optional[int], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get_subject(self, token: str, now: Optional[float] = None) -> Optional[Tuple[UUID, Optional[int]]]:
+        """The (user ID, issued-at) of a cached token."""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        user_id, issued_at, expires_at = entry
+        if expires_at <= (time.time() if now is None else now):
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return user_id, issued_at
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[UUID]:
+        subject = self.get_subject(token, now)
+        return subject[0] if subject else None
+
+    def put(self, token: str, user_id: UUID, expires_at: float, issued_at: Optional[int] = None) -> None:
+        if self.max_size <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (user_id, issued_at, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+token_cache = VerifiedTokenCache(settings.JWT_CACHE_SIZE)
+
+
+def decode_token_subject(token: str) -> Optional[Tuple[UUID, Optional[int]]]:
+    """Decodes a JWT token and extracts the user ID (sub) and issued-at (iat, if present)."""
+    cached = token_cache.get_subject(token)
+    if cached is not None:
+        return cached
     try:
         payload = jwt.decode(
             token,
@@ -90,11 +244,32 @@ def decode_token_and_get_user_id(token: str) -> Optional[UUID]:
         )
         user_id = payload.get("sub")
         if user_id:
-            return UUID(user_id)
+            user_id = UUID(user_id)
+            issued_at = payload.get("iat") if isinstance(payload.get("iat"), int) else None
+            # Tokens without an expiry are verified every time
+            if isinstance(payload.get("exp"), (int, float)):
+                token_cache.put(token, user_id, payload["exp"], issued_at)
+            return user_id, issued_at
         return None
     except (JWTError, ValueError):
         return None
 
+def decode_token_and_get_user_id(token: str) -> Optional[UUID]:
+    """Decodes a JWT token and extracts the user ID (sub)."""
+    subject = decode_token_subject(token)
+    return subject[0] if subject else None
+
+async def get_current_token_subject(token: str = Depends(oauth2_scheme)) -> Tuple[UUID, Optional[int]]:
+    """Get current user ID and token issued-at from JWT token."""
+    subject = decode_token_subject(token)
+    if not subject:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return subject
+
 async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> UUID:
     """Get current user ID from JWT token."""
     credentials_exception = HTTPException(
@@ -0,0 +1,129 @@
+"""
+Tests for the rate limiter.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.middleware.rate_limit import (
+    MemoryRateLimitStore,
+    PostgresRateLimitStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitPolicy,
+    client_identity,
+)
+
+MINUTE = RateLimit(3, 60)
+
+
+def make_limiter(**kwargs):
+    policy = RateLimitPolicy(
+        default=MINUTE,
+        routes={"/auth/": RateLimit(1, 60)},
+        users={"vip": RateLimit(100, 60)},
+    )
+    return RateLimiter(policy, MemoryRateLimitStore(**kwargs))
+
+
+def test_parse():
+    assert RateLimit.parse("60/minute") == RateLimit(60, 60)
+    assert RateLimit.parse("1000 / hours") == RateLimit(1000, 3600)
+    with pytest.raises(ValueError):
+        RateLimit.parse("lots/minute")
+
+
+def test_ipv6_clients_share_their_prefix():
+    assert client_identity("2001:db8:1:2:aaaa::1") == client_identity("2001:db8:1:2:bbbb::2")
+    assert client_identity("2001:db8:1:3::1") != client_identity("2001:db8:1:2::1")
+    assert client_identity("::ffff:10.0.0.1") == client_identity("10.0.0.1")
+
+
+@pytest.mark.asyncio
+class TestMemoryRateLimiter:
+    """Tests for RateLimiter with the in-process store."""
+
+    async def test_limits_within_a_window(self):
+        limiter = make_limiter()
+
+        results = [await limiter.hit("/api/v1/data", "10.0.0.1", now=1200.0) for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[0].remaining == 2
+        assert results[3].retry_after == 60
+        assert results[3].reset_at == 1260
+
+    async def test_previous_window_is_weighted(self):
+        limiter = make_limiter()
+        for _ in range(3):
+            await limiter.hit("/api/v1/data", "10.0.0.1", now=1250.0)
+
+        # A quarter into the next window, 3 * 0.75 of the old hits still count
+        blocked = await limiter.hit("/api/v1/data", "10.0.0.1", now=1275.0)
+        # Three quarters in, the old hits count for less than one
+        allowed = await limiter.hit("/api/v1/data", "10.0.0.1", now=1305.0)
+
+        assert not blocked.allowed
+        assert blocked.retry_after == 25
+        assert allowed.allowed
+
+    async def test_routes_users_and_addresses_are_counted_separately(self):
+        limiter = make_limiter()
+
+        assert (await limiter.hit("/api/v1/auth/login", "10.0.0.1", now=0.0)).allowed
+        assert not (await limiter.hit("/api/v1/auth/login", "10.0.0.1", now=1.0)).allowed
+        assert (await limiter.hit("/api/v1/auth/login", "10.0.0.2", now=1.0)).allowed
+        assert (await limiter.hit("/api/v1/data", "10.0.0.1", now=1.0)).allowed
+        vip = await limiter.hit("/api/v1/auth/login", "10.0.0.1", user_id="vip", now=1.0)
+        assert vip.allowed and vip.limit == 100
+
+    async def test_expired_keys_are_dropped_lazily(self):
+        limiter = make_limiter()
+        for i in range(50):
+            await limiter.hit("/api/v1/data", f"10.0.0.{i}", now=0.0)
+
+        for i in range(50):
+            await limiter.hit("/api/v1/data", "10.0.1.1", now=500.0 + i)
+
+        assert len(limiter.store) == 1
+
+    async def test_max_keys_bounds_memory(self):
+        limiter = make_limiter(max_keys=10)
+
+        for i in range(100):
+            await limiter.hit("/api/v1/data", f"10.0.0.{i}", now=0.0)
+
+        assert len(limiter.store) == 10
+
+
+@pytest.mark.asyncio
+class TestPostgresRateLimitStore:
+    """Tests for the shared Postgres store."""
+
+    def make_store(self, count=None, error=None):
+        conn = AsyncMock()
+        if error:
+            conn.execute.side_effect = error
+        else:
+            conn.execute.return_value.one = MagicMock(return_value=MagicMock(count=count, previous=0))
+        engine = MagicMock()
+        engine.begin.return_value.__aenter__.return_value = conn
+        return PostgresRateLimitStore(engine=engine), conn
+
+    async def test_one_upsert_per_hit(self):
+        store, conn = self.make_store(count=4)
+
+        result = await store.hit("default|3/60s|ip:10.0.0.1", MINUTE, now=1210.0)
+
+        assert not result.allowed
+        params = conn.execute.call_args_list[0].args[1]
+        assert params["window_start"] == 1200
+        assert params["previous_start"] == 1140
+        # First hit also clears out expired rows
+        assert conn.execute.await_count == 2
+
+    async def test_database_errors_fail_open(self):
+        store, _ = self.make_store(error=RuntimeError("connection refused"))
+
+        result = await store.hit("default|3/60s|ip:10.0.0.1", MINUTE, now=1210.0)
+
+        assert result.allowed
@@ -0,0 +1,103 @@
+"""
+Tests for the request pipeline middleware.
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.api.middleware.rate_limit import RateLimit, RateLimiter, RateLimitPolicy
+from src.api.middleware.security import RequestPipelineMiddleware
+from src.utils.query_stats import current_query_stats
+
+
+def create_test_app(**kwargs):
+    """Create a FastAPI app behind the pipeline."""
+    app = FastAPI()
+
+    @app.get("/api/v1/sports/leagues")
+    async def leagues(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/api/v1/stream")
+    async def stream():
+        async def body():
+            yield b"a\n"
+            yield b"b\n"
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+
+    @app.get("/api/v1/teams/{team_id}")
+    async def team(team_id: str):
+        # Stand-in for the engine events recording two statements
+        for _ in range(2):
+            current_query_stats().record("SELECT * FROM teams WHERE id = $1", 0.004)
+        return {"id": team_id}
+
+    @app.get("/api/v1/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestPipelineMiddleware, **kwargs)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_request_id_and_cache_headers():
+    client = create_test_app(environment="development")
+
+    response = client.get("/api/v1/sports/leagues")
+
+    assert response.headers["X-Request-ID"] == response.json()["request_id"]
+    assert response.headers["Cache-Control"] == "no-store, max-age=0"
+    assert response.headers["Vary"] == "Accept, Accept-Encoding"
+    assert "Content-Security-Policy" not in response.headers
+    assert "X-RateLimit-Limit" not in response.headers
+
+
+def test_production_headers_and_rate_limit():
+    limiter = RateLimiter(RateLimitPolicy(default=RateLimit(2, 60)))
+    client = create_test_app(environment="production", limiter=limiter)
+
+    first = client.get("/api/v1/sports/leagues")
+    client.get("/api/v1/sports/leagues")
+    limited = client.get("/api/v1/sports/leagues", headers={"Origin": "https://88gpts.com"})
+
+    assert first.headers["Cache-Control"] == "private, max-age=300, must-revalidate"
+    assert first.headers["X-Frame-Options"] == "DENY"
+    assert first.headers["X-RateLimit-Remaining"] == "1"
+    assert limited.status_code == 429
+    assert limited.json() == {"error": "Rate limit exceeded"}
+    assert int(limited.headers["Retry-After"]) > 0
+    assert limited.headers["Access-Control-Allow-Origin"] == "https://88gpts.com"
+
+
+def test_streaming_body_passes_through():
+    client = create_test_app(environment="development")
+
+    response = client.get("/api/v1/stream")
+
+    assert response.text == "a\nb\n"
+    assert "X-Request-ID" in response.headers
+
+
+def test_unhandled_errors_become_500_json():
+    client = create_test_app(environment="development")
+
+    response = client.get("/api/v1/boom")
+
+    assert response.status_code == 500
+    assert response.json()["error"] == "ServerError"
+    assert response.json()["request_id"] == response.headers["X-Request-ID"]
+
+
+def test_sql_statement_headers_and_metrics():
+    labels = {"route": "/api/v1/teams/{team_id}"}
+    before = REGISTRY.get_sample_value("sheetgpt_request_db_statements_sum", labels) or 0
+
+    response = create_test_app(environment="development").get("/api/v1/teams/42")
+    production = create_test_app(environment="production").get("/api/v1/teams/42")
+
+    assert response.headers["X-DB-Statements"] == "2"
+    assert response.headers["X-DB-Time-Ms"] == "8.00"
+    assert "X-DB-Statements" not in production.headers
+    # Both requests are counted, under the route template rather than the raw path
+    assert REGISTRY.get_sample_value("sheetgpt_request_db_statements_sum", labels) == before + 4
@@ -74,6 +74,9 @@ class TestBaseEntityService:
         self.update_patcher = patch('src.services.sports.base_service.update')
         self.mock_update = self.update_patcher.start()
 
+        self.search_patcher = patch('src.services.sports.base_service.ranked_search')
+        self.mock_search = self.search_patcher.start()
+
         # Now initialize the service
         self.service = BaseEntityService(self.model_class)
         self.mock_db = AsyncMock(spec=AsyncSession)
@@ -85,6 +88,7 @@ class TestBaseEntityService:
         self.or_patcher.stop()
         self.func_patcher.stop()
         self.update_patcher.stop()
+        self.search_patcher.stop()
     
     async def test_get_entity_success(self):
         """Test successful entity retrieval."""
@@ -117,7 +121,7 @@ class TestBaseEntityService:
         # Arrange
         entity_name = "Test Entity"
         mock_entity = MockModel(id=self.entity_id, name=entity_name)
-        self.mock_db.execute.return_value = MockQueryResult(mock_entity)
+        self.mock_db.execute.return_value = MockQueryResult(entities=[(mock_entity, 0, 1.0)])
         
         # Act
         result = await self.service.get_entity_by_name(self.mock_db, entity_name)
@@ -125,12 +129,13 @@ class TestBaseEntityService:
         # Assert
         assert result == mock_entity
         self.mock_db.execute.assert_called_once()
+        assert self.mock_search.call_args.kwargs["max_rank"] == 0  # exact matches only
     
     async def test_get_entity_by_name_not_found(self):
         """Test entity not found by name error."""
         # Arrange
         entity_name = "Nonexistent Entity"
-        self.mock_db.execute.return_value = MockQueryResult(None)
+        self.mock_db.execute.return_value = MockQueryResult(entities=[])
         
         # Act & Assert
         with pytest.raises(EntityNotFoundError) as exc_info:
@@ -274,29 +279,20 @@ class TestBaseEntityService:
         entity_name = "Test Entity"
         mock_entity = MockModel(id=self.entity_id, name=entity_name)
         
-        # First query returns no results (exact match fails)
-        first_result = MockQueryResult(None)
-        # Second query returns results (partial match)
-        second_result = MockQueryResult(entities=[mock_entity])
-        
-        self.mock_db.execute.side_effect = [first_result, second_result]
+        # One ranked query returns the best (prefix) match
+        self.mock_db.execute.return_value = MockQueryResult(entities=[(mock_entity, 1, 0.4)])
         
         # Act
         result = await self.service.find_entity(self.mock_db, "Test")
         
         # Assert
         assert result == mock_entity
-        assert self.mock_db.execute.call_count == 2
+        assert self.mock_db.execute.call_count == 1
         
     async def test_find_entity_not_found(self):
         """Test finding an entity that doesn't exist."""
         # Arrange
-        # Both exact and partial match queries return no results
-        self.mock_db.execute.side_effect = [
-            MockQueryResult(None),  # ID lookup fails
-            MockQueryResult(None),  # Exact name match fails
-            MockQueryResult(entities=[])  # Partial match fails
-        ]
+        self.mock_db.execute.return_value = MockQueryResult(entities=[])  # Ranked search finds nothing
         
         # Act
         result = await self.service.find_entity(self.mock_db, "Nonexistent", raise_not_found=False)
@@ -305,11 +301,7 @@ class TestBaseEntityService:
         assert result is None
         
         # Test with raise_not_found=True
-        self.mock_db.execute.side_effect = [
-            MockQueryResult(None),  # ID lookup fails
-            MockQueryResult(None),  # Exact name match fails
-            MockQueryResult(entities=[])  # Partial match fails
-        ]
+        self.mock_db.execute.return_value = MockQueryResult(entities=[])  # Ranked search finds nothing
         
         with pytest.raises(EntityNotFoundError):
             await self.service.find_entity(self.mock_db, "Nonexistent", raise_not_found=True)
@@ -322,12 +314,12 @@ class TestBaseEntityService:
             {"name": "Entity 2"}
         ]
         
-        # Mock the create_entity method to return mock entities
-        with patch.object(self.service, 'create_entity') as mock_create:
-            mock_create.side_effect = [
+        # bulk_create delegates to the set-based bulk_upsert
+        with patch.object(self.service, 'bulk_upsert') as mock_upsert:
+            mock_upsert.return_value = MagicMock(entities=[
                 MockModel(name="Entity 1"),
                 MockModel(name="Entity 2")
-            ]
+            ])
             
             # Act
             results = await self.service.bulk_create(self.mock_db, entities_data)
@@ -336,7 +328,9 @@ class TestBaseEntityService:
             assert len(results) == 2
             assert results[0].name == "Entity 1"
             assert results[1].name == "Entity 2"
-            assert mock_create.call_count == 2
+            mock_upsert.assert_called_once_with(
+                self.mock_db, entities_data, validate_fields=True, update_if_exists=False
+            )
             
     async def test_normalize_entity_type(self):
         """Test entity type normalization function."""
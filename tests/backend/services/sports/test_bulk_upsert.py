@@ -0,0 +1,144 @@
+"""
+Tests for the set-based bulk upsert.
+"""
+import pytest
+import sys
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.sports_models import Brand, DivisionConference, Game, League, Team
+from src.services.sports.base_service import BaseEntityService
+from src.services.sports.bulk_upsert import natural_key, required_columns, upsert_statement
+from src.utils.errors import ValidationError
+
+
+def make_db(*results):
+    db = AsyncMock(spec=AsyncSession)
+    savepoint = MagicMock()
+    savepoint.__aenter__ = AsyncMock()
+    savepoint.__aexit__ = AsyncMock(return_value=False)
+    db.begin_nested = MagicMock(return_value=savepoint)
+    db.execute.side_effect = list(results)
+    return db
+
+
+@pytest.fixture(autouse=True)
+def refresh_displays(monkeypatch):
+    refresh = AsyncMock()
+    monkeypatch.setattr(sys.modules[BaseEntityService.__module__], "refresh_displays", refresh)
+    return refresh
+
+
+def returning(*rows):
+    result = MagicMock()
+    result.all.return_value = list(rows)
+    return result
+
+
+def test_conflict_key_comes_from_the_unique_name_constraint():
+    assert natural_key(Team) == ("name",)
+    assert natural_key(DivisionConference) == ("league_id", "name")
+    assert natural_key(Brand) is None
+    assert "name" in required_columns(Brand)
+    assert "id" not in required_columns(Brand)
+
+
+def test_update_only_sets_supplied_fields():
+    stmt = upsert_statement(Team, ["name", "nickname", "league_id"], ("name",), update_if_exists=True)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "ON CONFLICT (name) DO UPDATE SET" in sql
+    assert "nickname = excluded.nickname" in sql
+    assert "updated_at = now()" in sql
+    assert "city" not in sql.split("DO UPDATE SET")[1].split("RETURNING")[0]
+    assert "xmax = 0 AS inserted" in sql
+
+    skip = str(upsert_statement(Team, ["name"], ("name",), update_if_exists=False).compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (name) DO NOTHING" in skip
+
+
+@pytest.mark.asyncio
+class TestBulkUpsert:
+    """Tests for BaseEntityService.bulk_upsert."""
+
+    async def test_counts_per_chunk(self):
+        rows = [{"name": f"League {i}", "sport": "Football", "country": "USA"} for i in range(3)]
+        rows.append({"sport": "Football", "country": "USA"})  # no name
+        db = make_db(
+            returning(("l0", True), ("l1", False)),
+            returning(("l2", True)),
+        )
+
+        report = await BaseEntityService(League).bulk_upsert(db, rows, chunk_size=2)
+
+        assert [(c.inserted, c.updated, c.failed) for c in report.chunks] == [(1, 1, 0), (1, 0, 1)]
+        assert report.errors[0].row == 3
+        assert report.entities == ["l0", "l1", "l2"]
+        assert db.execute.await_count == 2
+        db.commit.assert_awaited_once()
+
+    async def test_failed_chunk_does_not_stop_the_batch(self):
+        rows = [{"name": name, "sport": "Football", "country": "USA"} for name in ("A", "B")]
+        db = make_db(IntegrityError("INSERT", {}, Exception("fk violation")), returning(("b", True)))
+
+        report = await BaseEntityService(League).bulk_upsert(db, rows, chunk_size=1)
+
+        assert report.chunks[0].failed == 1
+        assert "fk violation" in report.chunks[0].error
+        assert report.inserted == 1
+
+    async def test_models_without_unique_names_match_existing_rows_by_name(self):
+        existing_id = uuid.uuid4()
+        rows = [
+            {"name": "Nike", "industry": "Apparel"},
+            {"name": "NIKE", "industry": "Sportswear"},
+            {"name": "Adidas", "industry": "Apparel"},
+        ]
+        db = make_db(returning((existing_id, "nike")), returning(("nike", False)), returning(("adidas", True)))
+
+        report = await BaseEntityService(Brand).bulk_upsert(db, rows)
+
+        assert report.conflict_key == ("id",)
+        # Duplicate names in the batch merge into one row, later values winning
+        upserted = db.execute.await_args_list[1].args[1]
+        assert upserted == [{"name": "NIKE", "industry": "Sportswear", "id": existing_id}]
+        assert (report.inserted, report.updated, report.failed) == (1, 2, 0)
+
+    async def test_insert_only_skips_rows_matching_existing_names(self):
+        existing_id = uuid.uuid4()
+        rows = [
+            {"name": "Nike", "industry": "Apparel"},
+            {"name": "Adidas", "industry": "Apparel"},
+            {"name": "ADIDAS", "industry": "Sportswear"},
+        ]
+        # The matched Nike row conflicts on id and is not returned
+        db = make_db(returning((existing_id, "nike")), returning(), returning(("adidas", True)))
+
+        report = await BaseEntityService(Brand).bulk_upsert(db, rows, update_if_exists=False)
+
+        inserted = [row for call in db.execute.await_args_list[1:] for row in call.args[1]]
+        assert {"name": "Nike", "industry": "Apparel", "id": existing_id} in inserted
+        assert [row["name"] for row in inserted if "id" not in row] == ["Adidas"]
+        assert (report.inserted, report.updated, report.failed) == (1, 0, 2)
+        assert report.chunks[0].error == "2 rows already exist"
+
+    async def test_written_rows_refresh_display_tables(self, refresh_displays):
+        game = Game(id=uuid.uuid4())
+        rows = [{"league_id": uuid.uuid4(), "home_team_id": uuid.uuid4(), "away_team_id": uuid.uuid4(),
+                 "stadium_id": uuid.uuid4(), "date": "2026-10-18", "season_year": 2026}]
+        db = make_db(returning((game, True)))
+
+        await BaseEntityService(Game).bulk_upsert(db, rows)
+
+        refresh_displays.assert_awaited_once()
+        assert list(refresh_displays.await_args.args[2]) == [game.id]
+
+    async def test_unknown_fields_are_rejected_once(self):
+        db = make_db()
+
+        with pytest.raises(ValidationError):
+            await BaseEntityService(Team).bulk_upsert(db, [{"name": "A", "colour": "red"}])
+        db.execute.assert_not_awaited()
@@ -0,0 +1,148 @@
+"""
+Tests for the denormalized *_display tables and their incremental refresh.
+"""
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.sports_models import Game, League, Team
+from src.services.sports import display_views
+from src.services.sports.display_views import (
+    DISPLAY_MODELS,
+    display_related,
+    display_sort,
+    refresh_statement,
+    refresh_statements,
+    stale_condition,
+)
+from src.services.sports.entity_name_resolver import EntityNameResolver
+from src.services.sports.pagination import apply_keyset, encode_cursor
+from src.services.sports.relationships import related_keys
+
+
+def compile_sql(statement):
+    return " ".join(str(statement.compile(dialect=postgresql.dialect())).split())
+
+
+def mappings_result(rows):
+    result = MagicMock()
+    result.mappings.return_value = rows
+    return result
+
+
+def test_display_columns_match_the_registry():
+    for entity_type, display in DISPLAY_MODELS.items():
+        columns = {column.key for column in display.__table__.columns} - {"id", "refreshed_at"}
+        assert columns == set(related_keys(entity_type)), entity_type
+
+
+def test_refresh_upserts_from_the_live_joins():
+    sql = compile_sql(refresh_statement("game", Game.id.in_([uuid.uuid4()])))
+
+    assert sql.startswith("INSERT INTO games_display (id, league_name, league_sport")
+    assert "JOIN teams" in sql
+    assert "WHERE games.id IN" in sql
+    assert "ON CONFLICT (id) DO UPDATE SET league_name = excluded.league_name" in sql
+    assert "refreshed_at = now()" in sql
+
+
+def test_team_rename_reaches_game_names_and_subjects():
+    team_ids = [uuid.uuid4()]
+
+    game_broadcasts = compile_sql(stale_condition("game_broadcast", Team, team_ids))
+    assert "game_broadcasts.game_id IN (SELECT games.id" in game_broadcasts
+    assert "games.home_team_id IN" in game_broadcasts and "games.away_team_id IN" in game_broadcasts
+
+    broadcasts = compile_sql(stale_condition("broadcast", Team, team_ids))
+    assert "lower(broadcast_rights.entity_type) IN" in broadcasts
+    # Team subjects, and game subjects whose name includes the team
+    assert broadcasts.count("broadcast_rights.entity_id IN") == 2
+
+    assert stale_condition("game_broadcast", League, [uuid.uuid4()]) is None
+
+
+def test_league_rename_reaches_subjects_and_the_fallback_division():
+    sql = compile_sql(stale_condition("broadcast", League, [uuid.uuid4()]))
+
+    assert "SELECT teams.id FROM teams WHERE teams.league_id IN" in sql
+    assert "broadcast_rights.division_conference_id IN (SELECT divisions_conferences.id" in sql
+    # Production services have no division fallback
+    assert "division_conference_id" not in compile_sql(stale_condition("production", League, [uuid.uuid4()]))
+
+
+def test_listing_sort_reads_the_display_table(monkeypatch):
+    query, expressions = display_related(select(Game), "game", ["home_team_name"])
+    sql = compile_sql(query.where(expressions["home_team_name"] == "Yankees"))
+
+    # Every entity has a display row, so the join is inner and the columns bare
+    assert "FROM games JOIN games_display AS games_display_1 ON games_display_1.id = games.id" in sql
+    assert "WHERE games_display_1.home_team_name = " in sql
+    assert "JOIN teams" not in sql
+
+    monkeypatch.setattr(display_views.settings, "ENTITY_DISPLAY_TABLES", False)
+    query, _ = display_related(select(Game), "game", ["home_team_name"])
+    assert "JOIN teams" in compile_sql(query)
+
+
+def test_related_sort_pages_by_keyset_on_the_display_index(monkeypatch):
+    query, sort_column, id_column = display_sort(select(Game), "game", "home_team_name")
+    cursor = encode_cursor("home_team_name", "desc", "Yankees", uuid.uuid4())
+    sql = compile_sql(apply_keyset(query, sort_column, id_column, "desc", 25, cursor, "home_team_name"))
+
+    assert "ORDER BY games_display_1.home_team_name DESC NULLS FIRST, games_display_1.id DESC" in sql
+    assert "(games_display_1.home_team_name, games_display_1.id) < (" in sql
+    assert "CASE" not in sql and "JOIN teams" not in sql
+
+    monkeypatch.setattr(display_views.settings, "ENTITY_DISPLAY_TABLES", False)
+    query, sort_column, id_column = display_sort(select(Game), "game", "home_team_name")
+    assert id_column is Game.id
+    assert "JOIN teams" in compile_sql(query)
+
+
+def test_flushed_rows_refresh_their_dependents():
+    team = Team(id=uuid.uuid4(), name="Yankees")
+    untouched = Team(id=uuid.uuid4(), name="Mets")
+    session = SimpleNamespace(
+        new=[team], dirty={untouched}, deleted=[], info={},
+        is_modified=lambda obj, include_collections=False: obj is not untouched,
+        connection=MagicMock(),
+    )
+
+    display_views._collect_display_sources(session, None)
+    assert session.info[display_views._PENDING_KEY] == {Team: {team.id}}
+
+    display_views._refresh_display_sources(session, None)
+    executed = session.connection.return_value.execute
+    assert executed.call_count == len(refresh_statements(Team, [team.id]))
+    assert display_views._PENDING_KEY not in session.info
+
+
+@pytest.mark.asyncio
+async def test_resolver_falls_back_to_live_names_for_missing_display_rows():
+    game_id = uuid.uuid4()
+    broadcasts = [
+        {"id": uuid.uuid4(), "game_id": game_id, "broadcast_company_id": uuid.uuid4(), "production_company_id": None},
+        {"id": uuid.uuid4(), "game_id": game_id, "broadcast_company_id": uuid.uuid4(), "production_company_id": None},
+    ]
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.side_effect = [
+        mappings_result([{"id": broadcasts[0]["id"], "game_name": "Yankees vs Mets",
+                          "broadcast_company_name": "ESPN", "production_company_name": None}]),
+        mappings_result([{"id": broadcasts[1]["id"], "game_name": "Yankees vs Mets",
+                          "broadcast_company_name": "FOX", "production_company_name": None}]),
+    ]
+
+    resolved = await EntityNameResolver.get_entities_with_related_names(db, "game_broadcast", broadcasts)
+
+    assert db.execute.await_count == 2
+    assert "FROM game_broadcasts_display" in compile_sql(db.execute.await_args_list[0].args[0])
+    live = db.execute.await_args_list[1].args[0]
+    assert "JOIN games" in compile_sql(live)
+    # Only the entity without a display row is resolved live
+    assert [value for value in live.compile().params.values() if isinstance(value, list)] == [[broadcasts[1]["id"]]]
+    assert [entity["name"] for entity in resolved] == ["ESPN - Yankees vs Mets", "FOX - Yankees vs Mets"]
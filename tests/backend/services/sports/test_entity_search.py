@@ -0,0 +1,65 @@
+"""
+Tests for the ranked entity name search queries.
+"""
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.models.sports_models import Game, Management, Team
+from src.services.sports.entity_search import (
+    EXACT,
+    contains_condition,
+    escape_like,
+    prefix_condition,
+    ranked_search,
+    to_matches,
+)
+
+
+def compile_sql(statement):
+    compiled = statement.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def test_like_wildcards_are_escaped():
+    assert escape_like("100%_a\\b") == "100\\%\\_a\\\\b"
+
+    sql, params = compile_sql(contains_condition(Team.name, "A_B"))
+    assert "teams.name ILIKE" in sql
+    assert list(params.values()) == ["%A\\_B%"]
+
+    sql, params = compile_sql(prefix_condition(Team.name, "New Y"))
+    assert "lower(teams.name) LIKE" in sql
+    assert list(params.values()) == ["new y%"]
+
+
+def test_ranked_search_is_one_query_over_name_and_nickname():
+    sql, params = compile_sql(ranked_search(Team, " Yankees ", limit=5))
+
+    # Every tier is in the WHERE clause, written against the indexed expressions
+    assert "lower(teams.nickname) =" in sql
+    assert "teams.name %% " in sql
+    assert "teams.nickname ILIKE" in sql
+    assert "greatest(similarity(teams.name" in sql
+    assert "ORDER BY rank ASC, score DESC, teams.name ASC" in sql
+    assert "yankees" in params.values()
+    assert 5 in params.values()
+
+
+def test_exact_only_search_skips_trigram_functions():
+    sql, _ = compile_sql(ranked_search(Management, "Acme", limit=1, max_rank=EXACT))
+
+    assert "lower(managements.name) =" in sql
+    assert "similarity" not in sql
+    assert "ILIKE" not in sql
+    assert "nickname" not in sql
+
+
+def test_models_without_names_are_rejected():
+    with pytest.raises(ValueError):
+        ranked_search(Game, "x")
+
+
+def test_rows_become_matches():
+    matches = to_matches([("a", 0, 1.0), ("b", 3, None)])
+
+    assert [(m.entity, m.match, m.score) for m in matches] == [("a", "exact", 1.0), ("b", "fuzzy", 0.0)]
@@ -0,0 +1,132 @@
+"""
+Tests for keyset pagination cursors and listing row counts.
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.sports_models import Team
+from src.services.sports.pagination import (
+    CountCache,
+    InvalidCursorError,
+    apply_keyset,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    next_page_cursor,
+    next_row_cursor,
+)
+
+
+def compile_sql(statement):
+    compiled = statement.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def scalar_result(value):
+    result = MagicMock()
+    result.scalar.return_value = value
+    return result
+
+
+def test_cursor_round_trips_typed_values():
+    row_id = uuid4()
+    created = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    cursor = encode_cursor("created_at", "desc", created, row_id)
+
+    assert decode_cursor(cursor, "created_at", "desc") == (created, row_id)
+
+
+def test_cursor_rejects_other_sorts_and_garbage():
+    cursor = encode_cursor("name", "asc", "Yankees", uuid4())
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "name", "desc")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "city", "asc")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor", "name", "asc")
+
+
+def test_keyset_page_seeks_past_the_cursor_instead_of_offsetting():
+    cursor = encode_cursor("name", "asc", "Mets", uuid4())
+
+    sql, params = compile_sql(apply_keyset(select(Team), Team.name, Team.id, "asc", 25, cursor, "name"))
+
+    assert "(teams.name, teams.id) > (" in sql
+    assert "IS NULL" not in sql  # name is NOT NULL, so the seek is a plain range
+    assert "ORDER BY teams.name ASC NULLS LAST, teams.id ASC" in sql
+    assert "OFFSET" not in sql
+    assert 26 in params.values()
+
+
+def test_nulls_sort_where_a_plain_index_returns_them():
+    cursor = encode_cursor("city", "desc", "Boston", uuid4())
+
+    sql, _ = compile_sql(apply_keyset(select(Team), Team.city, Team.id, "desc", 25, cursor, "city"))
+
+    # Descending NULLs come first, so past them a nullable column needs no IS NULL branch
+    assert "ORDER BY teams.city DESC NULLS FIRST, teams.id DESC" in sql
+    assert "(teams.city, teams.id) < (" in sql
+    assert "IS NULL" not in sql
+
+    ascending = encode_cursor("city", "asc", "Boston", uuid4())
+    sql, _ = compile_sql(apply_keyset(select(Team), Team.city, Team.id, "asc", 25, ascending, "city"))
+    assert "teams.city IS NULL" in sql
+
+
+def test_next_page_cursor_trims_the_lookahead_row():
+    rows = [SimpleNamespace(id=uuid4(), name=name) for name in ("A", "B", "C")]
+
+    cursor = next_page_cursor(rows, 2, "name", "asc")
+
+    assert [row.name for row in rows] == ["A", "B"]
+    assert decode_cursor(cursor, "name", "asc") == ("B", rows[1].id)
+    assert next_page_cursor(rows, 2, "name", "asc") is None
+
+
+def test_next_row_cursor_reads_the_joined_sort_value():
+    rows = [(SimpleNamespace(id=uuid4()), name) for name in ("A", "B", "C")]
+
+    cursor = next_row_cursor(rows, 2, "league_name", "desc")
+
+    assert [value for _, value in rows] == ["A", "B"]
+    assert decode_cursor(cursor, "league_name", "desc") == ("B", rows[1][0].id)
+    assert next_row_cursor(rows, 2, "league_name", "desc") is None
+
+
+def test_count_cache_expires():
+    cache = CountCache(ttl=10)
+    cache.put("teams", 42, now=100)
+
+    assert cache.get("teams", now=105) == 42
+    assert cache.get("teams", now=110) is None
+
+
+@pytest.mark.asyncio
+async def test_estimated_count_only_for_unfiltered_listings():
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.return_value = scalar_result(1_000_000)
+
+    assert await count_rows(db, select(Team), "teams", "estimated") == (1_000_000, True)
+    assert "pg_class" in str(db.execute.call_args[0][0])
+
+    db.execute.reset_mock()
+    db.execute.return_value = scalar_result(3)
+
+    filtered = select(Team).where(Team.city == "Boston")
+    assert await count_rows(db, filtered, "teams", "estimated") == (3, False)
+    assert "count(*)" in str(db.execute.call_args[0][0])
+
+
+@pytest.mark.asyncio
+async def test_unknown_count_mode_is_rejected():
+    with pytest.raises(ValueError):
+        await count_rows(AsyncMock(spec=AsyncSession), select(Team), "teams", "fast")
@@ -0,0 +1,112 @@
+"""
+Tests for the relationship registry and the batched related-name resolution.
+"""
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.sports_models import ProductionService, Team
+from src.services.sports.entity_name_resolver import EntityNameResolver
+from src.services.sports.pagination import keyset_order
+from src.services.sports.relationships import (
+    is_related_key,
+    registry_key,
+    related_field,
+    resolution_query,
+    with_related,
+)
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def mappings_result(rows):
+    result = MagicMock()
+    result.mappings.return_value = rows
+    return result
+
+
+def test_each_foreign_key_is_joined_once():
+    sql = compile_sql(resolution_query("teams", [uuid.uuid4()]))
+
+    assert sql.count("JOIN leagues") == 1
+    assert "leagues_1.name AS league_name" in sql
+    assert "leagues_1.sport AS league_sport" in sql
+    assert "stadiums_1.name AS stadium_name" in sql
+    assert "WHERE teams.id IN" in sql
+
+
+def test_polymorphic_subjects_resolve_in_the_same_query():
+    sql = compile_sql(resolution_query("broadcast_rights", [uuid.uuid4()]))
+
+    assert "AS entity_name" in sql
+    assert "lower(broadcast_rights.entity_type) IN" in sql
+    # The subject's league, falling back to the division/conference's
+    assert "coalesce(leagues_1.id, teams_1.league_id" in sql
+    assert "divisions_conferences_1.league_id)" in sql
+
+
+def test_related_sort_expression_joins_only_what_it_needs():
+    query, expressions = with_related(select(Team), "team", ["stadium_name"])
+    sql = compile_sql(query.order_by(expressions["stadium_name"]))
+
+    assert "JOIN stadiums" in sql
+    assert "leagues" not in sql
+    assert related_field("game_broadcast", "game_name").column == "display_name"
+    assert related_field("team", "entity_name") is None
+    assert registry_key("production_services") == "production"
+
+
+def test_polymorphic_sort_pages_in_sql():
+    query, expressions = with_related(select(ProductionService), "production", ["entity_name"])
+    sql = compile_sql(
+        query.order_by(*keyset_order(expressions["entity_name"], ProductionService.id, "desc"))
+        .offset(100)
+        .limit(50)
+    )
+
+    # Special subjects are named after their type; unresolved subjects sort as "Unknown Entity"
+    assert "coalesce(CASE WHEN (lower(production_services.entity_type) IN" in sql
+    assert "initcap(production_services.entity_type)" in sql
+    assert "DESC NULLS FIRST, production_services.id DESC" in sql
+    assert "LIMIT" in sql and "OFFSET" in sql
+    assert is_related_key("broadcast_rights", "entity_name")
+    assert not is_related_key("team", "entity_name")
+
+
+@pytest.mark.asyncio
+async def test_resolver_uses_one_query_per_page():
+    company_id, subject_id = uuid.uuid4(), uuid.uuid4()
+    rights = [
+        {"id": uuid.uuid4(), "broadcast_company_id": company_id, "entity_type": "Team",
+         "entity_id": subject_id, "division_conference_id": None, "territory": "USA"},
+        {"id": uuid.uuid4(), "broadcast_company_id": company_id, "entity_type": "League",
+         "entity_id": uuid.uuid4(), "division_conference_id": None, "territory": "Canada"},
+    ]
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.return_value = mappings_result([
+        {"id": rights[0]["id"], "broadcast_company_name": "ESPN", "division_conference_name": None,
+         "entity_name": "Yankees", "league_id": None, "league_name": "MLB", "league_sport": "Baseball"},
+        {"id": rights[1]["id"], "broadcast_company_name": "ESPN", "division_conference_name": None,
+         "entity_name": None, "league_id": None, "league_name": None, "league_sport": None},
+    ])
+
+    resolved = await EntityNameResolver.get_entities_with_related_names(db, "broadcast", rights)
+
+    assert db.execute.await_count == 1
+    assert resolved[0]["name"] == "ESPN - Yankees"
+    assert resolved[0]["league_name"] == "MLB"
+    assert resolved[1]["name"] == "ESPN - Canada"
+    assert resolved[1]["league_name"] == "Not Associated"
+    assert "division_conference_name" not in resolved[0]
+
+
+def test_allowed_export_fields_come_from_the_registry():
+    assert "game_name" in EntityNameResolver.get_allowed_fields("game_broadcast")
+    assert {"entity_name", "league_sport"} <= EntityNameResolver.get_allowed_fields("production")
+    assert "host_broadcaster_name" in EntityNameResolver.get_allowed_fields("stadiums")
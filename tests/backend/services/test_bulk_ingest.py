@@ -0,0 +1,169 @@
+"""
+Tests for bulk row ingestion.
+"""
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Conversation, DataColumn, StructuredData
+from src.services.data.bulk_ingest import (
+    IngestError,
+    InvalidRow,
+    RowValidator,
+    iter_csv,
+    iter_lines,
+    parse_rows,
+)
+from src.services.data.row_service import RowService
+from src.services.data.row_store import RowStore
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+def make_service(user_id, columns=()):
+    structured_data = StructuredData(
+        id=uuid.uuid4(),
+        conversation=Conversation(id=uuid.uuid4(), user_id=user_id),
+        data={"column_order": ["Team", "Points"]},
+        rows_in_table=True,
+        column_names=["Team", "Points"],
+        columns=list(columns),
+    )
+    session = AsyncMock(spec=AsyncSession)
+    service = RowService(session)
+    service.structured_data_service._get_structured_data = AsyncMock(return_value=structured_data)
+    service.history_service.record_change = AsyncMock()
+    service.row_store = AsyncMock(spec=RowStore)
+    service.row_store.ensure_row_table.return_value = True
+    service.row_store.row_shape.return_value = "object"
+    service.row_store.count.return_value = 10
+    return service, structured_data
+
+
+@pytest.mark.asyncio
+class TestParsing:
+    """Tests for stream parsing."""
+
+    async def test_lines_split_across_chunks(self):
+        lines = await collect(iter_lines(stream(b"\xef\xbb\xbfa,b\r\n1,", b"2\n3,4")))
+
+        assert lines == ["a,b", "1,2", "3,4"]
+
+    async def test_csv_with_quoted_newline(self):
+        rows = await collect(iter_csv(iter_lines(stream(b'Team,Note\nLakers,"two\nlines"\n\nCeltics,"a ""b"""\n'))))
+
+        assert rows == [{"Team": "Lakers", "Note": "two\nlines"}, {"Team": "Celtics", "Note": 'a "b"'}]
+
+    async def test_overlong_line_is_rejected(self):
+        with pytest.raises(IngestError, match="Line 2 is longer than 8 bytes"):
+            await collect(iter_lines(stream(b"short\n", b"0123", b"4567", b"89"), max_line_bytes=8))
+
+    async def test_overlong_csv_record_is_rejected(self):
+        lines = iter_lines(stream(b'Team,Note\nLakers,"a\nb\nc\nd\n'))
+
+        with pytest.raises(IngestError, match="record starting at line 2"):
+            await collect(iter_csv(lines, max_record_bytes=12))
+
+    async def test_invalid_utf8_is_an_ingest_error(self):
+        with pytest.raises(IngestError, match="Line 2 is not valid UTF-8"):
+            await collect(iter_lines(stream(b"ok\n\xff\xfe\n")))
+
+    async def test_csv_field_count_mismatch_is_a_row_error(self):
+        rows = await collect(iter_csv(iter_lines(stream(b"Team,Points\nLakers,1\nCeltics\nNets,2,extra\n"))))
+        validator = RowValidator([], ["Team", "Points"])
+
+        valid, errors, _ = validator.validate(rows, first_row=1)
+
+        assert rows[1] == InvalidRow("expected 2 fields, got 1")
+        assert valid == [{"Team": "Lakers", "Points": "1"}]
+        assert [(e.row, e.message) for e in errors] == [
+            (2, "expected 2 fields, got 1"),
+            (3, "expected 2 fields, got 3"),
+        ]
+
+    async def test_ndjson(self):
+        rows = await collect(parse_rows("ndjson", stream(b'{"a": 1}\n\n["x"]\n')))
+
+        assert rows == [{"a": 1}, ["x"]]
+
+
+def test_validator_coerces_and_reports():
+    validator = RowValidator(
+        [DataColumn(name="Points", data_type="number", is_active=True),
+         DataColumn(name="Active", data_type="boolean", is_active=True)],
+        ["Team", "Points"],
+    )
+
+    valid, errors, new_columns = validator.validate(
+        [{"Team": "A", "Points": "1,200", "Active": "yes"}, {"Team": "B", "Points": "lots"}, ["C", "3.5"]],
+        first_row=1,
+    )
+
+    assert valid == [{"Team": "A", "Points": 1200, "Active": True}, {"Team": "C", "Points": 3.5}]
+    assert [(e.row, e.column) for e in errors] == [(2, "Points")]
+    assert new_columns == ["Active"]
+
+
+@pytest.mark.asyncio
+class TestIngestRows:
+    """Tests for RowService.ingest_rows."""
+
+    async def test_appends_in_chunks_with_one_history_entry(self):
+        user_id = uuid.uuid4()
+        service, structured_data = make_service(user_id)
+        body = b"".join(b'{"Team": "T%d", "Points": %d}\n' % (i, i) for i in range(2500))
+
+        report = await service.ingest_rows(structured_data.id, user_id, stream(body))
+
+        assert report["rows_written"] == 2500
+        assert report["chunks"] == 3
+        assert report["start_row"] == 10
+        starts = [call.kwargs["start"] for call in service.row_store.insert_rows.await_args_list]
+        assert starts == [10, 1010, 2010]
+        assert structured_data.row_count == 2510
+        service.history_service.record_change.assert_awaited_once()
+        assert service.history_service.record_change.call_args.kwargs["change_type"] == "BULK_APPEND"
+        service.db.commit.assert_awaited_once()
+
+    async def test_invalid_rows_reject_the_upload(self):
+        user_id = uuid.uuid4()
+        service, structured_data = make_service(
+            user_id, [DataColumn(name="Points", data_type="number", is_active=True)]
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.ingest_rows(
+                structured_data.id, user_id, stream(b"Team,Points\nA,1\nB,many\n"), fmt="csv"
+            )
+
+        assert exc_info.value.status_code == 422
+        assert exc_info.value.detail["errors"][0]["row"] == 2
+        service.db.rollback.assert_awaited_once()
+        service.db.commit.assert_not_called()
+
+    async def test_skip_invalid_writes_the_rest(self):
+        user_id = uuid.uuid4()
+        service, structured_data = make_service(
+            user_id, [DataColumn(name="Points", data_type="number", is_active=True)]
+        )
+
+        report = await service.ingest_rows(
+            structured_data.id, user_id, stream(b"Team,Points\nA,1\nB,many\n"),
+            fmt="csv", mode="replace", skip_invalid=True,
+        )
+
+        assert report["rows_written"] == 1
+        assert report["rows_skipped"] == 1
+        service.row_store.replace_rows.assert_awaited_once_with(structured_data.id, [])
+        service.row_store.insert_rows.assert_awaited_once_with(
+            structured_data.id, [{"Team": "A", "Points": 1}], start=0
+        )
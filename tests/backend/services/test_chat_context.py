@@ -0,0 +1,157 @@
+"""
+Tests for the chat context window builder.
+"""
+import pytest
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Conversation, Message
+from src.services.chat_context import (
+    AnthropicSummarizer,
+    ConversationContextBuilder,
+    TruncatingSummarizer,
+    estimate_tokens,
+)
+from src.services.llm_router import FakeProvider, LLMRouter
+
+
+def make_messages(count, content="x" * 40):
+    """Create alternating user/assistant messages, oldest first."""
+    start = datetime(2025, 1, 1)
+    return [
+        Message(
+            id=uuid.uuid4(),
+            role="user" if i % 2 == 0 else "assistant",
+            content=f"{i}:{content}",
+            created_at=start + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def mock_session_returning(*message_lists):
+    """AsyncSession whose execute() returns the given lists (newest first) in order."""
+    session = AsyncMock(spec=AsyncSession)
+    results = []
+    for messages in message_lists:
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = messages
+        results.append(result)
+    session.execute.side_effect = results
+    return session
+
+
+@pytest.mark.asyncio
+class TestConversationContextBuilder:
+    """Tests for ConversationContextBuilder."""
+
+    async def test_build_returns_recent_messages_oldest_first(self):
+        messages = make_messages(4)
+        session = mock_session_returning(list(reversed(messages)))
+        conversation = Conversation(id=uuid.uuid4(), context_summary=None)
+        builder = ConversationContextBuilder(TruncatingSummarizer(), recent_limit=4)
+
+        context = await builder.build(session, conversation)
+
+        assert [m["content"] for m in context.messages] == [m.content for m in messages]
+        assert context.summary is None
+        session.execute.assert_called_once()
+
+    async def test_build_respects_token_budget_and_starts_with_user(self):
+        messages = make_messages(6, content="y" * 400)
+        session = mock_session_returning(list(reversed(messages)))
+        conversation = Conversation(id=uuid.uuid4(), context_summary="earlier facts")
+        # Room for roughly three 100-token messages after the summary
+        builder = ConversationContextBuilder(TruncatingSummarizer(), recent_limit=6, token_budget=320)
+
+        context = await builder.build(session, conversation)
+
+        assert context.summary == "earlier facts"
+        assert context.messages[0]["role"] == "user"
+        assert context.messages[-1]["content"] == messages[-1].content
+        assert len(context.messages) == 2
+        assert context.token_count <= 320
+
+    async def test_refresh_summary_folds_messages_outside_window(self):
+        messages = make_messages(6)
+        conversation = Conversation(id=uuid.uuid4(), context_summary=None, context_summary_until=None)
+        session = AsyncMock(spec=AsyncSession)
+        session.get.return_value = conversation
+        boundary_result = MagicMock()
+        boundary_result.scalar_one_or_none.return_value = messages[2].created_at
+        fold_result = MagicMock()
+        fold_result.scalars.return_value.all.return_value = messages[:2]
+        session.execute.side_effect = [boundary_result, fold_result]
+        builder = ConversationContextBuilder(TruncatingSummarizer(), recent_limit=4)
+
+        updated = await builder.refresh_summary(session, conversation.id)
+
+        assert updated is True
+        assert conversation.context_summary_until == messages[1].created_at
+        assert "user: 0:" in conversation.context_summary
+        assert "assistant: 1:" in conversation.context_summary
+        session.commit.assert_awaited_once()
+
+    async def test_refresh_summary_skips_other_roles_in_sql(self):
+        messages = make_messages(6)
+        conversation = Conversation(id=uuid.uuid4(), context_summary=None, context_summary_until=None)
+        session = AsyncMock(spec=AsyncSession)
+        session.get.return_value = conversation
+        boundary_result = MagicMock()
+        boundary_result.scalar_one_or_none.return_value = messages[4].created_at
+        fold_result = MagicMock()
+        fold_result.scalars.return_value.all.return_value = messages[2:4]
+        session.execute.side_effect = [boundary_result, fold_result]
+        # Batch of two: system rows taking up the batch would stall the summary for good
+        builder = ConversationContextBuilder(TruncatingSummarizer(), recent_limit=2, fold_batch_size=2)
+
+        updated = await builder.refresh_summary(session, conversation.id)
+
+        fold_sql = str(session.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+        assert "messages.role IN" in fold_sql
+        assert fold_sql.index("messages.role IN") < fold_sql.index("LIMIT")
+        assert updated is True
+        assert conversation.context_summary_until == messages[3].created_at
+
+
+@pytest.mark.asyncio
+class TestTruncatingSummarizer:
+    """Tests for the extractive fallback summarizer."""
+
+    async def test_summary_stays_within_budget(self):
+        summarizer = TruncatingSummarizer()
+
+        summary = await summarizer.summarize("old", make_messages(50, content="z" * 200), token_budget=100)
+
+        assert estimate_tokens(summary) <= 100
+        # Keeps the newest turns
+        assert "49:" in summary
+
+
+@pytest.mark.asyncio
+class TestAnthropicSummarizer:
+    """Tests for the LLM summarizer."""
+
+    async def test_summaries_go_through_the_router(self):
+        provider = FakeProvider(reply="Discussed NFL broadcast rights.", ttft=0)
+        router = LLMRouter()
+        router.register_provider("anthropic", provider)
+        summarizer = AnthropicSummarizer(router, "claude-3-haiku-20240307")
+
+        summary = await summarizer.summarize(None, make_messages(4), token_budget=100)
+
+        assert summary == "Discussed NFL broadcast rights."
+        assert provider.calls == ["claude-3-haiku-20240307"]
+        assert router.metrics()["routes"]["anthropic:claude-3-haiku-20240307"]["successes"] == 1
+
+    async def test_falls_back_to_truncation_when_the_router_fails(self):
+        router = LLMRouter()
+        router.register_provider("anthropic", FakeProvider(ttft=0, failure_rate=1.0))
+        summarizer = AnthropicSummarizer(router, "claude-3-haiku-20240307")
+
+        summary = await summarizer.summarize(None, make_messages(2), token_budget=100)
+
+        assert summary.startswith("user: 0:")
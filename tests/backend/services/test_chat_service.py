@@ -0,0 +1,120 @@
+"""
+Tests for the Claude streaming path of ChatService with stubbed router and search.
+"""
+import asyncio
+import json
+import logging
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from src.services.chat import ChatService
+from src.services.search_service import SearchService, StubSearchBackend
+from src.services.structured_extraction import DATA_DELIMITER, partial_delimiter_length
+
+
+class StubRouter:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def stream(self, route, request, **kwargs):
+        for chunk in self.chunks:
+            if chunk is None:
+                # Give background searches time to complete mid-stream
+                await asyncio.sleep(0.1)
+                yield ""
+            else:
+                yield chunk
+
+
+class StubContextBuilder:
+    async def build(self, db, conversation):
+        return SimpleNamespace(messages=[{"role": "user", "content": "hi"}], summary=None, token_count=1)
+
+    def schedule_summary_refresh(self, conversation_id):
+        pass
+
+
+def make_service(chunks, search_latency=0.05):
+    service = object.__new__(ChatService)
+    service.logger = logging.getLogger("test_chat_service")
+    service.router = StubRouter(chunks)
+    service.hedge_route = None
+    service.hedge_after = 0
+    service.fallback_routes = []
+    service.claude_models = {}
+    service.openai_models = {}
+    service.default_anthropic_model_name = "claude-test"
+    service.search_service = SearchService(backend=StubSearchBackend(latency=search_latency))
+    service.context_builder = StubContextBuilder()
+    service.saved = []
+    service.structured = []
+
+    async def add_message(db, conversation_id, role, content):
+        service.saved.append((role, content))
+
+    async def get_conversation(db, conversation_id):
+        return SimpleNamespace(id=conversation_id)
+
+    async def save_structured_data(db, conversation_id, data, structured_format=None):
+        service.structured.append(data)
+
+    service.add_message = add_message
+    service.get_conversation = get_conversation
+    service.save_structured_data = save_structured_data
+    return service
+
+
+@pytest.mark.asyncio
+class TestClaudeStreaming:
+    """Search sources must never end up inside the ---DATA--- block."""
+
+    DATA = {
+        "headers": ["Network", "Deal", "Value"],
+        "rows": [["ESPN", "11 years", "$2.6B"], ["NBC", "11 years", "$2.5B"], ["Amazon", "11 years", "$1.8B"]],
+    }
+
+    async def collect(self, service):
+        return [piece async for piece in service.get_chat_response(None, uuid4(), "nba tv deals")]
+
+    async def test_search_resolving_after_delimiter_stays_before_data(self):
+        payload = json.dumps(self.DATA)
+        service = make_service([
+            "Checking the deals. [SEARCH]nba tv deals[/SEARCH]",
+            f"Here are the deals. \n{DATA_DELIMITER}\n{payload[:-2]}",
+            None,
+            payload[-2:],
+        ])
+
+        streamed = "".join(await self.collect(service))
+
+        role, saved = service.saved[-1]
+        assert role == "assistant"
+        head, tail = saved.split(DATA_DELIMITER)
+        assert json.loads(tail) == self.DATA
+        assert "=== Sources ===" in head
+        assert "example.com" in head
+        assert streamed.split(DATA_DELIMITER)[1].startswith(tail)
+        assert service.structured == [self.DATA]
+
+    async def test_search_started_in_data_block_is_dropped(self):
+        payload = json.dumps(self.DATA)
+        service = make_service([
+            f"Here are the deals. \n{DATA_DELIMITER}\n{payload[:10]}[SEARCH]late[/SEARCH]",
+            payload[10:],
+        ])
+
+        await self.collect(service)
+
+        _, saved = service.saved[-1]
+        assert "=== Sources ===" not in saved
+        assert json.loads(saved.split(DATA_DELIMITER)[1]) == self.DATA
+
+
+class TestPartialDelimiterLength:
+    def test_detects_split_delimiter_suffix(self):
+        assert partial_delimiter_length("text ---DA") == 5
+        assert partial_delimiter_length("text -") == 1
+        assert partial_delimiter_length("text.") == 0
+        assert partial_delimiter_length("") == 0
@@ -0,0 +1,199 @@
+"""
+Tests for buffered change-history writing.
+"""
+import pytest
+import uuid
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.data import history_service
+from src.services.data.history_service import HistoryService
+from src.services.data.history_writer import (
+    HistoryBuffer,
+    HistoryFlusher,
+    SessionHistoryWriter,
+    insert_statement,
+    make_entry,
+)
+
+DATA_ID = uuid.uuid4()
+USER_ID = uuid.uuid4()
+
+
+def cell_edit(value, row_index=0, column_name="City", data_id=DATA_ID, after=0.0, base=None):
+    entry = make_entry(data_id, USER_ID, "UPDATE_CELL",
+                       column_name=column_name, row_index=row_index,
+                       old_value=f"before {value}", new_value=value)
+    if base is not None:
+        entry["created_at"] = base["created_at"] + timedelta(seconds=after)
+    return entry
+
+
+class TestHistoryBuffer:
+    """Tests for HistoryBuffer compaction."""
+
+    def test_merges_repeated_edits_of_a_cell(self):
+        buffer = HistoryBuffer(compaction_window=5)
+        first = cell_edit("L")
+        buffer.add(first)
+        buffer.add(cell_edit("Lo", base=first, after=1))
+        buffer.add(cell_edit("Los Angeles", base=first, after=2))
+
+        entries = buffer.drain()
+
+        assert len(entries) == 1
+        assert entries[0]["old_value"] == "before L"
+        assert entries[0]["new_value"] == "Los Angeles"
+        assert entries[0]["meta_data"]["merged_changes"] == 3
+        assert buffer.compacted == 2
+
+    def test_does_not_merge_across_other_changes_or_outside_window(self):
+        buffer = HistoryBuffer(compaction_window=5)
+        first = cell_edit("a")
+        buffer.add(first)
+        buffer.add(cell_edit("b", column_name="Team", base=first, after=1))
+        buffer.add(cell_edit("c", base=first, after=2))
+        buffer.add(cell_edit("d", base=first, after=10))
+
+        assert len(buffer.drain()) == 4
+
+    def test_edits_on_other_datasets_do_not_break_a_run(self):
+        buffer = HistoryBuffer(compaction_window=5)
+        first = cell_edit("a")
+        buffer.add(first)
+        buffer.add(cell_edit("x", data_id=uuid.uuid4(), base=first, after=1))
+        buffer.add(cell_edit("b", base=first, after=2))
+
+        assert [e["new_value"] for e in buffer.drain()] == ["b", "x"]
+
+    def test_compaction_can_be_disabled(self):
+        buffer = HistoryBuffer(compaction_window=0)
+        first = cell_edit("a")
+        buffer.add(first)
+        buffer.add(cell_edit("b", base=first, after=0))
+
+        assert len(buffer) == 2
+
+
+def test_insert_statement_is_one_multi_row_insert():
+    entries = [make_entry(DATA_ID, USER_ID, "ADD_ROW") for _ in range(3)]
+
+    sql = str(insert_statement(entries).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("INSERT INTO data_change_history") == 1
+    assert sql.count("), (") == 2
+
+
+@pytest.mark.asyncio
+class TestHistoryService:
+    """Tests for HistoryService buffering into the caller's transaction."""
+
+    async def test_record_change_buffers_without_committing(self):
+        session = AsyncSession()
+        session.commit = AsyncMock()
+        service = HistoryService(session)
+
+        await service.record_change(DATA_ID, USER_ID, "ADD_ROW")
+        await service.record_change(DATA_ID, USER_ID, "DELETE_ROW", row_index=1)
+
+        session.commit.assert_not_called()
+        assert len(SessionHistoryWriter.existing(session).buffer) == 2
+
+    async def test_before_commit_writes_one_insert(self):
+        writer = SessionHistoryWriter(AsyncSession(), compaction_window=0)
+        writer.add(make_entry(DATA_ID, USER_ID, "ADD_ROW"))
+        writer.add(make_entry(DATA_ID, USER_ID, "ADD_ROW"))
+        sync_session = MagicMock()
+
+        writer._before_commit(sync_session)
+
+        sync_session.flush.assert_called_once()
+        sync_session.execute.assert_called_once()
+        assert len(writer.buffer) == 0
+
+    async def test_rollback_discards_buffered_entries(self):
+        writer = SessionHistoryWriter(AsyncSession(), compaction_window=0)
+        writer.add(make_entry(DATA_ID, USER_ID, "ADD_ROW"))
+
+        writer._after_rollback(MagicMock())
+
+        assert len(writer.buffer) == 0
+
+    async def test_deferred_entries_reach_the_flusher_only_after_commit(self):
+        flusher = HistoryFlusher(session_factory=MagicMock(), interval=60)
+        writer = SessionHistoryWriter(AsyncSession(), compaction_window=0, flusher=flusher)
+        writer.defer(make_entry(DATA_ID, USER_ID, "CREATE_DATA"))
+        writer.defer(make_entry(DATA_ID, USER_ID, "ADD_ROW"))
+        writer._before_commit(MagicMock())
+
+        assert len(flusher.buffer) == 0
+
+        writer._after_commit(MagicMock())
+
+        assert len(flusher.buffer) == 2
+        assert len(writer.deferred) == 0
+
+    async def test_rollback_discards_deferred_entries(self):
+        flusher = HistoryFlusher(session_factory=MagicMock(), interval=60)
+        writer = SessionHistoryWriter(AsyncSession(), compaction_window=0, flusher=flusher)
+        writer.defer(make_entry(DATA_ID, USER_ID, "ADD_ROW"))
+
+        writer._after_rollback(MagicMock())
+        writer._after_commit(MagicMock())
+
+        assert len(flusher.buffer) == 0
+
+    async def test_in_transaction_entries_bypass_the_flusher(self, monkeypatch):
+        monkeypatch.setattr(history_service.settings, "HISTORY_BACKGROUND_FLUSH", True)
+        monkeypatch.setattr(HistoryFlusher, "running", property(lambda self: True))
+        session = AsyncSession()
+        service = HistoryService(session)
+
+        await service.record_change(DATA_ID, USER_ID, "ADD_ROW")
+        await service.record_change(DATA_ID, USER_ID, "DELETE_DATA", background=False)
+
+        writer = SessionHistoryWriter.existing(session)
+        assert len(writer.deferred) == 1
+        assert [e["change_type"] for e in writer.buffer.drain()] == ["DELETE_DATA"]
+
+
+@pytest.mark.asyncio
+async def test_flusher_writes_buffer_in_one_transaction():
+    session = AsyncMock(spec=AsyncSession)
+    session.__aenter__.return_value = session
+    flusher = HistoryFlusher(session_factory=MagicMock(return_value=session), interval=60)
+    for _ in range(5):
+        flusher.submit(make_entry(DATA_ID, USER_ID, "ADD_ROW"))
+
+    await flusher.start()
+    await flusher.stop()
+
+    session.execute.assert_awaited_once()
+    session.commit.assert_awaited_once()
+    assert flusher.written == 5
+
+
+@pytest.mark.asyncio
+async def test_flusher_failure_only_drops_the_bad_entry():
+    bad = make_entry(uuid.uuid4(), USER_ID, "CREATE_DATA")
+    entries = [make_entry(DATA_ID, USER_ID, "ADD_ROW") for _ in range(3)] + [bad]
+    inserted = []
+
+    async def execute(statement):
+        rows = statement.compile().params
+        if bad["structured_data_id"] in rows.values():
+            raise RuntimeError("violates foreign key constraint")
+        inserted.append(statement)
+
+    session = AsyncMock(spec=AsyncSession)
+    session.__aenter__.return_value = session
+    session.execute.side_effect = execute
+    flusher = HistoryFlusher(session_factory=MagicMock(return_value=session), interval=60)
+    for entry in entries:
+        flusher.submit(entry)
+
+    assert await flusher.flush() == 3
+    assert flusher.written == 3
+    assert len(flusher.buffer) == 0
@@ -0,0 +1,121 @@
+"""
+Tests for the LLM router using the in-process fake provider.
+"""
+import asyncio
+import pytest
+
+from src.services.llm_router import (
+    CircuitBreaker,
+    CircuitOpenError,
+    FakeProvider,
+    LLMRequest,
+    LLMRouter,
+    ModelRoute,
+    QueueTimeoutError,
+)
+
+PRIMARY = ModelRoute("fake", "primary")
+HEDGE = ModelRoute("fake", "hedge")
+REQUEST = LLMRequest(messages=[{"role": "user", "content": "hi"}])
+
+
+async def collect(stream):
+    return "".join([chunk async for chunk in stream])
+
+
+@pytest.mark.asyncio
+class TestLLMRouter:
+    """Tests for LLMRouter."""
+
+    async def test_streams_reply_and_records_ttft(self):
+        router = LLMRouter()
+        router.register_provider("fake", FakeProvider(reply="hello there world", ttft=0.01))
+
+        text = await collect(router.stream(PRIMARY, REQUEST))
+
+        assert text == "hello there world"
+        route = router.metrics()["routes"]["fake:primary"]
+        assert route["successes"] == 1
+        assert route["ttft"]["count"] == 1
+        assert route["in_flight"] == 0
+
+    async def test_model_limit_bounds_concurrency(self):
+        provider = FakeProvider(ttft=0.02)
+        router = LLMRouter()
+        router.register_provider("fake", provider, max_concurrency=10, model_limits={"primary": 2})
+
+        await asyncio.gather(*(collect(router.stream(PRIMARY, REQUEST)) for _ in range(6)))
+
+        assert provider.peak_active == 2
+        assert len(provider.calls) == 6
+
+    async def test_queue_deadline_rejects_waiting_requests(self):
+        router = LLMRouter()
+        router.register_provider("fake", FakeProvider(ttft=0.2), max_concurrency=1)
+
+        results = await asyncio.gather(
+            collect(router.stream(PRIMARY, REQUEST, queue_timeout=0.05)),
+            collect(router.stream(PRIMARY, REQUEST, queue_timeout=0.05)),
+            return_exceptions=True,
+        )
+
+        assert sum(isinstance(r, QueueTimeoutError) for r in results) == 1
+        assert router.metrics()["routes"]["fake:primary"]["queue_timeouts"] == 1
+
+    async def test_hedge_wins_when_primary_is_slow(self):
+        provider = FakeProvider(reply="fast", ttft=0.01, model_ttft={"primary": 1.0})
+        router = LLMRouter()
+        router.register_provider("fake", provider)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        text = await collect(router.stream(PRIMARY, REQUEST, hedge=HEDGE, hedge_after=0.05))
+
+        assert text == "fast"
+        assert loop.time() - started < 0.5
+        assert provider.calls == ["primary", "hedge"]
+        # The losing primary was cancelled and gave back its slot
+        assert provider.active == 0
+        metrics = router.metrics()["routes"]["fake:primary"]
+        assert metrics["hedges_started"] == 1
+        assert metrics["hedges_won"] == 1
+
+    async def test_falls_back_when_primary_fails_before_output(self):
+        router = LLMRouter()
+        router.register_provider("failing", FakeProvider(failure_rate=1.0, ttft=0))
+        router.register_provider("fake", FakeProvider(reply="backup", ttft=0))
+
+        text = await collect(router.stream(ModelRoute("failing", "m"), REQUEST, fallbacks=[PRIMARY]))
+
+        assert text == "backup"
+
+    async def test_circuit_opens_after_repeated_failures(self):
+        provider = FakeProvider(failure_rate=1.0, ttft=0)
+        router = LLMRouter(failure_threshold=2, reset_timeout=60)
+        router.register_provider("fake", provider)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await router.complete(PRIMARY, REQUEST)
+        with pytest.raises(CircuitOpenError):
+            await router.complete(PRIMARY, REQUEST)
+
+        assert len(provider.calls) == 2
+        assert router.metrics()["routes"]["fake:primary"]["circuit"] == "open"
+
+
+def test_circuit_breaker_half_open_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_model_route_parse():
+    assert ModelRoute.parse("anthropic:claude-3-haiku-20240307") == ModelRoute("anthropic", "claude-3-haiku-20240307")
+    with pytest.raises(ValueError):
+        ModelRoute.parse("no-provider")
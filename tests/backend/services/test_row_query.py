@@ -0,0 +1,253 @@
+"""
+Tests for server-side row queries.
+"""
+import pytest
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Conversation, DataColumn, StructuredData
+from src.schemas.data_management import RowQuery
+from src.services.data import row_indexes
+from src.services.data.row_indexes import RowIndexes
+from src.services.data.row_query import RowQueryBuilder, RowQueryError, index_prefix
+from src.services.data.row_service import RowService
+from src.services.data.row_store import RowStore
+
+DATA_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+def make_builder(**kwargs):
+    return RowQueryBuilder(
+        DATA_ID,
+        column_names=["Team", "Points", "Active"],
+        column_types={"Points": "number", "Active": "boolean"},
+        **kwargs,
+    )
+
+
+def sql_of(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestRowQueryBuilder:
+    """Tests for RowQueryBuilder."""
+
+    def test_typed_filters_and_sort(self):
+        query = RowQuery(
+            filters=[
+                {"column": "Points", "op": "gte", "value": "1,000"},
+                {"column": "Team", "op": "contains", "value": "50%"},
+            ],
+            sort=[{"column": "Points", "direction": "desc"}],
+            limit=25,
+        )
+
+        statement = make_builder().rows_statement(query)
+        sql = sql_of(statement)
+
+        assert "row_value_numeric((data ->> 'Points')) >= " in sql
+        assert "(data ->> 'Team') ILIKE " in sql
+        assert "ORDER BY row_value_numeric((data ->> 'Points')) DESC, ordinal DESC" in sql
+        assert "structured_data_id = '00000000-0000-0000-0000-000000000001'" in sql
+        values = statement.compile().params
+        assert values["p0"] == Decimal("1000")
+        assert values["p1"] == "%50\\%%"
+
+    def test_array_rows_use_positions(self):
+        query = RowQuery(sort=[{"column": "Points"}])
+
+        sql = sql_of(make_builder(array_rows=True).rows_statement(query))
+
+        assert "row_value_numeric((data ->> 1)) ASC" in sql
+
+    def test_group_by_with_aggregates(self):
+        query = RowQuery(
+            group_by=["Team"],
+            aggregates=[{"func": "sum", "column": "Points"}, {"func": "count"}],
+            sort=[{"column": "sum(Points)", "direction": "desc"}],
+        )
+
+        statement, keys = make_builder().groups_statement(query)
+        sql = sql_of(statement)
+
+        assert keys == ["Team", "sum(Points)", "count", "row_count"]
+        assert "GROUP BY 1" in sql
+        assert "ORDER BY 2 DESC, 1" in sql
+
+    def test_boolean_min_max_use_bool_aggregates(self):
+        query = RowQuery(aggregates=[{"func": "min", "column": "Active"}, {"func": "max", "column": "Active"}])
+
+        statement, keys = make_builder().groups_statement(query)
+        sql = sql_of(statement)
+
+        assert keys == ["min(Active)", "max(Active)", "row_count"]
+        assert "bool_and(row_value_boolean((data ->> 'Active')))" in sql
+        assert "bool_or(row_value_boolean((data ->> 'Active')))" in sql
+        assert "min(" not in sql and "max(" not in sql
+
+    def test_rejects_unknown_columns_and_bad_values(self):
+        builder = make_builder()
+
+        with pytest.raises(RowQueryError):
+            builder.rows_statement(RowQuery(sort=[{"column": "Nope"}]))
+        with pytest.raises(RowQueryError):
+            builder.rows_statement(RowQuery(filters=[{"column": "Points", "op": "eq", "value": "many"}]))
+
+    def test_literals_are_quoted(self):
+        builder = RowQueryBuilder(DATA_ID, column_names=[])
+
+        sql = sql_of(builder.rows_statement(RowQuery(sort=[{"column": "it's a:b"}])))
+
+        assert "(data ->> 'it''s a:b')" in sql
+
+    def test_index_matches_query_expression(self):
+        index_name, ddl = make_builder().index_statement("Points")
+
+        assert index_name.startswith(index_prefix(DATA_ID, "Points"))
+        assert len(index_name) <= 63
+        assert "CONCURRENTLY" in ddl
+        assert "((row_value_numeric((data ->> 'Points'))), ordinal)" in ddl
+        assert "WHERE structured_data_id = '00000000-0000-0000-0000-000000000001'" in ddl
+
+    def test_retyped_column_gets_a_new_index_name(self):
+        numeric_name, _ = make_builder().index_statement("Points")
+        text_name, _ = RowQueryBuilder(DATA_ID, column_names=["Points"]).index_statement("Points")
+
+        assert numeric_name != text_name
+        assert text_name.startswith(index_prefix(DATA_ID, "Points"))
+
+
+@pytest.mark.asyncio
+class TestQueryRows:
+    """Tests for RowService.query_rows."""
+
+    def make_service(self, user_id):
+        structured_data = StructuredData(
+            id=DATA_ID,
+            conversation=Conversation(id=uuid.uuid4(), user_id=user_id),
+            data={"column_order": ["Team", "Points"]},
+            rows_in_table=True,
+            column_names=["Team", "Points"],
+            columns=[DataColumn(name="Points", data_type="number", is_active=True)],
+        )
+        session = AsyncMock(spec=AsyncSession)
+        service = RowService(session)
+        service.structured_data_service._get_structured_data = AsyncMock(return_value=structured_data)
+        service.row_store = AsyncMock(spec=RowStore)
+        service.row_store.row_shape.return_value = "object"
+        return service, session
+
+    async def test_returns_page_and_total(self):
+        user_id = uuid.uuid4()
+        service, session = self.make_service(user_id)
+        rows = MagicMock()
+        rows.all.return_value = [MagicMock(ordinal=4, data={"Team": "A", "Points": 9}, version=2)]
+        count = MagicMock()
+        count.scalar_one.return_value = 1
+        session.execute.side_effect = [rows, count]
+
+        result = await service.query_rows(DATA_ID, user_id, RowQuery(sort=[{"column": "Points"}]))
+
+        assert result["total"] == 1
+        assert result["row_indexes"] == [4]
+        assert result["versions"] == [2]
+        assert "row_value_numeric" in sql_of(session.execute.call_args_list[0].args[0])
+
+    async def test_bad_query_is_a_400(self):
+        user_id = uuid.uuid4()
+        service, _ = self.make_service(user_id)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.query_rows(DATA_ID, user_id, RowQuery(sort=[{"column": "Nope"}]))
+
+        assert exc_info.value.status_code == 400
+
+    async def test_database_error_is_a_400(self):
+        user_id = uuid.uuid4()
+        service, session = self.make_service(user_id)
+        session.execute.side_effect = DBAPIError("SELECT", {}, Exception("function min(boolean) does not exist"))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.query_rows(DATA_ID, user_id, RowQuery(aggregates=[{"func": "min", "column": "Points"}]))
+
+        assert exc_info.value.status_code == 400
+        assert "min(boolean)" in exc_info.value.detail
+        session.rollback.assert_awaited_once()
+
+
+class FakeIndexConnection:
+    """Autocommit connection over an in-memory name -> indisvalid catalog."""
+
+    def __init__(self, indexes):
+        self.indexes = dict(indexes)
+        self.statements = []
+
+    async def execution_options(self, **options):
+        return self
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        result = MagicMock()
+        if sql.startswith("SELECT"):
+            result.all.return_value = [
+                (name, valid) for name, valid in self.indexes.items() if name.startswith(params["prefix"])
+            ]
+        elif sql.startswith("DROP"):
+            self.indexes.pop(sql.split()[-1], None)
+        elif sql.startswith("CREATE"):
+            self.indexes.setdefault(sql.split()[6], True)
+        return result
+
+
+def make_indexes(existing=()):
+    conn = FakeIndexConnection(existing)
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__.return_value = conn
+    return RowIndexes(engine), conn
+
+
+@pytest.mark.asyncio
+class TestRowIndexes:
+    """Tests for building and dropping per-dataset column indexes."""
+
+    async def test_build_replaces_the_index_of_the_old_data_type(self):
+        old_name, _ = RowQueryBuilder(DATA_ID, column_names=["Points"]).index_statement("Points")
+        indexes, conn = make_indexes({old_name: True})
+
+        result = await indexes.build(make_builder(), "Points")
+
+        assert result["valid"] is True
+        assert list(conn.indexes) == [result["index"]]
+
+    async def test_invalid_index_is_rebuilt(self):
+        name, _ = make_builder().index_statement("Points")
+        indexes, conn = make_indexes({name: False})
+
+        result = await indexes.build(make_builder(), "Points")
+
+        assert f"DROP INDEX CONCURRENTLY IF EXISTS {name}" in conn.statements
+        assert result["valid"] is True
+
+    async def test_indexes_per_dataset_are_capped(self, monkeypatch):
+        monkeypatch.setattr(row_indexes.settings, "ROW_QUERY_MAX_INDEXES_PER_DATASET", 1)
+        team_name, _ = make_builder().index_statement("Team")
+        indexes, conn = make_indexes({team_name: True})
+
+        with pytest.raises(RowQueryError):
+            await indexes.build(make_builder(), "Points")
+        # Rebuilding an existing index is still allowed
+        assert (await indexes.build(make_builder(), "Team"))["index"] == team_name
+
+    async def test_drop_removes_only_the_dataset_indexes(self):
+        ours, _ = make_builder().index_statement("Points")
+        theirs, _ = RowQueryBuilder(uuid.uuid4(), column_names=["Points"]).index_statement("Points")
+        indexes, conn = make_indexes({ours: True, theirs: True})
+
+        assert await indexes.drop(DATA_ID) == 1
+        assert list(conn.indexes) == [theirs]
@@ -0,0 +1,159 @@
+"""
+Tests for RowService on top of row-level storage.
+"""
+import pytest
+import uuid
+from unittest.mock import AsyncMock
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import Conversation, StructuredData
+from src.services.data.row_service import RowService
+from src.services.data.row_store import PatchedRow, RowStore, join_rows, split_rows
+
+
+def make_service(structured_data):
+    session = AsyncMock(spec=AsyncSession)
+    service = RowService(session)
+    service.structured_data_service._get_structured_data = AsyncMock(return_value=structured_data)
+    service.history_service.record_change = AsyncMock()
+    service.row_store = AsyncMock(spec=RowStore)
+    service.row_store.ensure_row_table.return_value = True
+    return service
+
+
+def make_data(user_id, rows_in_table=True, data=None):
+    return StructuredData(
+        id=uuid.uuid4(),
+        conversation=Conversation(id=uuid.uuid4(), user_id=user_id),
+        data=data if data is not None else {"column_order": ["Team", "City"]},
+        rows_in_table=rows_in_table,
+    )
+
+
+@pytest.mark.asyncio
+class TestRowService:
+    """Tests for RowService."""
+
+    async def test_get_rows_reads_only_the_requested_page(self):
+        user_id = uuid.uuid4()
+        structured_data = make_data(user_id)
+        service = make_service(structured_data)
+        service.row_store.count.return_value = 50000
+        service.row_store.get_range.return_value = ([{"Team": "Lakers"}], [3])
+
+        result = await service.get_rows(structured_data.id, user_id, skip=100, limit=1)
+
+        assert result == {
+            "total": 50000,
+            "rows": [{"Team": "Lakers"}],
+            "versions": [3],
+            "column_order": ["Team", "City"],
+        }
+        service.row_store.get_range.assert_awaited_once_with(structured_data.id, 100, 1)
+        service.row_store.get_all.assert_not_called()
+
+    async def test_get_rows_still_serves_inline_documents(self):
+        user_id = uuid.uuid4()
+        structured_data = make_data(
+            user_id, rows_in_table=False, data={"rows": [{"a": 1}, {"a": 2}, {"a": 3}], "column_order": ["a"]}
+        )
+        service = make_service(structured_data)
+
+        result = await service.get_rows(structured_data.id, user_id, skip=1, limit=1)
+
+        assert result == {"total": 3, "rows": [{"a": 2}], "versions": [0], "column_order": ["a"]}
+
+    async def test_update_cell_patches_in_the_database(self):
+        user_id = uuid.uuid4()
+        structured_data = make_data(user_id)
+        service = make_service(structured_data)
+        service.row_store.patch_rows.return_value = [
+            PatchedRow(
+                row_index=7,
+                old_data={"Team": "Lakers", "City": "LA"},
+                data={"Team": "Lakers", "City": "Los Angeles"},
+                version=2,
+            )
+        ]
+
+        row = await service.update_cell(structured_data.id, user_id, "City", 7, "Los Angeles", expected_version=1)
+
+        assert row == {"Team": "Lakers", "City": "Los Angeles"}
+        service.row_store.patch_rows.assert_awaited_once_with(
+            structured_data.id,
+            [{"row_index": 7, "column_name": "City", "value": "Los Angeles", "expected_version": 1}],
+        )
+        service.row_store.get_row.assert_not_called()
+        service.history_service.record_change.assert_awaited_once()
+        assert service.history_service.record_change.call_args.kwargs["old_value"] == "LA"
+
+    async def test_update_cell_conflict_on_stale_version(self):
+        user_id = uuid.uuid4()
+        structured_data = make_data(user_id)
+        service = make_service(structured_data)
+        service.row_store.patch_rows.return_value = []
+        service.row_store.get_versions.return_value = {7: 5}
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.update_cell(structured_data.id, user_id, "City", 7, "Los Angeles", expected_version=4)
+
+        assert exc_info.value.status_code == 409
+        service.db.rollback.assert_awaited_once()
+        service.history_service.record_change.assert_not_called()
+
+    async def test_update_cells_records_one_history_entry(self):
+        user_id = uuid.uuid4()
+        structured_data = make_data(user_id)
+        service = make_service(structured_data)
+        service.row_store.patch_rows.return_value = [
+            PatchedRow(row_index=0, old_data={"City": "LA"}, data={"City": "Los Angeles"}, version=1),
+            PatchedRow(row_index=1, old_data={"City": "NY"}, data={"City": "New York"}, version=1),
+        ]
+        edits = [
+            {"row_index": 0, "column_name": "City", "value": "Los Angeles", "expected_version": None},
+            {"row_index": 1, "column_name": "City", "value": "New York", "expected_version": None},
+        ]
+
+        result = await service.update_cells(structured_data.id, user_id, edits)
+
+        assert result["updated"] == 2
+        assert [row["row_index"] for row in result["rows"]] == [0, 1]
+        service.row_store.patch_rows.assert_awaited_once_with(structured_data.id, edits)
+        service.history_service.record_change.assert_awaited_once()
+        history = service.history_service.record_change.call_args.kwargs
+        assert history["change_type"] == "UPDATE_CELLS"
+        assert [edit["old_value"] for edit in history["meta_data"]["edits"]] == ["LA", "NY"]
+
+    async def test_delete_row_out_of_range(self):
+        user_id = uuid.uuid4()
+        structured_data = make_data(user_id)
+        service = make_service(structured_data)
+        service.row_store.delete_row.return_value = None
+        service.row_store.get_versions.return_value = {}
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.delete_row(structured_data.id, user_id, 99)
+
+        assert exc_info.value.status_code == 404
+        service.history_service.record_change.assert_not_called()
+
+    async def test_rejects_other_users(self):
+        structured_data = make_data(uuid.uuid4())
+        service = make_service(structured_data)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.update_row(structured_data.id, uuid.uuid4(), 0, {"Team": "Celtics"})
+
+        assert exc_info.value.status_code == 403
+
+
+def test_split_and_join_rows_round_trip():
+    document = {"rows": [{"a": 1}], "column_order": ["a"], "headers": ["a"]}
+
+    rest, rows = split_rows(document)
+
+    assert rest == {"column_order": ["a"], "headers": ["a"]}
+    assert rows == [{"a": 1}]
+    assert join_rows(rest, rows) == document
+    assert split_rows({"summary": "no rows"}) == ({"summary": "no rows"}, None)
@@ -0,0 +1,115 @@
+"""
+Tests for the schema context index and the prompt-cached NLQ prompt layout.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.services.schema_context import SchemaContextIndex, tokenize
+from src.services.ai_query_processor import AnthropicAIProcessor, SQL_GENERATION_RULES
+from src.services.anthropic_service import AnthropicService
+
+
+SCHEMA_MD = """You are an expert SQL writer.
+
+**General Guidelines for SQL Generation:**
+*   Always filter soft-deleted rows.
+
+---
+DATABASE SCHEMA:
+---
+
+**Table: `leagues`**
+*   Description: Stores sports leagues.
+*   Columns:
+    *   `id` (UUID, PK): Unique identifier.
+    *   `name` (VARCHAR): Name of the league.
+    *   `sport` (VARCHAR): The sport the league is for.
+
+**Table: `brands`**
+*   Description: Companies such as broadcasters and sponsors.
+*   Columns:
+    *   `id` (UUID, PK): Unique identifier.
+    *   `industry` (VARCHAR, NULLABLE): Industry of the brand.
+
+**Table: `broadcast_rights`**
+*   Description: Rights held by a broadcast company for an entity.
+*   Columns:
+    *   `id` (UUID, PK): Unique identifier.
+    *   `broadcast_company_id` (UUID, FK -> `brands.id`): The company.
+    *   `territory` (VARCHAR, NULLABLE): Geographic territory.
+
+---
+*Other tables also exist.*
+"""
+
+
+class TestSchemaContextIndex:
+    """Tests for SchemaContextIndex."""
+
+    def test_parses_sections_preamble_and_footer(self):
+        index = SchemaContextIndex(SCHEMA_MD)
+
+        assert list(index.sections) == ["leagues", "brands", "broadcast_rights"]
+        assert "General Guidelines" in index.preamble
+        assert "Other tables also exist" in index.footer
+        assert index.sections["broadcast_rights"].references == {"brands"}
+
+    def test_tokenize_stems_plurals_and_drops_stopwords(self):
+        assert tokenize("Show the Teams and their broadcast_rights") == ["team", "broadcast", "right"]
+
+    def test_select_tables_includes_referenced_tables(self):
+        index = SchemaContextIndex(SCHEMA_MD)
+
+        tables = index.select_tables("Which territory do the broadcast rights cover?")
+
+        assert tables[0] == "broadcast_rights"
+        assert "brands" in tables
+        assert "leagues" not in tables
+
+    def test_render_for_question_keeps_only_selected_sections(self):
+        index = SchemaContextIndex(SCHEMA_MD)
+
+        text, tables = index.render_for_question("What sport is each league?")
+
+        assert tables == ["leagues"]
+        assert "**Table: `leagues`**" in text
+        assert "**Table: `brands`**" not in text
+        assert text.startswith("You are an expert SQL writer.")
+        assert "Other tables also exist" in text
+
+    def test_render_for_question_falls_back_to_full_schema(self):
+        index = SchemaContextIndex(SCHEMA_MD)
+
+        text, tables = index.render_for_question("what is the weather tomorrow")
+
+        assert text == SCHEMA_MD
+        assert len(tables) == 3
+
+
+@pytest.mark.asyncio
+class TestAnthropicAIProcessorPromptCaching:
+    """Tests for the cached system prompt used by AnthropicAIProcessor."""
+
+    async def test_generate_sql_sends_cacheable_system_blocks_and_records_usage(self):
+        usage = {
+            "input_tokens": 40,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 3000,
+            "output_tokens": 25,
+        }
+        service = MagicMock(spec=AnthropicService)
+        service.cached_text_block.side_effect = AnthropicService.cached_text_block
+        service.generate_code_with_usage = AsyncMock(return_value=("```sql\nSELECT 1\n```", usage))
+        processor = AnthropicAIProcessor(service)
+
+        sql = await processor.generate_sql_from_text("count leagues", "SCHEMA TEXT", "")
+
+        assert sql == "SELECT 1"
+        prompt = service.generate_code_with_usage.call_args.args[0]
+        system_blocks = service.generate_code_with_usage.call_args.kwargs["system_prompt"]
+        assert "SCHEMA TEXT" not in prompt
+        assert "count leagues" in prompt
+        assert system_blocks[0]["text"] == SQL_GENERATION_RULES
+        assert "SCHEMA TEXT" in system_blocks[1]["text"]
+        assert all(block["cache_control"] == {"type": "ephemeral"} for block in system_blocks)
+        assert processor.get_token_usage() == [{"stage": "generate_sql", **usage}]
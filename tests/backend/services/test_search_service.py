@@ -0,0 +1,75 @@
+"""
+Tests for the cached, concurrent chat search service using the stub backend.
+"""
+import asyncio
+import pytest
+
+from src.services.search_service import (
+    SearchService,
+    StubSearchBackend,
+    normalize_query,
+)
+
+
+@pytest.mark.asyncio
+class TestSearchService:
+    """Tests for SearchService and SearchBatch."""
+
+    async def test_normalized_queries_hit_the_cache(self):
+        backend = StubSearchBackend({"nfl tv deals": ["https://a.example"]})
+        service = SearchService(backend=backend)
+
+        first = await service.search("NFL  TV deals")
+        second = await service.search("nfl tv DEALS ")
+
+        assert first == second == ["https://a.example"]
+        assert backend.calls == ["NFL  TV deals"]
+
+    async def test_concurrent_identical_queries_share_one_call(self):
+        backend = StubSearchBackend(latency=0.05)
+        service = SearchService(backend=backend)
+
+        results = await asyncio.gather(*(service.search("espn") for _ in range(5)))
+
+        assert len(backend.calls) == 1
+        assert all(r == results[0] for r in results)
+
+    async def test_batch_runs_searches_concurrently(self):
+        service = SearchService(backend=StubSearchBackend(latency=0.1))
+        batch = service.batch(deadline_seconds=5)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for query in ("one", "two", "three"):
+            batch.start(query)
+        results = await batch.finish()
+
+        assert [q for q, _ in results] == ["one", "two", "three"]
+        assert all("example.com" in text for _, text in results)
+        assert loop.time() - started < 0.25
+
+    async def test_batch_times_out_searches_past_the_deadline(self):
+        service = SearchService(backend=StubSearchBackend(latency=1.0))
+        batch = service.batch(deadline_seconds=0.05)
+
+        batch.start("slow query")
+        results = await batch.finish()
+
+        assert results == [("slow query", "Search timed out after 0.05 seconds")]
+        assert batch.pending == 0
+
+    async def test_pop_completed_returns_only_finished_searches(self):
+        service = SearchService(backend=StubSearchBackend(latency=0.05))
+        batch = service.batch()
+
+        batch.start("pending")
+        assert batch.pop_completed() == []
+        await asyncio.sleep(0.1)
+
+        completed = batch.pop_completed()
+        assert [q for q, _ in completed] == ["pending"]
+        await service.shutdown()
+
+
+def test_normalize_query():
+    assert normalize_query("  Premier   League RIGHTS ") == "premier league rights"
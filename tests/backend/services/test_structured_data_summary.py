@@ -0,0 +1,88 @@
+"""
+Tests for the structured data summary listing.
+"""
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.data.row_store import column_names_of
+from src.services.data.structured_data_service import StructuredDataService
+
+
+def make_record(created_at, column_names=("Team", "City")):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        conversation_id=uuid.uuid4(),
+        title="NBA teams",
+        data_type="table",
+        row_count=30,
+        column_names=list(column_names),
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+
+def make_service(records):
+    session = AsyncMock(spec=AsyncSession)
+    result = MagicMock()
+    result.all.return_value = records
+    session.execute.return_value = result
+    return StructuredDataService(session), session
+
+
+def compiled_sql(session):
+    statement = session.execute.call_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+class TestDataSummaries:
+    """Tests for StructuredDataService.get_data_summaries."""
+
+    async def test_selects_metadata_only(self):
+        now = datetime.now(timezone.utc)
+        service, session = make_service([make_record(now)])
+
+        page = await service.get_data_summaries(uuid.uuid4(), limit=10)
+
+        assert page.next_cursor is None
+        assert page.items[0].row_count == 30
+        assert page.items[0].column_count == 2
+        assert page.items[0].title == "NBA teams"
+        statement = session.execute.call_args.args[0]
+        selected = {column.name for column in statement.selected_columns}
+        assert "data" not in selected
+        assert {"row_count", "column_names", "title"} <= selected
+
+    async def test_next_cursor_continues_after_last_item(self):
+        now = datetime.now(timezone.utc)
+        records = [make_record(now - timedelta(minutes=i)) for i in range(3)]
+        service, session = make_service(records)
+
+        page = await service.get_data_summaries(uuid.uuid4(), limit=2)
+
+        assert len(page.items) == 2
+        assert service._decode_cursor(page.next_cursor) == (records[1].created_at, records[1].id)
+
+        await service.get_data_summaries(uuid.uuid4(), limit=2, cursor=page.next_cursor)
+        assert "structured_data.created_at <" in compiled_sql(session)
+
+    async def test_rejects_malformed_cursor(self):
+        service, _ = make_service([])
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.get_data_summaries(uuid.uuid4(), cursor="not-a-cursor")
+
+        assert exc_info.value.status_code == 400
+
+
+def test_column_names_of_prefers_column_order():
+    assert column_names_of({"column_order": ["b", "a"], "headers": ["x"]}) == ["b", "a"]
+    assert column_names_of({"headers": ["x", "y"]}) == ["x", "y"]
+    assert column_names_of({"rows": []}, [{"a": 1, "b": 2}]) == ["a", "b"]
+    assert column_names_of({"summary": "no rows"}) == []
@@ -0,0 +1,77 @@
+"""
+Tests for incremental extraction of ---DATA--- blocks from streamed replies.
+"""
+import json
+import pytest
+
+from src.services.structured_extraction import (
+    IncrementalJSONParser,
+    StructuredDataExtractor,
+)
+
+
+def feed_in_chunks(extractor, text, size):
+    for i in range(0, len(text), size):
+        extractor.feed(text[i:i + size])
+
+
+class TestStructuredDataExtractor:
+    """Tests for StructuredDataExtractor."""
+
+    DATA = {"headers": ["Team", "Note"], "rows": [["Lakers", "uses } and ] in \"text\""], ["Celtics", "ok"]]}
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+    def test_parses_data_split_across_chunks(self, chunk_size):
+        reply = f"Here are the teams.\n---DATA---\n{json.dumps(self.DATA)}\nLet me know if you need more."
+        extractor = StructuredDataExtractor()
+
+        feed_in_chunks(extractor, reply, chunk_size)
+        extractor.finish()
+
+        assert extractor.found_delimiter
+        assert extractor.complete
+        assert extractor.data == self.DATA
+
+    def test_completes_before_stream_ends(self):
+        extractor = StructuredDataExtractor()
+
+        extractor.feed("Summary\n---DA")
+        extractor.feed("TA---\n```json\n[1, 2")
+        assert extractor.found_delimiter and not extractor.complete
+        extractor.feed(", 3]\n```\nTrailing prose")
+
+        assert extractor.complete
+        assert extractor.data == [1, 2, 3]
+
+    def test_no_delimiter_means_no_data(self):
+        extractor = StructuredDataExtractor()
+
+        feed_in_chunks(extractor, "Just a plain answer with {braces}.", 5)
+        extractor.finish()
+
+        assert not extractor.found_delimiter
+        assert extractor.data is None
+
+    def test_unclosed_json_raises_on_finish(self):
+        extractor = StructuredDataExtractor()
+        extractor.feed('---DATA---\n{"rows": [1, 2')
+
+        with pytest.raises(ValueError, match="not closed"):
+            extractor.finish()
+
+    def test_invalid_json_raises_on_finish(self):
+        extractor = StructuredDataExtractor()
+        extractor.feed("---DATA---\n{'single': 'quotes'}")
+
+        with pytest.raises(ValueError, match="Invalid structured data JSON"):
+            extractor.finish()
+
+
+def test_parser_keeps_text_after_value_as_remainder():
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('  {"a": [1, {"b": "}"}]}') is True
+    parser.feed(" tail")
+
+    assert parser.value == {"a": [1, {"b": "}"}]}
+    assert parser.remainder == " tail"
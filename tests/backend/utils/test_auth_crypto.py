@@ -0,0 +1,84 @@
+"""
+Tests for the auth crypto pool and the verified-token cache.
+"""
+import asyncio
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.utils import security
+from src.utils.security import AuthCryptoExecutor, VerifiedTokenCache, create_access_token
+
+
+@pytest.mark.asyncio
+class TestAuthCryptoExecutor:
+    """Tests for AuthCryptoExecutor."""
+
+    async def test_runs_off_the_event_loop(self):
+        executor = AuthCryptoExecutor(workers=2, max_pending=4)
+        loop_thread = threading.get_ident()
+
+        thread = await executor.run(threading.get_ident)
+
+        assert thread != loop_thread
+        assert executor.metrics()["completed"] == 1
+        executor.shutdown()
+
+    async def test_rejects_when_saturated(self):
+        executor = AuthCryptoExecutor(workers=1, max_pending=2)
+        release = threading.Event()
+        jobs = [asyncio.create_task(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+
+        assert executor.queue_depth == 1
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.run(time.time)
+        release.set()
+        await asyncio.gather(*jobs)
+
+        assert exc_info.value.status_code == 503
+        assert executor.metrics()["rejected"] == 1
+        assert executor.pending == 0
+        executor.shutdown()
+
+
+class TestVerifiedTokenCache:
+    """Tests for VerifiedTokenCache."""
+
+    def test_entries_expire_with_the_token(self):
+        cache = VerifiedTokenCache(max_size=10)
+        user_id = uuid.uuid4()
+        cache.put("token", user_id, expires_at=100.0)
+
+        assert cache.get("token", now=99.0) == user_id
+        assert cache.get("token", now=100.0) is None
+        assert cache.metrics()["size"] == 0
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = VerifiedTokenCache(max_size=2)
+        for name in ("a", "b"):
+            cache.put(name, uuid.uuid4(), expires_at=time.time() + 60)
+        cache.get("a")
+        cache.put("c", uuid.uuid4(), expires_at=time.time() + 60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+
+def test_decode_skips_verification_for_cached_tokens(monkeypatch):
+    monkeypatch.setattr(security, "token_cache", VerifiedTokenCache(max_size=10))
+    user_id = uuid.uuid4()
+    token = create_access_token({"sub": str(user_id)}, expires_delta=timedelta(minutes=5))
+    calls = []
+    real_decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: calls.append(1) or real_decode(*a, **kw))
+
+    assert security.decode_token_and_get_user_id(token) == user_id
+    assert security.decode_token_and_get_user_id(token) == user_id
+    assert security.decode_token_and_get_user_id(token + "x") is None
+
+    assert len(calls) == 2
@@ -0,0 +1,77 @@
+"""
+Tests for the queue-based logging setup.
+"""
+import logging
+import queue
+
+import pytest
+
+from src.config.logging_config import (
+    LogDispatcher,
+    LogSampler,
+    NonBlockingQueueHandler,
+    set_log_level,
+)
+
+
+def make_record(msg="hot path %s", args=("x",), level=logging.DEBUG, created=100.0, lineno=10):
+    record = logging.LogRecord("sheetgpt.test", level, "module.py", lineno, msg, args, None)
+    record.created = created
+    return record
+
+
+def test_sampler_limits_each_call_site():
+    sampler = LogSampler(per_second=3, sample_rate=0.0)
+
+    kept = [sampler.filter(make_record()) for _ in range(10)]
+    other_site = sampler.filter(make_record(lineno=11))
+    warning = sampler.filter(make_record(level=logging.WARNING))
+    next_second = make_record(created=101.0)
+
+    assert kept == [True] * 3 + [False] * 7
+    assert other_site and warning
+    assert sampler.filter(next_second)
+    assert next_second.suppressed == 7
+
+
+def test_queue_handler_renders_message_and_drops_when_full():
+    log_queue = queue.Queue(1)
+    handler = NonBlockingQueueHandler(log_queue, "sheetgpt.test")
+    args = ["before"]
+    record = make_record("value %s", (args,))
+    record.suppressed = 2
+
+    handler.handle(record)
+    args.append("after")
+    handler.handle(make_record())
+
+    queued = log_queue.get_nowait()
+    assert queued.getMessage() == "value ['before'] (2 similar messages suppressed)"
+    assert queued._log_target == "sheetgpt.test"
+    assert handler.dropped == 1
+
+
+def test_dispatcher_routes_by_target_and_level():
+    written = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            written.append((self.name, record.getMessage()))
+
+    debug, error = ListHandler(logging.DEBUG), ListHandler(logging.ERROR)
+    debug.name, error.name = "debug", "error"
+    dispatcher = LogDispatcher()
+    dispatcher.register("sheetgpt.test", [debug, error])
+    record = make_record()
+    record._log_target = "sheetgpt.test"
+
+    dispatcher.handle(record)
+
+    assert written == [("debug", "hot path x")]
+
+
+def test_set_log_level():
+    assert set_log_level("sheetgpt.test.runtime", "warning") == "WARNING"
+    assert logging.getLogger("sheetgpt.test.runtime").level == logging.WARNING
+    with pytest.raises(ValueError):
+        set_log_level("sheetgpt.test.runtime", "LOUD")
@@ -0,0 +1,129 @@
+"""
+Tests for the authenticated-principal cache behind get_current_user.
+"""
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.models import User
+from src.utils import auth, security
+from src.utils.auth import PrincipalCache, get_current_user
+from src.utils.security import VerifiedTokenCache, create_access_token
+
+
+def make_user(user_id, is_admin=False):
+    return User(
+        id=user_id,
+        email="fan@example.com",
+        hashed_password="x",
+        is_active=True,
+        is_superuser=False,
+        is_admin=is_admin,
+        created_at=datetime(2026, 1, 1),
+        updated_at=None,
+    )
+
+
+def user_result(user):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = user
+    return result
+
+
+class TestPrincipalCache:
+    """Tests for PrincipalCache."""
+
+    def test_entries_expire_after_ttl(self):
+        cache = PrincipalCache(max_size=10, ttl=5)
+        key = (uuid.uuid4(), 1)
+        cache.put(key, {"id": "a"}, now=100.0)
+
+        assert cache.get(key, now=104.0) == {"id": "a"}
+        assert cache.get(key, now=105.0) is None
+
+    def test_invalidate_drops_every_token_of_a_user(self):
+        cache = PrincipalCache(max_size=10, ttl=60)
+        user_id, other_id = uuid.uuid4(), uuid.uuid4()
+        for key in [(user_id, 1), (user_id, 2), (other_id, 1)]:
+            cache.put(key, {"id": str(key[0])})
+
+        cache.invalidate(user_id)
+
+        assert cache.get((user_id, 1)) is None
+        assert cache.get((user_id, 2)) is None
+        assert cache.get((other_id, 1)) is not None
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = PrincipalCache(max_size=2, ttl=60)
+        a, b, c = ((uuid.uuid4(), None) for _ in range(3))
+        cache.put(a, {})
+        cache.put(b, {})
+        cache.get(a)
+        cache.put(c, {})
+
+        assert cache.get(b) is None
+        assert cache.get(a) is not None
+
+
+@pytest.mark.asyncio
+class TestGetCurrentUser:
+    """Tests for get_current_user."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self, monkeypatch):
+        monkeypatch.setattr(auth, "principal_cache", PrincipalCache(max_size=10, ttl=60))
+
+    async def test_user_is_queried_once_per_token(self):
+        user_id = uuid.uuid4()
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.return_value = user_result(make_user(user_id))
+
+        first = await get_current_user((user_id, 1), db)
+        first["is_admin"] = True
+        second = await get_current_user((user_id, 1), db)
+
+        assert second["id"] == str(user_id)
+        assert second["is_admin"] is False
+        assert db.execute.await_count == 1
+
+        # A token issued later reads the user again
+        await get_current_user((user_id, 2), db)
+        assert db.execute.await_count == 2
+
+    async def test_bulk_user_update_invalidates(self):
+        user_id = uuid.uuid4()
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.return_value = user_result(make_user(user_id))
+        await get_current_user((user_id, 1), db)
+
+        state = MagicMock(is_update=True, is_delete=False, bind_mapper=User.__mapper__)
+        auth._invalidate_bulk_user_changes(state)
+        await get_current_user((user_id, 1), db)
+
+        assert db.execute.await_count == 2
+
+    async def test_missing_user_is_not_cached(self):
+        db = AsyncMock(spec=AsyncSession)
+        db.execute.return_value = user_result(None)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user((uuid.uuid4(), 1), db)
+
+        assert exc_info.value.status_code == 404
+        assert auth.principal_cache.metrics()["size"] == 0
+
+
+def test_tokens_carry_issued_at(monkeypatch):
+    monkeypatch.setattr(security, "token_cache", VerifiedTokenCache(max_size=10))
+    user_id = uuid.uuid4()
+    token = create_access_token({"sub": str(user_id)}, expires_delta=timedelta(minutes=5))
+
+    decoded_id, issued_at = security.decode_token_subject(token)
+
+    assert decoded_id == user_id
+    assert isinstance(issued_at, int)
+    assert security.decode_token_subject(token) == (decoded_id, issued_at)
@@ -0,0 +1,78 @@
+"""
+Tests for the per-request SQL statement statistics.
+"""
+import logging
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from src.utils import query_stats
+from src.utils.query_stats import QueryStats, fingerprint, instrument_engine, track_queries
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE teams (id INTEGER PRIMARY KEY, name TEXT)"))
+    yield engine
+    engine.dispose()
+
+
+def test_fingerprints_ignore_values():
+    first = fingerprint("SELECT * FROM teams_1 WHERE id IN ($1, $2, $3) AND name = 'Yankees' LIMIT 50")
+    second = fingerprint("SELECT *\n  FROM teams_1 WHERE id IN ($1) AND name = 'Mets' LIMIT 10")
+
+    assert first == second == "SELECT * FROM teams_1 WHERE id IN (?, ...) AND name = ? LIMIT ?"
+
+
+def test_statements_are_counted_per_request(engine, monkeypatch):
+    monkeypatch.setattr(query_stats.settings, "SQL_DUPLICATE_THRESHOLD", 3)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))  # Outside any request
+        with track_queries("request-1") as stats:
+            for team_id in range(4):
+                conn.execute(text("SELECT name FROM teams WHERE id = :id"), {"id": team_id})
+            conn.execute(text("SELECT count(*) FROM teams"))
+
+    assert stats.statements == 5
+    assert stats.seconds > 0
+    assert stats.repeated() == {"SELECT name FROM teams WHERE id = ?": 4}
+    assert len(stats.slowest()) == 3
+    assert dict(stats.headers())["X-DB-Repeated-Statements"] == "1"
+    assert query_stats.current_query_stats() is None
+
+
+def test_failed_statements_are_not_left_running(engine):
+    with engine.connect() as conn:
+        with pytest.raises(exc.OperationalError):
+            conn.execute(text("SELECT * FROM missing"))
+        assert conn.info[query_stats._STARTED_KEY] == []
+
+
+def test_slow_statements_are_logged_with_the_request_id(engine, monkeypatch, caplog):
+    monkeypatch.setattr(query_stats.settings, "SQL_SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger="sheetgpt.db"):
+        with engine.connect() as conn, track_queries("request-2"):
+            conn.execute(text("SELECT name FROM teams WHERE id = 7"))
+
+    assert "Slow statement" in caplog.text
+    assert "request request-2" in caplog.text
+    assert "WHERE id = ?" in caplog.text
+
+
+def test_publish_flags_repeated_statements(monkeypatch):
+    monkeypatch.setattr(query_stats.settings, "SQL_DUPLICATE_THRESHOLD", 2)
+    route = "/api/v1/test/{entity_type}"
+    before = query_stats.REPEATED_STATEMENT_REQUESTS.labels(route)._value.get()
+
+    stats = QueryStats("request-3")
+    stats.record("SELECT * FROM leagues WHERE id = $1", 0.001)
+    stats.record("SELECT * FROM leagues WHERE id = $1", 0.002)
+    stats.publish(route)
+
+    assert query_stats.REPEATED_STATEMENT_REQUESTS.labels(route)._value.get() == before + 1
+    assert stats.summary()["db_repeated"] == {"SELECT * FROM leagues WHERE id = ?": 2}